@@ -1,7 +1,15 @@
 """AWS client wrapper module."""
 
+from .account_context import AccountContext
 from .aws_client import AWSAPIError, AWSClient
 from .cache import CacheError, RedisCache
 from .regional_client_factory import RegionalClientFactory
 
-__all__ = ["AWSClient", "AWSAPIError", "RedisCache", "CacheError", "RegionalClientFactory"]
+__all__ = [
+    "AWSClient",
+    "AWSAPIError",
+    "AccountContext",
+    "RedisCache",
+    "CacheError",
+    "RegionalClientFactory",
+]
@@ -0,0 +1,163 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Account-scoped metadata shared by all regional AWS clients.
+
+Facts such as the account ID, partition, the Cost Explorer client and the
+list of enabled regions are the same for every region. Holding them in one
+AccountContext means a 17-region scan resolves them once instead of once
+per regional AWSClient.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import boto3
+
+logger = logging.getLogger(__name__)
+
+# Cost Explorer is a global service served from us-east-1
+COST_EXPLORER_REGION = "us-east-1"
+
+
+class AccountContext:
+    """
+    Caches account-level metadata shared across regional clients.
+
+    The caller identity is fetched at most once: concurrent regional scans
+    that need the account ID wait on the same in-flight STS call rather
+    than each issuing their own.
+    """
+
+    def __init__(self, session: boto3.Session):
+        """
+        Initialize an empty account context.
+
+        Args:
+            session: boto3 Session used to create account-scoped clients
+        """
+        self._session = session
+        self._account_id: str | None = None
+        self._partition: str | None = None
+        self._identity_lock: asyncio.Lock | None = None
+        self._ce_client: Any = None
+        self._client_lock = threading.Lock()
+        self._enabled_regions: list[str] | None = None
+        self._enabled_regions_at: float = 0.0
+
+    @property
+    def account_id(self) -> str | None:
+        """Cached account ID, or None if not resolved yet."""
+        return self._account_id
+
+    @property
+    def partition(self) -> str | None:
+        """Cached AWS partition (e.g. "aws", "aws-cn"), or None if not resolved yet."""
+        return self._partition
+
+    async def get_account_id(
+        self, fetch_identity: Callable[[], Awaitable[dict[str, Any]]]
+    ) -> str:
+        """
+        Get the account ID, resolving it through STS on first use.
+
+        Args:
+            fetch_identity: Coroutine function returning a GetCallerIdentity response.
+                           Only invoked when the account ID is not cached yet.
+
+        Returns:
+            AWS account ID
+
+        Raises:
+            ValueError: If the identity response carries no account ID
+        """
+        if self._account_id is not None:
+            return self._account_id
+
+        if self._identity_lock is None:
+            self._identity_lock = asyncio.Lock()
+
+        async with self._identity_lock:
+            # Another region may have resolved it while we waited
+            if self._account_id is None:
+                identity = await fetch_identity()
+                account_id = identity.get("Account", "")
+                if not account_id:
+                    raise ValueError("Account ID not found in STS response")
+                self._account_id = account_id
+                self._partition = _partition_from_arn(identity.get("Arn", ""))
+                logger.debug(
+                    f"Resolved account identity: account={account_id}, "
+                    f"partition={self._partition}"
+                )
+
+        return self._account_id
+
+    @property
+    def ce(self) -> Any:
+        """Cost Explorer client shared by all regions (always us-east-1)."""
+        if self._ce_client is None:
+            with self._client_lock:
+                if self._ce_client is None:
+                    self._ce_client = self._session.client(
+                        "ce", region_name=COST_EXPLORER_REGION
+                    )
+        return self._ce_client
+
+    def get_enabled_regions(self, max_age_seconds: float) -> list[str] | None:
+        """
+        Get the cached enabled-region list if it is fresh enough.
+
+        Args:
+            max_age_seconds: Maximum age of the cached list in seconds
+
+        Returns:
+            List of region codes, or None if not cached or stale
+        """
+        if self._enabled_regions is None:
+            return None
+        if time.monotonic() - self._enabled_regions_at > max_age_seconds:
+            return None
+        return list(self._enabled_regions)
+
+    def set_enabled_regions(self, regions: list[str]) -> None:
+        """
+        Cache the enabled-region list for this account.
+
+        Args:
+            regions: List of enabled region codes
+        """
+        self._enabled_regions = list(regions)
+        self._enabled_regions_at = time.monotonic()
+
+    def clear_enabled_regions(self) -> None:
+        """Forget the cached enabled-region list."""
+        self._enabled_regions = None
+        self._enabled_regions_at = 0.0
+
+    def clear(self) -> None:
+        """Forget all cached account metadata."""
+        self._account_id = None
+        self._partition = None
+        self.clear_enabled_regions()
+
+
+def _partition_from_arn(arn: str) -> str:
+    """
+    Extract the partition from an ARN, defaulting to "aws".
+
+    Args:
+        arn: ARN such as "arn:aws-cn:sts::123456789012:assumed-role/x/y"
+
+    Returns:
+        Partition name
+    """
+    parts = arn.split(":")
+    if len(parts) > 1 and parts[0] == "arn" and parts[1]:
+        return parts[1]
+    return "aws"
@@ -0,0 +1,214 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Native-async AWS client backend built on aiobotocore.
+
+AsyncAWSClient keeps the fetcher interface of AWSClient (every
+get_* method is inherited unchanged) but issues requests on the event
+loop through aiobotocore instead of running boto3 in worker threads.
+Concurrency is no longer capped by thread pool size, and cancelling the
+awaiting task (e.g. ``asyncio.wait_for`` timing out a region scan)
+aborts the in-flight HTTP request instead of leaving it running.
+
+aiobotocore is an optional dependency. Select this backend with
+``AWS_CLIENT_BACKEND=aiobotocore`` after ``pip install aiobotocore``.
+"""
+
+import asyncio
+import contextlib
+import inspect
+import logging
+from collections.abc import Callable
+from typing import Any
+
+import boto3
+from botocore.config import Config
+
+from .account_context import COST_EXPLORER_REGION, AccountContext
+from .aws_client import AWSClient
+
+logger = logging.getLogger(__name__)
+
+# HTTP connections per service client. Requests are cheap coroutines, so the
+# limit is set well above botocore's default of 10.
+MAX_POOL_CONNECTIONS = 50
+
+# Process-wide aiobotocore session (lazy loaded)
+_shared_aio_session: Any = None
+
+
+def get_shared_aio_session() -> Any:
+    """
+    Get the process-wide aiobotocore session.
+
+    Returns:
+        Shared aiobotocore AioSession (created on first call)
+
+    Raises:
+        ImportError: If aiobotocore is not installed
+    """
+    global _shared_aio_session
+    if _shared_aio_session is None:
+        try:
+            from aiobotocore.session import get_session
+        except ImportError as e:
+            raise ImportError(
+                "The aiobotocore AWS client backend requires aiobotocore. "
+                "Install with: pip install aiobotocore>=2.9.0"
+            ) from e
+        _shared_aio_session = get_session()
+    return _shared_aio_session
+
+
+class _AsyncServiceProxy:
+    """
+    Stand-in for a service client until the real one is opened.
+
+    Fetchers reference operations as ``self.ec2.describe_instances`` from
+    synchronous properties, but aiobotocore clients can only be created
+    inside a coroutine. The proxy hands out coroutine functions that open
+    the client on first call and then forward to it.
+    """
+
+    def __init__(self, owner: "AsyncAWSClient", service_name: str):
+        self._owner = owner
+        self._service_name = service_name
+
+    def __getattr__(self, operation_name: str) -> Callable:
+        if operation_name.startswith("_"):
+            raise AttributeError(operation_name)
+
+        owner = self._owner
+        service_name = self._service_name
+
+        async def _operation(*args, **kwargs) -> Any:
+            client = await owner._open_client(service_name)
+            return await getattr(client, operation_name)(*args, **kwargs)
+
+        _operation.__name__ = operation_name
+        _operation.__qualname__ = f"{service_name}.{operation_name}"
+        return _operation
+
+
+class AsyncAWSClient(AWSClient):
+    """
+    AWSClient backend that calls AWS through aiobotocore.
+
+    Service clients are opened lazily on first use and kept open until
+    close() is called. Throttling backoff, rate limiting and account
+    metadata sharing behave exactly as in AWSClient.
+    """
+
+    def __init__(
+        self,
+        region: str = "us-east-1",
+        boto_config: Config | None = None,
+        session: boto3.Session | None = None,
+        account_context: AccountContext | None = None,
+        aio_session: Any = None,
+    ):
+        """
+        Initialize the async client wrapper.
+
+        Args:
+            region: AWS region to use for regional services
+            boto_config: Optional botocore Config applied to all clients
+            session: Optional boto3 Session, still used by callers that need
+                    a synchronous session (e.g. policy import)
+            account_context: Optional account metadata shared with other
+                            regional clients
+            aio_session: Optional aiobotocore session. Defaults to the
+                        process-wide shared session.
+        """
+        super().__init__(
+            region=region,
+            boto_config=boto_config,
+            session=session,
+            account_context=account_context,
+        )
+        self._boto_config = self._boto_config.merge(
+            Config(max_pool_connections=MAX_POOL_CONNECTIONS)
+        )
+        self._aio_session = aio_session or get_shared_aio_session()
+        self._aio_clients: dict[str, Any] = {}
+        self._exit_stack = contextlib.AsyncExitStack()
+        self._open_lock: asyncio.Lock | None = None
+
+    @property
+    def ce(self) -> Any:
+        """Cost Explorer is always us-east-1."""
+        return self._get_client("ce")
+
+    def _get_client(self, service_name: str) -> Any:
+        """
+        Get a lazily-opened proxy for a service client.
+
+        Args:
+            service_name: boto3 service name (e.g., "dynamodb", "eks")
+
+        Returns:
+            Proxy whose operations are coroutine functions
+        """
+        client = self._clients.get(service_name)
+        if client is None:
+            client = _AsyncServiceProxy(self, service_name)
+            self._clients[service_name] = client
+        return client
+
+    async def _open_client(self, service_name: str) -> Any:
+        """
+        Open the aiobotocore client for a service on first use.
+
+        Args:
+            service_name: boto3 service name
+
+        Returns:
+            Open aiobotocore client
+        """
+        client = self._aio_clients.get(service_name)
+        if client is not None:
+            return client
+
+        if self._open_lock is None:
+            self._open_lock = asyncio.Lock()
+
+        async with self._open_lock:
+            client = self._aio_clients.get(service_name)
+            if client is None:
+                region = COST_EXPLORER_REGION if service_name == "ce" else self.region
+                client = await self._exit_stack.enter_async_context(
+                    self._aio_session.create_client(
+                        service_name, region_name=region, config=self._boto_config
+                    )
+                )
+                self._aio_clients[service_name] = client
+        return client
+
+    async def _invoke(self, service_name: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Make a single AWS API call on the event loop.
+
+        Cancelling the awaiting task aborts the HTTP request.
+
+        Args:
+            service_name: Name of the AWS service
+            func: Proxy operation (coroutine function) to call
+            *args: Positional arguments for the operation
+            **kwargs: Keyword arguments for the operation
+
+        Returns:
+            Response from AWS API
+        """
+        if inspect.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+        # Plain callables (e.g. synchronous helpers) still go to the pools
+        return await super()._invoke(service_name, func, *args, **kwargs)
+
+    async def close(self) -> None:
+        """Close every open aiobotocore client and its connection pool."""
+        try:
+            await self._exit_stack.aclose()
+        finally:
+            self._aio_clients.clear()
+            self._exit_stack = contextlib.AsyncExitStack()
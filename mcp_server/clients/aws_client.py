@@ -5,8 +5,11 @@
 """AWS client wrapper with rate limiting and backoff."""
 
 import asyncio
+import contextvars
+import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -14,6 +17,28 @@ import boto3
 from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
 
+from ..utils.api_ledger import PAGE_TOKEN_PARAMS, attribute_api_calls, get_api_ledger
+from ..utils.deadline import (
+    deadline_near,
+    record_refused_call,
+    record_truncation,
+    remaining_seconds,
+)
+from ..utils.timing import span
+from .account_context import AccountContext
+from .executors import classify_workload, get_executor
+
+
+def _response_bytes(response: Any) -> int:
+    """Size of an API response from its Content-Length header (0 if unknown)."""
+    if not isinstance(response, dict):
+        return 0
+    headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+    try:
+        return int(headers.get("content-length", 0))
+    except (TypeError, ValueError):
+        return 0
+
 
 class AWSAPIError(Exception):
     """Raised when AWS API calls fail."""
@@ -21,6 +46,126 @@ class AWSAPIError(Exception):
     pass
 
 
+class DeadlineExceededError(AWSAPIError):
+    """Raised instead of making an AWS call when the request deadline is near."""
+
+    pass
+
+
+# Process-wide boto3 Session shared by every AWSClient (lazy loaded).
+# The underlying botocore loader caches parsed service models, so sharing
+# one session means a 17-region scan parses each model once, not 17 times.
+_shared_session: boto3.Session | None = None
+_session_lock = threading.RLock()
+
+
+def get_shared_session() -> boto3.Session:
+    """
+    Get the process-wide boto3 Session used to create service clients.
+
+    Returns:
+        Shared boto3 Session (created on first call)
+    """
+    global _shared_session
+    if _shared_session is None:
+        with _session_lock:
+            if _shared_session is None:
+                _shared_session = boto3.Session()
+    return _shared_session
+
+
+# Set while listing resources whose per-resource tag lookups can wait
+# (sampled scans only need tags for the resources they draw).
+_tag_lookups_deferred: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "tag_lookups_deferred", default=False
+)
+
+# Concurrent tag lookups when resolving a sample
+DEFERRED_TAG_CONCURRENCY = 16
+
+
+@contextmanager
+def defer_tag_lookups() -> Iterator[None]:
+    """
+    Skip per-resource tag API calls for resources listed in this block.
+
+    Fetchers that need one tag call per resource (RDS, S3, Lambda, ...)
+    store a DeferredTags in the resource's "tags" instead. Call
+    resolve_deferred_tags() on the resources you keep before reading them.
+    """
+    token = _tag_lookups_deferred.set(True)
+    try:
+        yield
+    finally:
+        _tag_lookups_deferred.reset(token)
+
+
+class DeferredTags:
+    """A per-resource tag lookup that hasn't been made yet."""
+
+    __slots__ = ("client", "service_name", "func", "extract", "kwargs")
+
+    def __init__(
+        self,
+        client: "AWSClient",
+        service_name: str,
+        func: Callable,
+        extract: Callable[[Any], dict[str, str]],
+        kwargs: dict[str, Any],
+    ):
+        self.client = client
+        self.service_name = service_name
+        self.func = func
+        self.extract = extract
+        self.kwargs = kwargs
+
+    async def resolve(self) -> dict[str, str]:
+        """
+        Make the tag call; a failed lookup counts as no tags, as when listing.
+
+        Raises:
+            DeadlineExceededError: If the request deadline refused the call.
+                The resource's tags are unknown, not empty.
+        """
+        try:
+            response = await self.client._call_with_backoff(
+                self.service_name, self.func, **self.kwargs
+            )
+        except DeadlineExceededError:
+            raise
+        except AWSAPIError:
+            return {}
+        return self.extract(response)
+
+
+async def resolve_deferred_tags(resources: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Replace DeferredTags in resources' "tags" with the looked-up tags, in place.
+
+    Args:
+        resources: Resources listed under defer_tag_lookups()
+
+    Returns:
+        Resources whose lookup the request deadline refused; their "tags"
+        are still DeferredTags
+    """
+    semaphore = asyncio.Semaphore(DEFERRED_TAG_CONCURRENCY)
+    refused: list[dict[str, Any]] = []
+
+    async def resolve(resource: dict[str, Any]) -> None:
+        async with semaphore:
+            with attribute_api_calls(resource.get("resource_type", "")):
+                try:
+                    resource["tags"] = await resource["tags"].resolve()
+                except DeadlineExceededError:
+                    refused.append(resource)
+
+    await asyncio.gather(
+        *(resolve(r) for r in resources if isinstance(r.get("tags"), DeferredTags))
+    )
+    return refused
+
+
 class AWSClient:
     """
     Wrapper around boto3 clients with rate limiting and exponential backoff.
@@ -29,9 +174,19 @@ class AWSClient:
     Implements exponential backoff for rate limit errors.
     """
 
-    def __init__(self, region: str = "us-east-1", boto_config: Config | None = None):
+    def __init__(
+        self,
+        region: str = "us-east-1",
+        boto_config: Config | None = None,
+        session: boto3.Session | None = None,
+        account_context: AccountContext | None = None,
+    ):
         """
-        Initialize AWS clients.
+        Initialize AWS client wrapper.
+
+        Service clients are not created here. Each one is built on first use
+        from a boto3 Session that is shared across all AWSClient instances, so
+        service models are loaded once per process rather than once per region.
 
         Args:
             region: AWS region to use for regional services
@@ -39,6 +194,11 @@ class AWSClient:
                         If not provided, a default config with adaptive retries is used.
                         This ensures consistent retry/timeout behavior when creating
                         clients for multiple regions via RegionalClientFactory.
+            session: Optional boto3 Session to create clients from.
+                    Defaults to the process-wide shared session.
+            account_context: Optional account metadata shared with other regional
+                            clients (account ID, Cost Explorer client). When None,
+                            this client resolves them on its own.
         """
         # Use provided config or create default with retries
         if boto_config is not None:
@@ -47,20 +207,12 @@ class AWSClient:
         else:
             config = Config(region_name=region, retries={"max_attempts": 3, "mode": "adaptive"})
 
-        # Initialize clients - uses IAM instance profile automatically
+        # Clients are created lazily - uses IAM instance profile automatically
         self.region = region
         self._boto_config = config  # Store for introspection
-        self.ec2 = boto3.client("ec2", config=config)
-        self.rds = boto3.client("rds", config=config)
-        self.s3 = boto3.client("s3", config=config)
-        self.lambda_client = boto3.client("lambda", config=config)
-        self.ecs = boto3.client("ecs", config=config)
-        self.sts = boto3.client("sts", config=config)
-        self.opensearch = boto3.client("opensearch", config=config)
-        # Resource Groups Tagging API - discovers all taggable resources
-        self.resourcegroupstaggingapi = boto3.client("resourcegroupstaggingapi", config=config)
-        # Cost Explorer is always us-east-1
-        self.ce = boto3.client("ce", region_name="us-east-1")
+        self._session = session or get_shared_session()
+        self._clients: dict[str, Any] = {}
+        self._account_context = account_context
 
         # Cache account ID to avoid repeated STS calls
         self._account_id: str | None = None
@@ -69,6 +221,60 @@ class AWSClient:
         self._last_call_time: dict[str, float] = {}
         self._min_call_interval = 0.1  # 100ms between calls to same service
 
+    @property
+    def session(self) -> boto3.Session:
+        """The boto3 Session that service clients are created from."""
+        return self._session
+
+    @property
+    def ec2(self) -> Any:
+        return self._get_client("ec2")
+
+    @property
+    def rds(self) -> Any:
+        return self._get_client("rds")
+
+    @property
+    def s3(self) -> Any:
+        return self._get_client("s3")
+
+    @property
+    def lambda_client(self) -> Any:
+        return self._get_client("lambda")
+
+    @property
+    def ecs(self) -> Any:
+        return self._get_client("ecs")
+
+    @property
+    def sts(self) -> Any:
+        return self._get_client("sts")
+
+    @property
+    def opensearch(self) -> Any:
+        return self._get_client("opensearch")
+
+    @property
+    def resourcegroupstaggingapi(self) -> Any:
+        """Resource Groups Tagging API - discovers all taggable resources."""
+        return self._get_client("resourcegroupstaggingapi")
+
+    @property
+    def account_context(self) -> AccountContext | None:
+        """Account metadata shared with other regional clients, if any."""
+        return self._account_context
+
+    @property
+    def ce(self) -> Any:
+        """Cost Explorer is always us-east-1."""
+        if self._account_context is not None:
+            return self._account_context.ce
+        if "ce" not in self._clients:
+            with _session_lock:
+                if "ce" not in self._clients:
+                    self._clients["ce"] = self._session.client("ce", region_name="us-east-1")
+        return self._clients["ce"]
+
     async def _rate_limit(self, service_name: str) -> None:
         """
         Implement basic rate limiting between calls to the same service.
@@ -98,36 +304,106 @@ class AWSClient:
 
         Raises:
             AWSAPIError: If the API call fails after retries
+            DeadlineExceededError: If the request deadline is too close to start the call
         """
+        operation_name = getattr(func, "__name__", "call")
+        operation = f"{service_name}.{operation_name}"
         await self._rate_limit(service_name)
 
         max_retries = 5
         base_delay = 1.0
 
-        for attempt in range(max_retries):
-            try:
-                # Run boto3 call in thread pool to avoid blocking
-                loop = asyncio.get_event_loop()
-                response = await loop.run_in_executor(None, lambda: func(*args, **kwargs))
-                return response
-
-            except ClientError as e:
-                error_code = e.response.get("Error", {}).get("Code", "")
-
-                # Retry on throttling errors
-                if error_code in ["Throttling", "ThrottlingException", "RequestLimitExceeded"]:
-                    if attempt < max_retries - 1:
-                        delay = base_delay * (2**attempt)
-                        await asyncio.sleep(delay)
-                        continue
+        started = time.perf_counter()
+        attempts = 0
+        throttles = 0
+        response = None
+        try:
+            for attempt in range(max_retries):
+                # Don't start calls the client will never see the result of
+                if deadline_near():
+                    record_refused_call(operation)
+                    raise DeadlineExceededError(f"Request deadline reached before {operation}")
 
-                # Don't retry other errors
-                raise AWSAPIError(f"AWS API error: {error_code} - {str(e)}") from e
+                attempts += 1
+                try:
+                    with span(f"aws.{service_name}"):
+                        response = await self._invoke(service_name, func, *args, **kwargs)
+                    return response
+
+                except ClientError as e:
+                    error_code = e.response.get("Error", {}).get("Code", "")
+
+                    # Retry on throttling errors
+                    if error_code in ["Throttling", "ThrottlingException", "RequestLimitExceeded"]:
+                        throttles += 1
+                        if attempt < max_retries - 1:
+                            delay = base_delay * (2**attempt)
+                            remaining = remaining_seconds()
+                            if remaining is not None and remaining < delay:
+                                record_refused_call(f"{operation} retry")
+                                raise DeadlineExceededError(
+                                    f"Request deadline reached while {operation} was throttled"
+                                ) from e
+                            await asyncio.sleep(delay)
+                            continue
 
-            except BotoCoreError as e:
-                raise AWSAPIError(f"Boto3 error: {str(e)}") from e
+                    # Don't retry other errors
+                    raise AWSAPIError(f"AWS API error: {error_code} - {str(e)}") from e
+
+                except BotoCoreError as e:
+                    raise AWSAPIError(f"Boto3 error: {str(e)}") from e
+
+            raise AWSAPIError(f"Max retries exceeded for {service_name}")
+
+        finally:
+            ledger = get_api_ledger()
+            if ledger is not None and attempts:
+                ledger.record(
+                    service=service_name,
+                    operation=operation_name,
+                    region=self._call_region(service_name, func),
+                    latency_ms=(time.perf_counter() - started) * 1000,
+                    retries=attempts - 1,
+                    throttles=throttles,
+                    response_bytes=_response_bytes(response),
+                    page=not PAGE_TOKEN_PARAMS.isdisjoint(kwargs),
+                    failed=response is None,
+                )
 
-        raise AWSAPIError(f"Max retries exceeded for {service_name}")
+    def _call_region(self, service_name: str, func: Callable) -> str:
+        """Region an API call went to, for the call ledger."""
+        client = getattr(func, "__self__", None)
+        region = getattr(getattr(client, "meta", None), "region_name", None)
+        return region or ("us-east-1" if service_name == "ce" else self.region)
+
+    async def _invoke(self, service_name: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Make a single AWS API call without retries.
+
+        Args:
+            service_name: Name of the AWS service
+            func: Boto3 client method to call
+            *args: Positional arguments for the method
+            **kwargs: Keyword arguments for the method
+
+        Returns:
+            Response from AWS API
+        """
+        # Inventory, tagging and Cost Explorer calls run in separate pools
+        # so a large Describe* sweep cannot starve the other workloads
+        executor = get_executor(
+            classify_workload(service_name, getattr(func, "__name__", ""))
+        )
+        # Run boto3 call in thread pool to avoid blocking
+        return await executor.run(func, *args, **kwargs)
+
+    async def close(self) -> None:
+        """
+        Release resources held by this client.
+
+        boto3 clients hold no per-client connections that need closing,
+        so this is a no-op kept for parity with AsyncAWSClient.
+        """
 
     async def _get_account_id(self) -> str:
         """
@@ -143,6 +419,13 @@ class AWSClient:
             return self._account_id
 
         try:
+            if self._account_context is not None:
+                # Resolved once per account, shared by every regional client
+                self._account_id = await self._account_context.get_account_id(
+                    lambda: self._call_with_backoff("sts", self.sts.get_caller_identity)
+                )
+                return self._account_id
+
             response = await self._call_with_backoff("sts", self.sts.get_caller_identity)
             self._account_id = response.get("Account", "")
             if not self._account_id:
@@ -159,7 +442,8 @@ class AWSClient:
         Lazily initialize and cache a boto3 client for a given service.
 
         Avoids creating 30+ boto3 clients at startup when only a few
-        resource types may be scanned.
+        resource types may be scanned. Clients come from the shared
+        session, so the service model is parsed once per process.
 
         Args:
             service_name: boto3 service name (e.g., "dynamodb", "eks")
@@ -167,10 +451,15 @@ class AWSClient:
         Returns:
             boto3 client for the service
         """
-        cache_attr = f"_lazy_{service_name.replace('-', '_')}"
-        if not hasattr(self, cache_attr):
-            setattr(self, cache_attr, boto3.client(service_name, config=self._boto_config))
-        return getattr(self, cache_attr)
+        client = self._clients.get(service_name)
+        if client is None:
+            # botocore sessions are not thread-safe for client creation
+            with _session_lock:
+                client = self._clients.get(service_name)
+                if client is None:
+                    client = self._session.client(service_name, config=self._boto_config)
+                    self._clients[service_name] = client
+        return client
 
     def _extract_tags(self, tag_list: list[dict[str, str]]) -> dict[str, str]:
         """
@@ -196,6 +485,29 @@ class AWSClient:
 
         return result
 
+    async def _lookup_tags(
+        self,
+        extract: Callable[[Any], dict[str, str]],
+        service_name: str,
+        func: Callable,
+        **kwargs,
+    ) -> dict[str, str] | DeferredTags:
+        """
+        Look up one resource's tags, or defer the call under defer_tag_lookups().
+
+        Args:
+            extract: Turns the API response into a tag dictionary
+            service_name: Service name for rate limiting and the call ledger
+            func: Boto3 tag-listing method
+            **kwargs: Arguments identifying the resource
+
+        Returns:
+            Tag dictionary, or a DeferredTags while lookups are deferred
+        """
+        if _tag_lookups_deferred.get():
+            return DeferredTags(self, service_name, func, extract, kwargs)
+        return extract(await self._call_with_backoff(service_name, func, **kwargs))
+
     async def get_tags_for_arns(self, arns: list[str]) -> dict[str, dict[str, str]]:
         """
         Efficiently fetch tags for specific resources by their ARNs.
@@ -502,12 +814,11 @@ class AWSClient:
                 created_at = db_instance.get("InstanceCreateTime")
 
                 # Fetch tags for this RDS instance
-                tags_response = await self._call_with_backoff(
-                    "rds", self.rds.list_tags_for_resource, ResourceName=db_arn
+                tags = await self._lookup_tags(
+                    lambda r: self._extract_tags(r.get("TagList", [])),
+                    "rds", self.rds.list_tags_for_resource, ResourceName=db_arn,
                 )
 
-                tags = self._extract_tags(tags_response.get("TagList", []))
-
                 resources.append(
                     {
                         "resource_id": db_id,
@@ -548,10 +859,10 @@ class AWSClient:
 
                 # Fetch tags for this bucket
                 try:
-                    tags_response = await self._call_with_backoff(
-                        "s3", self.s3.get_bucket_tagging, Bucket=bucket_name
+                    tags = await self._lookup_tags(
+                        lambda r: self._extract_tags(r.get("TagSet", [])),
+                        "s3", self.s3.get_bucket_tagging, Bucket=bucket_name,
                     )
-                    tags = self._extract_tags(tags_response.get("TagSet", []))
                 except AWSAPIError:
                     # Bucket might not have tags
                     tags = {}
@@ -599,10 +910,10 @@ class AWSClient:
 
                 # Fetch tags for this function
                 try:
-                    tags_response = await self._call_with_backoff(
-                        "lambda", self.lambda_client.list_tags, Resource=function_arn
+                    tags = await self._lookup_tags(
+                        lambda r: r.get("Tags", {}),
+                        "lambda", self.lambda_client.list_tags, Resource=function_arn,
                     )
-                    tags = tags_response.get("Tags", {})
                 except AWSAPIError:
                     tags = {}
 
@@ -728,10 +1039,10 @@ class AWSClient:
 
                     # Fetch tags for this domain
                     try:
-                        tags_response = await self._call_with_backoff(
-                            "opensearch", self.opensearch.list_tags, ARN=domain_arn
+                        tags = await self._lookup_tags(
+                            lambda r: self._extract_tags(r.get("TagList", [])),
+                            "opensearch", self.opensearch.list_tags, ARN=domain_arn,
                         )
-                        tags = self._extract_tags(tags_response.get("TagList", []))
                     except AWSAPIError:
                         tags = {}
 
@@ -994,10 +1305,10 @@ class AWSClient:
             resources = []
             for cluster in response.get("DBClusters", []):
                 cluster_arn = cluster.get("DBClusterArn")
-                tags_response = await self._call_with_backoff(
+                tags = await self._lookup_tags(
+                    lambda r: self._extract_tags(r.get("TagList", [])),
                     "rds", self.rds.list_tags_for_resource, ResourceName=cluster_arn,
                 )
-                tags = self._extract_tags(tags_response.get("TagList", []))
                 resources.append({
                     "resource_id": cluster.get("DBClusterIdentifier"),
                     "resource_type": "rds:cluster",
@@ -1029,10 +1340,10 @@ class AWSClient:
                     table = desc.get("Table", {})
                     table_arn = table.get("TableArn", "")
                     try:
-                        tags_resp = await self._call_with_backoff(
+                        tags = await self._lookup_tags(
+                            lambda r: self._extract_tags(r.get("Tags", [])),
                             "dynamodb", client.list_tags_of_resource, ResourceArn=table_arn,
                         )
-                        tags = self._extract_tags(tags_resp.get("Tags", []))
                     except AWSAPIError:
                         tags = {}
                     resources.append({
@@ -1065,10 +1376,10 @@ class AWSClient:
             for cluster in response.get("CacheClusters", []):
                 arn = cluster.get("ARN", "")
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: self._extract_tags(r.get("TagList", [])),
                         "elasticache", client.list_tags_for_resource, ResourceName=arn,
                     )
-                    tags = self._extract_tags(tags_resp.get("TagList", []))
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -1099,10 +1410,10 @@ class AWSClient:
             for rg in response.get("ReplicationGroups", []):
                 arn = rg.get("ARN", "")
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: self._extract_tags(r.get("TagList", [])),
                         "elasticache", client.list_tags_for_resource, ResourceName=arn,
                     )
-                    tags = self._extract_tags(tags_resp.get("TagList", []))
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -1162,10 +1473,10 @@ class AWSClient:
             for ep in response.get("Endpoints", []):
                 ep_arn = ep.get("EndpointArn", "")
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: self._extract_tags(r.get("Tags", [])),
                         "sagemaker", client.list_tags, ResourceArn=ep_arn,
                     )
-                    tags = self._extract_tags(tags_resp.get("Tags", []))
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -1194,10 +1505,10 @@ class AWSClient:
             for nb in response.get("NotebookInstances", []):
                 nb_arn = nb.get("NotebookInstanceArn", "")
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: self._extract_tags(r.get("Tags", [])),
                         "sagemaker", client.list_tags, ResourceArn=nb_arn,
                     )
-                    tags = self._extract_tags(tags_resp.get("Tags", []))
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -1228,10 +1539,10 @@ class AWSClient:
                 agent_id = agent_summary.get("agentId")
                 arn = f"arn:aws:bedrock:{self.region}:{account_id}:agent/{agent_id}"
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: r.get("tags", {}),
                         "bedrock-agent", client.list_tags_for_resource, resourceArn=arn,
                     )
-                    tags = tags_resp.get("tags", {})
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -1264,10 +1575,10 @@ class AWSClient:
                 kb_id = kb.get("knowledgeBaseId")
                 arn = f"arn:aws:bedrock:{self.region}:{account_id}:knowledge-base/{kb_id}"
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: r.get("tags", {}),
                         "bedrock-agent", client.list_tags_for_resource, resourceArn=arn,
                     )
-                    tags = tags_resp.get("tags", {})
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -1380,10 +1691,10 @@ class AWSClient:
             for stream_name in response.get("StreamNames", []):
                 arn = f"arn:aws:kinesis:{self.region}:{account_id}:stream/{stream_name}"
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: self._extract_tags(r.get("Tags", [])),
                         "kinesis", client.list_tags_for_stream, StreamName=stream_name,
                     )
-                    tags = self._extract_tags(tags_resp.get("Tags", []))
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -1412,10 +1723,10 @@ class AWSClient:
                 job_name = job.get("Name")
                 arn = f"arn:aws:glue:{self.region}:{account_id}:job/{job_name}"
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: r.get("Tags", {}),
                         "glue", client.get_tags, ResourceArn=arn,
                     )
-                    tags = tags_resp.get("Tags", {})
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -1446,10 +1757,10 @@ class AWSClient:
                 name = crawler.get("Name")
                 arn = f"arn:aws:glue:{self.region}:{account_id}:crawler/{name}"
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: r.get("Tags", {}),
                         "glue", client.get_tags, ResourceArn=arn,
                     )
-                    tags = tags_resp.get("Tags", {})
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -1486,10 +1797,10 @@ class AWSClient:
                         table_name = table.get("Name")
                         arn = f"arn:aws:glue:{self.region}:{account_id}:table/{db_name}/{table_name}"
                         try:
-                            tags_resp = await self._call_with_backoff(
+                            tags = await self._lookup_tags(
+                                lambda r: r.get("Tags", {}),
                                 "glue", client.get_tags, ResourceArn=arn,
                             )
-                            tags = tags_resp.get("Tags", {})
                         except AWSAPIError:
                             tags = {}
                         resources.append({
@@ -1658,10 +1969,10 @@ class AWSClient:
                     meta = desc.get("KeyMetadata", {})
                     if meta.get("KeyManager") != "CUSTOMER":
                         continue
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: self._extract_tags(r.get("Tags", [])),
                         "kms", client.list_resource_tags, KeyId=key_id,
                     )
-                    tags = self._extract_tags(tags_resp.get("Tags", []))
                     resources.append({
                         "resource_id": key_id,
                         "resource_type": "kms:key",
@@ -1722,11 +2033,10 @@ class AWSClient:
             for dist in dist_list.get("Items", []):
                 dist_arn = dist.get("ARN", "")
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: self._extract_tags(r.get("Tags", {}).get("Items", [])),
                         "cloudfront", client.list_tags_for_resource, Resource=dist_arn,
                     )
-                    tag_items = tags_resp.get("Tags", {}).get("Items", [])
-                    tags = self._extract_tags(tag_items)
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -1756,12 +2066,11 @@ class AWSClient:
                 zone_id = zone.get("Id", "").split("/")[-1]
                 arn = f"arn:aws:route53:::hostedzone/{zone_id}"
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: self._extract_tags(r.get("ResourceTagSet", {}).get("Tags", [])),
                         "route53", client.list_tags_for_resource,
                         ResourceType="hostedzone", ResourceId=zone_id,
                     )
-                    tag_set = tags_resp.get("ResourceTagSet", {})
-                    tags = self._extract_tags(tag_set.get("Tags", []))
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -1790,10 +2099,10 @@ class AWSClient:
             for sm in response.get("stateMachines", []):
                 sm_arn = sm.get("stateMachineArn", "")
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: self._extract_tags(r.get("tags", [])),
                         "stepfunctions", client.list_tags_for_resource, resourceArn=sm_arn,
                     )
-                    tags = self._extract_tags(tags_resp.get("tags", []))
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -1855,10 +2164,10 @@ class AWSClient:
                 name = pipeline.get("name")
                 arn = f"arn:aws:codepipeline:{self.region}:{account_id}:{name}"
                 try:
-                    tags_resp = await self._call_with_backoff(
+                    tags = await self._lookup_tags(
+                        lambda r: self._extract_tags(r.get("tags", [])),
                         "codepipeline", client.list_tags_for_resource, resourceArn=arn,
                     )
-                    tags = self._extract_tags(tags_resp.get("tags", []))
                 except AWSAPIError:
                     tags = {}
                 resources.append({
@@ -2094,6 +2403,63 @@ class AWSClient:
         except Exception as e:
             raise AWSAPIError(f"Failed to fetch cost data: {str(e)}") from e
 
+    async def get_cost_by_service_and_region(
+        self, time_period: dict[str, str] | None = None
+    ) -> dict[tuple[str, str], float]:
+        """
+        Fetch costs grouped by service and region in one Cost Explorer query.
+
+        Args:
+            time_period: Time period for cost data (defaults to the last 30 days)
+
+        Returns:
+            Dict mapping (service name, region) to total cost. Costs
+            Cost Explorer can't place in a region use region "global".
+        """
+        if not time_period:
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=30)
+            time_period = {
+                "Start": start_date.strftime("%Y-%m-%d"),
+                "End": end_date.strftime("%Y-%m-%d"),
+            }
+
+        costs: dict[tuple[str, str], float] = {}
+        request_params: dict[str, Any] = {
+            "TimePeriod": time_period,
+            "Granularity": "MONTHLY",
+            "Metrics": ["UnblendedCost"],
+            "GroupBy": [
+                {"Type": "DIMENSION", "Key": "SERVICE"},
+                {"Type": "DIMENSION", "Key": "REGION"},
+            ],
+        }
+
+        try:
+            while True:
+                response = await self._call_with_backoff(
+                    "ce", self.ce.get_cost_and_usage, **request_params
+                )
+                for result in response.get("ResultsByTime", []):
+                    for group in result.get("Groups", []):
+                        service, region = (group.get("Keys", []) + ["", ""])[:2]
+                        if not region or region == "NoRegion":
+                            region = "global"
+                        amount = float(
+                            group.get("Metrics", {}).get("UnblendedCost", {}).get("Amount", 0)
+                        )
+                        costs[(service, region)] = costs.get((service, region), 0.0) + amount
+
+                next_token = response.get("NextPageToken")
+                if not next_token:
+                    return costs
+                request_params["NextPageToken"] = next_token
+
+        except AWSAPIError:
+            raise
+        except Exception as e:
+            raise AWSAPIError(f"Failed to fetch cost data by region: {str(e)}") from e
+
     def get_service_name_for_resource_type(self, resource_type: str) -> str:
         """
         Map resource type to AWS Cost Explorer service name.
@@ -2192,6 +2558,13 @@ class AWSClient:
             # Paginate through all results
             while True:
                 if pagination_token:
+                    # Keep the pages we have rather than start one we can't finish
+                    if deadline_near():
+                        record_truncation(
+                            f"Resource Groups Tagging API pagination in {self.region} "
+                            f"after {len(resources)} resources"
+                        )
+                        break
                     request_params["PaginationToken"] = pagination_token
 
                 response = await self._call_with_backoff(
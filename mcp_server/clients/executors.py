@@ -0,0 +1,293 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Dedicated thread pools for blocking boto3 calls.
+
+boto3 is synchronous, so every AWS call runs in a worker thread. Sending
+them all to the event loop's default executor lets one workload starve
+another: a 17-region inventory sweep can queue hundreds of Describe*
+calls ahead of a single Cost Explorer request. This module keeps one
+sized pool per workload class and records how deep each queue gets and
+how long calls wait for a worker.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Matches the CoreSettings.max_concurrent_regions default
+DEFAULT_MAX_CONCURRENT_REGIONS = 5
+
+# Workers per concurrently scanned region. ComplianceService fetches all
+# resource types of a region at once, so inventory needs the most threads.
+INVENTORY_WORKERS_PER_REGION = 4
+TAGGING_WORKERS_PER_REGION = 2
+
+# Cost Explorer is a single global endpoint with a low request rate limit;
+# more threads would only produce throttling errors.
+COST_EXPLORER_WORKERS = 2
+
+
+class WorkloadClass(str, Enum):
+    """Classes of blocking AWS work, each served by its own thread pool."""
+
+    INVENTORY = "inventory"
+    TAGGING = "tagging"
+    COST_EXPLORER = "cost_explorer"
+
+
+@dataclass
+class ExecutorStats:
+    """
+    Point-in-time counters for one workload pool.
+
+    Attributes:
+        workload: Workload class served by the pool
+        max_workers: Number of worker threads
+        submitted: Calls submitted since the pool was created
+        completed: Calls that have finished (successfully or not)
+        active: Calls currently running in a worker thread
+        queue_depth: Calls waiting for a free worker
+        max_queue_depth: Highest queue depth observed
+        total_wait_ms: Total time calls spent waiting for a worker
+        max_wait_ms: Longest time a single call waited for a worker
+    """
+
+    workload: str
+    max_workers: int
+    submitted: int = 0
+    completed: int = 0
+    active: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    total_wait_ms: float = 0.0
+    max_wait_ms: float = 0.0
+
+    @property
+    def average_wait_ms(self) -> float:
+        """Average time a started call waited for a worker."""
+        started = self.completed + self.active
+        return self.total_wait_ms / started if started else 0.0
+
+
+class InstrumentedExecutor:
+    """
+    ThreadPoolExecutor wrapper that tracks queue depth and wait time.
+
+    Wait time is measured from submission until a worker thread picks
+    the call up, which is the delay that grows when a pool is undersized.
+    """
+
+    def __init__(self, workload: WorkloadClass, max_workers: int):
+        """
+        Create the pool.
+
+        Args:
+            workload: Workload class served by this pool
+            max_workers: Number of worker threads
+        """
+        self.workload = workload
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"aws-{workload.value}"
+        )
+        self._lock = threading.Lock()
+        self._stats = ExecutorStats(workload=workload.value, max_workers=max_workers)
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking callable in this pool and await its result.
+
+        Args:
+            func: Blocking callable (typically a boto3 client method)
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            Whatever the callable returns
+        """
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._stats.submitted += 1
+            self._stats.queue_depth += 1
+            self._stats.max_queue_depth = max(
+                self._stats.max_queue_depth, self._stats.queue_depth
+            )
+
+        def _call() -> Any:
+            wait_ms = (time.perf_counter() - submitted_at) * 1000
+            with self._lock:
+                self._stats.queue_depth -= 1
+                self._stats.active += 1
+                self._stats.total_wait_ms += wait_ms
+                self._stats.max_wait_ms = max(self._stats.max_wait_ms, wait_ms)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._stats.active -= 1
+                    self._stats.completed += 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _call)
+
+    def stats(self) -> ExecutorStats:
+        """Return a snapshot of this pool's counters."""
+        with self._lock:
+            return ExecutorStats(**vars(self._stats))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop the worker threads.
+
+        Args:
+            wait: Block until running calls finish
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def pool_sizes_for_concurrency(
+    max_concurrent_regions: int,
+) -> dict[WorkloadClass, int]:
+    """
+    Derive pool sizes from the region scan concurrency.
+
+    Args:
+        max_concurrent_regions: Maximum regions scanned in parallel
+
+    Returns:
+        Worker count for each workload class
+    """
+    regions = max(1, max_concurrent_regions)
+    return {
+        WorkloadClass.INVENTORY: regions * INVENTORY_WORKERS_PER_REGION,
+        WorkloadClass.TAGGING: regions * TAGGING_WORKERS_PER_REGION,
+        WorkloadClass.COST_EXPLORER: COST_EXPLORER_WORKERS,
+    }
+
+
+def classify_workload(service_name: str, operation_name: str = "") -> WorkloadClass:
+    """
+    Pick the workload class for an AWS API call.
+
+    Args:
+        service_name: boto3 service name (e.g. "ec2", "ce")
+        operation_name: boto3 operation name (e.g. "list_tags_for_resource")
+
+    Returns:
+        Workload class whose pool should run the call
+    """
+    if service_name == "ce":
+        return WorkloadClass.COST_EXPLORER
+    if service_name == "resourcegroupstaggingapi" or "tag" in operation_name.lower():
+        return WorkloadClass.TAGGING
+    return WorkloadClass.INVENTORY
+
+
+# Process-wide pools (lazy loaded, like the shared boto3 Session)
+_pools: dict[WorkloadClass, InstrumentedExecutor] = {}
+_pool_sizes: dict[WorkloadClass, int] = pool_sizes_for_concurrency(
+    DEFAULT_MAX_CONCURRENT_REGIONS
+)
+_pools_lock = threading.Lock()
+
+
+def configure_executor_pools(
+    max_concurrent_regions: int = DEFAULT_MAX_CONCURRENT_REGIONS,
+    overrides: dict[WorkloadClass, int | None] | None = None,
+) -> dict[WorkloadClass, int]:
+    """
+    Set pool sizes, replacing any pools that were already created.
+
+    Args:
+        max_concurrent_regions: Maximum regions scanned in parallel
+        overrides: Explicit worker counts that take precedence over the
+                  derived sizes. None values are ignored.
+
+    Returns:
+        Effective worker count for each workload class
+    """
+    global _pool_sizes
+    sizes = pool_sizes_for_concurrency(max_concurrent_regions)
+    for workload, size in (overrides or {}).items():
+        if size is not None:
+            sizes[workload] = size
+
+    with _pools_lock:
+        old_pools = list(_pools.values())
+        _pools.clear()
+        _pool_sizes = sizes
+
+    # Calls already running on replaced pools are allowed to finish
+    for pool in old_pools:
+        pool.shutdown(wait=False)
+
+    logger.info(
+        "Configured AWS executor pools: "
+        + ", ".join(f"{w.value}={n}" for w, n in sizes.items())
+    )
+    return dict(sizes)
+
+
+def get_executor(workload: WorkloadClass) -> InstrumentedExecutor:
+    """
+    Get the pool for a workload class, creating it on first use.
+
+    Args:
+        workload: Workload class
+
+    Returns:
+        The workload's thread pool
+    """
+    pool = _pools.get(workload)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(workload)
+            if pool is None:
+                pool = InstrumentedExecutor(workload, _pool_sizes[workload])
+                _pools[workload] = pool
+    return pool
+
+
+def get_executor_stats() -> list[ExecutorStats]:
+    """
+    Get counters for every workload class.
+
+    Pools that have not been used yet report zeros with their configured size.
+
+    Returns:
+        One ExecutorStats per workload class
+    """
+    stats = []
+    for workload in WorkloadClass:
+        pool = _pools.get(workload)
+        if pool is not None:
+            stats.append(pool.stats())
+        else:
+            stats.append(
+                ExecutorStats(workload=workload.value, max_workers=_pool_sizes[workload])
+            )
+    return stats
+
+
+def shutdown_executor_pools(wait: bool = True) -> None:
+    """
+    Stop all pools. They are recreated on next use.
+
+    Args:
+        wait: Block until running calls finish
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait)
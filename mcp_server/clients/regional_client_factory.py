@@ -7,12 +7,17 @@
 import logging
 from typing import Any
 
+import boto3
 from botocore.config import Config
 
-from .aws_client import AWSClient
+from .account_context import AccountContext
+from .aws_client import AWSClient, get_shared_session
 
 logger = logging.getLogger(__name__)
 
+# Supported AWSClient implementations
+AWS_CLIENT_BACKENDS = frozenset(["boto3", "aiobotocore"])
+
 
 class RegionalClientFactory:
     """
@@ -25,12 +30,20 @@ class RegionalClientFactory:
     - 2.1: Creates AWS clients for each enabled region
     - 2.2: Reuses existing clients for regions already initialized
     - 2.3: Applies same boto3 configuration (retries, timeouts) to all clients
+
+    All regional clients are created from one boto3 Session, so botocore
+    service models are loaded once and reused for every region. They also
+    share one AccountContext, so the account ID is resolved with a single
+    STS call and the Cost Explorer client and enabled-region list exist
+    once per account rather than once per region.
     """
     
     def __init__(
         self,
         default_region: str = "us-east-1",
-        boto_config: Config | None = None
+        boto_config: Config | None = None,
+        session: boto3.Session | None = None,
+        backend: str = "boto3",
     ):
         """
         Initialize with default region and boto3 config.
@@ -39,9 +52,24 @@ class RegionalClientFactory:
             default_region: Default AWS region code (e.g., "us-east-1")
             boto_config: Optional boto3 Config to apply to all clients.
                         If None, a default config with adaptive retries is used.
+            session: Optional boto3 Session shared by all regional clients.
+                    Defaults to the process-wide shared session.
+            backend: AWS client backend, "boto3" (threaded) or "aiobotocore"
+                    (native async, requires the aiobotocore package)
+
+        Raises:
+            ValueError: If the backend name is unknown
         """
+        if backend not in AWS_CLIENT_BACKENDS:
+            raise ValueError(
+                f"Unknown AWS client backend '{backend}'. "
+                f"Expected one of: {', '.join(sorted(AWS_CLIENT_BACKENDS))}"
+            )
         self._default_region = default_region
+        self._backend = backend
         self._boto_config = boto_config
+        self._session = session or get_shared_session()
+        self._account_context = AccountContext(self._session)
         self._clients: dict[str, AWSClient] = {}
         
         logger.debug(
@@ -58,6 +86,21 @@ class RegionalClientFactory:
         """Get the boto3 configuration."""
         return self._boto_config
     
+    @property
+    def backend(self) -> str:
+        """Get the AWS client backend name."""
+        return self._backend
+
+    @property
+    def session(self) -> boto3.Session:
+        """Get the boto3 Session shared by all regional clients."""
+        return self._session
+
+    @property
+    def account_context(self) -> AccountContext:
+        """Get the account metadata shared by all regional clients."""
+        return self._account_context
+
     @property
     def cached_regions(self) -> list[str]:
         """Get list of regions with cached clients."""
@@ -91,13 +134,39 @@ class RegionalClientFactory:
 
         # Create a new client for this region with consistent config
         logger.info(f"Creating new AWS client for region {region}")
-        client = AWSClient(region=region, boto_config=self._boto_config)
+        if self._backend == "aiobotocore":
+            # Imported here so the default backend works without aiobotocore
+            from .async_aws_client import AsyncAWSClient
+
+            client_class: type[AWSClient] = AsyncAWSClient
+        else:
+            client_class = AWSClient
+
+        client = client_class(
+            region=region,
+            boto_config=self._boto_config,
+            session=self._session,
+            account_context=self._account_context,
+        )
 
         # Cache the client for reuse
         self._clients[region] = client
 
         return client
     
+    async def close_clients(self) -> None:
+        """
+        Close and forget all cached clients.
+
+        Releases the HTTP connection pools held by async backend clients.
+        """
+        for region, client in list(self._clients.items()):
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Error closing AWS client for region {region}: {e}")
+        self.clear_clients()
+
     def clear_clients(self) -> None:
         """
         Clear all cached clients.
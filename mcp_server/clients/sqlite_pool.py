@@ -0,0 +1,300 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Non-blocking access to a SQLite database.
+
+sqlite3 calls block, so running them on the event loop stalls every
+in-flight request while the disk is slow. SQLitePool moves them off the
+loop:
+
+- Writes go to one writer thread that owns a long-lived connection.
+  Writes queued while it is busy are committed together in a single
+  transaction (group commit), each inside its own savepoint so a failing
+  write doesn't undo the others. A write's future resolves only once its
+  transaction has committed.
+- Reads run on a small pool of reader threads, each with its own
+  connection. File databases use WAL mode, so readers never wait for the
+  writer. An in-memory database exists only inside one connection, so
+  its reads go through the writer thread as well.
+
+Connections live as long as the pool, so sqlite3's per-connection
+statement cache keeps queries prepared between calls.
+"""
+
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_READERS = 2
+
+# Most writes committed in one transaction
+DEFAULT_MAX_BATCH = 256
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+# How long a connection waits for a lock held by another process
+BUSY_TIMEOUT_SECONDS = 5.0
+
+_STOP = object()
+
+
+@dataclass
+class SQLitePoolStats:
+    """
+    Counters for one pool.
+
+    Attributes:
+        writes: Write jobs committed
+        failed_writes: Write jobs that raised and were rolled back
+        batches: Transactions committed by the writer thread
+        max_batch_size: Most jobs committed in one transaction
+        reads: Read jobs run
+    """
+
+    writes: int = 0
+    failed_writes: int = 0
+    batches: int = 0
+    max_batch_size: int = 0
+    reads: int = 0
+
+
+class SQLitePool:
+    """A writer thread and reader threads sharing one SQLite database."""
+
+    def __init__(
+        self,
+        db_path: str,
+        readers: int = DEFAULT_READERS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        init: Callable[[sqlite3.Connection], Any] | None = None,
+    ):
+        """
+        Open the database and start the writer thread.
+
+        Args:
+            db_path: Path to the SQLite database file, or ":memory:"
+            readers: Reader threads for a file database
+            max_batch: Most write jobs committed in one transaction
+            init: Optional schema setup, run in a transaction before the
+                  pool accepts jobs
+        """
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.stats = SQLitePoolStats()
+        self._closed = False
+        # Makes the closed check and queueing a job atomic with close(), so
+        # no job lands behind the writer's stop marker
+        self._submit_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+
+        self._writer_conn = self._connect()
+        if db_path != ":memory:":
+            self._writer_conn.execute("PRAGMA journal_mode=WAL")
+            # WAL keeps the database consistent with NORMAL; only the last
+            # transactions before a power loss can be lost
+            self._writer_conn.execute("PRAGMA synchronous=NORMAL")
+        if init is not None:
+            self._writer_conn.execute("BEGIN")
+            try:
+                init(self._writer_conn)
+            except BaseException:
+                self._writer_conn.execute("ROLLBACK")
+                self._writer_conn.close()
+                raise
+            self._writer_conn.execute("COMMIT")
+
+        self._reader_pool: ThreadPoolExecutor | None = None
+        self._reader_conns: list[sqlite3.Connection] = []
+        self._reader_lock = threading.Lock()
+        self._local = threading.local()
+        if db_path != ":memory:" and readers > 0:
+            self._reader_pool = ThreadPoolExecutor(
+                max_workers=readers, thread_name_prefix="sqlite-read"
+            )
+
+        self._writer = threading.Thread(
+            target=self._write_loop, name=f"sqlite-write:{db_path}", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: the writer thread issues BEGIN/COMMIT itself
+        return sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT_SECONDS,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def submit_write(self, fn: Callable[[sqlite3.Connection], T]) -> "Future[T]":
+        """
+        Queue fn(connection) for the writer thread without waiting.
+
+        Returns:
+            Future resolved with fn's result once its transaction commits
+        """
+        future: Future = Future()
+        self._put((fn, future, True))
+        return future
+
+    async def write(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run fn(connection) on the writer thread and wait for the commit."""
+        return await asyncio.wrap_future(self.submit_write(fn))
+
+    async def execute(self, sql: str, params: Iterable = ()) -> int:
+        """Run one write statement; returns the number of rows changed."""
+        return await self.write(lambda conn: conn.execute(sql, params).rowcount)
+
+    async def executemany(self, sql: str, seq_of_params: Iterable[Iterable]) -> int:
+        """Run one write statement per parameter set; returns the rows changed."""
+        rows = list(seq_of_params)
+        return await self.write(lambda conn: conn.executemany(sql, rows).rowcount)
+
+    async def read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        """Run fn(connection) on a reader connection."""
+        if self._reader_pool is None:
+            future: Future = Future()
+            self._put((fn, future, False))
+            return await asyncio.wrap_future(future)
+        if self._closed:
+            raise RuntimeError(f"SQLite pool for {self.db_path} is closed")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._reader_pool, self._run_read, fn)
+
+    async def fetchall(self, sql: str, params: Iterable = ()) -> list[tuple]:
+        """Run a query and return all rows."""
+        return await self.read(lambda conn: conn.execute(sql, params).fetchall())
+
+    def _put(self, job: tuple) -> None:
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError(f"SQLite pool for {self.db_path} is closed")
+            self._queue.put(job)
+
+    def _run_read(self, fn: Callable[[sqlite3.Connection], T]) -> T:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+            self._local.conn = conn
+            with self._reader_lock:
+                self._reader_conns.append(conn)
+        self.stats.reads += 1
+        return fn(conn)
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _write_loop(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                break
+            batch = [job]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is _STOP:
+                    stop = True
+                    break
+                batch.append(job)
+            self._run_batch(batch)
+            if stop:
+                break
+        self._fail_queued()
+        self._writer_conn.close()
+
+    def _fail_queued(self) -> None:
+        """Fail jobs left behind the stop marker so no caller waits forever."""
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if job is not _STOP and job[1].set_running_or_notify_cancel():
+                job[1].set_exception(RuntimeError(f"SQLite pool for {self.db_path} is closed"))
+
+    def _run_batch(self, batch: list[tuple]) -> None:
+        """Run queued jobs in one transaction, one savepoint each."""
+        # Jobs whose caller stopped waiting are dropped
+        batch = [job for job in batch if job[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        conn = self._writer_conn
+        outcomes: list[tuple[Future, Any, BaseException | None]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for fn, future, _ in batch:
+                conn.execute("SAVEPOINT job")
+                try:
+                    result = fn(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO job")
+                    conn.execute("RELEASE job")
+                    outcomes.append((future, None, e))
+                else:
+                    conn.execute("RELEASE job")
+                    outcomes.append((future, result, None))
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.error(f"SQLite transaction on {self.db_path} failed: {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+
+        self.stats.batches += 1
+        self.stats.max_batch_size = max(self.stats.max_batch_size, len(batch))
+        for (_, _, is_write), (future, result, error) in zip(batch, outcomes, strict=True):
+            if not is_write:
+                self.stats.reads += 1
+            elif error is None:
+                self.stats.writes += 1
+            else:
+                self.stats.failed_writes += 1
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def close(self, timeout: float | None = None) -> None:
+        """Commit queued writes, stop the threads and close all connections."""
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._writer.join(timeout)
+        if self._reader_pool is not None:
+            self._reader_pool.shutdown(wait=True)
+        with self._reader_lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
@@ -14,6 +14,7 @@ security, timeouts). Usable by CLI, Lambda, stdio MCP, or any entry point.
 Requirements: 14.2
 """
 
+from typing import Literal
 
 from pydantic import AliasChoices, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -77,11 +78,115 @@ class CoreSettings(BaseSettings):
         description="Path to the audit logs SQLite database",
         validation_alias="AUDIT_DB_PATH",
     )
+    audit_batch_size: int = Field(
+        default=100,
+        ge=1,
+        description="Audit entries written per batch (1 writes each tool call immediately)",
+        validation_alias="AUDIT_BATCH_SIZE",
+    )
+    audit_flush_interval_seconds: float = Field(
+        default=1.0,
+        gt=0,
+        description="Longest an audit entry waits in memory before being written",
+        validation_alias="AUDIT_FLUSH_INTERVAL_SECONDS",
+    )
+    audit_queue_size: int = Field(
+        default=10_000,
+        ge=1,
+        description="Audit entries held in memory before new ones are dropped",
+        validation_alias="AUDIT_QUEUE_SIZE",
+    )
     history_db_path: str = Field(
         default="compliance_history.db",
         description="Path to the compliance history SQLite database",
         validation_alias=AliasChoices("HISTORY_DB_PATH", "DATABASE_PATH"),
     )
+    history_raw_retention_days: int = Field(
+        default=30,
+        ge=1,
+        description="Days raw compliance snapshots are kept before only rollups remain",
+        validation_alias="HISTORY_RAW_RETENTION_DAYS",
+    )
+    history_daily_retention_days: int = Field(
+        default=400,
+        ge=90,
+        description="Days daily compliance history rollups are kept",
+        validation_alias="HISTORY_DAILY_RETENTION_DAYS",
+    )
+    history_weekly_retention_days: int = Field(
+        default=1830,
+        ge=90,
+        description="Days weekly compliance history rollups are kept",
+        validation_alias="HISTORY_WEEKLY_RETENTION_DAYS",
+    )
+    history_monthly_retention_days: int = Field(
+        default=0,
+        ge=0,
+        description="Days monthly compliance history rollups are kept (0 keeps them forever)",
+        validation_alias="HISTORY_MONTHLY_RETENTION_DAYS",
+    )
+    scan_job_db_path: str = Field(
+        default="scan_jobs.db",
+        description="Path to the background scan jobs SQLite database",
+        validation_alias="SCAN_JOB_DB_PATH",
+    )
+    max_concurrent_scan_jobs: int = Field(
+        default=2,
+        ge=1,
+        le=10,
+        description="Maximum background scan jobs running at once; others wait as pending",
+        validation_alias="MAX_CONCURRENT_SCAN_JOBS",
+    )
+    scan_job_retention_hours: int = Field(
+        default=24,
+        ge=1,
+        description="Hours to keep finished background scan jobs and their results",
+        validation_alias="SCAN_JOB_RETENTION_HOURS",
+    )
+    result_store_db_path: str = Field(
+        default="scan_results.db",
+        description="Path to the SQLite database holding paginated scan results",
+        validation_alias="RESULT_STORE_DB_PATH",
+    )
+    result_store_retention_hours: int = Field(
+        default=24,
+        ge=1,
+        description="Hours to keep stored scan results available for pagination",
+        validation_alias="RESULT_STORE_RETENTION_HOURS",
+    )
+    export_dir: str = Field(
+        default="exports",
+        description="Directory that file-based exports (e.g. export_violations_csv) write to",
+        validation_alias="EXPORT_DIR",
+    )
+    tag_state_db_path: str = Field(
+        default="tag_state.db",
+        description="Path to the SQLite database of per-resource tag state for drift detection",
+        validation_alias="TAG_STATE_DB_PATH",
+    )
+    tag_state_retention_days: int = Field(
+        default=90,
+        ge=1,
+        description="Days to keep tag state for resources no longer seen in scans",
+        validation_alias="TAG_STATE_RETENTION_DAYS",
+    )
+    tag_event_dir: str | None = Field(
+        default=None,
+        description="Directory of CloudTrail tag change event files for apply_tag_events",
+        validation_alias="TAG_EVENT_DIR",
+    )
+    tag_event_queue_url: str | None = Field(
+        default=None,
+        description="SQS queue of CloudTrail tag change events for apply_tag_events",
+        validation_alias="TAG_EVENT_QUEUE_URL",
+    )
+    incremental_max_age_hours: int = Field(
+        default=24,
+        ge=1,
+        description="Hours after a full scan that event-patched results may answer "
+        "check_tag_compliance instead of a new scan",
+        validation_alias="INCREMENTAL_MAX_AGE_HOURS",
+    )
 
     # CloudWatch Configuration
     cloudwatch_enabled: bool = Field(
@@ -174,6 +279,33 @@ class CoreSettings(BaseSettings):
         description="Maximum regions to scan in parallel",
         validation_alias="MAX_CONCURRENT_REGIONS",
     )
+    inventory_pool_size: int | None = Field(
+        default=None,
+        ge=1,
+        le=256,
+        description=(
+            "Worker threads for blocking inventory (Describe*/List*) calls. "
+            "Defaults to 4 per concurrently scanned region."
+        ),
+        validation_alias="INVENTORY_POOL_SIZE",
+    )
+    tagging_pool_size: int | None = Field(
+        default=None,
+        ge=1,
+        le=128,
+        description=(
+            "Worker threads for blocking tag lookups. "
+            "Defaults to 2 per concurrently scanned region."
+        ),
+        validation_alias="TAGGING_POOL_SIZE",
+    )
+    cost_explorer_pool_size: int | None = Field(
+        default=None,
+        ge=1,
+        le=16,
+        description="Worker threads for blocking Cost Explorer calls (default: 2)",
+        validation_alias="COST_EXPLORER_POOL_SIZE",
+    )
     region_scan_timeout_seconds: int = Field(
         default=60,
         ge=10,
@@ -201,6 +333,46 @@ class CoreSettings(BaseSettings):
         description="Maximum time allowed for a single tool execution in seconds",
         validation_alias="TOOL_EXECUTION_TIMEOUT_SECONDS",
     )
+    request_deadline_seconds: int = Field(
+        default=55,
+        ge=0,
+        description=(
+            "Deadline for scan tools such as check_tag_compliance, in seconds. "
+            "MCP clients typically give up after ~60s; near the deadline the scan "
+            "stops issuing AWS calls and returns partial results. 0 disables it."
+        ),
+        validation_alias="REQUEST_DEADLINE_SECONDS",
+    )
+    timings_enabled: bool = Field(
+        default=True,
+        description=(
+            "Record per-stage timings (region discovery, fetches, Cost Explorer, "
+            "validation, serialization) for every tool call in the audit log"
+        ),
+        validation_alias="TIMINGS_ENABLED",
+    )
+    timings_in_response: bool = Field(
+        default=False,
+        description="Add a 'timings' block with the stage timings to tool responses",
+        validation_alias="TIMINGS_IN_RESPONSE",
+    )
+    aws_calls_in_response: bool = Field(
+        default=True,
+        description=(
+            "Add an 'aws_api_calls' block to tool responses that made AWS calls: "
+            "calls, pages, retries, throttles and Cost Explorer requests"
+        ),
+        validation_alias="AWS_CALLS_IN_RESPONSE",
+    )
+    aws_client_backend: Literal["boto3", "aiobotocore"] = Field(
+        default="boto3",
+        description=(
+            "AWS client implementation: 'boto3' runs calls in thread pools, "
+            "'aiobotocore' issues them natively on the event loop "
+            "(requires: pip install aiobotocore)"
+        ),
+        validation_alias="AWS_CLIENT_BACKEND",
+    )
     aws_api_timeout_seconds: int = Field(
         default=10,
         description="Timeout for AWS API calls in seconds",
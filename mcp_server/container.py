@@ -14,28 +14,43 @@ an HTTP server, a CLI tool, a Lambda handler, or any other entry point.
 Phase 1.9: Core Library Extraction
 """
 
+import asyncio
 import logging
+from datetime import timedelta
 from typing import Optional
 
 import boto3
 
 from .clients.aws_client import AWSClient
 from .clients.cache import RedisCache
+from .clients.executors import (
+    WorkloadClass,
+    configure_executor_pools,
+    shutdown_executor_pools,
+)
 from .clients.regional_client_factory import RegionalClientFactory
-from .config import CoreSettings, settings as get_default_settings
-from .utils.budget_tracker import BudgetTracker
+from .config import CoreSettings
+from .config import settings as get_default_settings
 from .services.audit_service import AuditService
+from .services.auto_policy_service import AutoPolicyService
 from .services.compliance_service import ComplianceService
+from .services.history_rollups import HistoryRetention
 from .services.history_service import HistoryService
+from .services.incremental_scan_service import IncrementalScanService
 from .services.multi_region_scanner import MultiRegionScanner
 from .services.policy_service import PolicyService
 from .services.region_discovery_service import RegionDiscoveryService
-from .services.auto_policy_service import AutoPolicyService
+from .services.result_store_service import ResultStoreService
+from .services.scan_job_service import ScanJobService
 from .services.scheduler_service import SchedulerService
 from .services.security_service import (
     SecurityService,
     configure_security_logging,
 )
+from .services.tag_event_source import DirectoryEventSource, QueueEventSource, TagEventSource
+from .services.tag_state_service import TagStateService
+from .services.validation_cache import ValidationCache
+from .utils.budget_tracker import BudgetTracker
 from .utils.loop_detection import LoopDetector
 
 logger = logging.getLogger(__name__)
@@ -86,7 +101,11 @@ class ServiceContainer:
         self._redis_cache: Optional[RedisCache] = None
         self._audit_service: Optional[AuditService] = None
         self._history_service: Optional[HistoryService] = None
+        self._scan_job_service: Optional[ScanJobService] = None
+        self._result_store_service: Optional[ResultStoreService] = None
+        self._tag_state_service: Optional[TagStateService] = None
         self._aws_client: Optional[AWSClient] = None
+        self._regional_client_factory: Optional[RegionalClientFactory] = None
         self._policy_service: Optional[PolicyService] = None
         self._compliance_service: Optional[ComplianceService] = None
         self._security_service: Optional[SecurityService] = None
@@ -95,6 +114,8 @@ class ServiceContainer:
         self._multi_region_scanner: Optional[MultiRegionScanner] = None
         self._auto_policy_service: Optional[AutoPolicyService] = None
         self._scheduler_service: Optional[SchedulerService] = None
+        self._tag_event_source: Optional[TagEventSource] = None
+        self._incremental_scan_service: Optional[IncrementalScanService] = None
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -126,7 +147,12 @@ class ServiceContainer:
 
         # 2. Audit service (SQLite)
         try:
-            self._audit_service = AuditService(db_path=s.audit_db_path)
+            self._audit_service = AuditService(
+                db_path=s.audit_db_path,
+                batch_size=s.audit_batch_size,
+                flush_interval_seconds=s.audit_flush_interval_seconds,
+                max_queue_size=s.audit_queue_size,
+            )
             logger.info("ServiceContainer: audit service initialized")
         except Exception as e:
             logger.error(f"ServiceContainer: failed to initialize audit service: {e}")
@@ -134,7 +160,15 @@ class ServiceContainer:
 
         # 3. History service (SQLite)
         try:
-            self._history_service = HistoryService(db_path=s.history_db_path)
+            self._history_service = HistoryService(
+                db_path=s.history_db_path,
+                retention=HistoryRetention(
+                    raw_days=s.history_raw_retention_days,
+                    daily_days=s.history_daily_retention_days,
+                    weekly_days=s.history_weekly_retention_days,
+                    monthly_days=s.history_monthly_retention_days or None,
+                ),
+            )
             logger.info(
                 f"ServiceContainer: history service initialized "
                 f"(db={s.history_db_path})"
@@ -143,12 +177,74 @@ class ServiceContainer:
             logger.warning(f"ServiceContainer: failed to initialize history service: {e}")
             self._history_service = None
 
+        # 3b. Background scan jobs (SQLite)
+        try:
+            self._scan_job_service = ScanJobService(
+                db_path=s.scan_job_db_path,
+                max_concurrent_jobs=s.max_concurrent_scan_jobs,
+                retention_hours=s.scan_job_retention_hours,
+                audit_service=self._audit_service,
+                timings_enabled=s.timings_enabled,
+            )
+            logger.info(
+                f"ServiceContainer: scan job service initialized "
+                f"(db={s.scan_job_db_path}, max_concurrent={s.max_concurrent_scan_jobs})"
+            )
+        except Exception as e:
+            logger.warning(f"ServiceContainer: failed to initialize scan job service: {e}")
+            self._scan_job_service = None
+
+        # 3c. Paginated scan result store (SQLite)
+        try:
+            self._result_store_service = ResultStoreService(
+                db_path=s.result_store_db_path,
+                retention_hours=s.result_store_retention_hours,
+            )
+            logger.info(
+                f"ServiceContainer: result store initialized (db={s.result_store_db_path})"
+            )
+        except Exception as e:
+            logger.warning(f"ServiceContainer: failed to initialize result store: {e}")
+            self._result_store_service = None
+
+        # 3d. Per-resource tag state for drift detection (SQLite)
+        try:
+            self._tag_state_service = TagStateService(
+                db_path=s.tag_state_db_path,
+                retention_days=s.tag_state_retention_days,
+            )
+            logger.info(
+                f"ServiceContainer: tag state store initialized (db={s.tag_state_db_path})"
+            )
+        except Exception as e:
+            logger.warning(f"ServiceContainer: failed to initialize tag state store: {e}")
+            self._tag_state_service = None
+
         # 4. AWS client
+        # The default-region client comes from the regional factory so it shares
+        # account metadata (account ID, Cost Explorer client, region list) with
+        # every client the multi-region scanner creates.
         try:
-            self._aws_client = AWSClient(region=s.aws_region)
-            logger.info(f"ServiceContainer: AWS client initialized (region={s.aws_region})")
+            # Thread pools for blocking boto3 calls, sized from scan concurrency
+            configure_executor_pools(
+                max_concurrent_regions=s.max_concurrent_regions,
+                overrides={
+                    WorkloadClass.INVENTORY: s.inventory_pool_size,
+                    WorkloadClass.TAGGING: s.tagging_pool_size,
+                    WorkloadClass.COST_EXPLORER: s.cost_explorer_pool_size,
+                },
+            )
+            self._regional_client_factory = RegionalClientFactory(
+                default_region=s.aws_region, backend=s.aws_client_backend
+            )
+            self._aws_client = self._regional_client_factory.get_client(s.aws_region)
+            logger.info(
+                f"ServiceContainer: AWS client initialized "
+                f"(region={s.aws_region}, backend={s.aws_client_backend})"
+            )
         except Exception as e:
             logger.warning(f"ServiceContainer: failed to initialize AWS client: {e}")
+            self._regional_client_factory = None
             self._aws_client = None
 
         # 4b. Auto-policy detection (Phase 2.4)
@@ -160,9 +256,9 @@ class ServiceContainer:
                 aws_policy_id=s.auto_import_policy_id,
                 fallback_to_default=s.fallback_to_default_policy,
             )
-            # AWSClient doesn't expose a boto3 Session; create one directly.
+            # Reuse the AWSClient's shared boto3 Session.
             # ECS task role / instance profile provides credentials automatically.
-            aws_session = boto3.Session() if self._aws_client else None
+            aws_session = self._aws_client.session if self._aws_client else None
             auto_result = await self._auto_policy_service.detect_and_load(
                 aws_session=aws_session,
             )
@@ -187,6 +283,12 @@ class ServiceContainer:
             self._policy_service = None
 
         # 6. Compliance service (depends on AWS + policy)
+        # One validation cache is shared by every regional compliance service.
+        # Its shards only answer requests when tag change events keep them current.
+        validation_cache = ValidationCache()
+        incremental_max_age = None
+        if s.tag_event_dir or s.tag_event_queue_url:
+            incremental_max_age = timedelta(hours=s.incremental_max_age_hours)
         if self._aws_client and self._policy_service:
             try:
                 self._compliance_service = ComplianceService(
@@ -194,6 +296,9 @@ class ServiceContainer:
                     policy_service=self._policy_service,
                     cache=self._redis_cache,
                     cache_ttl=s.compliance_cache_ttl_seconds,
+                    tag_state_service=self._tag_state_service,
+                    validation_cache=validation_cache,
+                    incremental_max_age=incremental_max_age,
                 )
                 logger.info("ServiceContainer: compliance service initialized")
             except Exception as e:
@@ -206,12 +311,13 @@ class ServiceContainer:
         # Multi-region scanning is ALWAYS enabled. Use allowed_regions to restrict.
         if self._aws_client and self._policy_service:
             try:
+                regional_client_factory = self._regional_client_factory
                 region_discovery = RegionDiscoveryService(
                     ec2_client=self._aws_client.ec2,
                     cache=self._redis_cache,
                     cache_ttl=s.region_cache_ttl_seconds,
+                    account_context=regional_client_factory.account_context,
                 )
-                regional_client_factory = RegionalClientFactory()
 
                 # Factory function to create ComplianceService for a regional client
                 # Captures policy_service, redis_cache, and cache_ttl from container scope
@@ -223,6 +329,9 @@ class ServiceContainer:
                         policy_service=self._policy_service,
                         cache=self._redis_cache,
                         cache_ttl=compliance_cache_ttl,
+                        tag_state_service=self._tag_state_service,
+                        validation_cache=validation_cache,
+                        incremental_max_age=incremental_max_age,
                     )
 
                 self._multi_region_scanner = MultiRegionScanner(
@@ -256,6 +365,30 @@ class ServiceContainer:
         else:
             self._multi_region_scanner = None
 
+        # 6c. Tag change events for incremental rescans (depends on tag state + policy)
+        if incremental_max_age and self._tag_state_service and self._policy_service:
+            try:
+                if s.tag_event_queue_url:
+                    self._tag_event_source = QueueEventSource(
+                        boto3.client("sqs", region_name=s.aws_region), s.tag_event_queue_url
+                    )
+                else:
+                    self._tag_event_source = DirectoryEventSource(s.tag_event_dir)
+                self._incremental_scan_service = IncrementalScanService(
+                    tag_state_service=self._tag_state_service,
+                    policy_service=self._policy_service,
+                    validation_cache=validation_cache,
+                    compliance_service=self._compliance_service,
+                )
+                logger.info(
+                    f"ServiceContainer: incremental scans initialized "
+                    f"(source={s.tag_event_queue_url or s.tag_event_dir})"
+                )
+            except Exception as e:
+                logger.warning(f"ServiceContainer: failed to initialize incremental scans: {e}")
+                self._tag_event_source = None
+                self._incremental_scan_service = None
+
         # 7. Budget tracker (Requirements: 15.3)
         if s.budget_tracking_enabled:
             try:
@@ -333,7 +466,7 @@ class ServiceContainer:
 
                 async def _store_callback(result):
                     """Store compliance result in history."""
-                    history_svc.store_scan_result(result)
+                    await history_svc.store_scan_result(result)
 
                 self._scheduler_service = SchedulerService(
                     scan_callback=_scan_callback,
@@ -374,11 +507,45 @@ class ServiceContainer:
                 await self._scheduler_service.stop()
             except Exception as e:
                 logger.warning(f"ServiceContainer: error stopping scheduler: {e}")
+        if self._scan_job_service:
+            try:
+                await self._scan_job_service.shutdown()
+                await asyncio.to_thread(self._scan_job_service.close)
+            except Exception as e:
+                logger.warning(f"ServiceContainer: error stopping scan jobs: {e}")
+        if self._audit_service:
+            try:
+                # Writes audit entries still queued in memory
+                await asyncio.to_thread(self._audit_service.close)
+            except Exception as e:
+                logger.warning(f"ServiceContainer: error closing audit log: {e}")
+        if self._history_service:
+            try:
+                # Commits snapshot writes still queued on the writer thread
+                await asyncio.to_thread(self._history_service.close)
+            except Exception as e:
+                logger.warning(f"ServiceContainer: error closing history database: {e}")
+        if self._result_store_service:
+            try:
+                await asyncio.to_thread(self._result_store_service.close)
+            except Exception as e:
+                logger.warning(f"ServiceContainer: error closing result store: {e}")
+        if self._tag_state_service:
+            try:
+                await asyncio.to_thread(self._tag_state_service.close)
+            except Exception as e:
+                logger.warning(f"ServiceContainer: error closing tag state store: {e}")
         if self._redis_cache:
             try:
                 await self._redis_cache.close()
             except Exception as e:
                 logger.warning(f"ServiceContainer: error closing Redis: {e}")
+        if self._regional_client_factory:
+            try:
+                await self._regional_client_factory.close_clients()
+            except Exception as e:
+                logger.warning(f"ServiceContainer: error closing AWS clients: {e}")
+        shutdown_executor_pools(wait=False)
         self._initialized = False
         logger.info("ServiceContainer: shutdown complete")
 
@@ -406,10 +573,34 @@ class ServiceContainer:
     def history_service(self) -> Optional[HistoryService]:
         return self._history_service
 
+    @property
+    def scan_job_service(self) -> Optional[ScanJobService]:
+        return self._scan_job_service
+
+    @property
+    def result_store_service(self) -> Optional[ResultStoreService]:
+        return self._result_store_service
+
+    @property
+    def tag_state_service(self) -> Optional[TagStateService]:
+        return self._tag_state_service
+
+    @property
+    def tag_event_source(self) -> Optional[TagEventSource]:
+        return self._tag_event_source
+
+    @property
+    def incremental_scan_service(self) -> Optional[IncrementalScanService]:
+        return self._incremental_scan_service
+
     @property
     def aws_client(self) -> Optional[AWSClient]:
         return self._aws_client
 
+    @property
+    def regional_client_factory(self) -> Optional[RegionalClientFactory]:
+        return self._regional_client_factory
+
     @property
     def policy_service(self) -> Optional[PolicyService]:
         return self._policy_service
@@ -13,9 +13,14 @@ from .health import BudgetHealthInfo, HealthStatus
 from .history import (
     ComplianceHistoryEntry,
     ComplianceHistoryResult,
+    ComplianceTrendPoint,
+    ComplianceTrendResult,
+    ComplianceTrendSeries,
     GroupBy,
+    HistoryDimension,
     TrendDirection,
 )
+from .inventory import ResourceInventory
 from .multi_region import (
     GLOBAL_RESOURCE_TYPES,
     REGIONAL_RESOURCE_TYPES,
@@ -25,11 +30,14 @@ from .multi_region import (
     RegionScanMetadata,
 )
 from .observability import (
+    AwsApiCallStats,
     BudgetUtilizationMetrics,
     ErrorRateMetrics,
+    ExecutorPoolMetrics,
     GlobalMetrics,
     LoopDetectionMetrics,
     SessionMetrics,
+    StageTimingStats,
     ToolUsageStats,
 )
 from .policy import OptionalTag, RequiredTag, TagNamingRules, TagPolicy
@@ -40,7 +48,18 @@ from .report import (
     ViolationRanking,
 )
 from .resource import Resource
+from .result_store import ViolationPage
+from .rollup import ROLLUP_DIMENSIONS, ComplianceRollup, RollupCell
+from .sampling import (
+    ConfidenceInterval,
+    SampledComplianceResult,
+    SamplingStratum,
+    SamplingSummary,
+)
+from .scan_job import ScanJob, ScanJobStatus, ScanProgress
 from .suggestions import TagSuggestion
+from .tag_events import IncrementalScanResult, ShardSummary, TagChangeEvent
+from .tag_state import TagStateBaseline
 from .untagged import UntaggedResource, UntaggedResourcesResult
 from .validation import ResourceValidationResult, ValidateResourceTagsResult
 from .violations import Violation
@@ -56,6 +75,7 @@ __all__ = [
     "OptionalTag",
     "TagNamingRules",
     "Resource",
+    "ResourceInventory",
     "UntaggedResource",
     "UntaggedResourcesResult",
     "ResourceValidationResult",
@@ -68,7 +88,11 @@ __all__ = [
     "ViolationRanking",
     "ComplianceHistoryEntry",
     "ComplianceHistoryResult",
+    "ComplianceTrendPoint",
+    "ComplianceTrendResult",
+    "ComplianceTrendSeries",
     "GroupBy",
+    "HistoryDimension",
     "TrendDirection",
     "AuditLogEntry",
     "AuditStatus",
@@ -83,6 +107,9 @@ __all__ = [
     "LoopDetectionMetrics",
     "SessionMetrics",
     "GlobalMetrics",
+    "ExecutorPoolMetrics",
+    "StageTimingStats",
+    "AwsApiCallStats",
     # Multi-region models
     "RegionalScanResult",
     "RegionScanMetadata",
@@ -90,4 +117,23 @@ __all__ = [
     "RegionalSummary",
     "GLOBAL_RESOURCE_TYPES",
     "REGIONAL_RESOURCE_TYPES",
+    # Scan job models
+    "ScanJob",
+    "ScanJobStatus",
+    "ScanProgress",
+    "ViolationPage",
+    # Rollup models
+    "ComplianceRollup",
+    "RollupCell",
+    "ROLLUP_DIMENSIONS",
+    # Sampling models
+    "SampledComplianceResult",
+    "SamplingSummary",
+    "SamplingStratum",
+    "ConfidenceInterval",
+    "TagStateBaseline",
+    # Incremental rescan models
+    "TagChangeEvent",
+    "ShardSummary",
+    "IncrementalScanResult",
 ]
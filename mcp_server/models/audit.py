@@ -28,6 +28,10 @@ class AuditLogEntry(BaseModel):
     error_message: str | None = None
     execution_time_ms: float | None = None
     correlation_id: str | None = None
+    # {stage: {"count", "total_ms", "max_ms"}} for the request, if timed
+    stage_timings: dict[str, dict] | None = None
+    # Per (service, operation, region, resource type) AWS API call counts
+    aws_calls: list[dict] | None = None
 
     class Config:
         """Pydantic config."""
@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from .rollup import ComplianceRollup
 from .violations import Violation
 
 
@@ -49,6 +50,21 @@ class ComplianceResult(BaseModel):
         default_factory=lambda: datetime.now(timezone.utc),
         description="Timestamp when the scan was performed",
     )
+    incomplete_resource_types: list[str] = Field(
+        default_factory=list,
+        description=(
+            "Resource types not fully scanned because the request deadline was reached. "
+            "Non-empty means the result is partial."
+        ),
+    )
+    rollup: ComplianceRollup | None = Field(
+        None,
+        exclude=True,
+        description=(
+            "Violation rollup cube built during validation. Not serialized, so "
+            "results loaded from the cache have None."
+        ),
+    )
 
     @field_validator("compliant_resources")
     @classmethod
@@ -51,3 +51,56 @@ class ComplianceHistoryResult(BaseModel):
     )
     latest_score: float = Field(ge=0.0, le=1.0, description="Latest compliance score in the range")
     days_back: int = Field(ge=1, le=90, description="Number of days of history returned")
+
+
+class HistoryDimension(str, Enum):
+    """Breakdowns recorded for every compliance snapshot."""
+
+    ALL = "all"
+    REGION = "region"
+    RESOURCE_TYPE = "resource_type"
+    TAG = "tag_name"
+
+
+class ComplianceTrendPoint(BaseModel):
+    """One period of a compliance time series, averaged over its snapshots."""
+
+    period: datetime = Field(description="Start of the period (day, week or month)")
+    scans: int = Field(ge=0, description="Compliance snapshots recorded in the period")
+    compliance_score: float | None = Field(
+        None,
+        ge=0.0,
+        le=1.0,
+        description="Average compliance score (overall series only)",
+    )
+    total_resources: float | None = Field(
+        None, ge=0.0, description="Average resources scanned per snapshot (overall series only)"
+    )
+    non_compliant_resources: float = Field(
+        ge=0.0, description="Average resources with at least one violation per snapshot"
+    )
+    violation_count: float = Field(ge=0.0, description="Average violations per snapshot")
+    cost_gap: float = Field(
+        ge=0.0, description="Average monthly cost of the violations per snapshot in USD"
+    )
+
+
+class ComplianceTrendSeries(BaseModel):
+    """Time series for one value of a dimension (e.g. one region)."""
+
+    key: str = Field(description="Dimension value, or '' for the overall series")
+    points: list[ComplianceTrendPoint] = Field(description="Points, oldest first")
+    trend_direction: TrendDirection = Field(
+        description=(
+            "Compliance score trend for the overall series; non-compliant "
+            "resource trend (fewer is improving) for the others"
+        )
+    )
+
+
+class ComplianceTrendResult(BaseModel):
+    """Result of a long-range compliance trend query."""
+
+    dimension: HistoryDimension = Field(description="Breakdown the series are keyed by")
+    group_by: GroupBy = Field(description="How the points are grouped")
+    series: list[ComplianceTrendSeries] = Field(description="One series per dimension value")
@@ -0,0 +1,42 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Data models for raw resource listings (inventory exports, sampling, drift)."""
+
+from pydantic import BaseModel, Field
+
+
+class ResourceInventory(BaseModel):
+    """Resources listed without policy validation, and what couldn't be listed.
+
+    A region or resource type whose listing fails is recorded here instead
+    of being dropped silently, so callers can report the listing as partial.
+    """
+
+    resources_by_region: dict[str, list[dict]] = Field(
+        default_factory=dict,
+        description="Region ('global' for global types) -> resources, for regions listed",
+    )
+    failed_regions: list[str] = Field(
+        default_factory=list, description="Regions whose listing failed entirely"
+    )
+    failed_resource_types: dict[str, list[str]] = Field(
+        default_factory=dict,
+        description="Region -> resource types whose listing failed in that region",
+    )
+
+    @property
+    def resources(self) -> list[dict]:
+        """Resources from every listed region."""
+        return [r for resources in self.resources_by_region.values() for r in resources]
+
+    @property
+    def failed_type_names(self) -> list[str]:
+        """Resource types that failed in at least one region, sorted."""
+        return sorted({rt for types in self.failed_resource_types.values() for rt in types})
+
+    @property
+    def complete(self) -> bool:
+        """True if every region and resource type was listed."""
+        return not self.failed_regions and not self.failed_resource_types
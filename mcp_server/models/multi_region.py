@@ -12,6 +12,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, Field
 
+from .rollup import ComplianceRollup
 from .violations import Violation
 
 
@@ -106,6 +107,18 @@ class RegionalScanResult(BaseModel):
         ge=0,
         description="Scan duration in milliseconds"
     )
+    incomplete_resource_types: list[str] = Field(
+        default_factory=list,
+        description=(
+            "Resource types not fully scanned in this region because the request "
+            "deadline was reached"
+        )
+    )
+
+    @property
+    def deadline_skipped(self) -> bool:
+        """True if the region was not scanned at all because of the request deadline."""
+        return not self.success and bool(self.incomplete_resource_types)
 
 
 class RegionScanMetadata(BaseModel):
@@ -139,6 +152,13 @@ class RegionScanMetadata(BaseModel):
         default=None,
         description="Error message if region discovery failed"
     )
+    incomplete_regions: list[str] = Field(
+        default_factory=list,
+        description=(
+            "Regions skipped or only partially scanned because the request "
+            "deadline was reached"
+        )
+    )
 
 
 class MultiRegionComplianceResult(BaseModel):
@@ -187,3 +207,8 @@ class MultiRegionComplianceResult(BaseModel):
         default_factory=dict,
         description="Per-region compliance summary keyed by region code"
     )
+    rollup: ComplianceRollup | None = Field(
+        default=None,
+        exclude=True,
+        description="Violation rollup cube built while aggregating regions (not serialized)"
+    )
@@ -39,6 +39,17 @@ class ToolUsageStats(BaseModel):
     max_execution_time_ms: float | None = Field(
         default=None, ge=0.0, description="Maximum execution time in milliseconds"
     )
+    p95_execution_time_ms: float | None = Field(
+        default=None,
+        ge=0.0,
+        description="95th percentile execution time in milliseconds, estimated from the "
+        "latency histogram (upper bound of its bucket)",
+    )
+    latency_histogram: dict[str, int] = Field(
+        default_factory=dict,
+        description="Invocations per execution time bucket, keyed by bucket bound "
+        "(e.g. '<=100ms')",
+    )
     error_rate: float = Field(
         default=0.0, ge=0.0, le=1.0, description="Error rate as a fraction (0.0 to 1.0)"
     )
@@ -194,6 +205,82 @@ class SessionMetrics(BaseModel):
         json_encoders = {datetime: lambda v: v.isoformat()}
 
 
+class ExecutorPoolMetrics(BaseModel):
+    """Queue depth and wait-time metrics for one AWS call thread pool."""
+
+    workload: str = Field(
+        ..., description="Workload class served by the pool (inventory, tagging, cost_explorer)"
+    )
+    max_workers: int = Field(..., ge=1, description="Number of worker threads")
+    submitted: int = Field(default=0, ge=0, description="Calls submitted to the pool")
+    completed: int = Field(default=0, ge=0, description="Calls that have finished")
+    active: int = Field(default=0, ge=0, description="Calls currently running")
+    queue_depth: int = Field(default=0, ge=0, description="Calls waiting for a free worker")
+    max_queue_depth: int = Field(default=0, ge=0, description="Highest queue depth observed")
+    average_wait_ms: float = Field(
+        default=0.0, ge=0.0, description="Average time a call waited for a worker"
+    )
+    max_wait_ms: float = Field(
+        default=0.0, ge=0.0, description="Longest time a call waited for a worker"
+    )
+    utilization: float = Field(
+        default=0.0, ge=0.0, le=1.0, description="Fraction of workers currently busy"
+    )
+
+
+class StageTimingStats(BaseModel):
+    """Time spent in one stage of a tool's requests (see utils/timing.py)."""
+
+    tool_name: str = Field(..., description="Name of the tool")
+    stage: str = Field(..., description="Stage name (e.g. 'fetch', 'cost_explorer', 'aws.ec2')")
+    invocation_count: int = Field(
+        default=0, ge=0, description="Invocations of the tool that went through the stage"
+    )
+    span_count: int = Field(default=0, ge=0, description="Times the stage ran in total")
+    total_time_ms: float = Field(
+        default=0.0,
+        ge=0.0,
+        description="Summed duration of the stage; concurrent spans (e.g. regions scanned "
+        "in parallel) each count in full",
+    )
+    average_time_per_invocation_ms: float = Field(
+        default=0.0, ge=0.0, description="Stage time per invocation that went through it"
+    )
+    max_span_ms: float = Field(default=0.0, ge=0.0, description="Longest single span")
+
+
+class AwsApiCallStats(BaseModel):
+    """AWS API calls a tool made to one operation (see utils/api_ledger.py)."""
+
+    tool_name: str = Field(..., description="Name of the tool")
+    service: str = Field(..., description="AWS service (e.g. 'ec2', 'ce')")
+    operation: str = Field(..., description="API operation (e.g. 'describe_instances')")
+    resource_type: str | None = Field(
+        default=None, description="Resource type being fetched when the calls were made"
+    )
+    invocation_count: int = Field(
+        default=0, ge=0, description="Invocations of the tool that made these calls"
+    )
+    call_count: int = Field(default=0, ge=0, description="API requests, not counting retries")
+    page_count: int = Field(
+        default=0, ge=0, description="Requests that fetched a continuation page"
+    )
+    retry_count: int = Field(default=0, ge=0, description="Extra attempts after throttling")
+    throttle_count: int = Field(default=0, ge=0, description="Throttling errors received")
+    error_count: int = Field(default=0, ge=0, description="Requests that failed")
+    calls_per_invocation: float = Field(
+        default=0.0, ge=0.0, description="Average requests per invocation of the tool"
+    )
+    average_latency_ms: float = Field(
+        default=0.0, ge=0.0, description="Average request latency, including retries"
+    )
+    max_latency_ms: float = Field(default=0.0, ge=0.0, description="Slowest request")
+    total_bytes: int = Field(default=0, ge=0, description="Response bytes received")
+    estimated_cost_usd: float = Field(
+        default=0.0, ge=0.0, description="Charge for the requests (Cost Explorer is billed)"
+    )
+
+
 class GlobalMetrics(BaseModel):
     """Global metrics aggregated across all sessions."""
 
@@ -234,6 +321,15 @@ class GlobalMetrics(BaseModel):
     loop_detection_metrics: LoopDetectionMetrics | None = Field(
         default=None, description="Global loop detection metrics"
     )
+    executor_pools: list[ExecutorPoolMetrics] = Field(
+        default_factory=list, description="Thread pool metrics for blocking AWS calls"
+    )
+    stage_stats: list[StageTimingStats] = Field(
+        default_factory=list, description="Time spent per tool and stage, slowest first"
+    )
+    api_call_stats: list[AwsApiCallStats] = Field(
+        default_factory=list, description="AWS API calls per tool and operation, most first"
+    )
     most_used_tool: str | None = Field(
         default=None, description="Name of the most frequently used tool"
     )
@@ -0,0 +1,28 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Data models for paginated access to stored scan results."""
+
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class ViolationPage(BaseModel):
+    """One page of violations from a stored scan result."""
+
+    result_id: str = Field(..., description="Stored result the page belongs to")
+    violations: list[dict[str, Any]] = Field(
+        default_factory=list, description="Violations on this page"
+    )
+    total_matching: int = Field(
+        0, ge=0, description="Violations matching the filters across all pages"
+    )
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next page, or None on the last page"
+    )
+    sort_by: str = Field("resource_id", description="Sort key used for the pages")
+    filters: dict[str, str] = Field(
+        default_factory=dict, description="Filters applied to the violations"
+    )
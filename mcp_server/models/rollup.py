@@ -0,0 +1,220 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Precomputed compliance rollups.
+
+Most compliance questions are "how bad is it by region x type x tag".
+Instead of regrouping the full violation list for every answer, the
+compliance pipeline builds a ComplianceRollup while it validates
+resources: one cell per (region, resource_type, tag_name, violation_type)
+holding the violation count, the unique non-compliant resources and the
+cost gap. Coarser views (e.g. by tag only) are sliced out of the cube.
+
+High-cardinality keys (resource IDs, invalid tag values) don't fit the
+cube. Unique resources are counted per cell with a DistinctCounter
+(exact for small cells, a HyperLogLog beyond that), and the same pass
+feeds heavy-hitter trackers for rankings, which are estimates once a
+scan has more keys than the sketch width. The rollup's memory therefore
+grows with the number of cells, not with the number of resources or
+violations. That bound is the rollup's own: the scan result that carries
+it still holds its full violation list.
+"""
+
+import heapq
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from ..utils.heavy_hitters import DistinctCounter, HeavyHitters
+from .violations import Violation
+
+# Cube dimensions, in key order
+ROLLUP_DIMENSIONS: tuple[str, ...] = ("region", "resource_type", "tag_name", "violation_type")
+
+
+class RollupCell(BaseModel):
+    """Aggregated violations for one slice of the rollup cube.
+
+    Dimensions that were rolled up (not grouped by) are None.
+    """
+
+    region: str | None = Field(None, description="AWS region, or None if rolled up")
+    resource_type: str | None = Field(None, description="Resource type, or None if rolled up")
+    tag_name: str | None = Field(None, description="Tag name, or None if rolled up")
+    violation_type: str | None = Field(
+        None, description="Violation type, or None if rolled up"
+    )
+    violation_count: int = Field(0, ge=0, description="Violations in this slice")
+    non_compliant_resources: int = Field(
+        0, ge=0, description="Unique resources with at least one violation in this slice"
+    )
+    cost_gap: float = Field(
+        0.0, ge=0.0, description="Summed monthly cost impact of the violations in USD"
+    )
+
+
+class ComplianceRollup(BaseModel):
+    """Cube of violation counts, unique resources and cost gap.
+
+    Built incrementally with add() during the validation pass. Each cell
+    counts its unique resources in a DistinctCounter; rolling cells up
+    into coarser slices merges their counters, so a resource in several
+    cells is still counted once.
+    """
+
+    _cells: dict[tuple[str, ...], dict[str, Any]] = PrivateAttr(default_factory=dict)
+    _resources_by_count: HeavyHitters = PrivateAttr(default_factory=HeavyHitters)
+    _resources_by_cost: HeavyHitters = PrivateAttr(default_factory=HeavyHitters)
+    _invalid_values: HeavyHitters = PrivateAttr(default_factory=HeavyHitters)
+
+    @classmethod
+    def from_violations(cls, violations: list[Violation]) -> "ComplianceRollup":
+        """Build a rollup from an existing violation list."""
+        rollup = cls()
+        rollup.add_all(violations)
+        return rollup
+
+    @classmethod
+    def for_result(cls, result: Any) -> "ComplianceRollup":
+        """
+        Get the rollup of a compliance result.
+
+        Results built by a scan carry their rollup. Results loaded from
+        the cache do not (the rollup isn't serialized), so it is rebuilt
+        from their violations.
+        """
+        rollup = getattr(result, "rollup", None)
+        if rollup is None:
+            rollup = cls.from_violations(result.violations)
+        return rollup
+
+    def add(self, violation: Violation) -> None:
+        """Add one violation to its cell."""
+        key = (
+            violation.region,
+            violation.resource_type,
+            violation.tag_name,
+            violation.violation_type.value,
+        )
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = {"count": 0, "cost": 0.0, "resources": DistinctCounter()}
+        cell["count"] += 1
+        cell["cost"] += violation.cost_impact_monthly
+        cell["resources"].add(violation.resource_id)
+
+        self._resources_by_count.add(violation.resource_id)
+        self._resources_by_cost.add(violation.resource_id, violation.cost_impact_monthly)
+        if violation.current_value is not None:
+            self._invalid_values.add(f"{violation.tag_name}={violation.current_value}")
+
+    def add_all(self, violations: list[Violation]) -> None:
+        """Add several violations."""
+        for violation in violations:
+            self.add(violation)
+
+    @property
+    def violation_count(self) -> int:
+        """Total violations in the cube."""
+        return sum(cell["count"] for cell in self._cells.values())
+
+    @property
+    def cells(self) -> list[RollupCell]:
+        """All cells at full (region, resource_type, tag_name, violation_type) grain."""
+        return self.slice(list(ROLLUP_DIMENSIONS))
+
+    def top(
+        self,
+        dimension: str,
+        k: int = 10,
+        by: Literal["count", "cost"] = "count",
+    ) -> list[RollupCell]:
+        """
+        The k largest values of one dimension, by violation count or cost gap.
+
+        Raises:
+            ValueError: If the dimension is not in ROLLUP_DIMENSIONS
+        """
+        measure = "violation_count" if by == "count" else "cost_gap"
+        return heapq.nlargest(k, self.slice([dimension]), key=lambda c: getattr(c, measure))
+
+    def top_resources(
+        self, k: int = 10, by: Literal["count", "cost"] = "count"
+    ) -> list[tuple[str, float]]:
+        """
+        Resources with the most violations or the largest cost gap.
+
+        Tracked in bounded memory, so values are estimates (never low)
+        on scans with many distinct resources.
+
+        Returns:
+            List of (resource_id, violation count or cost), largest first
+        """
+        tracker = self._resources_by_count if by == "count" else self._resources_by_cost
+        return tracker.top(k)
+
+    def top_invalid_values(self, k: int = 10) -> list[tuple[str, float]]:
+        """
+        Most frequent invalid tag values, as ("TagName=value", estimated count).
+        """
+        return self._invalid_values.top(k)
+
+    def slice(
+        self,
+        group_by: list[str] | None = None,
+        filters: dict[str, str] | None = None,
+    ) -> list[RollupCell]:
+        """
+        Roll the cube up to the given dimensions.
+
+        Args:
+            group_by: Dimensions to keep (subset of ROLLUP_DIMENSIONS).
+                      None or empty rolls everything up into one total cell.
+            filters: Optional exact-match values for any dimension
+
+        Returns:
+            Cells sorted by violation count (descending)
+
+        Raises:
+            ValueError: If a dimension name is not in ROLLUP_DIMENSIONS
+        """
+        group_by = list(group_by or [])
+        filters = {k: v for k, v in (filters or {}).items() if v is not None}
+        unknown = sorted((set(group_by) | set(filters)) - set(ROLLUP_DIMENSIONS))
+        if unknown:
+            raise ValueError(
+                f"Invalid rollup dimensions: {unknown}. "
+                f"Valid dimensions: {list(ROLLUP_DIMENSIONS)}"
+            )
+
+        positions = [ROLLUP_DIMENSIONS.index(d) for d in group_by]
+        filter_positions = [(ROLLUP_DIMENSIONS.index(d), v) for d, v in filters.items()]
+
+        groups: dict[tuple[str, ...], dict[str, Any]] = {}
+        for key, cell in self._cells.items():
+            if any(key[pos] != value for pos, value in filter_positions):
+                continue
+            group_key = tuple(key[pos] for pos in positions)
+            group = groups.get(group_key)
+            if group is None:
+                group = groups[group_key] = {
+                    "count": 0,
+                    "cost": 0.0,
+                    "resources": DistinctCounter(),
+                }
+            group["count"] += cell["count"]
+            group["cost"] += cell["cost"]
+            group["resources"].merge(cell["resources"])
+
+        result = [
+            RollupCell(
+                **dict(zip(group_by, group_key, strict=True)),
+                violation_count=group["count"],
+                non_compliant_resources=group["resources"].count(),
+                cost_gap=group["cost"],
+            )
+            for group_key, group in groups.items()
+        ]
+        result.sort(key=lambda c: c.violation_count, reverse=True)
+        return result
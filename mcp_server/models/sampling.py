@@ -0,0 +1,67 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Data models for sampled (approximate) compliance checks."""
+
+from pydantic import BaseModel, Field
+
+from .compliance import ComplianceResult
+
+
+class ConfidenceInterval(BaseModel):
+    """Two-sided confidence interval around an estimate."""
+
+    lower: float = Field(..., description="Lower bound")
+    upper: float = Field(..., description="Upper bound")
+
+
+class SamplingStratum(BaseModel):
+    """Sample drawn from one (region, resource_type) stratum."""
+
+    region: str = Field(..., description="AWS region (or 'global')")
+    resource_type: str = Field(..., description="Resource type")
+    population: int = Field(..., ge=0, description="In-scope resources in the stratum")
+    sample_size: int = Field(..., ge=0, description="Resources validated from the stratum")
+    compliant_in_sample: int = Field(..., ge=0, description="Compliant resources in the sample")
+
+
+class SamplingSummary(BaseModel):
+    """How a sampled compliance estimate was produced and how precise it is."""
+
+    sample_size: int = Field(..., ge=0, description="Resources validated across all strata")
+    population: int = Field(..., ge=0, description="In-scope resources listed")
+    confidence_level: float = Field(..., gt=0.0, lt=1.0, description="e.g. 0.95")
+    compliance_score_ci: ConfidenceInterval = Field(
+        ..., description="Confidence interval for the compliance score"
+    )
+    cost_attribution_gap_ci: ConfidenceInterval = Field(
+        ..., description="Confidence interval for the monthly cost attribution gap"
+    )
+    strata: list[SamplingStratum] = Field(default_factory=list, description="Per-stratum samples")
+    cost_estimated: bool = Field(
+        True,
+        description="False when Cost Explorer couldn't be queried and the cost gap isn't estimated",
+    )
+    exact: bool = Field(
+        False, description="True when every resource was sampled, so estimates are exact"
+    )
+    failed_regions: list[str] = Field(
+        default_factory=list,
+        description="Regions that failed to list; the estimates don't cover them",
+    )
+    failed_resource_types: list[str] = Field(
+        default_factory=list,
+        description="Resource types that failed to list in at least one region",
+    )
+
+
+class SampledComplianceResult(ComplianceResult):
+    """ComplianceResult estimated from a stratified random sample.
+
+    compliance_score, compliant_resources and cost_attribution_gap are
+    estimates for the whole population; violations are those of the
+    sampled resources only.
+    """
+
+    sampling: SamplingSummary = Field(..., description="Sample design and confidence intervals")
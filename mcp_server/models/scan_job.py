@@ -0,0 +1,86 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Data models for background compliance scan jobs."""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+
+class ScanJobStatus(str, Enum):
+    """Lifecycle states of a scan job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ScanProgress(BaseModel):
+    """Progress and running totals of an in-flight multi-region scan.
+
+    A region scan is one region (or the global resources) for one chunk
+    of resource types, so "all" mode scans report more region scans than
+    there are regions.
+    """
+
+    total_region_scans: int = Field(0, ge=0, description="Region scans planned")
+    completed_region_scans: int = Field(0, ge=0, description="Region scans finished")
+    failed_region_scans: int = Field(0, ge=0, description="Region scans that failed")
+    completed_regions: list[str] = Field(
+        default_factory=list, description="Regions with at least one finished scan"
+    )
+    resources_scanned: int = Field(0, ge=0, description="Resources evaluated so far")
+    compliant_resources: int = Field(0, ge=0, description="Compliant resources so far")
+    violations_found: int = Field(0, ge=0, description="Violations found so far")
+    elapsed_seconds: float = Field(0.0, ge=0.0, description="Seconds since the scan started")
+
+    @property
+    def compliance_score(self) -> float:
+        """Compliance score of the resources scanned so far."""
+        if self.resources_scanned == 0:
+            return 1.0
+        return self.compliant_resources / self.resources_scanned
+
+    @property
+    def percent_complete(self) -> float:
+        """Share of planned region scans that have finished (0-100)."""
+        if self.total_region_scans == 0:
+            return 0.0
+        return round(100.0 * self.completed_region_scans / self.total_region_scans, 1)
+
+    @property
+    def eta_seconds(self) -> float | None:
+        """Estimated seconds remaining, from the average time per region scan so far.
+
+        None until the first region scan has finished.
+        """
+        if self.completed_region_scans == 0 or self.total_region_scans == 0:
+            return None
+        remaining = max(self.total_region_scans - self.completed_region_scans, 0)
+        per_scan = self.elapsed_seconds / self.completed_region_scans
+        return round(per_scan * remaining, 1)
+
+
+class ScanJob(BaseModel):
+    """A compliance scan running (or finished) in the background."""
+
+    job_id: str = Field(..., description="Unique job identifier")
+    status: ScanJobStatus = Field(..., description="Current job state")
+    parameters: dict[str, Any] = Field(
+        default_factory=dict, description="Tool parameters the scan was started with"
+    )
+    created_at: datetime = Field(..., description="When the job was submitted")
+    started_at: datetime | None = Field(None, description="When the scan started running")
+    completed_at: datetime | None = Field(None, description="When the scan finished")
+    progress: ScanProgress | None = Field(None, description="Latest progress update")
+    error: str | None = Field(None, description="Failure reason for failed jobs")
+
+    @property
+    def is_finished(self) -> bool:
+        """True once the job has completed or failed."""
+        return self.status in (ScanJobStatus.COMPLETED, ScanJobStatus.FAILED)
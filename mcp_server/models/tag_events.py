@@ -0,0 +1,65 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Data models for event-driven incremental rescans."""
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+# tag: merge tags, untag: remove keys, replace: set the exact tag set,
+# create: resource created with tags, delete: resource deleted
+TagEventAction = Literal["tag", "untag", "replace", "create", "delete"]
+
+
+class TagChangeEvent(BaseModel):
+    """One resource-level tag or lifecycle change, parsed from a CloudTrail record."""
+
+    event_id: str = Field("", description="CloudTrail eventID")
+    event_name: str = Field(..., description="CloudTrail eventName, e.g. CreateTags")
+    event_time: datetime = Field(..., description="When the change happened")
+    resource_arn: str = Field(..., description="ARN of the changed resource")
+    resource_id: str = Field(..., description="Resource identifier")
+    resource_type: str = Field(..., description="Resource type (e.g., ec2:instance)")
+    region: str = Field(..., description="AWS region (or 'global')")
+    action: TagEventAction = Field(..., description="What the event does to the resource")
+    tags: dict[str, str] = Field(
+        default_factory=dict, description="Tags set (tag, replace and create actions)"
+    )
+    removed_keys: list[str] = Field(
+        default_factory=list, description="Tag keys removed (untag action)"
+    )
+
+
+class ShardSummary(BaseModel):
+    """Recomputed compliance aggregate for one (region, resource type) shard."""
+
+    region: str = Field(..., description="AWS region (or 'global')")
+    resource_type: str = Field(..., description="Resource type")
+    total_resources: int = Field(0, ge=0, description="In-scope resources in the shard")
+    compliant_resources: int = Field(0, ge=0, description="Compliant resources in the shard")
+    violation_count: int = Field(0, ge=0, description="Violations in the shard")
+    compliance_score: float = Field(1.0, ge=0.0, le=1.0, description="Shard compliance score")
+
+
+class IncrementalScanResult(BaseModel):
+    """Outcome of applying a batch of tag change events."""
+
+    events_received: int = Field(0, description="Events parsed from the source")
+    events_applied: int = Field(0, description="Events that changed cached state")
+    events_ignored: int = Field(
+        0, description="Events for out-of-scope resource types or unparseable records"
+    )
+    resources_updated: int = Field(0, description="Existing resources whose tags changed")
+    resources_created: int = Field(0, description="Resources added to the inventory")
+    resources_deleted: int = Field(0, description="Resources removed from the inventory")
+    unresolved_resources: list[str] = Field(
+        default_factory=list,
+        description="ARNs whose full tag set is unknown (not in the cached inventory); "
+        "their shards are marked stale so the next scan lists them again",
+    )
+    affected_shards: list[ShardSummary] = Field(
+        default_factory=list, description="Recomputed aggregates of every shard touched"
+    )
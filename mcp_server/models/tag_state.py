@@ -0,0 +1,21 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Data models for the per-resource tag state store."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class TagStateBaseline(BaseModel):
+    """A recorded tag state scan used as a drift baseline."""
+
+    scanned_at: datetime = Field(
+        ..., description="When the baseline scan finished (state as of this time is compared)"
+    )
+    started_at: datetime | None = Field(
+        None, description="When the baseline scan's first recording was made"
+    )
+    resource_count: int = Field(0, ge=0, description="Resources recorded at that time")
@@ -4,6 +4,7 @@ from .audit_service import AuditService
 from .compliance_service import ComplianceService
 from .cost_service import CostAttributionResult, CostService
 from .history_service import HistoryService
+from .incremental_scan_service import IncrementalScanService
 from .metrics_service import MetricsService
 from .multi_region_scanner import MultiRegionScanner, MultiRegionScanError
 from .policy_service import PolicyService
@@ -13,6 +14,9 @@ from .region_discovery_service import (
     filter_regions_by_opt_in_status,
 )
 from .report_service import ReportService
+from .result_store_service import ResultNotFoundError, ResultStoreService
+from .sampling_service import SamplingService
+from .scan_job_service import ScanJobNotFoundError, ScanJobService
 from .security_service import (
     SecurityEvent,
     SecurityService,
@@ -21,6 +25,9 @@ from .security_service import (
     set_security_service,
 )
 from .suggestion_service import SuggestionService
+from .tag_event_source import DirectoryEventSource, LocalQueue, QueueEventSource
+from .tag_state_service import ResourceTagChange, TagStateService
+from .validation_cache import ValidationCache
 
 __all__ = [
     "PolicyService",
@@ -42,4 +49,16 @@ __all__ = [
     "filter_regions_by_opt_in_status",
     "MultiRegionScanner",
     "MultiRegionScanError",
+    "ScanJobService",
+    "ScanJobNotFoundError",
+    "ResultStoreService",
+    "ResultNotFoundError",
+    "SamplingService",
+    "TagStateService",
+    "ResourceTagChange",
+    "ValidationCache",
+    "IncrementalScanService",
+    "DirectoryEventSource",
+    "QueueEventSource",
+    "LocalQueue",
 ]
@@ -0,0 +1,594 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Per-tool, per-minute rollups of the audit log.
+
+Every batch of audit entries is folded into five small tables in the
+same transaction that inserts it:
+
+- audit_rollups: per (minute, tool) invocation and failure counts,
+  latency sum/min/max and a fixed-bucket latency histogram
+- audit_error_rollups: per (minute, tool, error type) failure counts
+- audit_sessions: first and last activity per correlation ID
+- audit_stage_rollups: per (minute, tool, stage) span counts and
+  durations, from the stage timings stored with each entry
+- audit_api_rollups: per (minute, tool, service, operation, resource
+  type) AWS API call counts, from the call ledger stored with each entry
+
+Metrics queries aggregate these rows in SQL, so their cost depends on
+the number of minutes and tools in the window, not the number of calls.
+All functions take an open connection; AuditService owns the
+transactions.
+"""
+
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+
+from ..utils.api_ledger import request_cost_usd
+
+# Upper bounds (ms) of the latency histogram buckets. Latencies above the
+# last bound fall into one extra, unbounded bucket.
+LATENCY_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+_BUCKET_COLUMNS = [f"bucket_{i}" for i in range(len(LATENCY_BUCKETS_MS) + 1)]
+
+_MINUTE = "strftime('%Y-%m-%dT%H:%M', timestamp)"
+
+
+def _bucket_conditions() -> list[str]:
+    conditions = []
+    lower = None
+    for upper in LATENCY_BUCKETS_MS:
+        if lower is None:
+            conditions.append(f"execution_time_ms <= {upper}")
+        else:
+            conditions.append(f"execution_time_ms > {lower} AND execution_time_ms <= {upper}")
+        lower = upper
+    conditions.append(f"execution_time_ms > {lower}")
+    return conditions
+
+
+_CREATE_TABLES = [
+    f"""
+    CREATE TABLE IF NOT EXISTS audit_rollups (
+        minute TEXT NOT NULL,
+        tool_name TEXT NOT NULL,
+        invocations INTEGER NOT NULL,
+        failures INTEGER NOT NULL,
+        timed INTEGER NOT NULL,
+        latency_sum_ms REAL NOT NULL,
+        latency_min_ms REAL,
+        latency_max_ms REAL,
+        last_invoked_at TEXT NOT NULL,
+        last_error_id INTEGER,
+        {", ".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in _BUCKET_COLUMNS)},
+        PRIMARY KEY (minute, tool_name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS audit_error_rollups (
+        minute TEXT NOT NULL,
+        tool_name TEXT NOT NULL,
+        error_type TEXT NOT NULL,
+        failures INTEGER NOT NULL,
+        PRIMARY KEY (minute, tool_name, error_type)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS audit_sessions (
+        correlation_id TEXT PRIMARY KEY,
+        first_seen TEXT NOT NULL,
+        last_seen TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS audit_stage_rollups (
+        minute TEXT NOT NULL,
+        tool_name TEXT NOT NULL,
+        stage TEXT NOT NULL,
+        invocations INTEGER NOT NULL,
+        spans INTEGER NOT NULL,
+        total_ms REAL NOT NULL,
+        max_ms REAL NOT NULL,
+        PRIMARY KEY (minute, tool_name, stage)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS audit_api_rollups (
+        minute TEXT NOT NULL,
+        tool_name TEXT NOT NULL,
+        service TEXT NOT NULL,
+        operation TEXT NOT NULL,
+        resource_type TEXT NOT NULL,
+        invocations INTEGER NOT NULL,
+        calls INTEGER NOT NULL,
+        pages INTEGER NOT NULL,
+        retries INTEGER NOT NULL,
+        throttles INTEGER NOT NULL,
+        errors INTEGER NOT NULL,
+        latency_sum_ms REAL NOT NULL,
+        latency_max_ms REAL NOT NULL,
+        bytes INTEGER NOT NULL,
+        PRIMARY KEY (minute, tool_name, service, operation, resource_type)
+    )
+    """,
+    # Newest failures first, for recent_failures()
+    """
+    CREATE INDEX IF NOT EXISTS idx_audit_failures
+    ON audit_logs(id) WHERE status = 'failure'
+    """,
+]
+
+# Templates completed by _statements(). The SELECTs keep a WHERE clause so
+# SQLite doesn't read ON CONFLICT as part of a join.
+_UPDATE_ROLLUPS = """
+    INSERT INTO audit_rollups (
+        minute, tool_name, invocations, failures, timed, latency_sum_ms,
+        latency_min_ms, latency_max_ms, last_invoked_at, last_error_id,
+        @BUCKETS@
+    )
+    SELECT
+        @MINUTE@ AS minute,
+        tool_name,
+        COUNT(*),
+        COUNT(CASE WHEN status = 'failure' THEN 1 END),
+        COUNT(execution_time_ms),
+        TOTAL(execution_time_ms),
+        MIN(execution_time_ms),
+        MAX(execution_time_ms),
+        MAX(timestamp),
+        MAX(CASE WHEN status = 'failure' THEN id END),
+        @BUCKET_COUNTS@
+    FROM audit_logs
+    WHERE @ENTRIES@
+    GROUP BY minute, tool_name
+    ON CONFLICT (minute, tool_name) DO UPDATE SET
+        invocations = invocations + excluded.invocations,
+        failures = failures + excluded.failures,
+        timed = timed + excluded.timed,
+        latency_sum_ms = latency_sum_ms + excluded.latency_sum_ms,
+        latency_min_ms = MIN(
+            COALESCE(latency_min_ms, excluded.latency_min_ms),
+            COALESCE(excluded.latency_min_ms, latency_min_ms)
+        ),
+        latency_max_ms = MAX(
+            COALESCE(latency_max_ms, excluded.latency_max_ms),
+            COALESCE(excluded.latency_max_ms, latency_max_ms)
+        ),
+        last_invoked_at = MAX(last_invoked_at, excluded.last_invoked_at),
+        last_error_id = NULLIF(
+            MAX(COALESCE(last_error_id, 0), COALESCE(excluded.last_error_id, 0)), 0
+        ),
+        @BUCKET_SUMS@
+"""
+
+# Error type: the first word before any ":" in the message, as MetricsService
+# has always reported it
+_UPDATE_ERROR_ROLLUPS = """
+    INSERT INTO audit_error_rollups (minute, tool_name, error_type, failures)
+    SELECT
+        minute,
+        tool_name,
+        CASE WHEN head = '' THEN 'unknown'
+             ELSE substr(head, 1, instr(head || ' ', ' ') - 1) END AS error_type,
+        COUNT(*)
+    FROM (
+        SELECT
+            @MINUTE@ AS minute,
+            tool_name,
+            trim(substr(
+                COALESCE(error_message, ''), 1,
+                instr(COALESCE(error_message, '') || ':', ':') - 1
+            )) AS head
+        FROM audit_logs
+        WHERE status = 'failure' AND @ENTRIES@
+    )
+    WHERE true
+    GROUP BY minute, tool_name, error_type
+    ON CONFLICT (minute, tool_name, error_type) DO UPDATE SET
+        failures = failures + excluded.failures
+"""
+
+_UPDATE_SESSIONS = """
+    INSERT INTO audit_sessions (correlation_id, first_seen, last_seen)
+    SELECT correlation_id, MIN(timestamp), MAX(timestamp)
+    FROM audit_logs
+    WHERE correlation_id IS NOT NULL AND @ENTRIES@
+    GROUP BY correlation_id
+    ON CONFLICT (correlation_id) DO UPDATE SET
+        first_seen = MIN(first_seen, excluded.first_seen),
+        last_seen = MAX(last_seen, excluded.last_seen)
+"""
+
+
+# stage_timings holds {stage: {"count", "total_ms", "max_ms"}}. The entries
+# are selected in a subquery because json_each has an id column too.
+_UPDATE_STAGE_ROLLUPS = """
+    INSERT INTO audit_stage_rollups (minute, tool_name, stage, invocations, spans, total_ms, max_ms)
+    SELECT
+        l.minute,
+        l.tool_name,
+        s.key AS stage,
+        COUNT(*),
+        SUM(json_extract(s.value, '$.count')),
+        TOTAL(json_extract(s.value, '$.total_ms')),
+        MAX(json_extract(s.value, '$.max_ms'))
+    FROM (
+        SELECT @MINUTE@ AS minute, tool_name, stage_timings
+        FROM audit_logs
+        WHERE stage_timings IS NOT NULL AND @ENTRIES@
+    ) l, json_each(l.stage_timings) s
+    WHERE true
+    GROUP BY l.minute, l.tool_name, s.key
+    ON CONFLICT (minute, tool_name, stage) DO UPDATE SET
+        invocations = invocations + excluded.invocations,
+        spans = spans + excluded.spans,
+        total_ms = total_ms + excluded.total_ms,
+        max_ms = MAX(max_ms, excluded.max_ms)
+"""
+
+
+# aws_calls holds a list of ApiCallLedger rows; regions are summed over
+_UPDATE_API_ROLLUPS = """
+    INSERT INTO audit_api_rollups (
+        minute, tool_name, service, operation, resource_type, invocations, calls, pages,
+        retries, throttles, errors, latency_sum_ms, latency_max_ms, bytes
+    )
+    SELECT
+        l.minute,
+        l.tool_name,
+        json_extract(c.value, '$.service') AS service,
+        json_extract(c.value, '$.operation') AS operation,
+        COALESCE(json_extract(c.value, '$.resource_type'), '') AS resource_type,
+        COUNT(DISTINCT l.entry_id),
+        SUM(json_extract(c.value, '$.calls')),
+        SUM(json_extract(c.value, '$.pages')),
+        SUM(json_extract(c.value, '$.retries')),
+        SUM(json_extract(c.value, '$.throttles')),
+        SUM(json_extract(c.value, '$.errors')),
+        TOTAL(json_extract(c.value, '$.latency_ms')),
+        MAX(json_extract(c.value, '$.max_latency_ms')),
+        SUM(json_extract(c.value, '$.bytes'))
+    FROM (
+        SELECT id AS entry_id, @MINUTE@ AS minute, tool_name, aws_calls
+        FROM audit_logs
+        WHERE aws_calls IS NOT NULL AND @ENTRIES@
+    ) l, json_each(l.aws_calls) c
+    WHERE true
+    GROUP BY l.minute, l.tool_name, service, operation, resource_type
+    ON CONFLICT (minute, tool_name, service, operation, resource_type) DO UPDATE SET
+        invocations = invocations + excluded.invocations,
+        calls = calls + excluded.calls,
+        pages = pages + excluded.pages,
+        retries = retries + excluded.retries,
+        throttles = throttles + excluded.throttles,
+        errors = errors + excluded.errors,
+        latency_sum_ms = latency_sum_ms + excluded.latency_sum_ms,
+        latency_max_ms = MAX(latency_max_ms, excluded.latency_max_ms),
+        bytes = bytes + excluded.bytes
+"""
+
+
+def _statements(entries: str) -> list[str]:
+    """The rollup updates for the audit entries matching an SQL condition."""
+    substitutions = {
+        "@BUCKETS@": ", ".join(_BUCKET_COLUMNS),
+        "@BUCKET_COUNTS@": ", ".join(
+            f"COUNT(CASE WHEN {cond} THEN 1 END)" for cond in _bucket_conditions()
+        ),
+        "@BUCKET_SUMS@": ", ".join(f"{c} = {c} + excluded.{c}" for c in _BUCKET_COLUMNS),
+        "@MINUTE@": _MINUTE,
+        "@ENTRIES@": entries,
+    }
+    statements = []
+    for template in (
+        _UPDATE_ROLLUPS,
+        _UPDATE_ERROR_ROLLUPS,
+        _UPDATE_SESSIONS,
+        _UPDATE_STAGE_ROLLUPS,
+        _UPDATE_API_ROLLUPS,
+    ):
+        for token, value in substitutions.items():
+            template = template.replace(token, value)
+        statements.append(template)
+    return statements
+
+
+# One parameter (a JSON array of entry IDs) keeps the statement text, and so
+# its prepared statement, the same for every batch
+_BATCH_UPDATES = _statements("id IN (SELECT value FROM json_each(?))")
+_FULL_UPDATES = _statements("1=1")
+
+
+@dataclass
+class ToolRollup:
+    """Aggregated audit rollups of one tool over a time window."""
+
+    tool_name: str
+    invocations: int = 0
+    failures: int = 0
+    timed: int = 0
+    latency_sum_ms: float = 0.0
+    latency_min_ms: float | None = None
+    latency_max_ms: float | None = None
+    last_invoked_at: datetime | None = None
+    last_error: str | None = None
+    # Counts per LATENCY_BUCKETS_MS bucket, plus the unbounded last bucket
+    latency_buckets: list[int] = field(default_factory=list)
+
+    @property
+    def latency_histogram(self) -> dict[str, int]:
+        """Bucket counts keyed by their bound, e.g. {"<=10ms": 4, ">30000ms": 0}."""
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, self.latency_buckets, strict=True))
+
+    def latency_percentile(self, q: float) -> float | None:
+        """
+        Estimate a latency percentile from the histogram.
+
+        Returns the upper bound of the bucket holding the percentile,
+        capped at the largest latency seen, or None without timed calls.
+        """
+        if not self.timed:
+            return None
+        rank = q * self.timed
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.latency_buckets, strict=True):
+            seen += count
+            if seen >= rank:
+                return min(float(bound), self.latency_max_ms)
+        return self.latency_max_ms
+
+
+@dataclass
+class StageRollup:
+    """Aggregated stage timings of one tool over a time window."""
+
+    tool_name: str
+    stage: str
+    # Invocations that recorded the stage, and their spans in total
+    invocations: int
+    spans: int
+    total_ms: float
+    max_ms: float
+
+
+@dataclass
+class ApiCallRollup:
+    """Aggregated AWS API calls of one tool to one operation over a time window."""
+
+    tool_name: str
+    service: str
+    operation: str
+    # "" for calls not made while fetching a particular resource type
+    resource_type: str
+    # Invocations of the tool that made the calls
+    invocations: int
+    calls: int
+    pages: int
+    retries: int
+    throttles: int
+    errors: int
+    latency_sum_ms: float
+    latency_max_ms: float
+    bytes: int
+
+    @property
+    def estimated_cost_usd(self) -> float:
+        """Charge for the calls (nonzero for billed APIs such as Cost Explorer)."""
+        return request_cost_usd(self.service, self.calls)
+
+
+def create_tables(conn: sqlite3.Connection) -> bool:
+    """
+    Create the rollup tables.
+
+    Returns:
+        True if they didn't exist yet, so existing entries need rolling up
+    """
+    (existed,) = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'audit_rollups'"
+    ).fetchone()
+    for statement in _CREATE_TABLES:
+        conn.execute(statement)
+    return not existed
+
+
+def update(conn: sqlite3.Connection, entry_ids: list[int]) -> None:
+    """Fold newly inserted audit entries into the rollups."""
+    ids = json.dumps(entry_ids)
+    for statement in _BATCH_UPDATES:
+        conn.execute(statement, (ids,))
+
+
+def rebuild(conn: sqlite3.Connection) -> None:
+    """Roll up every audit entry (for tables created on an existing log)."""
+    for statement in _FULL_UPDATES:
+        conn.execute(statement)
+
+
+def _utc(moment: datetime) -> datetime:
+    # Audit timestamps are UTC; naive datetimes are taken to be UTC too
+    if moment.tzinfo is None:
+        return moment.replace(tzinfo=UTC)
+    return moment.astimezone(UTC)
+
+
+def minute_key(moment: datetime) -> str:
+    """The rollup minute a timestamp falls in."""
+    return _utc(moment).strftime("%Y-%m-%dT%H:%M")
+
+
+def _window(since: datetime | None, until: datetime | None) -> tuple[str, list[str]]:
+    clauses, params = [], []
+    if since is not None:
+        clauses.append("minute >= ?")
+        params.append(minute_key(since))
+    if until is not None:
+        clauses.append("minute <= ?")
+        params.append(minute_key(until))
+    return " AND ".join(clauses) or "1=1", params
+
+
+def tool_rollups(
+    conn: sqlite3.Connection,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    tool_name: str | None = None,
+) -> list[ToolRollup]:
+    """Per-tool totals over a window, most invoked first."""
+    where, params = _window(since, until)
+    if tool_name:
+        where += " AND tool_name = ?"
+        params.append(tool_name)
+    rows = conn.execute(
+        f"""
+        SELECT r.*, l.error_message FROM (
+            SELECT
+                tool_name, SUM(invocations) AS invocations, SUM(failures), SUM(timed),
+                SUM(latency_sum_ms), MIN(latency_min_ms), MAX(latency_max_ms),
+                MAX(last_invoked_at), MAX(last_error_id) AS last_error_id,
+                {", ".join(f"SUM({c})" for c in _BUCKET_COLUMNS)}
+            FROM audit_rollups
+            WHERE {where}
+            GROUP BY tool_name
+        ) r
+        LEFT JOIN audit_logs l ON l.id = r.last_error_id
+        ORDER BY r.invocations DESC, r.tool_name
+        """,
+        params,
+    ).fetchall()
+    return [
+        ToolRollup(
+            tool_name=row[0],
+            invocations=row[1],
+            failures=row[2],
+            timed=row[3],
+            latency_sum_ms=row[4],
+            latency_min_ms=row[5],
+            latency_max_ms=row[6],
+            last_invoked_at=datetime.fromisoformat(row[7]),
+            latency_buckets=list(row[9:-1]),
+            last_error=row[-1],
+        )
+        for row in rows
+    ]
+
+
+def errors_by_type(
+    conn: sqlite3.Connection, since: datetime | None = None, until: datetime | None = None
+) -> dict[str, int]:
+    """Failure counts per error type over a window."""
+    where, params = _window(since, until)
+    rows = conn.execute(
+        f"""
+        SELECT error_type, SUM(failures) FROM audit_error_rollups
+        WHERE {where} GROUP BY error_type ORDER BY SUM(failures) DESC
+        """,
+        params,
+    ).fetchall()
+    return dict(rows)
+
+
+def minute_totals(
+    conn: sqlite3.Connection, since: datetime | None = None, until: datetime | None = None
+) -> list[tuple[str, int, int]]:
+    """(minute, invocations, failures) for every minute with calls, oldest first."""
+    where, params = _window(since, until)
+    return conn.execute(
+        f"""
+        SELECT minute, SUM(invocations), SUM(failures) FROM audit_rollups
+        WHERE {where} GROUP BY minute ORDER BY minute
+        """,
+        params,
+    ).fetchall()
+
+
+def recent_failures(
+    conn: sqlite3.Connection,
+    limit: int = 10,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> list[tuple]:
+    """
+    The newest failed audit_logs rows within a window, newest first.
+
+    The status is a literal rather than a parameter so SQLite matches the
+    partial index idx_audit_failures and walks it backwards from the
+    newest ID, instead of scanning the log. The window is compared by
+    minute, like the rollups, on the rows the index walk visits.
+    """
+    clauses, params = ["status = 'failure'"], []
+    if since is not None:
+        clauses.append("substr(timestamp, 1, 16) >= ?")
+        params.append(minute_key(since))
+    if until is not None:
+        clauses.append("substr(timestamp, 1, 16) <= ?")
+        params.append(minute_key(until))
+    return conn.execute(
+        f"SELECT * FROM audit_logs WHERE {' AND '.join(clauses)} ORDER BY id DESC LIMIT ?",
+        (*params, limit),
+    ).fetchall()
+
+
+def session_count(conn: sqlite3.Connection, since: datetime | None = None) -> int:
+    """Correlation IDs active since a moment (all of them if since is None)."""
+    if since is None:
+        return conn.execute("SELECT COUNT(*) FROM audit_sessions").fetchone()[0]
+    return conn.execute(
+        "SELECT COUNT(*) FROM audit_sessions WHERE last_seen >= ?",
+        (_utc(since).isoformat(),),
+    ).fetchone()[0]
+
+
+def stage_rollups(
+    conn: sqlite3.Connection,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    tool_name: str | None = None,
+) -> list[StageRollup]:
+    """Per-tool, per-stage totals over a window, slowest stages first."""
+    where, params = _window(since, until)
+    if tool_name:
+        where += " AND tool_name = ?"
+        params.append(tool_name)
+    rows = conn.execute(
+        f"""
+        SELECT tool_name, stage, SUM(invocations), SUM(spans), SUM(total_ms), MAX(max_ms)
+        FROM audit_stage_rollups
+        WHERE {where}
+        GROUP BY tool_name, stage
+        ORDER BY SUM(total_ms) DESC, tool_name, stage
+        """,
+        params,
+    ).fetchall()
+    return [StageRollup(*row) for row in rows]
+
+
+def api_call_rollups(
+    conn: sqlite3.Connection,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    tool_name: str | None = None,
+) -> list[ApiCallRollup]:
+    """Per-tool API call totals by operation and resource type, most calls first."""
+    where, params = _window(since, until)
+    if tool_name:
+        where += " AND tool_name = ?"
+        params.append(tool_name)
+    rows = conn.execute(
+        f"""
+        SELECT tool_name, service, operation, resource_type, SUM(invocations), SUM(calls),
+               SUM(pages), SUM(retries), SUM(throttles), SUM(errors), SUM(latency_sum_ms),
+               MAX(latency_max_ms), SUM(bytes)
+        FROM audit_api_rollups
+        WHERE {where}
+        GROUP BY tool_name, service, operation, resource_type
+        ORDER BY SUM(calls) DESC, tool_name, service, operation, resource_type
+        """,
+        params,
+    ).fetchall()
+    return [ApiCallRollup(*row) for row in rows]
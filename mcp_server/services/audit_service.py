@@ -2,65 +2,175 @@
 # Licensed under the Apache License, Version 2.0.
 # See LICENSE file in the project root for full license information.
 
-"""Audit logging service for tracking tool invocations."""
+"""Audit logging service for tracking tool invocations.
 
+Database work runs on an SQLitePool (see clients/sqlite_pool.py), so
+neither logging nor querying ever blocks the event loop. log_invocation
+doesn't touch the database or wait for it: entries collect in memory and
+are handed to the pool's writer thread in batches, one executemany per
+batch, when batch_size entries are waiting or flush_interval_seconds has
+passed, whichever comes first. With batch_size 1 (the default) each entry
+is handed over as soon as it is logged.
+
+At most max_queue_size entries wait to be written (buffered or queued on
+the writer). Beyond that, new entries are dropped and counted rather than
+making the caller wait (backpressure). Queries are async; they first
+hand over buffered entries and wait for the writer to commit them, so
+they see every entry logged before them. close() writes everything still
+pending, so nothing is lost on shutdown.
+
+Entry IDs are assigned by SQLite when the writer inserts the entry, so
+they always match the stored rows, whichever process writes the same
+database. The AuditLogEntry returned by log_invocation gets its id once
+its batch commits; await flush() first if you need it.
+
+Entries can carry the stage timings of their request (see
+utils/timing.py) and its AWS API call ledger (utils/api_ledger.py);
+both are stored as JSON and rolled up like the other audit metrics.
+"""
+
+import asyncio
+import atexit
 import json
+import logging
 import sqlite3
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
+from ..clients.sqlite_pool import DEFAULT_READERS, SQLitePool
 from ..models.audit import AuditLogEntry, AuditStatus
 from ..utils.correlation import get_correlation_id
+from . import audit_rollups
+from .audit_rollups import ApiCallRollup, StageRollup, ToolRollup
+
+logger = logging.getLogger(__name__)
+
+# Batch size the server uses (AUDIT_BATCH_SIZE); the class default of 1
+# hands each entry to the writer as soon as it is logged
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+DEFAULT_MAX_QUEUE_SIZE = 10_000
+
+_INSERT = """
+    INSERT INTO audit_logs
+    (timestamp, tool_name, parameters, status, error_message, execution_time_ms,
+     correlation_id, stage_timings, aws_calls)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+@dataclass
+class AuditWriterStats:
+    """
+    Counters for the audit log writer.
+
+    Attributes:
+        enqueued: Entries accepted for writing
+        written: Entries committed to the database
+        dropped: Entries lost: too many were pending, or their batch failed
+        flushes: Batches committed
+        write_errors: Batches that failed to commit
+        queue_depth: Entries waiting to be written
+        max_queue_depth: Highest queue depth observed
+    """
+
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    flushes: int = 0
+    write_errors: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
 
 
 class AuditService:
     """Service for logging and retrieving audit entries."""
 
-    def __init__(self, db_path: str = "audit_logs.db"):
+    def __init__(
+        self,
+        db_path: str = "audit_logs.db",
+        batch_size: int = 1,
+        flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        readers: int = DEFAULT_READERS,
+    ):
         """
-        Initialize the audit service.
+        Initialize the audit service and, when batching, start its flush timer.
 
         Args:
             db_path: Path to the SQLite database file
+            batch_size: Buffered entries that trigger a flush; 1 hands each
+                        entry to the writer immediately
+            flush_interval_seconds: Longest an entry stays buffered
+            max_queue_size: Most entries waiting to be written; beyond
+                            this, new entries are dropped
+            readers: Reader threads for audit queries
         """
         self.db_path = db_path
-        self._init_database()
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_queue_size = max_queue_size
 
-    def _init_database(self) -> None:
-        """Initialize the SQLite database with the audit_logs table."""
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                CREATE TABLE IF NOT EXISTS audit_logs (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    tool_name TEXT NOT NULL,
-                    parameters TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    error_message TEXT,
-                    execution_time_ms REAL,
-                    correlation_id TEXT
-                )
-                """
-            )
-            # Create index on timestamp for faster queries
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_audit_timestamp 
-                ON audit_logs(timestamp)
-                """
+        self._stats = AuditWriterStats()
+        # Guards the buffer, the in-flight bookkeeping and the counters
+        self._lock = threading.Lock()
+        self._buffer: list[tuple[tuple, AuditLogEntry]] = []
+        # Batches handed to the writer and not yet committed
+        self._in_flight: dict[Future, list[AuditLogEntry]] = {}
+        self._stopping = threading.Event()
+        self._closed = False
+
+        self._pool = SQLitePool(db_path, readers=readers, init=self._init_database)
+
+        self._flusher: threading.Thread | None = None
+        if batch_size > 1:
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="audit-flush", daemon=True
             )
-            # Create index on correlation_id for faster correlation-based queries
-            cursor.execute(
-                """
-                CREATE INDEX IF NOT EXISTS idx_audit_correlation_id 
-                ON audit_logs(correlation_id)
-                """
+            self._flusher.start()
+            atexit.register(self.close)
+
+    def _init_database(self, conn: sqlite3.Connection) -> None:
+        """Initialize the SQLite database with the audit_logs table."""
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS audit_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                tool_name TEXT NOT NULL,
+                parameters TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error_message TEXT,
+                execution_time_ms REAL,
+                correlation_id TEXT,
+                stage_timings TEXT,
+                aws_calls TEXT
             )
-            conn.commit()
-        finally:
-            conn.close()
+            """
+        )
+        # Logs created before stage timings and API calls were recorded
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(audit_logs)")}
+        for column in ("stage_timings", "aws_calls"):
+            if column not in columns:
+                conn.execute(f"ALTER TABLE audit_logs ADD COLUMN {column} TEXT")
+        # Create index on timestamp for faster queries
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_audit_timestamp 
+            ON audit_logs(timestamp)
+            """
+        )
+        # Create index on correlation_id for faster correlation-based queries
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_audit_correlation_id 
+            ON audit_logs(correlation_id)
+            """
+        )
+        if audit_rollups.create_tables(conn):
+            audit_rollups.rebuild(conn)
 
     def log_invocation(
         self,
@@ -70,9 +180,11 @@ class AuditService:
         error_message: str | None = None,
         execution_time_ms: float | None = None,
         correlation_id: str | None = None,
+        stage_timings: dict[str, dict] | None = None,
+        aws_calls: list[dict] | None = None,
     ) -> AuditLogEntry:
         """
-        Log a tool invocation to the audit database.
+        Record a tool invocation; it is written to the database in the background.
 
         Args:
             tool_name: Name of the tool that was invoked
@@ -81,9 +193,12 @@ class AuditService:
             error_message: Error message if status is failure
             execution_time_ms: Execution time in milliseconds
             correlation_id: Correlation ID for request tracing (auto-captured from context if not provided)
+            stage_timings: Stage timings of the request, as RequestTimings.stage_dict()
+            aws_calls: AWS API calls of the request, as ApiCallLedger.rows()
 
         Returns:
-            AuditLogEntry with the logged data including generated ID
+            AuditLogEntry with the logged data; its id is set once the
+            entry is written (after flush())
         """
         timestamp = datetime.now(timezone.utc)
 
@@ -91,32 +206,7 @@ class AuditService:
         if correlation_id is None:
             correlation_id = get_correlation_id() or None
 
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO audit_logs 
-                (timestamp, tool_name, parameters, status, error_message, execution_time_ms, correlation_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    timestamp.isoformat(),
-                    tool_name,
-                    json.dumps(parameters),  # Store as JSON string for security
-                    status.value,
-                    error_message,
-                    execution_time_ms,
-                    correlation_id,
-                ),
-            )
-            conn.commit()
-            entry_id = cursor.lastrowid
-        finally:
-            conn.close()
-
-        return AuditLogEntry(
-            id=entry_id,
+        entry = AuditLogEntry(
             timestamp=timestamp,
             tool_name=tool_name,
             parameters=parameters,
@@ -124,9 +214,132 @@ class AuditService:
             error_message=error_message,
             execution_time_ms=execution_time_ms,
             correlation_id=correlation_id,
+            stage_timings=stage_timings,
+            aws_calls=aws_calls,
+        )
+        row = (
+            timestamp.isoformat(),
+            tool_name,
+            json.dumps(parameters),  # Store as JSON string for security
+            status.value,
+            error_message,
+            execution_time_ms,
+            correlation_id,
+            json.dumps(stage_timings) if stage_timings else None,
+            json.dumps(aws_calls) if aws_calls else None,
         )
+        self._enqueue(row, entry)
+        return entry
+
+    def _enqueue(self, row: tuple, entry: AuditLogEntry) -> None:
+        batch = None
+        with self._lock:
+            if self._closed:
+                logger.warning("Audit service is closed - dropping audit entry")
+                self._stats.dropped += 1
+                return
+            depth = len(self._buffer) + sum(map(len, self._in_flight.values()))
+            if depth >= self.max_queue_size:
+                self._stats.dropped += 1
+                logger.warning("Audit queue full - dropping audit entry")
+                return
+            self._buffer.append((row, entry))
+            self._stats.enqueued += 1
+            self._stats.max_queue_depth = max(self._stats.max_queue_depth, depth + 1)
+            if len(self._buffer) >= self.batch_size:
+                batch, self._buffer = self._buffer, []
+        if batch:
+            self._submit(batch)
+
+    def _submit_buffer(self) -> None:
+        """Hand every buffered entry to the writer thread without waiting."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if batch:
+            self._submit(batch)
+
+    def _submit(self, batch: list[tuple[tuple, AuditLogEntry]]) -> None:
+        rows = [row for row, _ in batch]
+        try:
+            future = self._pool.submit_write(lambda conn: self._write_batch(conn, rows))
+        except RuntimeError as e:
+            # The pool closed between the buffer swap and the submit
+            self._batch_failed(len(rows), e)
+            return
+        with self._lock:
+            self._in_flight[future] = [entry for _, entry in batch]
+        future.add_done_callback(self._batch_done)
+
+    def _write_batch(self, conn: sqlite3.Connection, rows: list[tuple]) -> list[int]:
+        """Insert rows and update the rollups (on the writer thread); returns their IDs."""
+        conn.executemany(_INSERT, rows)
+        # The writer holds the write lock, so AUTOINCREMENT numbered the
+        # batch consecutively up to the last inserted row
+        (last,) = conn.execute("SELECT last_insert_rowid()").fetchone()
+        ids = list(range(last - len(rows) + 1, last + 1))
+        audit_rollups.update(conn, ids)
+        return ids
+
+    def _batch_done(self, future: Future) -> None:
+        with self._lock:
+            entries = self._in_flight.pop(future, [])
+        error = future.exception()
+        if error is not None:
+            self._batch_failed(len(entries), error)
+            return
+        for entry, entry_id in zip(entries, future.result(), strict=True):
+            entry.id = entry_id
+        with self._lock:
+            self._stats.written += len(entries)
+            self._stats.flushes += 1
+
+    def _batch_failed(self, count: int, error: BaseException) -> None:
+        logger.error(f"Failed to write {count} audit entries: {error}")
+        with self._lock:
+            self._stats.write_errors += 1
+            self._stats.dropped += count
+
+    def _flush_loop(self) -> None:
+        while not self._stopping.wait(self.flush_interval_seconds):
+            self._submit_buffer()
+
+    async def flush(self) -> int:
+        """
+        Write every pending entry and wait for the writer to commit it.
+
+        Returns:
+            Number of entries written
+        """
+        self._submit_buffer()
+        with self._lock:
+            pending = list(self._in_flight)
+        results = await asyncio.gather(
+            *(asyncio.wrap_future(future) for future in pending), return_exceptions=True
+        )
+        return sum(len(result) for result in results if isinstance(result, list))
+
+    def stats(self) -> AuditWriterStats:
+        """Snapshot of the writer's counters."""
+        with self._lock:
+            snapshot = AuditWriterStats(**vars(self._stats))
+            snapshot.queue_depth = len(self._buffer) + sum(map(len, self._in_flight.values()))
+        return snapshot
 
-    def get_logs(
+    def close(self) -> None:
+        """Write every pending entry, stop the flush timer and close the database."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._stopping.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self._submit_buffer()
+        self._pool.close()
+        if self._flusher is not None:
+            atexit.unregister(self.close)
+
+    async def get_logs(
         self,
         tool_name: str | None = None,
         status: AuditStatus | None = None,
@@ -145,46 +358,164 @@ class AuditService:
         Returns:
             List of audit log entries
         """
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
-
-            query = "SELECT * FROM audit_logs WHERE 1=1"
-            params = []
-
-            if tool_name:
-                query += " AND tool_name = ?"
-                params.append(tool_name)
-
-            if status:
-                query += " AND status = ?"
-                params.append(status.value)
-
-            if correlation_id:
-                query += " AND correlation_id = ?"
-                params.append(correlation_id)
-
-            query += " ORDER BY timestamp DESC LIMIT ?"
-            params.append(limit)
-
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-
-            logs = []
-            for row in rows:
-                logs.append(
-                    AuditLogEntry(
-                        id=row[0],
-                        timestamp=datetime.fromisoformat(row[1]),
-                        tool_name=row[2],
-                        parameters=json.loads(row[3]),  # Convert JSON string back to dict
-                        status=AuditStatus(row[4]),
-                        error_message=row[5],
-                        execution_time_ms=row[6],
-                        correlation_id=row[7] if len(row) > 7 else None,
-                    )
-                )
-
-            return logs
-        finally:
-            conn.close()
+        query = "SELECT * FROM audit_logs WHERE 1=1"
+        params = []
+
+        if tool_name:
+            query += " AND tool_name = ?"
+            params.append(tool_name)
+
+        if status:
+            query += " AND status = ?"
+            params.append(status.value)
+
+        if correlation_id:
+            query += " AND correlation_id = ?"
+            params.append(correlation_id)
+
+        query += " ORDER BY timestamp DESC LIMIT ?"
+        params.append(limit)
+
+        rows = await self._read(lambda conn: conn.execute(query, params).fetchall())
+        return [self._entry_from_row(row) for row in rows]
+
+    async def get_recent_failures(
+        self,
+        limit: int = 10,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[AuditLogEntry]:
+        """
+        The newest failed invocations within a window, newest first.
+
+        Unlike get_logs(status=...), the query can use the partial
+        idx_audit_failures index, so it reads only the rows it returns
+        (and, for a window that ends in the past, the newer failures).
+
+        Args:
+            limit: Maximum number of failures to return
+            since: Only failures in this minute or later
+            until: Only failures in this minute or earlier
+
+        Returns:
+            List of audit log entries
+        """
+        rows = await self._read(audit_rollups.recent_failures, limit, since, until)
+        return [self._entry_from_row(row) for row in rows]
+
+    @staticmethod
+    def _entry_from_row(row: tuple) -> AuditLogEntry:
+        return AuditLogEntry(
+            id=row[0],
+            timestamp=datetime.fromisoformat(row[1]),
+            tool_name=row[2],
+            parameters=json.loads(row[3]),  # Convert JSON string back to dict
+            status=AuditStatus(row[4]),
+            error_message=row[5],
+            execution_time_ms=row[6],
+            correlation_id=row[7] if len(row) > 7 else None,
+            stage_timings=json.loads(row[8]) if len(row) > 8 and row[8] else None,
+            aws_calls=json.loads(row[9]) if len(row) > 9 and row[9] else None,
+        )
+
+    # ------------------------------------------------------------------
+    # Rollup queries (see audit_rollups.py)
+    # ------------------------------------------------------------------
+
+    async def _read(self, query, *args):
+        # Entries logged before the query must be visible to it
+        await self.flush()
+        return await self._pool.read(lambda conn: query(conn, *args))
+
+    async def get_tool_rollups(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        tool_name: str | None = None,
+    ) -> list[ToolRollup]:
+        """
+        Per-tool invocation, failure and latency totals over a time window.
+
+        Args:
+            since: Start of the window (whole minutes); None for all history
+            until: End of the window (whole minutes); None for now
+            tool_name: Only this tool
+
+        Returns:
+            One rollup per tool, most invoked first
+        """
+        return await self._read(audit_rollups.tool_rollups, since, until, tool_name)
+
+    async def get_stage_rollups(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        tool_name: str | None = None,
+    ) -> list[StageRollup]:
+        """Per-tool, per-stage span counts and durations over a window, slowest first."""
+        return await self._read(audit_rollups.stage_rollups, since, until, tool_name)
+
+    async def get_api_call_rollups(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        tool_name: str | None = None,
+    ) -> list[ApiCallRollup]:
+        """Per-tool AWS API call totals by operation and resource type, most calls first."""
+        return await self._read(audit_rollups.api_call_rollups, since, until, tool_name)
+
+    async def get_error_type_counts(
+        self, since: datetime | None = None, until: datetime | None = None
+    ) -> dict[str, int]:
+        """Failure counts per error type (first word of the message) over a window."""
+        return await self._read(audit_rollups.errors_by_type, since, until)
+
+    async def get_minute_totals(
+        self, since: datetime | None = None, until: datetime | None = None
+    ) -> list[tuple[str, int, int]]:
+        """(minute, invocations, failures) for each minute with calls, oldest first."""
+        return await self._read(audit_rollups.minute_totals, since, until)
+
+    async def get_session_count(self, since: datetime | None = None) -> int:
+        """Number of correlation IDs seen (active since a moment, if given)."""
+        return await self._read(audit_rollups.session_count, since)
+
+    async def get_session_summary(self, correlation_id: str) -> dict | None:
+        """
+        Aggregate the entries of one correlation ID in SQL.
+
+        Returns:
+            Dict with invocations, successes, failures, timed,
+            total_execution_time_ms, first_seen, last_seen and tools_used,
+            or None if the correlation ID has no entries
+        """
+
+        def query(conn: sqlite3.Connection) -> dict | None:
+            row = conn.execute(
+                """
+                SELECT COUNT(*), COUNT(CASE WHEN status = 'success' THEN 1 END),
+                       COUNT(CASE WHEN status = 'failure' THEN 1 END),
+                       COUNT(execution_time_ms), TOTAL(execution_time_ms),
+                       MIN(timestamp), MAX(timestamp)
+                FROM audit_logs WHERE correlation_id = ?
+                """,
+                (correlation_id,),
+            ).fetchone()
+            if not row[0]:
+                return None
+            tools = conn.execute(
+                "SELECT DISTINCT tool_name FROM audit_logs WHERE correlation_id = ?",
+                (correlation_id,),
+            ).fetchall()
+            return {
+                "invocations": row[0],
+                "successes": row[1],
+                "failures": row[2],
+                "timed": row[3],
+                "total_execution_time_ms": row[4],
+                "first_seen": datetime.fromisoformat(row[5]),
+                "last_seen": datetime.fromisoformat(row[6]),
+                "tools_used": sorted(tool for (tool,) in tools),
+            }
+
+        return await self._read(query)
@@ -8,18 +8,27 @@ import asyncio
 import hashlib
 import json
 import logging
+from datetime import timedelta
 
 from ..clients.aws_client import AWSClient
 from ..clients.cache import RedisCache
 from ..models.compliance import ComplianceResult
+from ..models.inventory import ResourceInventory
+from ..models.rollup import ComplianceRollup
 from ..models.violations import Violation
 from ..services.policy_service import PolicyService
+from ..services.tag_state_service import TagStateService
+from ..services.validation_cache import ValidationCache
+from ..utils.api_ledger import attribute_api_calls
+from ..utils.deadline import begin_deadline_scope, deadline_near, record_refused_call
 from ..utils.resource_type_config import get_resource_type_config
 from ..utils.resource_utils import (
     expand_all_to_supported_types,
     extract_account_from_arn,
     fetch_resources_by_type,
 )
+from ..utils.tag_digest import TagDigestTree, group_by_leaf
+from ..utils.timing import span
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +47,9 @@ class ComplianceService:
         aws_client: AWSClient,
         policy_service: PolicyService,
         cache_ttl: int = 3600,
+        tag_state_service: TagStateService | None = None,
+        validation_cache: ValidationCache | None = None,
+        incremental_max_age: timedelta | None = None,
     ):
         """
         Initialize compliance service.
@@ -47,11 +59,22 @@ class ComplianceService:
             aws_client: AWS client for fetching resources
             policy_service: Policy service for validation rules
             cache_ttl: Cache time-to-live in seconds (default: 1 hour)
+            tag_state_service: Optional store that records per-resource tags
+                               after each scan (for drift detection)
+            validation_cache: Optional cache so resources in unchanged digest
+                              leaves are not validated again
+            incremental_max_age: When set with a validation_cache, a cache miss
+                                 is answered from the cache's shards (kept current
+                                 by tag change events) if a full scan within this
+                                 age covered every requested type
         """
         self.cache = cache
         self.aws_client = aws_client
         self.policy_service = policy_service
         self.cache_ttl = cache_ttl
+        self.tag_state_service = tag_state_service
+        self.validation_cache = validation_cache
+        self.incremental_max_age = incremental_max_age
 
     def _generate_cache_key(
         self,
@@ -141,12 +164,32 @@ class ComplianceService:
                 logger.info(f"Returning cached compliance result for key: {cache_key}")
                 return cached_result
 
+        # Between full scans, shards patched by tag change events stand in
+        # for listing resources again
+        if (
+            not force_refresh
+            and not filters
+            and self.incremental_max_age
+            and self.validation_cache is not None
+        ):
+            result = self._result_from_shards(resource_types, severity)
+            if result is not None:
+                logger.info("Returning compliance result from event-patched shards")
+                return result
+
         # Cache miss or force refresh - perform actual scan
         logger.info("Cache miss or force refresh - scanning resources")
         result = await self._scan_and_validate(resource_types, filters, severity)
 
-        # Cache the result
-        await self._cache_result(cache_key, result)
+        # Cache the result - unless the request deadline cut the scan short,
+        # so a later request with more time doesn't get the partial data
+        if result.incomplete_resource_types:
+            logger.info(
+                f"Not caching partial result (incomplete types: "
+                f"{result.incomplete_resource_types})"
+            )
+        else:
+            await self._cache_result(cache_key, result)
 
         return result
 
@@ -236,24 +279,47 @@ class ComplianceService:
         # asyncio.gather() runs all fetchers concurrently. Each fetcher failure
         # is isolated — one type failing doesn't block others.
         all_resources = []
+        incomplete_resource_types = []
+        failed_resource_types = []
 
-        async def _fetch_one(resource_type: str) -> tuple[str, list[dict]]:
-            """Fetch a single resource type, returning (type, resources)."""
+        async def _fetch_one(resource_type: str) -> tuple[str, list[dict], bool]:
+            """Fetch a single resource type, returning (type, resources, complete)."""
+            if deadline_near():
+                record_refused_call(f"fetch {resource_type}")
+                return resource_type, [], False
+
+            # Runs in its own task, so the scope only sees this type's calls
+            scope = begin_deadline_scope()
             try:
-                resources = await self._fetch_resources_by_type(resource_type, filters)
+                with attribute_api_calls(resource_type), span("fetch"):
+                    resources = await self._fetch_resources_by_type(resource_type, filters)
                 logger.info(f"Fetched {len(resources)} resources of type {resource_type}")
-                return resource_type, resources
             except Exception as e:
                 logger.error(f"Failed to fetch resources of type {resource_type}: {str(e)}")
-                return resource_type, []
+                failed_resource_types.append(resource_type)
+                resources = []
+
+            if scope.refused_calls:
+                # A skipped tag lookup looks like an untagged resource; drop
+                # the type rather than report violations that may not exist
+                return resource_type, [], False
+            return resource_type, resources, not scope.truncated
 
         # Run all fetchers in parallel
         results = await asyncio.gather(
             *[_fetch_one(rt) for rt in expanded_resource_types]
         )
 
-        for resource_type, resources in results:
+        for resource_type, resources, complete in results:
             all_resources.extend(resources)
+            if not complete:
+                incomplete_resource_types.append(resource_type)
+
+        if incomplete_resource_types:
+            logger.warning(
+                f"Request deadline reached - {len(incomplete_resource_types)} resource "
+                f"types incomplete: {incomplete_resource_types}"
+            )
 
         logger.info(f"Total resources fetched before filtering: {len(all_resources)}")
 
@@ -297,6 +363,14 @@ class ComplianceService:
         filtered_resources = self._apply_resource_filters(filtered_by_state, filters)
         logger.info(f"Total resources after filtering: {len(filtered_resources)}")
 
+        # Record per-resource tag state for drift detection. A failure here
+        # must never fail the scan.
+        if self.tag_state_service:
+            try:
+                await self.tag_state_service.record_state(filtered_resources)
+            except Exception as e:
+                logger.warning(f"Failed to record tag state: {e}")
+
         # Filter out resources with no applicable policy rules.
         # Resources whose resource_type has zero required tags in the policy are "out of scope"
         # and should not be counted in compliance metrics. This prevents types like
@@ -319,37 +393,52 @@ class ComplianceService:
                 f"(out of scope for compliance)"
             )
 
-        # Validate each resource against policy and collect violations
+        # Validate each resource against policy and collect violations. The
+        # rollup cube is filled in the same pass (with the violations the
+        # severity filter keeps) so summaries never regroup the full list.
         all_violations = []
         compliant_count = 0
-
-        for resource in in_scope_resources:
-            violations = self.policy_service.validate_resource_tags(
-                resource_id=resource["resource_id"],
-                resource_type=resource["resource_type"],
-                region=resource["region"],
-                tags=resource["tags"],
-                cost_impact=resource.get("cost_impact", 0.0),
-            )
-
-            if violations:
-                all_violations.extend(violations)
+        rollup = ComplianceRollup()
+
+        with span("validate"):
+            if self.validation_cache:
+                # Unfiltered scans list every resource of the complete types, so
+                # their shards can answer later requests for those types. A type
+                # whose listing failed isn't covered: its old shards must stay.
+                covered = None
+                if not filters:
+                    uncovered = set(incomplete_resource_types) | set(failed_resource_types)
+                    covered = (
+                        self.aws_client.region,
+                        [t for t in expanded_resource_types if t not in uncovered],
+                    )
+                all_violations, compliant_count = self._validate_incrementally(
+                    in_scope_resources, covered
+                )
+                rollup.add_all(self._filter_by_severity(all_violations, severity))
             else:
-                compliant_count += 1
+                for resource in in_scope_resources:
+                    violations = self._validate_resource(resource)
+                    if violations:
+                        all_violations.extend(violations)
+                        rollup.add_all(self._filter_by_severity(violations, severity))
+                    else:
+                        compliant_count += 1
 
         logger.info(
             f"Found {len(all_violations)} violations across {len(in_scope_resources)} resources"
         )
 
-        # Apply severity filter to violations
-        filtered_violations = self._filter_by_severity(all_violations, severity)
+        with span("aggregate"):
+            # Apply severity filter to violations
+            filtered_violations = self._filter_by_severity(all_violations, severity)
 
-        # Calculate compliance score (only in-scope resources count)
-        total_resources = len(in_scope_resources)
-        compliance_score = self._calculate_compliance_score(compliant_count, total_resources)
+            # Calculate compliance score (only in-scope resources count)
+            total_resources = len(in_scope_resources)
+            compliance_score = self._calculate_compliance_score(compliant_count, total_resources)
 
-        # Calculate cost attribution gap (sum of cost impacts from violations)
-        cost_attribution_gap = sum(v.cost_impact_monthly for v in all_violations)
+            # Calculate cost attribution gap (sum of cost impacts from violations)
+            cost_attribution_gap = sum(v.cost_impact_monthly for v in all_violations)
 
         return ComplianceResult(
             compliance_score=compliance_score,
@@ -357,6 +446,131 @@ class ComplianceService:
             compliant_resources=compliant_count,
             violations=filtered_violations,
             cost_attribution_gap=cost_attribution_gap,
+            incomplete_resource_types=incomplete_resource_types,
+            rollup=rollup,
+        )
+
+    def _validate_resource(self, resource: dict) -> list[Violation]:
+        return self.policy_service.validate_resource_tags(
+            resource_id=resource["resource_id"],
+            resource_type=resource["resource_type"],
+            region=resource["region"],
+            tags=resource["tags"],
+            cost_impact=resource.get("cost_impact", 0.0),
+        )
+
+    def _validate_incrementally(
+        self, resources: list[dict], covered: tuple[str, list[str]] | None = None
+    ) -> tuple[list[Violation], int]:
+        """
+        Validate only resources in digest leaves that changed since earlier scans.
+
+        Args:
+            resources: In-scope resources to validate
+            covered: (scan region, resource types) listed completely, if any
+
+        Returns:
+            Tuple of (all violations, compliant resource count)
+        """
+        groups = group_by_leaf(resources)
+        tree = TagDigestTree.from_groups(groups)
+        fingerprint = ValidationCache.policy_fingerprint(self.policy_service.get_policy())
+        reusable = self.validation_cache.reusable_leaves(tree, fingerprint)
+
+        all_violations: list[Violation] = []
+        compliant_count = 0
+        results = {}
+        revalidated = 0
+        for leaf, members in groups.items():
+            if leaf in reusable:
+                violations, compliant = self.validation_cache.get(leaf)
+            else:
+                violations, compliant = [], 0
+                for resource in members:
+                    found = self._validate_resource(resource)
+                    violations.extend(found)
+                    compliant += not found
+                revalidated += len(members)
+            results[leaf] = (violations, compliant)
+            all_violations.extend(violations)
+            compliant_count += compliant
+
+        self.validation_cache.update(tree, groups, results, covered)
+        logger.info(
+            f"Validated {revalidated} of {len(resources)} resources "
+            f"({len(groups) - len(reusable)} of {len(groups)} digest leaves changed)"
+        )
+        return all_violations, compliant_count
+
+    def _result_from_shards(
+        self, resource_types: list[str], severity: str
+    ) -> ComplianceResult | None:
+        """Build a result from the validation cache's shards, if they cover the request."""
+        fingerprint = ValidationCache.policy_fingerprint(self.policy_service.get_policy())
+        if not self.validation_cache.check_policy(fingerprint):
+            return None
+        totals = self.validation_cache.totals(
+            self.aws_client.region,
+            expand_all_to_supported_types(resource_types),
+            self.incremental_max_age,
+        )
+        if totals is None:
+            return None
+
+        all_violations, compliant_count, total_resources = totals
+        filtered_violations = self._filter_by_severity(all_violations, severity)
+        rollup = ComplianceRollup()
+        rollup.add_all(filtered_violations)
+        return ComplianceResult(
+            compliance_score=self._calculate_compliance_score(compliant_count, total_resources),
+            total_resources=total_resources,
+            compliant_resources=compliant_count,
+            violations=filtered_violations,
+            cost_attribution_gap=sum(v.cost_impact_monthly for v in all_violations),
+            rollup=rollup,
+        )
+
+    async def fetch_inventory(
+        self, resource_types: list[str], filters: dict | None = None
+    ) -> ResourceInventory:
+        """
+        Fetch raw resources without validating them against the policy.
+
+        Used by inventory exports and sampling. Free resources are excluded
+        and the region/account filters applied, as in compliance scans, but
+        resources with no policy rules are kept. Resource types that fail
+        to list are recorded in the result rather than raised.
+
+        Args:
+            resource_types: Resource types to fetch (["all"] expands to every supported type)
+            filters: Optional filters for region, account_id
+
+        Returns:
+            ResourceInventory keyed by this client's region, with the
+            resource types that failed to list
+        """
+        expanded_resource_types = expand_all_to_supported_types(resource_types)
+        results = await asyncio.gather(
+            *[self._fetch_resources_by_type(rt, filters) for rt in expanded_resource_types],
+            return_exceptions=True,
+        )
+
+        config = get_resource_type_config()
+        resources = []
+        failed_types = []
+        for resource_type, fetched in zip(expanded_resource_types, results, strict=True):
+            if isinstance(fetched, BaseException):
+                logger.error(f"Failed to fetch resources of type {resource_type}: {fetched}")
+                failed_types.append(resource_type)
+                continue
+            resources.extend(
+                r for r in fetched if not config.is_free_resource(r.get("resource_type", ""))
+            )
+
+        region = self.aws_client.region
+        return ResourceInventory(
+            resources_by_region={region: self._apply_resource_filters(resources, filters)},
+            failed_resource_types={region: failed_types} if failed_types else {},
         )
 
     def _apply_resource_filters(self, resources: list[dict], filters: dict | None) -> list[dict]:
@@ -11,12 +11,15 @@ from typing import TYPE_CHECKING
 
 from ..clients.aws_client import AWSClient
 from ..services.policy_service import PolicyService
+from ..utils.api_ledger import attribute_api_calls
+from ..utils.deadline import deadline_near, record_refused_call
 from ..utils.resource_type_config import get_unattributable_services
 from ..utils.resource_utils import (
     expand_all_to_supported_types,
     extract_account_from_arn,
     fetch_resources_by_type,
 )
+from ..utils.timing import span
 
 if TYPE_CHECKING:
     from .multi_region_scanner import MultiRegionScanner
@@ -198,6 +201,10 @@ class CostService:
         all_resources = []
 
         for resource_type in resource_types:
+            if deadline_near():
+                record_refused_call(f"cost scan of {resource_type}")
+                resources_by_type[resource_type] = []
+                continue
             try:
                 resources = await self._fetch_resources_by_type(resource_type, filters)
                 resources_by_type[resource_type] = resources
@@ -214,18 +221,20 @@ class CostService:
         # Get cost data
         if use_total_account_spend:
             # Use total account spend for "all" - captures ALL services
-            total_spend, service_breakdown = await self.aws_client.get_total_account_spend(
-                time_period=time_period
-            )
+            with span("cost_explorer"):
+                total_spend, service_breakdown = await self.aws_client.get_total_account_spend(
+                    time_period=time_period
+                )
             logger.info(
                 f"Total account spend: ${total_spend:.2f} across {len(service_breakdown)} services"
             )
             service_costs = service_breakdown
         else:
             # Get service-level costs only for specified types
-            _, service_costs, _, _ = await self.aws_client.get_cost_data_by_resource(
-                time_period=time_period
-            )
+            with span("cost_explorer"):
+                _, service_costs, _, _ = await self.aws_client.get_cost_data_by_resource(
+                    time_period=time_period
+                )
             # Calculate total spend only for tracked services
             total_spend = 0.0
             for resource_type in resource_types:
@@ -234,9 +243,10 @@ class CostService:
             logger.info(f"Total spend for tracked services: ${total_spend:.2f}")
 
         # Get per-resource costs where available (by Name tag)
-        resource_costs, _, costs_by_name, cost_source = (
-            await self.aws_client.get_cost_data_by_resource(time_period=time_period)
-        )
+        with span("cost_explorer"):
+            resource_costs, _, costs_by_name, cost_source = (
+                await self.aws_client.get_cost_data_by_resource(time_period=time_period)
+            )
 
         logger.info(f"Cost source: {cost_source}, costs by name: {len(costs_by_name)}")
 
@@ -493,16 +503,18 @@ class CostService:
         logger.info("Calculating cost attribution gap for ALL resources")
 
         # Get total account spend across ALL services
-        total_spend, service_breakdown = await self.aws_client.get_total_account_spend(
-            time_period=time_period
-        )
+        with span("cost_explorer"):
+            total_spend, service_breakdown = await self.aws_client.get_total_account_spend(
+                time_period=time_period
+            )
 
         logger.info(
             f"Total account spend: ${total_spend:.2f} across {len(service_breakdown)} services"
         )
 
         # Get all tagged resources using Resource Groups Tagging API
-        all_resources = await self.aws_client.get_all_tagged_resources()
+        with span("fetch"):
+            all_resources = await self.aws_client.get_all_tagged_resources()
 
         logger.info(f"Found {len(all_resources)} tagged resources via Resource Groups Tagging API")
 
@@ -515,9 +527,10 @@ class CostService:
             resources_by_type[rt].append(resource)
 
         # Get per-resource costs where available (by Name tag)
-        resource_costs, service_costs, costs_by_name, cost_source = (
-            await self.aws_client.get_cost_data_by_resource(time_period=time_period)
-        )
+        with span("cost_explorer"):
+            resource_costs, service_costs, costs_by_name, cost_source = (
+                await self.aws_client.get_cost_data_by_resource(time_period=time_period)
+            )
 
         # Build a case-insensitive lookup for costs_by_name
         costs_by_name_lower: dict[str, float] = {}
@@ -770,9 +783,10 @@ class CostService:
         logger.info(f"Total resources fetched: {len(all_resources)}")
 
         # Get cost data with per-resource granularity where available (by Name tag)
-        resource_costs, service_costs, costs_by_name, cost_source = (
-            await self.aws_client.get_cost_data_by_resource(time_period=time_period)
-        )
+        with span("cost_explorer"):
+            resource_costs, service_costs, costs_by_name, cost_source = (
+                await self.aws_client.get_cost_data_by_resource(time_period=time_period)
+            )
 
         logger.info(
             f"Cost source: {cost_source}, costs by name: {len(costs_by_name)}, service costs: {len(service_costs)}"
@@ -1029,15 +1043,16 @@ class CostService:
         Returns:
             List of resource dictionaries with tags
         """
-        # Use multi-region scanning when available and enabled
-        if (
-            self.multi_region_scanner is not None
-            and self.multi_region_scanner.multi_region_enabled
-        ):
-            return await self._fetch_resources_multi_region(resource_type, filters)
+        with attribute_api_calls(resource_type), span("fetch"):
+            # Use multi-region scanning when available and enabled
+            if (
+                self.multi_region_scanner is not None
+                and self.multi_region_scanner.multi_region_enabled
+            ):
+                return await self._fetch_resources_multi_region(resource_type, filters)
 
-        # Fall back to single-region
-        return await fetch_resources_by_type(self.aws_client, resource_type, filters)
+            # Fall back to single-region
+            return await fetch_resources_by_type(self.aws_client, resource_type, filters)
 
     async def _fetch_resources_multi_region(
         self, resource_type: str, filters: dict | None
@@ -1071,6 +1086,9 @@ class CostService:
 
         async def fetch_from_region(region: str) -> list[dict]:
             async with semaphore:
+                if deadline_near():
+                    record_refused_call(f"fetch {resource_type} from {region}")
+                    return []
                 try:
                     client = self.multi_region_scanner.client_factory.get_client(region)
                     resources = await fetch_resources_by_type(client, resource_type, {})
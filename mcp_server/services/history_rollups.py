@@ -0,0 +1,312 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Downsampled compliance time series.
+
+Every compliance snapshot is stored as raw points in compliance_points:
+one for the whole scan (dimension "all") and one per region, resource
+type and tag with violations. In the same transaction the points are
+folded into compliance_rollups, which holds per-day, per-week and
+per-month sums for each (dimension, key). A key missing from a snapshot
+had no violations in it, so series() reads its absent periods as zero.
+
+Raw points and the finer rollups are kept only as long as the retention
+policy says, so the store grows with the number of periods, not the
+number of scans. compliance_rollups is a WITHOUT ROWID table keyed by
+(granularity, dimension, key, period): every trend query is a range scan
+of its primary key, which holds all the columns it reads.
+
+All functions take an open connection; HistoryService owns the
+transactions.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+# Longest get_history window; rollups used by it must be kept this long
+MAX_DAYS_BACK = 90
+
+# Period start of a timestamp, per granularity (weeks start on Monday)
+_PERIODS = {
+    "day": "DATE({ts})",
+    "week": "DATE({ts}, 'weekday 0', '-6 days')",
+    "month": "DATE({ts}, 'start of month')",
+}
+
+_CREATE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS compliance_points (
+        scan_id INTEGER NOT NULL,
+        timestamp TEXT NOT NULL,
+        dimension TEXT NOT NULL,
+        key TEXT NOT NULL,
+        compliance_score REAL,
+        total_resources INTEGER,
+        compliant_resources INTEGER,
+        violation_count INTEGER NOT NULL,
+        non_compliant_resources INTEGER NOT NULL,
+        cost_gap REAL NOT NULL,
+        PRIMARY KEY (scan_id, dimension, key)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_points_timestamp
+    ON compliance_points(timestamp)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS compliance_rollups (
+        granularity TEXT NOT NULL,
+        dimension TEXT NOT NULL,
+        key TEXT NOT NULL,
+        period TEXT NOT NULL,
+        scans INTEGER NOT NULL,
+        score_sum REAL NOT NULL,
+        total_resources INTEGER NOT NULL,
+        compliant_resources INTEGER NOT NULL,
+        violation_count INTEGER NOT NULL,
+        non_compliant_resources INTEGER NOT NULL,
+        cost_gap REAL NOT NULL,
+        PRIMARY KEY (granularity, dimension, key, period)
+    ) WITHOUT ROWID
+    """,
+    # Retention deletes whole periods across every dimension
+    """
+    CREATE INDEX IF NOT EXISTS idx_rollups_period
+    ON compliance_rollups(granularity, period)
+    """,
+]
+
+_INSERT_POINT = """
+    INSERT INTO compliance_points (
+        scan_id, timestamp, dimension, key, compliance_score, total_resources,
+        compliant_resources, violation_count, non_compliant_resources, cost_gap
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Whole-scan points for scans stored before the series tables existed
+_BACKFILL_POINTS = """
+    INSERT OR IGNORE INTO compliance_points (
+        scan_id, timestamp, dimension, key, compliance_score, total_resources,
+        compliant_resources, violation_count, non_compliant_resources, cost_gap
+    )
+    SELECT id, timestamp, 'all', '', compliance_score, total_resources,
+           compliant_resources, violation_count, total_resources - compliant_resources, 0
+    FROM compliance_scans
+"""
+
+# Completed by _statements(). The SELECT keeps a WHERE clause so SQLite
+# doesn't read ON CONFLICT as part of a join.
+_UPDATE_ROLLUPS = """
+    INSERT INTO compliance_rollups (
+        granularity, dimension, key, period, scans, score_sum, total_resources,
+        compliant_resources, violation_count, non_compliant_resources, cost_gap
+    )
+    SELECT
+        '@GRANULARITY@', dimension, key, @PERIOD@ AS period, COUNT(*),
+        TOTAL(compliance_score), TOTAL(total_resources), TOTAL(compliant_resources),
+        SUM(violation_count), SUM(non_compliant_resources), TOTAL(cost_gap)
+    FROM compliance_points
+    WHERE @POINTS@
+    GROUP BY dimension, key, period
+    ON CONFLICT (granularity, dimension, key, period) DO UPDATE SET
+        scans = scans + excluded.scans,
+        score_sum = score_sum + excluded.score_sum,
+        total_resources = total_resources + excluded.total_resources,
+        compliant_resources = compliant_resources + excluded.compliant_resources,
+        violation_count = violation_count + excluded.violation_count,
+        non_compliant_resources = non_compliant_resources + excluded.non_compliant_resources,
+        cost_gap = cost_gap + excluded.cost_gap
+"""
+
+
+def _statements(points: str) -> list[str]:
+    """The rollup updates, one per granularity, for points matching a condition."""
+    return [
+        _UPDATE_ROLLUPS.replace("@GRANULARITY@", granularity)
+        .replace("@PERIOD@", period.format(ts="timestamp"))
+        .replace("@POINTS@", points)
+        for granularity, period in _PERIODS.items()
+    ]
+
+
+_SCAN_UPDATES = _statements("scan_id = ?")
+_FULL_UPDATES = _statements("1=1")
+
+
+@dataclass
+class HistoryRetention:
+    """
+    How long each resolution of the history is kept, in days.
+
+    None keeps that resolution forever. Day and week rollups back
+    get_history, so they must cover its longest window.
+    """
+
+    raw_days: int | None = 30
+    daily_days: int | None = 400
+    weekly_days: int | None = 1830
+    monthly_days: int | None = None
+
+    def __post_init__(self):
+        for name in ("daily_days", "weekly_days", "monthly_days"):
+            days = getattr(self, name)
+            if days is not None and days < MAX_DAYS_BACK:
+                raise ValueError(f"{name} must be at least {MAX_DAYS_BACK} days")
+        if self.raw_days is not None and self.raw_days < 1:
+            raise ValueError("raw_days must be at least 1 day")
+
+
+@dataclass
+class SeriesRow:
+    """Rollup sums for one (key, period), with the snapshot count of the period."""
+
+    key: str
+    period: str
+    scans: int
+    score_sum: float
+    total_resources: int
+    compliant_resources: int
+    violation_count: int
+    non_compliant_resources: int
+    cost_gap: float
+
+
+def create_tables(conn: sqlite3.Connection) -> bool:
+    """
+    Create the series tables.
+
+    Returns:
+        True if they didn't exist yet, so existing scans need rolling up
+    """
+    (existed,) = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'compliance_rollups'"
+    ).fetchone()
+    for statement in _CREATE_TABLES:
+        conn.execute(statement)
+    return not existed
+
+
+def rebuild(conn: sqlite3.Connection) -> None:
+    """Roll up every stored scan (for tables created on an existing database)."""
+    conn.execute(_BACKFILL_POINTS)
+    for statement in _FULL_UPDATES:
+        conn.execute(statement)
+
+
+def record(conn: sqlite3.Connection, scan_id: int, timestamp: str, points: list[tuple]) -> None:
+    """
+    Store the points of one snapshot and fold them into the rollups.
+
+    Args:
+        conn: Open connection, inside the transaction storing the scan
+        scan_id: compliance_scans ID of the snapshot
+        timestamp: Snapshot timestamp, as stored in compliance_scans
+        points: (dimension, key, compliance_score, total_resources,
+                compliant_resources, violation_count,
+                non_compliant_resources, cost_gap) tuples
+    """
+    conn.executemany(_INSERT_POINT, [(scan_id, timestamp, *point) for point in points])
+    for statement in _SCAN_UPDATES:
+        conn.execute(statement, (scan_id,))
+
+
+def timestamp_key(moment: datetime) -> str:
+    """Stored form of a timestamp: ISO 8601 in UTC (naive datetimes are UTC)."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=UTC)
+    return moment.astimezone(UTC).isoformat()
+
+
+def apply_retention(
+    conn: sqlite3.Connection, retention: HistoryRetention, now: datetime | None = None
+) -> None:
+    """Delete raw points and rollup periods older than the retention policy."""
+    now = now or datetime.now(UTC)
+    if retention.raw_days is not None:
+        cutoff = timestamp_key(now - timedelta(days=retention.raw_days))
+        conn.execute("DELETE FROM compliance_scans WHERE timestamp < ?", (cutoff,))
+        conn.execute("DELETE FROM compliance_points WHERE timestamp < ?", (cutoff,))
+    for granularity, days in (
+        ("day", retention.daily_days),
+        ("week", retention.weekly_days),
+        ("month", retention.monthly_days),
+    ):
+        if days is None:
+            continue
+        # Only periods that ended before the cutoff are dropped
+        conn.execute(
+            f"DELETE FROM compliance_rollups WHERE granularity = ? "
+            f"AND period < {_PERIODS[granularity].format(ts='?')}",
+            (granularity, timestamp_key(now - timedelta(days=days))),
+        )
+
+
+def series(
+    conn: sqlite3.Connection,
+    granularity: str,
+    dimension: str,
+    key: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> list[SeriesRow]:
+    """
+    Rollup rows of a dimension over a window, ordered by key then period.
+
+    Args:
+        conn: Open connection
+        granularity: "day", "week" or "month"
+        dimension: "all", "region", "resource_type" or "tag_name"
+        key: Only this dimension value; None for every value
+        since: Include the period containing this moment and later ones
+        until: Include the period containing this moment and earlier ones
+
+    Returns:
+        One SeriesRow per (key, period), for every period with snapshots
+        from the key's first rollup on. scans is the number of snapshots
+        in the period, so averages include snapshots where the key had no
+        violations, and a period where it had none at all reads as zero.
+    """
+    period = _PERIODS[granularity].format(ts="?")
+    key_clauses = ["granularity = ?", "dimension = ?"]
+    key_params: list = [granularity, dimension]
+    clauses = ["a.granularity = ?", "a.dimension = 'all'", "a.key = ''"]
+    params: list = [granularity]
+    if key is not None:
+        key_clauses.append("key = ?")
+        key_params.append(key)
+    if since is not None:
+        clauses.append(f"a.period >= {period}")
+        params.append(timestamp_key(since))
+    if until is not None:
+        key_clauses.append(f"period <= {period}")
+        key_params.append(timestamp_key(until))
+        clauses.append(f"a.period <= {period}")
+        params.append(timestamp_key(until))
+
+    # Points are only written for keys with violations, so a key's periods
+    # come from the overall series and missing rollups count as zero
+    rows = conn.execute(
+        f"""
+        WITH keys AS (
+            SELECT key, MIN(period) AS first_period
+            FROM compliance_rollups
+            WHERE {" AND ".join(key_clauses)}
+            GROUP BY key
+        )
+        SELECT k.key, a.period, a.scans,
+               COALESCE(r.score_sum, 0), COALESCE(r.total_resources, 0),
+               COALESCE(r.compliant_resources, 0), COALESCE(r.violation_count, 0),
+               COALESCE(r.non_compliant_resources, 0), COALESCE(r.cost_gap, 0)
+        FROM keys k
+        JOIN compliance_rollups a ON a.period >= k.first_period
+        LEFT JOIN compliance_rollups r
+            ON r.granularity = a.granularity AND r.dimension = ? AND r.key = k.key
+            AND r.period = a.period
+        WHERE {" AND ".join(clauses)}
+        ORDER BY k.key, a.period
+        """,
+        [*key_params, dimension, *params],
+    ).fetchall()
+    return [SeriesRow(*row) for row in rows]
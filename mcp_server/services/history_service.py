@@ -2,51 +2,64 @@
 # Licensed under the Apache License, Version 2.0.
 # See LICENSE file in the project root for full license information.
 
-"""Service for tracking compliance history over time."""
+"""Service for tracking compliance history over time.
+
+Database work runs on an SQLitePool (see clients/sqlite_pool.py), so
+storing a scan from the scheduler or querying history never blocks the
+event loop, and concurrent snapshot writes are committed together.
+
+Each snapshot is also recorded as a time series broken down by region,
+resource type and tag, and downsampled into day, week and month rollups
+(see history_rollups.py). History and trend queries read the rollups, so
+they cost the same whether a period holds one scan or thousands, and
+trends reach back as far as the monthly rollups are retained.
+"""
 
 import sqlite3
 from datetime import datetime, timedelta
 
+from ..clients.sqlite_pool import DEFAULT_READERS, SQLitePool
 from ..models import (
     ComplianceHistoryEntry,
     ComplianceHistoryResult,
     ComplianceResult,
+    ComplianceTrendPoint,
+    ComplianceTrendResult,
+    ComplianceTrendSeries,
     GroupBy,
+    HistoryDimension,
     TrendDirection,
 )
+from ..models.rollup import ComplianceRollup
+from . import history_rollups
+from .history_rollups import MAX_DAYS_BACK, HistoryRetention
 
 
 class HistoryService:
     """Service for storing and querying compliance history."""
 
-    def __init__(self, db_path: str = "compliance_history.db"):
+    def __init__(
+        self,
+        db_path: str = "compliance_history.db",
+        readers: int = DEFAULT_READERS,
+        retention: HistoryRetention | None = None,
+    ):
         """
         Initialize the history service.
 
         Args:
             db_path: Path to the SQLite database file
+            readers: Reader threads for history queries
+            retention: How long raw points and each rollup resolution
+                       are kept (defaults to HistoryRetention())
         """
         self.db_path = db_path
-        self._connection = None
-        self._init_database()
-
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get or create a database connection."""
-        if self.db_path == ":memory:":
-            # For in-memory databases, keep a persistent connection
-            if self._connection is None:
-                self._connection = sqlite3.connect(self.db_path)
-            return self._connection
-        else:
-            # For file-based databases, create a new connection each time
-            return sqlite3.connect(self.db_path)
+        self.retention = retention or HistoryRetention()
+        self._pool = SQLitePool(db_path, readers=readers, init=self._init_database)
 
-    def _init_database(self) -> None:
+    def _init_database(self, conn: sqlite3.Connection) -> None:
         """Initialize the SQLite database schema."""
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
+        conn.execute(
             """
             CREATE TABLE IF NOT EXISTS compliance_scans (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -61,45 +74,79 @@ class HistoryService:
         )
 
         # Create index on timestamp for faster queries
-        cursor.execute(
+        conn.execute(
             """
             CREATE INDEX IF NOT EXISTS idx_timestamp 
             ON compliance_scans(timestamp)
         """
         )
 
-        conn.commit()
-        if self.db_path != ":memory:":
-            conn.close()
+        if history_rollups.create_tables(conn):
+            history_rollups.rebuild(conn)
+        history_rollups.apply_retention(conn, self.retention)
 
     async def store_scan_result(self, result: ComplianceResult) -> None:
         """
         Store a compliance scan result in the database.
 
+        The scan's region, resource type and tag breakdowns are recorded
+        and rolled up in the same transaction.
+
         Args:
             result: The compliance scan result to store
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            INSERT INTO compliance_scans 
-            (timestamp, compliance_score, total_resources, compliant_resources, violation_count)
-            VALUES (?, ?, ?, ?, ?)
-        """,
+        timestamp = history_rollups.timestamp_key(result.scan_timestamp)
+        points = [
             (
-                result.scan_timestamp.isoformat(),
+                HistoryDimension.ALL.value,
+                "",
                 result.compliance_score,
                 result.total_resources,
                 result.compliant_resources,
                 len(result.violations),
-            ),
-        )
+                result.total_resources - result.compliant_resources,
+                result.cost_attribution_gap,
+            )
+        ]
+        rollup = ComplianceRollup.for_result(result)
+        for dimension in (
+            HistoryDimension.REGION,
+            HistoryDimension.RESOURCE_TYPE,
+            HistoryDimension.TAG,
+        ):
+            for cell in rollup.slice([dimension.value]):
+                points.append(
+                    (
+                        dimension.value,
+                        getattr(cell, dimension.value),
+                        None,
+                        None,
+                        None,
+                        cell.violation_count,
+                        cell.non_compliant_resources,
+                        cell.cost_gap,
+                    )
+                )
+
+        def store(conn: sqlite3.Connection) -> None:
+            cursor = conn.execute(
+                """
+                INSERT INTO compliance_scans 
+                (timestamp, compliance_score, total_resources, compliant_resources, violation_count)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                (
+                    timestamp,
+                    result.compliance_score,
+                    result.total_resources,
+                    result.compliant_resources,
+                    len(result.violations),
+                ),
+            )
+            history_rollups.record(conn, cursor.lastrowid, timestamp, points)
+            history_rollups.apply_retention(conn, self.retention)
 
-        conn.commit()
-        if self.db_path != ":memory:":
-            conn.close()
+        await self._pool.write(store)
 
     async def get_history(
         self, days_back: int = 30, group_by: GroupBy = GroupBy.DAY
@@ -115,72 +162,30 @@ class HistoryService:
             ComplianceHistoryResult with historical data and trend analysis
         """
         # Validate days_back
-        if days_back < 1 or days_back > 90:
+        if days_back < 1 or days_back > MAX_DAYS_BACK:
             raise ValueError("days_back must be between 1 and 90")
 
-        # Calculate the cutoff date
-        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
+        group_by = GroupBy(group_by)
 
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        # Query data based on grouping
-        if group_by == GroupBy.DAY:
-            query = """
-                SELECT 
-                    DATE(timestamp) as period,
-                    AVG(compliance_score) as avg_score,
-                    SUM(total_resources) as total_res,
-                    SUM(compliant_resources) as compliant_res,
-                    SUM(violation_count) as violations
-                FROM compliance_scans
-                WHERE timestamp >= ?
-                GROUP BY DATE(timestamp)
-                ORDER BY period ASC
-            """
-        elif group_by == GroupBy.WEEK:
-            query = """
-                SELECT 
-                    DATE(timestamp, 'weekday 0', '-6 days') as period,
-                    AVG(compliance_score) as avg_score,
-                    SUM(total_resources) as total_res,
-                    SUM(compliant_resources) as compliant_res,
-                    SUM(violation_count) as violations
-                FROM compliance_scans
-                WHERE timestamp >= ?
-                GROUP BY DATE(timestamp, 'weekday 0', '-6 days')
-                ORDER BY period ASC
-            """
-        else:  # MONTH
-            query = """
-                SELECT 
-                    DATE(timestamp, 'start of month') as period,
-                    AVG(compliance_score) as avg_score,
-                    SUM(total_resources) as total_res,
-                    SUM(compliant_resources) as compliant_res,
-                    SUM(violation_count) as violations
-                FROM compliance_scans
-                WHERE timestamp >= ?
-                GROUP BY DATE(timestamp, 'start of month')
-                ORDER BY period ASC
-            """
+        # Calculate the cutoff date; the period containing it is included whole
+        cutoff_date = datetime.utcnow() - timedelta(days=days_back)
 
-        cursor.execute(query, (cutoff_date.isoformat(),))
-        rows = cursor.fetchall()
-        if self.db_path != ":memory:":
-            conn.close()
+        rows = await self._pool.read(
+            lambda conn: history_rollups.series(
+                conn, group_by.value, HistoryDimension.ALL.value, "", since=cutoff_date
+            )
+        )
 
-        # Convert rows to history entries
+        # Convert rollup rows to history entries
         history: list[ComplianceHistoryEntry] = []
         for row in rows:
-            period_str, avg_score, total_res, compliant_res, violations = row
             history.append(
                 ComplianceHistoryEntry(
-                    timestamp=datetime.fromisoformat(period_str),
-                    compliance_score=avg_score,
-                    total_resources=int(total_res),
-                    compliant_resources=int(compliant_res),
-                    violation_count=int(violations),
+                    timestamp=datetime.fromisoformat(row.period),
+                    compliance_score=min(row.score_sum / row.scans, 1.0),
+                    total_resources=int(row.total_resources),
+                    compliant_resources=int(row.compliant_resources),
+                    violation_count=int(row.violation_count),
                 )
             )
 
@@ -216,8 +221,79 @@ class HistoryService:
             days_back=days_back,
         )
 
+    async def get_trend(
+        self,
+        dimension: HistoryDimension = HistoryDimension.ALL,
+        key: str | None = None,
+        group_by: GroupBy = GroupBy.MONTH,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> ComplianceTrendResult:
+        """
+        Query a long-range compliance time series.
+
+        Unlike get_history, the window isn't capped: it reaches back as far
+        as the rollups for group_by are retained (monthly rollups are kept
+        forever by default).
+
+        Args:
+            dimension: Breakdown to return (overall, region, resource type or tag)
+            key: Only this region, resource type or tag; None for all of them
+            group_by: Period of each point (day, week, month)
+            since: Start of the window; None for all retained history
+            until: End of the window; None for now
+
+        Returns:
+            ComplianceTrendResult with one series per dimension value
+        """
+        dimension = HistoryDimension(dimension)
+        group_by = GroupBy(group_by)
+        rows = await self._pool.read(
+            lambda conn: history_rollups.series(
+                conn,
+                group_by.value,
+                dimension.value,
+                "" if dimension == HistoryDimension.ALL else key,
+                since=since,
+                until=until,
+            )
+        )
+
+        series: list[ComplianceTrendSeries] = []
+        for row in rows:
+            if not series or series[-1].key != row.key:
+                series.append(
+                    ComplianceTrendSeries(
+                        key=row.key, points=[], trend_direction=TrendDirection.STABLE
+                    )
+                )
+            overall = dimension == HistoryDimension.ALL
+            series[-1].points.append(
+                ComplianceTrendPoint(
+                    period=datetime.fromisoformat(row.period),
+                    scans=row.scans,
+                    compliance_score=min(row.score_sum / row.scans, 1.0) if overall else None,
+                    total_resources=row.total_resources / row.scans if overall else None,
+                    non_compliant_resources=row.non_compliant_resources / row.scans,
+                    violation_count=row.violation_count / row.scans,
+                    cost_gap=row.cost_gap / row.scans,
+                )
+            )
+
+        for entry in series:
+            first, last = entry.points[0], entry.points[-1]
+            if dimension == HistoryDimension.ALL:
+                change = last.compliance_score - first.compliance_score
+            else:
+                # Fewer non-compliant resources is an improvement
+                change = first.non_compliant_resources - last.non_compliant_resources
+            if change > 0:
+                entry.trend_direction = TrendDirection.IMPROVING
+            elif change < 0:
+                entry.trend_direction = TrendDirection.DECLINING
+
+        return ComplianceTrendResult(dimension=dimension, group_by=group_by, series=series)
+
     def close(self) -> None:
-        """Close any open database connections."""
-        if self._connection is not None:
-            self._connection.close()
-            self._connection = None
+        """Commit pending writes and close the database connections."""
+        self._pool.close()
@@ -0,0 +1,230 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Event-driven incremental rescans.
+
+Instead of listing every resource again, tag change events parsed from
+CloudTrail (see utils/cloudtrail_events.py) are applied to what the last
+full scan left behind:
+
+- the cached inventory in TagStateService, patched per resource (deleted
+  resources get a tombstone row),
+- the validation shards in ValidationCache, where each changed resource
+  is validated again and only its leaf digest and that leaf's ancestors
+  are recomputed.
+
+Tag and untag events only carry the keys they change, so they can only be
+applied to resources whose full tag set is already known. Any other
+resource is reported as unresolved and its (region, type) shards are
+marked stale, so the next request for that type lists it again.
+
+Cached Redis compliance results are keyed by request rather than by
+resource and can't be patched, so they are invalidated whenever an event
+batch changes something.
+"""
+
+import asyncio
+import logging
+from itertools import groupby
+
+from ..models.tag_events import IncrementalScanResult, TagChangeEvent
+from ..utils.cloudtrail_events import parse_payload
+from ..utils.resource_type_config import get_resource_type_config
+from ..utils.tag_digest import tag_set_hash
+from .policy_service import PolicyService
+from .tag_event_source import TagEventSource
+from .tag_state_service import TagStateService
+from .validation_cache import ValidationCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_EVENTS = 1000
+
+
+class IncrementalScanService:
+    """Applies tag change events to the cached inventory and validation shards."""
+
+    def __init__(
+        self,
+        tag_state_service: TagStateService,
+        policy_service: PolicyService,
+        validation_cache: ValidationCache,
+        compliance_service=None,
+    ):
+        """
+        Args:
+            tag_state_service: Cached per-resource tag state
+            policy_service: Policy service used to validate changed resources
+            validation_cache: Validation shards to patch
+            compliance_service: Optional ComplianceService whose cached
+                                results are invalidated after a change
+        """
+        self.tag_state_service = tag_state_service
+        self.policy_service = policy_service
+        self.validation_cache = validation_cache
+        self.compliance_service = compliance_service
+
+    async def consume(
+        self, source: TagEventSource, max_events: int = DEFAULT_MAX_EVENTS
+    ) -> IncrementalScanResult:
+        """
+        Read messages from a source, apply their events, then acknowledge them.
+
+        Args:
+            source: Where to read events from
+            max_events: Stop receiving once this many events have been read
+
+        Returns:
+            IncrementalScanResult for the applied batch
+        """
+        messages = []
+        seen: set[str] = set()
+        events: list[TagChangeEvent] = []
+        unparsed = 0
+        while len(events) < max_events:
+            batch = await asyncio.to_thread(source.receive, max_events - len(events))
+            # A directory hands out the same files until they are acked, so
+            # stop once a receive brings nothing new
+            batch = [m for m in batch if m.receipt not in seen]
+            if not batch:
+                break
+            for message in batch:
+                seen.add(message.receipt)
+                try:
+                    events.extend(parse_payload(message.body))
+                except ValueError as e:
+                    logger.warning(f"Skipping unparseable event message {message.receipt}: {e}")
+                    unparsed += 1
+            messages.extend(batch)
+
+        result = await self.apply_events(events)
+        result.events_ignored += unparsed
+        await asyncio.to_thread(source.ack, messages)
+        return result
+
+    async def apply_events(self, events: list[TagChangeEvent]) -> IncrementalScanResult:
+        """
+        Apply tag change events in event time order.
+
+        Args:
+            events: Parsed tag change events
+
+        Returns:
+            IncrementalScanResult with the recomputed aggregate of every
+            (region, resource type) shard touched
+        """
+        result = IncrementalScanResult(events_received=len(events))
+        config = get_resource_type_config()
+
+        in_scope = []
+        for event in events:
+            if config.is_free_resource(event.resource_type) or not (
+                self.policy_service.get_required_tags(event.resource_type)
+            ):
+                result.events_ignored += 1
+            else:
+                in_scope.append(event)
+        if not in_scope:
+            return result
+
+        by_arn = {
+            arn: sorted(arn_events, key=lambda e: e.event_time)
+            for arn, arn_events in groupby(
+                sorted(in_scope, key=lambda e: e.resource_arn), key=lambda e: e.resource_arn
+            )
+        }
+        known = await self.tag_state_service.current_state(list(by_arn))
+
+        changes = []
+        affected: set[tuple[str, str]] = set()
+        for arn, arn_events in by_arn.items():
+            last = arn_events[-1]
+            prior = known.get(arn)
+            tags = dict(prior[0]) if prior else None
+            applied = 0
+            for event in arn_events:
+                if event.action in ("create", "replace"):
+                    tags = dict(event.tags)
+                elif event.action == "delete":
+                    tags = None
+                elif tags is None:
+                    # Tag/untag of a resource the inventory hasn't seen:
+                    # its other tags are unknown
+                    continue
+                elif event.action == "tag":
+                    tags.update(event.tags)
+                else:
+                    for key in event.removed_keys:
+                        tags.pop(key, None)
+                applied += 1
+
+            result.events_applied += applied
+            result.events_ignored += len(arn_events) - applied
+            if applied == 0:
+                result.unresolved_resources.append(arn)
+                self.validation_cache.invalidate(last.region, last.resource_type)
+                continue
+            if tags == (prior[0] if prior else None):
+                continue
+
+            if tags is None:
+                result.resources_deleted += 1
+            elif prior is None:
+                result.resources_created += 1
+            else:
+                result.resources_updated += 1
+            changes.append((arn, tags, last.resource_type, last.region))
+            affected.add((last.region, last.resource_type))
+            await self._patch_shard(last, tags)
+
+        if changes:
+            await self.tag_state_service.patch_state(changes)
+            await self._invalidate_results()
+
+        result.affected_shards = [
+            self.validation_cache.summarize(region, resource_type)
+            for region, resource_type in sorted(affected)
+        ]
+        logger.info(
+            f"Applied {result.events_applied} tag change events: "
+            f"{result.resources_updated} updated, {result.resources_created} created, "
+            f"{result.resources_deleted} deleted, "
+            f"{len(result.unresolved_resources)} unresolved"
+        )
+        return result
+
+    async def _patch_shard(self, event: TagChangeEvent, tags: dict[str, str] | None) -> None:
+        """Validate one resource again, keeping its cost impact, and replace it in its shard."""
+        fingerprint = ValidationCache.policy_fingerprint(self.policy_service.get_policy())
+        self.validation_cache.check_policy(fingerprint)
+
+        cost_impact = self.validation_cache.cost_impact(
+            event.resource_arn, event.region, event.resource_type
+        )
+        violations = []
+        if tags is not None:
+            violations = self.policy_service.validate_resource_tags(
+                resource_id=event.resource_id,
+                resource_type=event.resource_type,
+                region=event.region,
+                tags=tags,
+                cost_impact=cost_impact,
+            )
+        self.validation_cache.patch(
+            event.resource_arn,
+            event.resource_id,
+            event.resource_type,
+            event.region,
+            tag_set_hash(tags) if tags is not None else None,
+            violations,
+            cost_impact,
+        )
+
+    async def _invalidate_results(self) -> None:
+        if self.compliance_service is None or self.compliance_service.cache is None:
+            return
+        try:
+            await self.compliance_service.invalidate_cache()
+        except Exception as e:
+            logger.warning(f"Failed to invalidate cached compliance results: {e}")
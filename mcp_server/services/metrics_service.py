@@ -8,21 +8,27 @@ This service aggregates tool usage, execution times, error rates, and other
 metrics from various sources (audit logs, budget tracker, loop detector) to
 provide comprehensive observability data for monitoring agent behavior.
 
+Tool usage, error, stage timing and AWS API call metrics are read from
+the per-tool, per-minute rollups the audit store keeps up to date on every write, so
+they are exact over any window however many invocations it covers.
+
 Requirements: 15.2
 """
 
 import logging
-from collections import defaultdict
 from datetime import datetime, timezone
 
+from ..clients.executors import get_executor_stats
 from ..utils.budget_tracker import BudgetTracker, get_budget_tracker
-from ..models.audit import AuditStatus
 from ..models.observability import (
+    AwsApiCallStats,
     BudgetUtilizationMetrics,
     ErrorRateMetrics,
+    ExecutorPoolMetrics,
     GlobalMetrics,
     LoopDetectionMetrics,
     SessionMetrics,
+    StageTimingStats,
     ToolUsageStats,
 )
 from ..services.audit_service import AuditService
@@ -67,161 +73,193 @@ class MetricsService:
         logger.info("MetricsService initialized")
 
     async def get_tool_usage_stats(
-        self, tool_name: str | None = None, limit: int = 1000
+        self,
+        tool_name: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
     ) -> list[ToolUsageStats]:
         """
         Get usage statistics for tools.
 
         Args:
             tool_name: Optional filter for specific tool
-            limit: Maximum number of audit logs to analyze
+            since: Start of the window to report on; None for all history
+            until: End of the window to report on; None for now
 
         Returns:
             List of tool usage statistics
         """
-        # Retrieve audit logs
-        logs = self._audit_service.get_logs(tool_name=tool_name, limit=limit)
-
-        # Aggregate by tool name
-        tool_data: dict[str, dict] = defaultdict(
-            lambda: {
-                "invocation_count": 0,
-                "success_count": 0,
-                "failure_count": 0,
-                "execution_times": [],
-                "last_invoked_at": None,
-                "last_error": None,
-            }
+        # Per-minute rollups are summed in SQL, however many calls they cover
+        rollups = await self._audit_service.get_tool_rollups(
+            since=since, until=until, tool_name=tool_name
         )
 
-        for log in logs:
-            data = tool_data[log.tool_name]
-            data["invocation_count"] += 1
-
-            if log.status == AuditStatus.SUCCESS:
-                data["success_count"] += 1
-            else:
-                data["failure_count"] += 1
-                data["last_error"] = log.error_message
-
-            if log.execution_time_ms is not None:
-                data["execution_times"].append(log.execution_time_ms)
-
-            # Track most recent invocation
-            if data["last_invoked_at"] is None or log.timestamp > data["last_invoked_at"]:
-                data["last_invoked_at"] = log.timestamp
-
-        # Convert to ToolUsageStats objects
         stats = []
-        for tool_name, data in tool_data.items():
-            execution_times = data["execution_times"]
-            total_execution_time = sum(execution_times) if execution_times else 0.0
-            avg_execution_time = (
-                total_execution_time / len(execution_times) if execution_times else 0.0
+        for rollup in rollups:
+            average_execution_time = (
+                rollup.latency_sum_ms / rollup.timed if rollup.timed else 0.0
             )
-            min_execution_time = min(execution_times) if execution_times else None
-            max_execution_time = max(execution_times) if execution_times else None
-
-            invocation_count = data["invocation_count"]
-            failure_count = data["failure_count"]
-            error_rate = failure_count / invocation_count if invocation_count > 0 else 0.0
+            error_rate = rollup.failures / rollup.invocations if rollup.invocations > 0 else 0.0
 
             stats.append(
                 ToolUsageStats(
-                    tool_name=tool_name,
-                    invocation_count=invocation_count,
-                    success_count=data["success_count"],
-                    failure_count=failure_count,
-                    total_execution_time_ms=total_execution_time,
-                    average_execution_time_ms=avg_execution_time,
-                    min_execution_time_ms=min_execution_time,
-                    max_execution_time_ms=max_execution_time,
+                    tool_name=rollup.tool_name,
+                    invocation_count=rollup.invocations,
+                    success_count=rollup.invocations - rollup.failures,
+                    failure_count=rollup.failures,
+                    total_execution_time_ms=rollup.latency_sum_ms,
+                    average_execution_time_ms=average_execution_time,
+                    min_execution_time_ms=rollup.latency_min_ms,
+                    max_execution_time_ms=rollup.latency_max_ms,
+                    p95_execution_time_ms=rollup.latency_percentile(0.95),
+                    latency_histogram=rollup.latency_histogram,
                     error_rate=error_rate,
-                    last_invoked_at=data["last_invoked_at"],
-                    last_error=data["last_error"],
+                    last_invoked_at=rollup.last_invoked_at,
+                    last_error=rollup.last_error,
                 )
             )
 
-        # Sort by invocation count descending
-        stats.sort(key=lambda s: s.invocation_count, reverse=True)
-
+        # Rollups come sorted by invocation count descending
         return stats
 
-    async def get_error_rate_metrics(self, limit: int = 1000) -> ErrorRateMetrics:
+    async def get_stage_timing_stats(
+        self,
+        tool_name: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[StageTimingStats]:
+        """
+        Get where tool time goes, per stage of their requests.
+
+        Args:
+            tool_name: Optional filter for specific tool
+            since: Start of the window to report on; None for all history
+            until: End of the window to report on; None for now
+
+        Returns:
+            One entry per (tool, stage), most total time first
+        """
+        return [
+            StageTimingStats(
+                tool_name=rollup.tool_name,
+                stage=rollup.stage,
+                invocation_count=rollup.invocations,
+                span_count=rollup.spans,
+                total_time_ms=rollup.total_ms,
+                average_time_per_invocation_ms=rollup.total_ms / rollup.invocations,
+                max_span_ms=rollup.max_ms,
+            )
+            for rollup in await self._audit_service.get_stage_rollups(
+                since=since, until=until, tool_name=tool_name
+            )
+        ]
+
+    async def get_api_call_stats(
+        self,
+        tool_name: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> list[AwsApiCallStats]:
+        """
+        Get the AWS API calls tools make, per operation and resource type.
+
+        Args:
+            tool_name: Optional filter for specific tool
+            since: Start of the window to report on; None for all history
+            until: End of the window to report on; None for now
+
+        Returns:
+            One entry per (tool, service, operation, resource type), most calls first
+        """
+        return [
+            AwsApiCallStats(
+                tool_name=rollup.tool_name,
+                service=rollup.service,
+                operation=rollup.operation,
+                resource_type=rollup.resource_type or None,
+                invocation_count=rollup.invocations,
+                call_count=rollup.calls,
+                page_count=rollup.pages,
+                retry_count=rollup.retries,
+                throttle_count=rollup.throttles,
+                error_count=rollup.errors,
+                calls_per_invocation=rollup.calls / rollup.invocations,
+                average_latency_ms=rollup.latency_sum_ms / rollup.calls,
+                max_latency_ms=rollup.latency_max_ms,
+                total_bytes=rollup.bytes,
+                estimated_cost_usd=rollup.estimated_cost_usd,
+            )
+            for rollup in await self._audit_service.get_api_call_rollups(
+                since=since, until=until, tool_name=tool_name
+            )
+        ]
+
+    async def get_error_rate_metrics(
+        self, since: datetime | None = None, until: datetime | None = None
+    ) -> ErrorRateMetrics:
         """
         Get error rate metrics across all tools.
 
         Args:
-            limit: Maximum number of audit logs to analyze
+            since: Start of the window to report on; None for all history
+            until: End of the window to report on; None for now
 
         Returns:
             Error rate metrics
         """
-        # Retrieve all audit logs
-        logs = self._audit_service.get_logs(limit=limit)
+        minutes = await self._audit_service.get_minute_totals(since=since, until=until)
 
-        total_invocations = len(logs)
-        total_errors = sum(1 for log in logs if log.status == AuditStatus.FAILURE)
+        total_invocations = sum(invocations for _, invocations, _ in minutes)
+        total_errors = sum(failures for _, _, failures in minutes)
         overall_error_rate = total_errors / total_invocations if total_invocations > 0 else 0.0
 
-        # Count errors by type (using error message prefix as type)
-        errors_by_type: dict[str, int] = defaultdict(int)
-        errors_by_tool: dict[str, int] = defaultdict(int)
-        recent_errors = []
-
-        for log in logs:
-            if log.status == AuditStatus.FAILURE:
-                # Extract error type from error message
-                error_type = "unknown"
-                if log.error_message:
-                    # Use first word of error message as type
-                    error_type = log.error_message.split(":")[0].split()[0]
-
-                errors_by_type[error_type] += 1
-                errors_by_tool[log.tool_name] += 1
-
-                # Keep recent errors (last 10)
-                if len(recent_errors) < 10:
-                    recent_errors.append(
-                        {
-                            "timestamp": log.timestamp.isoformat(),
-                            "tool_name": log.tool_name,
-                            "error_message": log.error_message,
-                            "correlation_id": log.correlation_id,
-                        }
-                    )
-
-        # Calculate error trend (simple: compare first half vs second half)
-        if total_invocations >= 10:
-            mid_point = total_invocations // 2
-            first_half_errors = sum(
-                1 for log in logs[:mid_point] if log.status == AuditStatus.FAILURE
-            )
-            second_half_errors = sum(
-                1 for log in logs[mid_point:] if log.status == AuditStatus.FAILURE
-            )
-            first_half_rate = first_half_errors / mid_point if mid_point > 0 else 0.0
-            second_half_rate = (
-                second_half_errors / (total_invocations - mid_point)
-                if (total_invocations - mid_point) > 0
-                else 0.0
+        errors_by_tool = {
+            rollup.tool_name: rollup.failures
+            for rollup in await self._audit_service.get_tool_rollups(since=since, until=until)
+            if rollup.failures
+        }
+        errors_by_type = await self._audit_service.get_error_type_counts(since=since, until=until)
+
+        # Keep recent errors (last 10)
+        recent_errors = [
+            {
+                "timestamp": log.timestamp.isoformat(),
+                "tool_name": log.tool_name,
+                "error_message": log.error_message,
+                "correlation_id": log.correlation_id,
+            }
+            for log in await self._audit_service.get_recent_failures(
+                limit=10, since=since, until=until
             )
+        ]
 
-            if second_half_rate < first_half_rate * 0.9:
-                error_trend = "improving"
-            elif second_half_rate > first_half_rate * 1.1:
-                error_trend = "declining"
-            else:
-                error_trend = "stable"
-        else:
-            error_trend = "stable"
+        # Calculate error trend: compare the error rate of the older half of
+        # the invocations with the newer half, split on a minute boundary
+        error_trend = "stable"
+        if total_invocations >= 10:
+            first_half = [0, 0]
+            second_half = [0, 0]
+            seen = 0
+            for _, invocations, failures in minutes:
+                half = first_half if seen < total_invocations / 2 else second_half
+                half[0] += invocations
+                half[1] += failures
+                seen += invocations
+
+            if first_half[0] and second_half[0]:
+                first_half_rate = first_half[1] / first_half[0]
+                second_half_rate = second_half[1] / second_half[0]
+                if second_half_rate < first_half_rate * 0.9:
+                    error_trend = "improving"
+                elif second_half_rate > first_half_rate * 1.1:
+                    error_trend = "declining"
 
         return ErrorRateMetrics(
             total_invocations=total_invocations,
             total_errors=total_errors,
             overall_error_rate=overall_error_rate,
-            errors_by_type=dict(errors_by_type),
-            errors_by_tool=dict(errors_by_tool),
+            errors_by_type=errors_by_type,
+            errors_by_tool=errors_by_tool,
             recent_errors=recent_errors,
             error_trend=error_trend,
         )
@@ -321,10 +359,10 @@ class MetricsService:
         Returns:
             Session metrics
         """
-        # Get audit logs for this session (using correlation_id as session_id)
-        logs = self._audit_service.get_logs(correlation_id=session_id, limit=1000)
+        # Aggregate this session's audit entries (correlation_id as session_id)
+        summary = await self._audit_service.get_session_summary(session_id)
 
-        if not logs:
+        if summary is None:
             # No logs for this session, return empty metrics
             return SessionMetrics(
                 session_id=session_id,
@@ -332,24 +370,16 @@ class MetricsService:
                 last_activity_at=datetime.now(timezone.utc),
             )
 
-        # Calculate metrics from logs
-        tool_invocation_count = len(logs)
-        tool_success_count = sum(1 for log in logs if log.status == AuditStatus.SUCCESS)
-        tool_failure_count = sum(1 for log in logs if log.status == AuditStatus.FAILURE)
-
-        execution_times = [
-            log.execution_time_ms for log in logs if log.execution_time_ms is not None
-        ]
-        total_execution_time_ms = sum(execution_times) if execution_times else 0.0
+        tool_invocation_count = summary["invocations"]
+        tool_success_count = summary["successes"]
+        tool_failure_count = summary["failures"]
+        total_execution_time_ms = summary["total_execution_time_ms"]
         average_execution_time_ms = (
-            total_execution_time_ms / len(execution_times) if execution_times else 0.0
+            total_execution_time_ms / summary["timed"] if summary["timed"] else 0.0
         )
-
-        tools_used = list(set(log.tool_name for log in logs))
-
-        # Get timestamps
-        created_at = min(log.timestamp for log in logs)
-        last_activity_at = max(log.timestamp for log in logs)
+        tools_used = summary["tools_used"]
+        created_at = summary["first_seen"]
+        last_activity_at = summary["last_seen"]
 
         # Get budget status
         budget_status = await self.get_budget_utilization_metrics(session_id)
@@ -373,12 +403,35 @@ class MetricsService:
             is_active=True,  # Would need additional logic to determine if session is still active
         )
 
-    async def get_global_metrics(self, limit: int = 1000) -> GlobalMetrics:
+    def get_executor_pool_metrics(self) -> list[ExecutorPoolMetrics]:
+        """
+        Get queue depth and wait-time metrics for the AWS call thread pools.
+
+        Returns:
+            One entry per workload class (inventory, tagging, cost_explorer)
+        """
+        return [
+            ExecutorPoolMetrics(
+                workload=stats.workload,
+                max_workers=stats.max_workers,
+                submitted=stats.submitted,
+                completed=stats.completed,
+                active=stats.active,
+                queue_depth=stats.queue_depth,
+                max_queue_depth=stats.max_queue_depth,
+                average_wait_ms=stats.average_wait_ms,
+                max_wait_ms=stats.max_wait_ms,
+                utilization=min(1.0, stats.active / stats.max_workers),
+            )
+            for stats in get_executor_stats()
+        ]
+
+    async def get_global_metrics(self, since: datetime | None = None) -> GlobalMetrics:
         """
         Get global metrics aggregated across all sessions.
 
         Args:
-            limit: Maximum number of audit logs to analyze
+            since: Start of the window to report on; None for all history
 
         Returns:
             Global metrics
@@ -386,37 +439,31 @@ class MetricsService:
         current_time = datetime.now(timezone.utc)
         uptime_seconds = (current_time - self._server_start_time).total_seconds()
 
-        # Get all audit logs
-        logs = self._audit_service.get_logs(limit=limit)
+        # Get tool usage stats
+        tool_stats = await self.get_tool_usage_stats(since=since)
 
         # Calculate global statistics
-        total_tool_invocations = len(logs)
-        total_tool_successes = sum(1 for log in logs if log.status == AuditStatus.SUCCESS)
-        total_tool_failures = sum(1 for log in logs if log.status == AuditStatus.FAILURE)
+        total_tool_invocations = sum(t.invocation_count for t in tool_stats)
+        total_tool_successes = sum(t.success_count for t in tool_stats)
+        total_tool_failures = sum(t.failure_count for t in tool_stats)
         overall_error_rate = (
             total_tool_failures / total_tool_invocations if total_tool_invocations > 0 else 0.0
         )
 
-        execution_times = [
-            log.execution_time_ms for log in logs if log.execution_time_ms is not None
-        ]
-        total_execution_time_ms = sum(execution_times) if execution_times else 0.0
+        total_execution_time_ms = sum(t.total_execution_time_ms for t in tool_stats)
+        timed_invocations = sum(sum(t.latency_histogram.values()) for t in tool_stats)
         average_execution_time_ms = (
-            total_execution_time_ms / len(execution_times) if execution_times else 0.0
+            total_execution_time_ms / timed_invocations if timed_invocations else 0.0
         )
 
         # Count unique sessions (using correlation_id as session_id)
-        unique_sessions = set(log.correlation_id for log in logs if log.correlation_id)
-        total_sessions = len(unique_sessions)
+        total_sessions = await self._audit_service.get_session_count(since=since)
 
         # Get active sessions from budget tracker
         active_sessions = 0
         if self._budget_tracker:
             active_sessions = await self._budget_tracker.get_active_session_count()
 
-        # Get tool usage stats
-        tool_stats = await self.get_tool_usage_stats(limit=limit)
-
         # Find most and least used tools
         most_used_tool = None
         least_used_tool = None
@@ -425,7 +472,7 @@ class MetricsService:
             least_used_tool = tool_stats[-1].tool_name
 
         # Get error metrics
-        error_metrics = await self.get_error_rate_metrics(limit=limit)
+        error_metrics = await self.get_error_rate_metrics(since=since)
 
         # Get budget metrics
         budget_metrics = await self.get_budget_utilization_metrics()
@@ -449,6 +496,9 @@ class MetricsService:
             error_metrics=error_metrics,
             budget_metrics=budget_metrics,
             loop_detection_metrics=loop_detection_metrics,
+            executor_pools=self.get_executor_pool_metrics(),
+            stage_stats=await self.get_stage_timing_stats(since=since),
+            api_call_stats=await self.get_api_call_stats(since=since),
             most_used_tool=most_used_tool,
             least_used_tool=least_used_tool,
         )
@@ -13,12 +13,15 @@ Requirements: 3.1, 3.2, 3.3, 3.4, 3.5, 4.1, 4.2, 4.3, 4.4, 4.5, 5.1, 5.2, 5.3
 
 import asyncio
 import logging
+import math
 import random
 import time
+from collections.abc import Awaitable
 from typing import Callable
 
 from ..clients.aws_client import AWSClient
 from ..clients.regional_client_factory import RegionalClientFactory
+from ..models.inventory import ResourceInventory
 from ..models.multi_region import (
     GLOBAL_RESOURCE_TYPES,
     MultiRegionComplianceResult,
@@ -26,10 +29,14 @@ from ..models.multi_region import (
     RegionalSummary,
     RegionScanMetadata,
 )
+from ..models.rollup import ComplianceRollup
+from ..models.scan_job import ScanProgress
 from ..models.violations import Violation
+from ..utils.deadline import deadline_near, record_refused_call, remaining_seconds
 from ..utils.resource_utils import expand_all_to_supported_types
+from ..utils.timing import span
 from .compliance_service import ComplianceService
-from .region_discovery_service import RegionDiscoveryService
+from .region_discovery_service import RegionDiscoveryResult, RegionDiscoveryService
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +62,9 @@ TRANSIENT_ERROR_CODES = frozenset([
     "InternalServiceError",
 ])
 
+# Called with running totals each time a region scan finishes
+ProgressCallback = Callable[[ScanProgress], Awaitable[None]]
+
 
 class MultiRegionScanError(Exception):
     """Error during multi-region scanning.
@@ -110,6 +120,37 @@ class InvalidRegionFilterError(Exception):
         self.enabled_regions = enabled_regions
 
 
+class _ScanProgressTracker:
+    """Accumulates per-region results and reports them to a ProgressCallback."""
+
+    def __init__(self, callback: ProgressCallback, total_region_scans: int):
+        self._callback = callback
+        self._started = time.monotonic()
+        self.progress = ScanProgress(total_region_scans=total_region_scans)
+
+    async def report(self) -> None:
+        """Send the current totals to the callback. Callback errors are logged."""
+        self.progress.elapsed_seconds = round(time.monotonic() - self._started, 2)
+        try:
+            await self._callback(self.progress.model_copy(deep=True))
+        except Exception as e:
+            logger.warning(f"Scan progress callback failed: {e}")
+
+    async def record(self, result: RegionalScanResult) -> None:
+        """Add a finished region scan to the totals and report them."""
+        progress = self.progress
+        progress.completed_region_scans += 1
+        if result.region not in progress.completed_regions:
+            progress.completed_regions.append(result.region)
+        if result.success:
+            progress.resources_scanned += result.compliant_count + result.non_compliant_count
+            progress.compliant_resources += result.compliant_count
+            progress.violations_found += len(result.violations)
+        elif not result.deadline_skipped:
+            progress.failed_region_scans += 1
+        await self.report()
+
+
 class MultiRegionScanner:
     """
     Orchestrates multi-region resource scanning.
@@ -192,6 +233,7 @@ class MultiRegionScanner:
         filters: dict | None = None,
         severity: str = "all",
         force_refresh: bool = False,
+        progress_callback: ProgressCallback | None = None,
     ) -> MultiRegionComplianceResult:
         """
         Scan resources across all enabled regions.
@@ -209,6 +251,8 @@ class MultiRegionScanner:
             filters: Optional filters (may include region filter from user query)
             severity: Severity filter for violations ("all", "errors_only", "warnings_only")
             force_refresh: If True, bypass cache and perform fresh scan (default: False)
+            progress_callback: Optional async callback receiving running totals
+                              once regions are known and after each region scan
 
         Returns:
             Aggregated compliance result from all regions
@@ -239,40 +283,23 @@ class MultiRegionScanner:
 
         logger.info(f"Global resource types: {global_types}, Regional types: {regional_types}")
 
-        # Determine regions to scan
-        # Step 1: Get enabled regions from AWS (with status to detect fallback)
-        discovery_result = await self.region_discovery.get_enabled_regions_with_status()
-        enabled_regions = discovery_result.regions
+        discovery_result, regions_to_scan, skipped_regions = await self._resolve_regions(
+            filters
+        )
 
-        if discovery_result.discovery_failed:
-            logger.warning(
-                f"Region discovery failed and fell back to default region. "
-                f"Results may be incomplete. Error: {discovery_result.discovery_error}"
+        use_chunking = is_all_mode and len(regional_types) > DEFAULT_RESOURCE_TYPE_CHUNK_SIZE
+        progress: _ScanProgressTracker | None = None
+        if progress_callback is not None:
+            chunk_count = (
+                math.ceil(len(regional_types) / DEFAULT_RESOURCE_TYPE_CHUNK_SIZE)
+                if use_chunking else 1
             )
-        else:
-            logger.info(f"Discovered {len(enabled_regions)} enabled regions in account")
-
-        # Step 2: Apply infrastructure restriction (allowed_regions setting)
-        if self.allowed_regions:
-            # Validate that all allowed_regions are actually enabled
-            invalid_allowed = [r for r in self.allowed_regions if r not in enabled_regions]
-            if invalid_allowed:
-                logger.warning(
-                    f"Some allowed_regions are not enabled in the account: {invalid_allowed}"
-                )
-            # Restrict to allowed regions that are also enabled
-            available_regions = [r for r in self.allowed_regions if r in enabled_regions]
-            logger.info(f"Restricted to allowed regions: {available_regions}")
-        else:
-            available_regions = enabled_regions
-
-        # Step 3: Apply user query filter (filters.regions)
-        regions_to_scan = self._apply_region_filter(available_regions, filters)
-        logger.info(f"Regions to scan after user filter: {regions_to_scan}")
+            total_region_scans = (1 if global_types else 0) + (
+                len(regions_to_scan) * chunk_count if regional_types else 0
+            )
+            progress = _ScanProgressTracker(progress_callback, total_region_scans)
+            await progress.report()
 
-        # Track skipped regions (available but not scanned due to user filter)
-        skipped_regions = [r for r in available_regions if r not in regions_to_scan]
-        
         # Scan global resources once (Requirement 5.1)
         # Global resources (S3, IAM, CloudFront, Route53) are not region-specific.
         # We use us-east-1 as the API endpoint but report them as "global" region.
@@ -300,6 +327,7 @@ class MultiRegionScanner:
                 non_compliant_count=global_result.non_compliant_count,
                 error_message=global_result.error_message,
                 scan_duration_ms=global_result.scan_duration_ms,
+                incomplete_resource_types=global_result.incomplete_resource_types,
             )
             # Mark resources as global
             for resource in global_result.resources:
@@ -308,12 +336,14 @@ class MultiRegionScanner:
             # Update violation regions to "global" as well
             for violation in global_result.violations:
                 violation.region = "global"
+            if progress:
+                await progress.record(global_result)
         
         # Scan regional resources in parallel (Requirement 3.2)
         # For "all" mode, chunk resource types to avoid overwhelming AWS APIs
         regional_results: list[RegionalScanResult] = []
         if regional_types and regions_to_scan:
-            if is_all_mode and len(regional_types) > DEFAULT_RESOURCE_TYPE_CHUNK_SIZE:
+            if use_chunking:
                 # Chunk resource types for "all" mode
                 regional_results = await self._scan_regions_chunked(
                     regions=regions_to_scan,
@@ -322,6 +352,7 @@ class MultiRegionScanner:
                     severity=severity,
                     chunk_size=DEFAULT_RESOURCE_TYPE_CHUNK_SIZE,
                     force_refresh=force_refresh,
+                    progress=progress,
                 )
             else:
                 regional_results = await self._scan_regions_parallel(
@@ -331,6 +362,7 @@ class MultiRegionScanner:
                     severity=severity,
                     extended_timeout=is_all_mode,  # Use extended timeout for "all" mode
                     force_refresh=force_refresh,
+                    progress=progress,
                 )
         
         # Combine global and regional results
@@ -347,18 +379,21 @@ class MultiRegionScanner:
             )
         
         # Aggregate results (Requirements 4.1-4.5)
-        aggregated = self._aggregate_results(
-            regional_results=all_results,
-            skipped_regions=skipped_regions,
-            global_result=global_result,
-            discovery_failed=discovery_result.discovery_failed,
-            discovery_error=discovery_result.discovery_error,
-        )
+        with span("region_aggregate"):
+            aggregated = self._aggregate_results(
+                regional_results=all_results,
+                skipped_regions=skipped_regions,
+                global_result=global_result,
+                discovery_failed=discovery_result.discovery_failed,
+                discovery_error=discovery_result.discovery_error,
+            )
         
-        # Check if all regions failed
+        # Check if all regions failed. Running out of time is not a failure:
+        # the caller gets an empty result marked partial instead.
         if (
             aggregated.region_metadata.total_regions > 0
             and len(aggregated.region_metadata.successful_regions) == 0
+            and not aggregated.region_metadata.incomplete_regions
         ):
             # Provide helpful error message
             error_msg = "All regions failed to scan"
@@ -383,6 +418,120 @@ class MultiRegionScanner:
         
         return aggregated
 
+    async def _resolve_regions(
+        self, filters: dict | None
+    ) -> tuple[RegionDiscoveryResult, list[str], list[str]]:
+        """
+        Determine which regions to scan.
+
+        Args:
+            filters: Optional filters (may include a region filter from the user query)
+
+        Returns:
+            Tuple of (discovery result, regions to scan, regions skipped by the filter)
+
+        Raises:
+            InvalidRegionFilterError: If user requests regions not in allowed list
+        """
+        # Step 1: Get enabled regions from AWS (with status to detect fallback)
+        with span("region_discovery"):
+            discovery_result = await self.region_discovery.get_enabled_regions_with_status()
+        enabled_regions = discovery_result.regions
+
+        if discovery_result.discovery_failed:
+            logger.warning(
+                f"Region discovery failed and fell back to default region. "
+                f"Results may be incomplete. Error: {discovery_result.discovery_error}"
+            )
+        else:
+            logger.info(f"Discovered {len(enabled_regions)} enabled regions in account")
+
+        # Step 2: Apply infrastructure restriction (allowed_regions setting)
+        if self.allowed_regions:
+            # Validate that all allowed_regions are actually enabled
+            invalid_allowed = [r for r in self.allowed_regions if r not in enabled_regions]
+            if invalid_allowed:
+                logger.warning(
+                    f"Some allowed_regions are not enabled in the account: {invalid_allowed}"
+                )
+            # Restrict to allowed regions that are also enabled
+            available_regions = [r for r in self.allowed_regions if r in enabled_regions]
+            logger.info(f"Restricted to allowed regions: {available_regions}")
+        else:
+            available_regions = enabled_regions
+
+        # Step 3: Apply user query filter (filters.regions)
+        regions_to_scan = self._apply_region_filter(available_regions, filters)
+        logger.info(f"Regions to scan after user filter: {regions_to_scan}")
+
+        # Track skipped regions (available but not scanned due to user filter)
+        skipped_regions = [r for r in available_regions if r not in regions_to_scan]
+
+        return discovery_result, regions_to_scan, skipped_regions
+
+    async def fetch_inventory(
+        self, resource_types: list[str], filters: dict | None = None
+    ) -> ResourceInventory:
+        """
+        Fetch raw resources (no policy validation) across all scanned regions.
+
+        Uses the same region selection as scan_all_regions. Global
+        resource types are fetched once and reported with region "global".
+        Regions, and resource types within a region, that fail to list are
+        recorded in the result so callers can report it as partial.
+
+        Args:
+            resource_types: Resource types to fetch (["all"] expands to every supported type)
+            filters: Optional filters (region filter and account_id)
+
+        Returns:
+            ResourceInventory keyed by region ("global" for global types)
+        """
+        resource_types = expand_all_to_supported_types(resource_types)
+        global_types = [rt for rt in resource_types if self._is_global_resource_type(rt)]
+        regional_types = [rt for rt in resource_types if not self._is_global_resource_type(rt)]
+        _, regions_to_scan, _ = await self._resolve_regions(filters)
+        regional_filters = self._strip_region_filter(filters)
+        semaphore = asyncio.Semaphore(self.max_concurrent_regions)
+
+        async def fetch(region: str, types: list[str]) -> ResourceInventory | None:
+            async with semaphore:
+                client = self.client_factory.get_client(region)
+                service = self.compliance_service_factory(client)
+                try:
+                    return await service.fetch_inventory(types, regional_filters)
+                except Exception as e:
+                    logger.error(f"Inventory fetch failed for region {region}: {e}")
+                    return None
+
+        jobs = []
+        if global_types:
+            jobs.append(("global", global_types, fetch("us-east-1", global_types)))
+        if regional_types:
+            jobs.extend(
+                (region, regional_types, fetch(region, regional_types))
+                for region in regions_to_scan
+            )
+        results = await asyncio.gather(*(job for _, _, job in jobs))
+
+        inventory = ResourceInventory()
+        for (region, types, _), regional in zip(jobs, results, strict=True):
+            if regional is None:
+                if region == "global":
+                    inventory.failed_resource_types[region] = types
+                else:
+                    inventory.failed_regions.append(region)
+                continue
+            resources = regional.resources
+            if region == "global":
+                for resource in resources:
+                    resource["region"] = "global"
+            inventory.resources_by_region[region] = resources
+            failed_types = regional.failed_type_names
+            if failed_types:
+                inventory.failed_resource_types[region] = failed_types
+        return inventory
+
     async def _scan_regions_parallel(
         self,
         regions: list[str],
@@ -391,6 +540,7 @@ class MultiRegionScanner:
         severity: str,
         extended_timeout: bool = False,
         force_refresh: bool = False,
+        progress: _ScanProgressTracker | None = None,
     ) -> list[RegionalScanResult]:
         """
         Scan multiple regions in parallel with concurrency control.
@@ -403,6 +553,7 @@ class MultiRegionScanner:
             filters: Optional filters
             severity: Severity filter
             extended_timeout: Use extended timeout for "all" mode scanning
+            progress: Optional tracker notified as each region finishes
 
         Returns:
             List of regional scan results
@@ -419,9 +570,17 @@ class MultiRegionScanner:
 
         async def scan_with_semaphore(region: str) -> RegionalScanResult:
             async with semaphore:
-                return await self._scan_region(
-                    region, resource_types, filters, severity, extended_timeout, force_refresh
-                )
+                # Regions still queued when the deadline nears are not started
+                if deadline_near():
+                    record_refused_call(f"scan region {region}")
+                    result = self._deadline_skipped_result(region, resource_types)
+                else:
+                    result = await self._scan_region(
+                        region, resource_types, filters, severity, extended_timeout, force_refresh
+                    )
+            if progress:
+                await progress.record(result)
+            return result
 
         # Create tasks for all regions
         tasks = [scan_with_semaphore(region) for region in regions]
@@ -457,6 +616,7 @@ class MultiRegionScanner:
         severity: str,
         chunk_size: int = DEFAULT_RESOURCE_TYPE_CHUNK_SIZE,
         force_refresh: bool = False,
+        progress: _ScanProgressTracker | None = None,
     ) -> list[RegionalScanResult]:
         """
         Scan regions with resource types chunked to avoid overwhelming AWS APIs.
@@ -478,6 +638,7 @@ class MultiRegionScanner:
             filters: Optional filters
             severity: Severity filter
             chunk_size: Number of resource types per chunk
+            progress: Optional tracker notified as each region chunk finishes
 
         Returns:
             List of merged regional scan results
@@ -512,6 +673,7 @@ class MultiRegionScanner:
                 severity=severity,
                 extended_timeout=True,
                 force_refresh=force_refresh,
+                progress=progress,
             )
 
             # Merge chunk results into accumulated results
@@ -521,16 +683,23 @@ class MultiRegionScanner:
                     merged_results[result.region] = result
                 else:
                     # Merge with existing result for this region
+                    # A chunk skipped for the deadline leaves earlier chunks valid
                     existing = merged_results[result.region]
                     merged_results[result.region] = RegionalScanResult(
                         region=result.region,
-                        success=existing.success and result.success,
+                        success=(
+                            existing.success and (result.success or result.deadline_skipped)
+                        ),
                         resources=existing.resources + result.resources,
                         violations=existing.violations + result.violations,
                         compliant_count=existing.compliant_count + result.compliant_count,
                         non_compliant_count=existing.non_compliant_count + result.non_compliant_count,
                         error_message=existing.error_message or result.error_message,
                         scan_duration_ms=existing.scan_duration_ms + result.scan_duration_ms,
+                        incomplete_resource_types=(
+                            existing.incomplete_resource_types
+                            + result.incomplete_resource_types
+                        ),
                     )
 
             # Small delay between chunks to be nice to AWS APIs
@@ -578,12 +747,29 @@ class MultiRegionScanner:
         )
 
         for attempt in range(self.max_retries + 1):
+            # Never retry or start past the request deadline
+            if deadline_near():
+                record_refused_call(f"scan region {region} (attempt {attempt + 1})")
+                return self._deadline_skipped_result(
+                    region, resource_types, int((time.time() - start_time) * 1000)
+                )
+
+            # The request deadline caps the region timeout. It is a backstop:
+            # the stack normally stops issuing calls before it is reached.
+            attempt_timeout = timeout_seconds
+            remaining = remaining_seconds()
+            if remaining is not None and remaining < attempt_timeout:
+                attempt_timeout = max(remaining, 0.0)
+
             try:
                 # Apply timeout to the scan operation
-                result = await asyncio.wait_for(
-                    self._execute_region_scan(region, resource_types, filters, severity, force_refresh),
-                    timeout=timeout_seconds,
-                )
+                with span("region_scan"):
+                    result = await asyncio.wait_for(
+                        self._execute_region_scan(
+                            region, resource_types, filters, severity, force_refresh
+                        ),
+                        timeout=attempt_timeout,
+                    )
 
                 # Calculate duration
                 duration_ms = int((time.time() - start_time) * 1000)
@@ -592,6 +778,13 @@ class MultiRegionScanner:
                 return result
 
             except asyncio.TimeoutError:
+                if attempt_timeout < timeout_seconds:
+                    # Cut off by the request deadline, not a slow region
+                    record_refused_call(f"scan region {region} (timed out at deadline)")
+                    return self._deadline_skipped_result(
+                        region, resource_types, int((time.time() - start_time) * 1000)
+                    )
+
                 # Provide helpful error message with suggestion
                 timeout_msg = f"Region {region} scan timed out after {timeout_seconds}s"
                 if extended_timeout:
@@ -632,6 +825,28 @@ class MultiRegionScanner:
             scan_duration_ms=duration_ms,
         )
 
+    def _deadline_skipped_result(
+        self, region: str, resource_types: list[str], duration_ms: int = 0
+    ) -> RegionalScanResult:
+        """
+        Build the result for a region not scanned because the request deadline was near.
+
+        Args:
+            region: AWS region code
+            resource_types: Resource types that were not scanned
+            duration_ms: Time spent before giving up
+
+        Returns:
+            Unsuccessful RegionalScanResult listing every type as incomplete
+        """
+        return RegionalScanResult(
+            region=region,
+            success=False,
+            error_message="Not scanned: request deadline reached",
+            scan_duration_ms=duration_ms,
+            incomplete_resource_types=list(resource_types),
+        )
+
     async def _execute_region_scan(
         self,
         region: str,
@@ -711,6 +926,7 @@ class MultiRegionScanner:
             compliant_count=compliance_result.compliant_resources,
             non_compliant_count=non_compliant_count,  # Track unique non-compliant resources
             error_message=None,
+            incomplete_resource_types=compliance_result.incomplete_resource_types,
         )
 
     def _aggregate_results(
@@ -741,13 +957,18 @@ class MultiRegionScanner:
         """
         skipped_regions = skipped_regions or []
         
-        # Separate successful and failed results
+        # Separate successful and failed results. Regions skipped because the
+        # request deadline was reached are reported as incomplete, not failed.
         successful_results = [r for r in regional_results if r.success]
-        failed_results = [r for r in regional_results if not r.success]
+        failed_results = [
+            r for r in regional_results if not r.success and not r.deadline_skipped
+        ]
+        incomplete_regions = [r.region for r in regional_results if r.incomplete_resource_types]
         
-        # Collect all violations (Requirement 4.1)
+        # Collect all violations (Requirement 4.1), rolling them up as we go
         all_violations: list[Violation] = []
         seen_violation_ids: set[str] = set()  # For deduplication
+        rollup = ComplianceRollup()
         
         for result in successful_results:
             for violation in result.violations:
@@ -756,6 +977,7 @@ class MultiRegionScanner:
                 if violation_key not in seen_violation_ids:
                     seen_violation_ids.add(violation_key)
                     all_violations.append(violation)
+                    rollup.add(violation)
         
         # Calculate totals across all successful regions
         total_resources = 0
@@ -832,6 +1054,7 @@ class MultiRegionScanner:
             skipped_regions=skipped_regions,
             discovery_failed=discovery_failed,
             discovery_error=discovery_error,
+            incomplete_regions=incomplete_regions,
         )
         
         return MultiRegionComplianceResult(
@@ -842,6 +1065,7 @@ class MultiRegionScanner:
             cost_attribution_gap=total_cost_gap,  # Requirement 4.4
             region_metadata=region_metadata,
             regional_breakdown=regional_breakdown,
+            rollup=rollup,
         )
 
     def _is_global_resource_type(self, resource_type: str) -> bool:
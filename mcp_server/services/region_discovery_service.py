@@ -11,7 +11,7 @@ to minimize API calls.
 Requirements: 1.1, 1.2, 1.3, 1.4
 """
 
-import asyncio
+import inspect
 import logging
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
@@ -19,7 +19,9 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     import boto3
 
+from ..clients.account_context import AccountContext
 from ..clients.cache import RedisCache
+from ..clients.executors import WorkloadClass, get_executor
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +76,7 @@ class RegionDiscoveryService:
         cache: RedisCache,
         cache_ttl: int = 3600,
         default_region: str = "us-east-1",
+        account_context: AccountContext | None = None,
     ):
         """
         Initialize with EC2 client and cache.
@@ -83,11 +86,15 @@ class RegionDiscoveryService:
             cache: Redis cache instance for caching region list
             cache_ttl: Time-to-live for cached region list in seconds (default: 1 hour)
             default_region: Default region to fall back to on API failure
+            account_context: Optional account metadata shared with the regional
+                            clients. When set, the region list is also kept there
+                            in memory so repeat scans skip Redis and the API.
         """
         self.ec2_client = ec2_client
         self.cache = cache
         self.cache_ttl = cache_ttl
         self.default_region = default_region
+        self.account_context = account_context
 
     async def get_enabled_regions(self) -> list[str]:
         """
@@ -129,10 +136,19 @@ class RegionDiscoveryService:
 
         Requirements: 1.1, 1.2, 1.3, 1.4
         """
+        # Account-scoped in-memory copy is cheapest - no Redis round trip
+        if self.account_context is not None:
+            known_regions = self.account_context.get_enabled_regions(self.cache_ttl)
+            if known_regions is not None:
+                logger.debug(f"Returning {len(known_regions)} enabled regions from account context")
+                return RegionDiscoveryResult(regions=known_regions)
+
         # Try to get from cache first (Requirement 1.4)
         cached_regions = await self._get_from_cache()
         if cached_regions is not None:
             logger.info(f"Returning {len(cached_regions)} cached enabled regions")
+            if self.account_context is not None:
+                self.account_context.set_enabled_regions(cached_regions)
             return RegionDiscoveryResult(regions=cached_regions)
 
         # Cache miss - call EC2 DescribeRegions API (Requirement 1.1)
@@ -141,6 +157,8 @@ class RegionDiscoveryService:
 
             # Cache the result (Requirement 1.4)
             await self._cache_regions(regions)
+            if self.account_context is not None:
+                self.account_context.set_enabled_regions(regions)
 
             logger.info(f"Discovered {len(regions)} enabled regions")
             return RegionDiscoveryResult(regions=regions)
@@ -171,12 +189,15 @@ class RegionDiscoveryService:
         Requirements: 1.1, 1.2
         """
         try:
-            # Run boto3 call in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.ec2_client.describe_regions(AllRegions=True),
-            )
+            describe_regions = self.ec2_client.describe_regions
+            if inspect.iscoroutinefunction(describe_regions):
+                # Native-async client backend
+                response = await describe_regions(AllRegions=True)
+            else:
+                # Run boto3 call in the inventory pool to avoid blocking
+                response = await get_executor(WorkloadClass.INVENTORY).run(
+                    describe_regions, AllRegions=True
+                )
 
             # Filter regions by opt-in status (Requirement 1.2)
             enabled_regions = []
@@ -253,6 +274,9 @@ class RegionDiscoveryService:
         Returns:
             True if cache was invalidated, False if cache unavailable
         """
+        if self.account_context is not None:
+            self.account_context.clear_enabled_regions()
+
         try:
             result = await self.cache.delete(ENABLED_REGIONS_CACHE_KEY)
             if result:
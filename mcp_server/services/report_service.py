@@ -5,10 +5,11 @@
 """Report generation service."""
 
 import csv
+import heapq
 import io
 import json
 import logging
-from collections import defaultdict
+from typing import TextIO
 
 from ..models.compliance import ComplianceResult
 from ..models.report import (
@@ -17,6 +18,8 @@ from ..models.report import (
     ReportFormat,
     ViolationRanking,
 )
+from ..models.rollup import ComplianceRollup
+from ..utils.columnar_export import load_compliance_result
 
 logger = logging.getLogger(__name__)
 
@@ -59,17 +62,18 @@ class ReportService:
         non_compliant_resources = (
             compliance_result.total_resources - compliance_result.compliant_resources
         )
-        total_violations = len(compliance_result.violations)
 
-        # Rank violations by count and cost
-        top_by_count = self._rank_violations_by_count(compliance_result.violations)
-        top_by_cost = self._rank_violations_by_cost(compliance_result.violations)
+        # Totals and rankings come from the rollup cube, so the report works
+        # even when the scan never materialized its violation list
+        rollup = ComplianceRollup.for_result(compliance_result)
+        total_violations = rollup.violation_count
+        top_by_count, top_by_cost = self._rank_violations(rollup)
 
         # Generate recommendations if requested
         recommendations = []
         if include_recommendations:
             recommendations = self._generate_recommendations(
-                compliance_result, top_by_count, top_by_cost
+                compliance_result, top_by_count, top_by_cost, rollup
             )
 
         report = ComplianceReport(
@@ -88,93 +92,81 @@ class ReportService:
         logger.info(f"Report generated with {len(recommendations)} recommendations")
         return report
 
-    def _rank_violations_by_count(
-        self, violations: list, top_n: int = 10
-    ) -> list[ViolationRanking]:
+    def generate_report_from_export(
+        self, path: str, include_recommendations: bool = True
+    ) -> ComplianceReport:
         """
-        Rank violations by occurrence count.
-
-        Groups violations by tag name and counts occurrences.
+        Generate a compliance report from a columnar violations export.
 
         Args:
-            violations: List of Violation objects
-            top_n: Number of top violations to return
+            path: Parquet or Arrow file written by export_columnar (dataset "violations")
+            include_recommendations: Whether to include actionable recommendations
 
         Returns:
-            List of ViolationRanking objects sorted by count (descending)
+            ComplianceReport for the exported scan
 
-        Requirements: 7.4 - Rank violations by count
+        Raises:
+            ImportError: If pyarrow is not installed
+            ValueError: If the file is not a violations export
         """
-        # Group violations by tag name
-        violation_groups = defaultdict(lambda: {"count": 0, "cost": 0.0, "resource_types": set()})
-
-        for violation in violations:
-            tag_name = violation.tag_name
-            violation_groups[tag_name]["count"] += 1
-            violation_groups[tag_name]["cost"] += violation.cost_impact_monthly
-            violation_groups[tag_name]["resource_types"].add(violation.resource_type)
-
-        # Convert to ViolationRanking objects
-        rankings = []
-        for tag_name, data in violation_groups.items():
-            rankings.append(
-                ViolationRanking(
-                    tag_name=tag_name,
-                    violation_count=data["count"],
-                    total_cost_impact=data["cost"],
-                    affected_resource_types=sorted(list(data["resource_types"])),
-                )
-            )
-
-        # Sort by count (descending) and return top N
-        rankings.sort(key=lambda x: x.violation_count, reverse=True)
-        return rankings[:top_n]
+        return self.generate_report(
+            load_compliance_result(path), include_recommendations=include_recommendations
+        )
 
-    def _rank_violations_by_cost(self, violations: list, top_n: int = 10) -> list[ViolationRanking]:
+    def _rank_violations(
+        self, rollup: ComplianceRollup, top_n: int = 10
+    ) -> tuple[list[ViolationRanking], list[ViolationRanking]]:
         """
-        Rank violations by cost impact.
+        Rank violations by occurrence count and by cost impact.
 
-        Groups violations by tag name and sums cost impacts.
+        Per-tag totals are accumulated in a single pass over the rollup's
+        (tag_name, resource_type) slice; each ranking is then a heap-based
+        top-N selection, so only top_n rankings are ever sorted.
 
         Args:
-            violations: List of Violation objects
-            top_n: Number of top violations to return
+            rollup: Violation rollup of the compliance result
+            top_n: Number of top violations to return per ranking
 
         Returns:
-            List of ViolationRanking objects sorted by cost (descending)
+            Tuple of (rankings by count, rankings by cost), both descending
 
-        Requirements: 7.4 - Rank violations by cost impact
+        Requirements: 7.4 - Rank violations by count and cost impact
         """
-        # Group violations by tag name
-        violation_groups = defaultdict(lambda: {"count": 0, "cost": 0.0, "resource_types": set()})
-
-        for violation in violations:
-            tag_name = violation.tag_name
-            violation_groups[tag_name]["count"] += 1
-            violation_groups[tag_name]["cost"] += violation.cost_impact_monthly
-            violation_groups[tag_name]["resource_types"].add(violation.resource_type)
-
-        # Convert to ViolationRanking objects
-        rankings = []
-        for tag_name, data in violation_groups.items():
-            rankings.append(
-                ViolationRanking(
+        totals: dict[str, list] = {}
+        for cell in rollup.slice(["tag_name", "resource_type"]):
+            tag = totals.get(cell.tag_name)
+            if tag is None:
+                tag = totals[cell.tag_name] = [0, 0.0, set()]
+            tag[0] += cell.violation_count
+            tag[1] += cell.cost_gap
+            tag[2].add(cell.resource_type)
+
+        by_count = heapq.nlargest(top_n, totals.items(), key=lambda item: item[1][0])
+        by_cost = heapq.nlargest(top_n, totals.items(), key=lambda item: item[1][1])
+
+        rankings: dict[str, ViolationRanking] = {}
+
+        def ranking(tag_name: str, total: list) -> ViolationRanking:
+            if tag_name not in rankings:
+                rankings[tag_name] = ViolationRanking(
                     tag_name=tag_name,
-                    violation_count=data["count"],
-                    total_cost_impact=data["cost"],
-                    affected_resource_types=sorted(list(data["resource_types"])),
+                    violation_count=total[0],
+                    total_cost_impact=total[1],
+                    affected_resource_types=sorted(total[2]),
                 )
-            )
+            return rankings[tag_name]
 
-        # Sort by cost (descending) and return top N
-        rankings.sort(key=lambda x: x.total_cost_impact, reverse=True)
-        return rankings[:top_n]
+        return (
+            [ranking(tag_name, total) for tag_name, total in by_count],
+            [ranking(tag_name, total) for tag_name, total in by_cost],
+        )
 
     def _generate_recommendations(
         self,
         compliance_result: ComplianceResult,
         top_by_count: list[ViolationRanking],
         top_by_cost: list[ViolationRanking],
+        rollup: ComplianceRollup | None = None,
     ) -> list[ComplianceRecommendation]:
         """
         Generate actionable recommendations based on compliance results.
@@ -186,6 +178,8 @@ class ReportService:
             compliance_result: ComplianceResult from scan
             top_by_count: Top violations by count
             top_by_cost: Top violations by cost
+            rollup: Violation rollup of the result (rebuilt from its
+                    violations if not given)
 
         Returns:
             List of ComplianceRecommendation objects
@@ -249,13 +243,13 @@ class ReportService:
         # Recommendation 4: Focus on specific resource types
         if top_by_count:
             # Find resource type with most violations
-            resource_type_violations = defaultdict(int)
-            for violation in compliance_result.violations:
-                resource_type_violations[violation.resource_type] += 1
+            if rollup is None:
+                rollup = ComplianceRollup.for_result(compliance_result)
+            by_resource_type = rollup.slice(["resource_type"])
 
-            if resource_type_violations:
-                worst_resource_type = max(resource_type_violations.items(), key=lambda x: x[1])
-                resource_type, count = worst_resource_type
+            if by_resource_type:
+                resource_type = by_resource_type[0].resource_type
+                count = by_resource_type[0].violation_count
 
                 if count > 5:
                     recommendations.append(
@@ -336,28 +330,44 @@ class ReportService:
 
         Requirements: 7.2 - Support JSON, CSV, and Markdown output formats
         """
+        output = io.StringIO()
+        self.render_report(report, format, output)
+        return output.getvalue()
+
+    def render_report(self, report: ComplianceReport, format: ReportFormat, out: TextIO) -> None:
+        """
+        Write a compliance report to a text stream in the specified format.
+
+        Renderers write straight to the stream as they walk the report, so
+        rendering to a file never holds the whole formatted report in memory.
+
+        Args:
+            report: ComplianceReport to render
+            format: Output format (JSON, CSV, or Markdown)
+            out: Writable text stream (file, StringIO, ...)
+
+        Raises:
+            ValueError: If the format is not supported
+        """
         if format == ReportFormat.JSON:
-            return self._format_as_json(report)
+            self._render_json(report, out)
         elif format == ReportFormat.CSV:
-            return self._format_as_csv(report)
+            self._render_csv(report, out)
         elif format == ReportFormat.MARKDOWN:
-            return self._format_as_markdown(report)
+            self._render_markdown(report, out)
         else:
             raise ValueError(f"Unsupported report format: {format}")
 
-    def _format_as_json(self, report: ComplianceReport) -> str:
+    def _render_json(self, report: ComplianceReport, out: TextIO) -> None:
         """
-        Format report as JSON.
+        Render report as JSON.
 
         Args:
-            report: ComplianceReport to format
-
-        Returns:
-            JSON string
+            report: ComplianceReport to render
+            out: Stream to write to
         """
         # Use Pydantic's model_dump with mode='json' for proper serialization
-        report_dict = report.model_dump(mode="json")
-        return json.dumps(report_dict, indent=2)
+        json.dump(report.model_dump(mode="json"), out, indent=2)
 
     def _has_cost_data(self, report: ComplianceReport) -> bool:
         """
@@ -376,9 +386,9 @@ class ReportService:
                 return True
         return False
 
-    def _format_as_csv(self, report: ComplianceReport) -> str:
+    def _render_csv(self, report: ComplianceReport, out: TextIO) -> None:
         """
-        Format report as CSV.
+        Render report as CSV.
 
         Creates multiple CSV sections:
         1. Summary statistics
@@ -387,13 +397,10 @@ class ReportService:
         4. Recommendations (if present)
 
         Args:
-            report: ComplianceReport to format
-
-        Returns:
-            CSV string
+            report: ComplianceReport to render
+            out: Stream to write to
         """
-        output = io.StringIO()
-        writer = csv.writer(output)
+        writer = csv.writer(out)
 
         has_cost_data = self._has_cost_data(report)
 
@@ -414,25 +421,25 @@ class ReportService:
             writer.writerow(
                 ["Tag Name", "Violation Count", "Cost Impact", "Affected Resource Types"]
             )
-            for ranking in report.top_violations_by_count:
-                writer.writerow(
-                    [
-                        ranking.tag_name,
-                        ranking.violation_count,
-                        f"${ranking.total_cost_impact:.2f}",
-                        ", ".join(ranking.affected_resource_types),
-                    ]
-                )
+            writer.writerows(
+                [
+                    ranking.tag_name,
+                    ranking.violation_count,
+                    f"${ranking.total_cost_impact:.2f}",
+                    ", ".join(ranking.affected_resource_types),
+                ]
+                for ranking in report.top_violations_by_count
+            )
         else:
             writer.writerow(["Tag Name", "Violation Count", "Affected Resource Types"])
-            for ranking in report.top_violations_by_count:
-                writer.writerow(
-                    [
-                        ranking.tag_name,
-                        ranking.violation_count,
-                        ", ".join(ranking.affected_resource_types),
-                    ]
-                )
+            writer.writerows(
+                [
+                    ranking.tag_name,
+                    ranking.violation_count,
+                    ", ".join(ranking.affected_resource_types),
+                ]
+                for ranking in report.top_violations_by_count
+            )
         writer.writerow([])
 
         # Top violations by cost (only show if cost data available)
@@ -441,15 +448,15 @@ class ReportService:
             writer.writerow(
                 ["Tag Name", "Cost Impact", "Violation Count", "Affected Resource Types"]
             )
-            for ranking in report.top_violations_by_cost:
-                writer.writerow(
-                    [
-                        ranking.tag_name,
-                        f"${ranking.total_cost_impact:.2f}",
-                        ranking.violation_count,
-                        ", ".join(ranking.affected_resource_types),
-                    ]
-                )
+            writer.writerows(
+                [
+                    ranking.tag_name,
+                    f"${ranking.total_cost_impact:.2f}",
+                    ranking.violation_count,
+                    ", ".join(ranking.affected_resource_types),
+                ]
+                for ranking in report.top_violations_by_cost
+            )
             writer.writerow([])
 
         # Recommendations
@@ -458,22 +465,20 @@ class ReportService:
             writer.writerow(
                 ["Priority", "Title", "Description", "Estimated Impact", "Affected Resources"]
             )
-            for rec in report.recommendations:
-                writer.writerow(
-                    [
-                        rec.priority,
-                        rec.title,
-                        rec.description,
-                        rec.estimated_impact,
-                        rec.affected_resources,
-                    ]
-                )
-
-        return output.getvalue()
+            writer.writerows(
+                [
+                    rec.priority,
+                    rec.title,
+                    rec.description,
+                    rec.estimated_impact,
+                    rec.affected_resources,
+                ]
+                for rec in report.recommendations
+            )
 
-    def _format_as_markdown(self, report: ComplianceReport) -> str:
+    def _render_markdown(self, report: ComplianceReport, out: TextIO) -> None:
         """
-        Format report as Markdown.
+        Render report as Markdown.
 
         Creates a well-structured Markdown document with:
         - Summary section with key metrics
@@ -482,85 +487,67 @@ class ReportService:
         - Recommendations section
 
         Args:
-            report: ComplianceReport to format
-
-        Returns:
-            Markdown string
+            report: ComplianceReport to render
+            out: Stream to write to
         """
-        lines = []
         has_cost_data = self._has_cost_data(report)
 
         # Title
-        lines.append("# Tag Compliance Report")
-        lines.append("")
-        lines.append(f"**Generated:** {report.report_timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-        lines.append(f"**Scan Date:** {report.scan_timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-        lines.append("")
+        out.write("# Tag Compliance Report\n\n")
+        out.write(
+            f"**Generated:** {report.report_timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}\n"
+        )
+        out.write(f"**Scan Date:** {report.scan_timestamp.strftime('%Y-%m-%d %H:%M:%S UTC')}\n")
+        out.write("\n")
 
         # Summary section
-        lines.append("## Summary")
-        lines.append("")
-        lines.append(f"- **Overall Compliance Score:** {report.overall_compliance_score:.1%}")
-        lines.append(f"- **Total Resources:** {report.total_resources}")
-        lines.append(f"- **Compliant Resources:** {report.compliant_resources}")
-        lines.append(f"- **Non-Compliant Resources:** {report.non_compliant_resources}")
-        lines.append(f"- **Total Violations:** {report.total_violations}")
-        lines.append(f"- **Cost Attribution Gap:** ${report.cost_attribution_gap:,.2f}/month")
-        lines.append("")
+        out.write("## Summary\n\n")
+        out.write(f"- **Overall Compliance Score:** {report.overall_compliance_score:.1%}\n")
+        out.write(f"- **Total Resources:** {report.total_resources}\n")
+        out.write(f"- **Compliant Resources:** {report.compliant_resources}\n")
+        out.write(f"- **Non-Compliant Resources:** {report.non_compliant_resources}\n")
+        out.write(f"- **Total Violations:** {report.total_violations}\n")
+        out.write(f"- **Cost Attribution Gap:** ${report.cost_attribution_gap:,.2f}/month\n")
 
         # Top violations by count (hide Cost Impact column if no cost data)
         if report.top_violations_by_count:
-            lines.append("## Top Violations by Count")
-            lines.append("")
+            out.write("\n## Top Violations by Count\n\n")
             if has_cost_data:
-                lines.append(
-                    "| Tag Name | Violation Count | Cost Impact | Affected Resource Types |"
-                )
-                lines.append("|----------|----------------|-------------|------------------------|")
+                out.write("| Tag Name | Violation Count | Cost Impact | Affected Resource Types |\n")
+                out.write("|----------|----------------|-------------|------------------------|\n")
                 for ranking in report.top_violations_by_count:
                     resource_types = ", ".join(ranking.affected_resource_types)
-                    lines.append(
+                    out.write(
                         f"| {ranking.tag_name} | {ranking.violation_count} | "
-                        f"${ranking.total_cost_impact:,.2f} | {resource_types} |"
+                        f"${ranking.total_cost_impact:,.2f} | {resource_types} |\n"
                     )
             else:
-                lines.append("| Tag Name | Violation Count | Affected Resource Types |")
-                lines.append("|----------|----------------|------------------------|")
+                out.write("| Tag Name | Violation Count | Affected Resource Types |\n")
+                out.write("|----------|----------------|------------------------|\n")
                 for ranking in report.top_violations_by_count:
                     resource_types = ", ".join(ranking.affected_resource_types)
-                    lines.append(
-                        f"| {ranking.tag_name} | {ranking.violation_count} | {resource_types} |"
+                    out.write(
+                        f"| {ranking.tag_name} | {ranking.violation_count} | {resource_types} |\n"
                     )
-            lines.append("")
 
         # Top violations by cost (only show if cost data available)
         if has_cost_data and report.top_violations_by_cost:
-            lines.append("## Top Violations by Cost Impact")
-            lines.append("")
-            lines.append("| Tag Name | Cost Impact | Violation Count | Affected Resource Types |")
-            lines.append("|----------|-------------|----------------|------------------------|")
+            out.write("\n## Top Violations by Cost Impact\n\n")
+            out.write("| Tag Name | Cost Impact | Violation Count | Affected Resource Types |\n")
+            out.write("|----------|-------------|----------------|------------------------|\n")
             for ranking in report.top_violations_by_cost:
                 resource_types = ", ".join(ranking.affected_resource_types)
-                lines.append(
+                out.write(
                     f"| {ranking.tag_name} | ${ranking.total_cost_impact:,.2f} | "
-                    f"{ranking.violation_count} | {resource_types} |"
+                    f"{ranking.violation_count} | {resource_types} |\n"
                 )
-            lines.append("")
 
         # Recommendations
         if report.recommendations:
-            lines.append("## Recommendations")
-            lines.append("")
+            out.write("\n## Recommendations\n")
             for i, rec in enumerate(report.recommendations, 1):
-                lines.append(f"### {i}. {rec.title}")
-                lines.append("")
-                lines.append(f"**Priority:** {rec.priority.upper()}")
-                lines.append("")
-                lines.append(rec.description)
-                lines.append("")
-                lines.append(f"**Estimated Impact:** {rec.estimated_impact}")
-                lines.append("")
-                lines.append(f"**Affected Resources:** {rec.affected_resources}")
-                lines.append("")
-
-        return "\n".join(lines)
+                out.write(f"\n### {i}. {rec.title}\n\n")
+                out.write(f"**Priority:** {rec.priority.upper()}\n\n")
+                out.write(f"{rec.description}\n\n")
+                out.write(f"**Estimated Impact:** {rec.estimated_impact}\n\n")
+                out.write(f"**Affected Resources:** {rec.affected_resources}\n")
@@ -0,0 +1,371 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Server-side store for scan results, served back one page at a time.
+
+Large accounts produce tens of thousands of violations. Returning them
+all in one tool response costs serialization time and gets truncated by
+the client anyway. Instead the full result is stored under a result ID
+and clients page through the violations with opaque cursors.
+
+Violations live in an indexed SQLite table. Pages use keyset pagination
+(the cursor holds the sort value and row number of the last violation
+returned), so fetching page N costs the same as fetching page 1.
+
+Database work, including encoding and decoding the violation rows, runs
+on an SQLitePool (see clients/sqlite_pool.py), so storing or paging a
+large result never blocks the event loop.
+"""
+
+import base64
+import binascii
+import json
+import logging
+import sqlite3
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from ..clients.sqlite_pool import SQLitePool
+from ..models.result_store import ViolationPage
+
+logger = logging.getLogger(__name__)
+
+# Sort key name -> (column, direction)
+SORT_KEYS: dict[str, tuple[str, str]] = {
+    "resource_id": ("resource_id", "ASC"),
+    "cost_impact": ("cost_impact_monthly", "DESC"),
+    "severity": ("severity", "ASC"),  # "error" sorts before "warning"
+    "region": ("region", "ASC"),
+    "resource_type": ("resource_type", "ASC"),
+    "tag_name": ("tag_name", "ASC"),
+}
+
+# Filter name -> column
+FILTER_COLUMNS: dict[str, str] = {
+    "region": "region",
+    "resource_type": "resource_type",
+    "tag_name": "tag_name",
+    "severity": "severity",
+    "violation_type": "violation_type",
+}
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class ResultNotFoundError(Exception):
+    """Raised when a result ID does not match any stored result."""
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+class ResultStoreService:
+    """Service for storing scan results and paging through their violations."""
+
+    def __init__(self, db_path: str = "scan_results.db", retention_hours: int = 24):
+        """
+        Initialize the result store.
+
+        Args:
+            db_path: Path to the SQLite database file
+            retention_hours: Stored results older than this are deleted
+        """
+        self.db_path = db_path
+        self.retention_hours = retention_hours
+        self._pool = SQLitePool(db_path, init=self._init_database)
+
+    def _init_database(self, conn: sqlite3.Connection) -> None:
+        """Create the result tables and their indexes."""
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scan_results (
+                result_id TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                violation_count INTEGER NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS result_violations (
+                result_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                resource_id TEXT NOT NULL,
+                resource_type TEXT NOT NULL,
+                region TEXT NOT NULL,
+                violation_type TEXT NOT NULL,
+                tag_name TEXT NOT NULL,
+                severity TEXT NOT NULL,
+                cost_impact_monthly REAL NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (result_id, seq)
+            )
+            """
+        )
+        # One index per sort key; filters narrow within the same result
+        for name, (column, _) in SORT_KEYS.items():
+            conn.execute(
+                f"""
+                CREATE INDEX IF NOT EXISTS idx_result_violations_{name}
+                ON result_violations(result_id, {column}, seq)
+                """
+            )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_scan_results_created_at
+            ON scan_results(created_at)
+            """
+        )
+
+    async def store_result(
+        self, summary: dict[str, Any], violations: list[dict[str, Any]]
+    ) -> str:
+        """
+        Store a scan result and its violations.
+
+        Args:
+            summary: Result fields other than the violations
+            violations: Violation dicts as returned by the scan tools
+
+        Returns:
+            The new result ID
+        """
+        result_id = uuid.uuid4().hex
+        created_at = datetime.now(UTC)
+
+        def store(conn: sqlite3.Connection) -> None:
+            self._purge_expired(conn, created_at)
+            conn.execute(
+                """
+                INSERT INTO scan_results (result_id, created_at, summary, violation_count)
+                VALUES (?, ?, ?, ?)
+                """,
+                (
+                    result_id,
+                    created_at.isoformat(),
+                    json.dumps(summary, default=str),
+                    len(violations),
+                ),
+            )
+            conn.executemany(
+                """
+                INSERT INTO result_violations
+                (result_id, seq, resource_id, resource_type, region, violation_type,
+                 tag_name, severity, cost_impact_monthly, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    (
+                        result_id,
+                        seq,
+                        v.get("resource_id") or "",
+                        v.get("resource_type") or "",
+                        v.get("region") or "",
+                        v.get("violation_type") or "",
+                        v.get("tag_name") or "",
+                        v.get("severity") or "",
+                        v.get("cost_impact_monthly") or 0.0,
+                        json.dumps(v, default=str),
+                    )
+                    for seq, v in enumerate(violations)
+                ),
+            )
+
+        await self._pool.write(store)
+
+        logger.info(f"Stored scan result {result_id} with {len(violations)} violations")
+        return result_id
+
+    async def get_summary(self, result_id: str) -> dict[str, Any]:
+        """
+        Get the non-violation fields of a stored result.
+
+        Args:
+            result_id: ID returned by store_result
+
+        Returns:
+            The stored summary
+
+        Raises:
+            ResultNotFoundError: If no result has this ID (or it has expired)
+        """
+        rows = await self._pool.fetchall(
+            "SELECT summary FROM scan_results WHERE result_id = ?", (result_id,)
+        )
+        if not rows:
+            raise ResultNotFoundError(f"Scan result not found or expired: {result_id}")
+        return json.loads(rows[0][0])
+
+    async def get_page(
+        self,
+        result_id: str,
+        cursor: str | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        filters: dict[str, str] | None = None,
+        sort_by: str = "resource_id",
+    ) -> ViolationPage:
+        """
+        Get one page of a stored result's violations.
+
+        When a cursor is given, the result ID, filters and sort key stored
+        in it are used, so every page of a listing is consistent.
+
+        Args:
+            result_id: ID returned by store_result
+            cursor: next_cursor from the previous page, or None for the first page
+            page_size: Violations per page (1-1000)
+            filters: Optional exact-match filters on region, resource_type,
+                     tag_name, severity or violation_type
+            sort_by: One of SORT_KEYS (ignored when a cursor is given)
+
+        Returns:
+            ViolationPage with the violations and the cursor for the next page
+
+        Raises:
+            ResultNotFoundError: If no result has this ID (or it has expired)
+            InvalidCursorError: If the cursor is malformed
+            ValueError: If the sort key, a filter name or page_size is invalid
+        """
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+
+        after: tuple[Any, int] | None = None
+        if cursor:
+            state = _decode_cursor(cursor)
+            result_id = state["result_id"]
+            filters = state["filters"]
+            sort_by = state["sort_by"]
+            after = (state["last_key"], state["last_seq"])
+
+        filters = {k: v for k, v in (filters or {}).items() if v is not None}
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Invalid sort_by '{sort_by}'. Valid values: {sorted(SORT_KEYS)}")
+        unknown = sorted(set(filters) - set(FILTER_COLUMNS))
+        if unknown:
+            raise ValueError(f"Invalid filters: {unknown}. Valid filters: {sorted(FILTER_COLUMNS)}")
+
+        column, direction = SORT_KEYS[sort_by]
+        where = ["result_id = ?"]
+        params: list[Any] = [result_id]
+        for name, value in sorted(filters.items()):
+            where.append(f"{FILTER_COLUMNS[name]} = ?")
+            params.append(value)
+
+        page_where = list(where)
+        page_params = list(params)
+        if after is not None:
+            op = "<" if direction == "DESC" else ">"
+            page_where.append(f"({column} {op} ? OR ({column} = ? AND seq > ?))")
+            page_params.extend([after[0], after[0], after[1]])
+
+        def read_page(conn: sqlite3.Connection) -> tuple[int, list[tuple[Any, int, dict]]] | None:
+            if conn.execute(
+                "SELECT 1 FROM scan_results WHERE result_id = ?", (result_id,)
+            ).fetchone() is None:
+                return None
+
+            total = conn.execute(
+                f"SELECT COUNT(*) FROM result_violations WHERE {' AND '.join(where)}",
+                params,
+            ).fetchone()[0]
+
+            rows = conn.execute(
+                f"""
+                SELECT {column}, seq, data FROM result_violations
+                WHERE {' AND '.join(page_where)}
+                ORDER BY {column} {direction}, seq ASC
+                LIMIT ?
+                """,
+                (*page_params, page_size + 1),
+            ).fetchall()
+            return total, [(key, seq, json.loads(data)) for key, seq, data in rows]
+
+        found = await self._pool.read(read_page)
+        if found is None:
+            raise ResultNotFoundError(f"Scan result not found or expired: {result_id}")
+        total, rows = found
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        next_cursor = None
+        if has_more:
+            last_key, last_seq, _ = rows[-1]
+            next_cursor = _encode_cursor(
+                {
+                    "result_id": result_id,
+                    "filters": filters,
+                    "sort_by": sort_by,
+                    "last_key": last_key,
+                    "last_seq": last_seq,
+                }
+            )
+
+        return ViolationPage(
+            result_id=result_id,
+            violations=[violation for _, _, violation in rows],
+            total_matching=total,
+            next_cursor=next_cursor,
+            sort_by=sort_by,
+            filters=filters,
+        )
+
+    def _purge_expired(self, conn: sqlite3.Connection, now: datetime) -> None:
+        """Delete results older than the retention period."""
+        cutoff = (now - timedelta(hours=self.retention_hours)).isoformat()
+        conn.execute(
+            """
+            DELETE FROM result_violations WHERE result_id IN
+            (SELECT result_id FROM scan_results WHERE created_at < ?)
+            """,
+            (cutoff,),
+        )
+        conn.execute("DELETE FROM scan_results WHERE created_at < ?", (cutoff,))
+
+    def close(self) -> None:
+        """Commit pending writes and close the database connections."""
+        self._pool.close()
+
+
+def _encode_cursor(state: dict[str, Any]) -> str:
+    """Encode pagination state as an opaque URL-safe string."""
+    raw = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> dict[str, Any]:
+    """Decode and validate a cursor produced by _encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursorError(f"Invalid pagination cursor: {e}") from e
+
+    # A cursor is client-supplied: check every field before it reaches SQL
+    if not isinstance(state, dict):
+        raise InvalidCursorError("Invalid pagination cursor: not an object")
+    filters = state.get("filters")
+    last_key = state.get("last_key")
+    last_seq = state.get("last_seq")
+    if not isinstance(state.get("result_id"), str):
+        field = "result_id"
+    elif not isinstance(state.get("sort_by"), str) or state["sort_by"] not in SORT_KEYS:
+        field = "sort_by"
+    elif not isinstance(filters, dict) or not all(
+        name in FILTER_COLUMNS and isinstance(value, str) for name, value in filters.items()
+    ):
+        field = "filters"
+    elif "last_key" not in state or (
+        last_key is not None
+        and (isinstance(last_key, bool) or not isinstance(last_key, (str, int, float)))
+    ):
+        field = "last_key"
+    elif isinstance(last_seq, bool) or not isinstance(last_seq, int):
+        field = "last_seq"
+    else:
+        return state
+    raise InvalidCursorError(f"Invalid pagination cursor: bad {field}")
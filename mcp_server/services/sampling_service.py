@@ -0,0 +1,271 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Stratified sampling estimates of tag compliance.
+
+An exact scan validates every resource and, for the cost gap, queries
+Cost Explorer per resource type. For a quick read on a very large estate
+this service validates a random sample instead:
+
+- The listed inventory is split into strata by (region, resource_type)
+  and the sample is allocated proportionally to stratum size, with at
+  least two resources per stratum so every stratum has a variance.
+- Only drawn resources are validated, so the caller can list the
+  inventory without per-resource tag calls and resolve tags for the
+  sample alone (see clients.aws_client.defer_tag_lookups). Resource
+  costs come from one Cost Explorer query split by service and region.
+- The compliance score and cost attribution gap are estimated with the
+  stratified estimators, and confidence intervals use the normal
+  approximation with the finite population correction. Sampling every
+  resource in a stratum makes its variance zero, so estimates converge
+  to the exact scan as the sample grows.
+"""
+
+import logging
+import math
+import random
+from collections import defaultdict
+from statistics import NormalDist
+
+from ..models.enums import Severity
+from ..models.rollup import ComplianceRollup
+from ..models.sampling import (
+    ConfidenceInterval,
+    SampledComplianceResult,
+    SamplingStratum,
+    SamplingSummary,
+)
+from ..models.violations import Violation
+from .policy_service import PolicyService
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIDENCE_LEVEL = 0.95
+MIN_PER_STRATUM = 2
+
+# (region, resource_type) -> (stratum size, drawn resources)
+Sample = dict[tuple[str, str], tuple[int, list[dict]]]
+
+
+class SamplingService:
+    """Estimates compliance from a stratified random sample of resources."""
+
+    def __init__(self, policy_service: PolicyService, seed: int | None = None):
+        """
+        Initialize the sampling service.
+
+        Args:
+            policy_service: PolicyService used to validate sampled resources
+            seed: Optional random seed for reproducible samples
+        """
+        self.policy_service = policy_service
+        self._random = random.Random(seed)
+
+    def estimate(
+        self,
+        resources: list[dict],
+        sample_size: int,
+        severity: str = "all",
+        confidence_level: float = DEFAULT_CONFIDENCE_LEVEL,
+    ) -> SampledComplianceResult:
+        """
+        Estimate compliance for a resource inventory from a stratified sample.
+
+        Args:
+            resources: Listed resources (resource_id, resource_type, region, tags, ...)
+            sample_size: Total resources to validate across all strata
+            severity: Severity filter for the returned violations
+            confidence_level: Confidence level of the intervals (0 < level < 1)
+
+        Returns:
+            SampledComplianceResult with estimates, intervals and sample details
+
+        Raises:
+            ValueError: If sample_size or confidence_level is out of range
+        """
+        return self.estimate_sample(
+            self.draw(resources, sample_size),
+            severity=severity,
+            confidence_level=confidence_level,
+        )
+
+    def draw(self, resources: list[dict], sample_size: int) -> Sample:
+        """
+        Draw a stratified random sample without validating it.
+
+        Only the drawn resources' tags are read by estimate_sample, so
+        resources listed under defer_tag_lookups() can have their tags
+        resolved after the draw.
+
+        Args:
+            resources: Listed resources (resource_id, resource_type, region, ...)
+            sample_size: Total resources to draw across all strata
+
+        Returns:
+            Dict mapping (region, resource_type) to (stratum size, drawn resources)
+
+        Raises:
+            ValueError: If sample_size is less than 1
+        """
+        if sample_size < 1:
+            raise ValueError("sample_size must be at least 1")
+
+        strata: dict[tuple[str, str], list[dict]] = defaultdict(list)
+        for resource in resources:
+            if self._in_scope(resource):
+                strata[(resource["region"], resource["resource_type"])].append(resource)
+
+        population = sum(len(members) for members in strata.values())
+        allocation = self._allocate(strata, sample_size, population)
+        return {
+            key: (len(members), self._random.sample(members, allocation[key]))
+            for key, members in sorted(strata.items())
+        }
+
+    def estimate_sample(
+        self,
+        sample: Sample,
+        severity: str = "all",
+        confidence_level: float = DEFAULT_CONFIDENCE_LEVEL,
+        cost_estimated: bool = True,
+        failed_regions: list[str] | None = None,
+        failed_resource_types: list[str] | None = None,
+    ) -> SampledComplianceResult:
+        """
+        Validate a drawn sample and estimate compliance for its population.
+
+        Args:
+            sample: Stratified sample from draw()
+            severity: Severity filter for the returned violations
+            confidence_level: Confidence level of the intervals (0 < level < 1)
+            cost_estimated: False if resources have no cost_impact because
+                Cost Explorer couldn't be queried
+            failed_regions: Regions whose listing failed, so they have no strata
+            failed_resource_types: Resource types whose listing failed in at
+                least one region
+
+        Returns:
+            SampledComplianceResult with estimates, intervals and sample details
+
+        Raises:
+            ValueError: If confidence_level is out of range
+        """
+        if not 0.0 < confidence_level < 1.0:
+            raise ValueError("confidence_level must be between 0 and 1")
+
+        population = sum(size for size, _ in sample.values())
+        z = NormalDist().inv_cdf((1 + confidence_level) / 2)
+        score = score_variance = 0.0
+        cost_gap = cost_variance = 0.0
+        sampled = compliant_total = 0
+        stratum_summaries = []
+        violations: list[Violation] = []
+        rollup = ComplianceRollup()
+
+        for (region, resource_type), (size, drawn) in sample.items():
+            n = len(drawn)
+            compliant = 0
+            costs = []
+            for resource in drawn:
+                found = self.policy_service.validate_resource_tags(
+                    resource_id=resource["resource_id"],
+                    resource_type=resource["resource_type"],
+                    region=resource["region"],
+                    tags=resource["tags"],
+                    cost_impact=resource.get("cost_impact", 0.0),
+                )
+                if not found:
+                    compliant += 1
+                costs.append(sum(v.cost_impact_monthly for v in found))
+                kept = self._filter_by_severity(found, severity)
+                violations.extend(kept)
+                rollup.add_all(kept)
+
+            weight = size / population
+            fpc = 1 - n / size
+            p = compliant / n
+            mean_cost = sum(costs) / n
+            score += weight * p
+            cost_gap += size * mean_cost
+            if n > 1:
+                score_variance += weight**2 * fpc * p * (1 - p) / (n - 1)
+                cost_sd2 = sum((c - mean_cost) ** 2 for c in costs) / (n - 1)
+                cost_variance += size**2 * fpc * cost_sd2 / n
+
+            sampled += n
+            compliant_total += compliant
+            stratum_summaries.append(
+                SamplingStratum(
+                    region=region,
+                    resource_type=resource_type,
+                    population=size,
+                    sample_size=n,
+                    compliant_in_sample=compliant,
+                )
+            )
+
+        if population == 0:
+            score = 1.0
+        score_margin = z * math.sqrt(score_variance)
+        cost_margin = z * math.sqrt(cost_variance)
+
+        logger.info(
+            f"Sampled {sampled} of {population} resources in {len(sample)} strata: "
+            f"score={score:.2%} ±{score_margin:.2%}, cost gap=${cost_gap:.2f} ±${cost_margin:.2f}"
+        )
+
+        return SampledComplianceResult(
+            compliance_score=min(max(score, 0.0), 1.0),
+            total_resources=population,
+            compliant_resources=min(round(score * population), population),
+            violations=violations,
+            cost_attribution_gap=cost_gap,
+            rollup=rollup,
+            sampling=SamplingSummary(
+                sample_size=sampled,
+                population=population,
+                confidence_level=confidence_level,
+                compliance_score_ci=ConfidenceInterval(
+                    lower=max(score - score_margin, 0.0),
+                    upper=min(score + score_margin, 1.0),
+                ),
+                cost_attribution_gap_ci=ConfidenceInterval(
+                    lower=max(cost_gap - cost_margin, 0.0),
+                    upper=cost_gap + cost_margin,
+                ),
+                strata=stratum_summaries,
+                cost_estimated=cost_estimated,
+                failed_regions=failed_regions or [],
+                failed_resource_types=failed_resource_types or [],
+                exact=sampled == population,
+            ),
+        )
+
+    def _in_scope(self, resource: dict) -> bool:
+        """Same scope rules as a full scan: live resources with policy rules."""
+        state = resource.get("instance_state", "")
+        if state and state.lower() in ("terminated", "shutting-down"):
+            return False
+        return bool(self.policy_service.get_required_tags(resource.get("resource_type", "")))
+
+    @staticmethod
+    def _allocate(
+        strata: dict[tuple[str, str], list[dict]], sample_size: int, population: int
+    ) -> dict[tuple[str, str], int]:
+        """Proportional allocation, at least MIN_PER_STRATUM, capped at stratum size."""
+        return {
+            key: min(
+                len(members),
+                max(MIN_PER_STRATUM, round(sample_size * len(members) / population)),
+            )
+            for key, members in strata.items()
+        }
+
+    @staticmethod
+    def _filter_by_severity(violations: list[Violation], severity: str) -> list[Violation]:
+        if severity == "errors_only":
+            return [v for v in violations if v.severity == Severity.ERROR]
+        if severity == "warnings_only":
+            return [v for v in violations if v.severity == Severity.WARNING]
+        return violations
@@ -0,0 +1,386 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Background compliance scan jobs.
+
+A full multi-region scan can take several minutes, longer than MCP
+clients wait for a single tool call. ScanJobService runs scans as
+asyncio tasks on the server's event loop and returns a job ID at once;
+clients poll for progress and fetch the result when it is ready.
+
+Job state (status, progress, final result) lives in SQLite so a client
+that reconnects can still look up its job. Jobs that were running when
+the server stopped are marked failed on the next start. Database work
+runs on an SQLitePool (see clients/sqlite_pool.py), and results are
+encoded and decoded on its threads, so storing or fetching a large
+result never blocks other tool calls.
+
+A job outlives the tool call that started it, so its task runs in a
+fresh context rather than a copy of the caller's: it gets its own
+correlation ID, stage timings and AWS call ledger, and writes its own
+"scan_job" audit entry when it finishes.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from ..clients.sqlite_pool import SQLitePool
+from ..models.audit import AuditStatus
+from ..models.scan_job import ScanJob, ScanJobStatus, ScanProgress
+from ..utils.api_ledger import clear_api_ledger, start_api_ledger
+from ..utils.correlation import generate_correlation_id, set_correlation_id
+from ..utils.timing import clear_request_timings, start_request_timings
+from .audit_service import AuditService
+from .multi_region_scanner import ProgressCallback
+
+logger = logging.getLogger(__name__)
+
+# Runs the scan, reporting progress through the callback, and returns the
+# JSON-serializable result payload
+JobRunner = Callable[[ProgressCallback], Awaitable[dict[str, Any]]]
+
+
+class ScanJobNotFoundError(Exception):
+    """Raised when a job ID does not match any stored job."""
+
+
+class ScanJobService:
+    """Service for starting, tracking and retrieving background scan jobs."""
+
+    def __init__(
+        self,
+        db_path: str = "scan_jobs.db",
+        max_concurrent_jobs: int = 2,
+        retention_hours: int = 24,
+        audit_service: AuditService | None = None,
+        timings_enabled: bool = True,
+    ):
+        """
+        Initialize the scan job service.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_concurrent_jobs: Jobs allowed to scan at once. Further jobs
+                                stay pending until a slot frees up.
+            retention_hours: Finished jobs older than this are deleted
+            audit_service: Optional audit log for each job's outcome,
+                           stage timings and AWS calls
+            timings_enabled: Collect stage timings while a job runs
+        """
+        self.db_path = db_path
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.retention_hours = retention_hours
+        self.audit_service = audit_service
+        self.timings_enabled = timings_enabled
+        self._semaphore: asyncio.Semaphore | None = None
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._pool = SQLitePool(db_path, init=self._init_database)
+
+    def _init_database(self, conn: sqlite3.Connection) -> None:
+        """Create the scan_jobs table and fail jobs orphaned by a restart."""
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS scan_jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                parameters TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                completed_at TEXT,
+                progress TEXT,
+                error TEXT,
+                result TEXT
+            )
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_scan_jobs_created_at
+            ON scan_jobs(created_at)
+            """
+        )
+        # No task survives a restart, so unfinished jobs can never complete
+        cursor = conn.execute(
+            """
+            UPDATE scan_jobs
+            SET status = ?, error = ?, completed_at = ?
+            WHERE status IN (?, ?)
+            """,
+            (
+                ScanJobStatus.FAILED.value,
+                "Server restarted before the scan finished. Start a new scan.",
+                datetime.now(UTC).isoformat(),
+                ScanJobStatus.PENDING.value,
+                ScanJobStatus.RUNNING.value,
+            ),
+        )
+        if cursor.rowcount:
+            logger.warning(f"Marked {cursor.rowcount} interrupted scan job(s) as failed")
+
+    async def start_job(self, parameters: dict[str, Any], runner: JobRunner) -> ScanJob:
+        """
+        Record a new job and start running it in the background.
+
+        Args:
+            parameters: Tool parameters, stored for display in status responses
+            runner: Coroutine function performing the scan
+
+        Returns:
+            The newly created job (status pending)
+        """
+        await self._purge_expired()
+
+        job = ScanJob(
+            job_id=uuid.uuid4().hex,
+            status=ScanJobStatus.PENDING,
+            parameters=parameters,
+            created_at=datetime.now(UTC),
+        )
+        await self._pool.execute(
+            """
+            INSERT INTO scan_jobs (job_id, status, parameters, created_at)
+            VALUES (?, ?, ?, ?)
+            """,
+            (
+                job.job_id,
+                job.status.value,
+                json.dumps(parameters, default=str),
+                job.created_at.isoformat(),
+            ),
+        )
+
+        # An empty context: nothing of the starting request (its ledger,
+        # timings or deadline) carries over into the job
+        task = contextvars.Context().run(
+            asyncio.create_task, self._run_job(job.job_id, parameters, runner)
+        )
+        self._tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.job_id, None))
+
+        logger.info(f"Scan job {job.job_id} submitted: {parameters}")
+        return job
+
+    async def _run_job(
+        self, job_id: str, parameters: dict[str, Any], runner: JobRunner
+    ) -> None:
+        """Run a job once a slot is free and record its outcome."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
+
+        correlation_id = generate_correlation_id()
+        set_correlation_id(correlation_id)
+        timings = start_request_timings() if self.timings_enabled else None
+        ledger = start_api_ledger(correlation_id)
+        started = time.perf_counter()
+        error: str | None = None
+        try:
+            async with self._semaphore:
+                await self._update(
+                    job_id,
+                    status=ScanJobStatus.RUNNING.value,
+                    started_at=datetime.now(UTC).isoformat(),
+                )
+
+                async def on_progress(progress: ScanProgress) -> None:
+                    await self._update(job_id, progress=progress.model_dump_json())
+
+                result = await runner(on_progress)
+
+            await self._update(
+                job_id,
+                status=ScanJobStatus.COMPLETED.value,
+                completed_at=datetime.now(UTC).isoformat(),
+                result=result,
+            )
+            logger.info(f"Scan job {job_id} completed")
+        except asyncio.CancelledError:
+            error = "Cancelled at shutdown"
+            await self._update(
+                job_id,
+                status=ScanJobStatus.FAILED.value,
+                completed_at=datetime.now(UTC).isoformat(),
+                error="Server shut down before the scan finished. Start a new scan.",
+            )
+            raise
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Scan job {job_id} failed: {e}")
+            await self._update(
+                job_id,
+                status=ScanJobStatus.FAILED.value,
+                completed_at=datetime.now(UTC).isoformat(),
+                error=error,
+            )
+        finally:
+            clear_request_timings()
+            clear_api_ledger()
+            if self.audit_service is not None:
+                try:
+                    self.audit_service.log_invocation(
+                        tool_name="scan_job",
+                        parameters={"job_id": job_id, **parameters},
+                        status=AuditStatus.FAILURE if error else AuditStatus.SUCCESS,
+                        error_message=error,
+                        execution_time_ms=(time.perf_counter() - started) * 1000,
+                        correlation_id=correlation_id,
+                        stage_timings=timings.stage_dict() if timings else None,
+                        aws_calls=ledger.rows() or None,
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to audit scan job {job_id}: {e}")
+
+    async def _update(
+        self, job_id: str, result: dict[str, Any] | None = None, **columns: str
+    ) -> None:
+        """Write the given columns of a job row, and its result payload if given."""
+
+        def update(conn: sqlite3.Connection) -> None:
+            values = dict(columns)
+            if result is not None:
+                # Encoded on the writer thread: large results don't block the loop
+                values["result"] = json.dumps(result, default=str)
+            assignments = ", ".join(f"{name} = ?" for name in values)
+            conn.execute(
+                f"UPDATE scan_jobs SET {assignments} WHERE job_id = ?",
+                (*values.values(), job_id),
+            )
+
+        await self._pool.write(update)
+
+    async def get_job(self, job_id: str) -> ScanJob:
+        """
+        Look up a job's status and latest progress.
+
+        Args:
+            job_id: Job identifier returned by start_job
+
+        Returns:
+            The stored job
+
+        Raises:
+            ScanJobNotFoundError: If no job has this ID (or it has expired)
+        """
+        rows = await self._pool.fetchall(
+            """
+            SELECT job_id, status, parameters, created_at, started_at,
+                   completed_at, progress, error
+            FROM scan_jobs WHERE job_id = ?
+            """,
+            (job_id,),
+        )
+
+        if not rows:
+            raise ScanJobNotFoundError(f"Scan job not found: {job_id}")
+        return self._row_to_job(rows[0])
+
+    async def get_result(self, job_id: str) -> dict[str, Any] | None:
+        """
+        Get the result payload of a job.
+
+        Args:
+            job_id: Job identifier returned by start_job
+
+        Returns:
+            The result payload, or None if the job has not completed
+
+        Raises:
+            ScanJobNotFoundError: If no job has this ID (or it has expired)
+        """
+
+        def load(conn: sqlite3.Connection) -> tuple[bool, dict[str, Any] | None]:
+            row = conn.execute(
+                "SELECT result FROM scan_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return False, None
+            # Decoded on the reader thread, like the encoding on the writer
+            return True, json.loads(row[0]) if row[0] else None
+
+        found, result = await self._pool.read(load)
+        if not found:
+            raise ScanJobNotFoundError(f"Scan job not found: {job_id}")
+        return result
+
+    async def list_jobs(self, limit: int = 20) -> list[ScanJob]:
+        """
+        List the most recent jobs, newest first.
+
+        Args:
+            limit: Maximum number of jobs to return
+
+        Returns:
+            List of jobs without their result payloads
+        """
+        rows = await self._pool.fetchall(
+            """
+            SELECT job_id, status, parameters, created_at, started_at,
+                   completed_at, progress, error
+            FROM scan_jobs ORDER BY created_at DESC LIMIT ?
+            """,
+            (limit,),
+        )
+        return [self._row_to_job(row) for row in rows]
+
+    async def wait_for_job(self, job_id: str, timeout: float | None = None) -> ScanJob:
+        """
+        Wait for a job started by this process to finish.
+
+        Args:
+            job_id: Job identifier returned by start_job
+            timeout: Optional maximum seconds to wait
+
+        Returns:
+            The job after it finished (or its state when the timeout expired)
+        """
+        task = self._tasks.get(job_id)
+        if task is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+            except TimeoutError:
+                pass
+        return await self.get_job(job_id)
+
+    async def shutdown(self) -> None:
+        """Cancel running jobs, recording them as failed."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            logger.info(f"Cancelled {len(tasks)} unfinished scan job(s)")
+
+    async def _purge_expired(self) -> None:
+        """Delete finished jobs older than the retention period."""
+        cutoff = datetime.now(UTC) - timedelta(hours=self.retention_hours)
+        await self._pool.execute(
+            "DELETE FROM scan_jobs WHERE created_at < ? AND status IN (?, ?)",
+            (cutoff.isoformat(), ScanJobStatus.COMPLETED.value, ScanJobStatus.FAILED.value),
+        )
+
+    def close(self) -> None:
+        """Commit pending writes and close the database connections."""
+        self._pool.close()
+
+    @staticmethod
+    def _row_to_job(row: tuple) -> ScanJob:
+        """Convert a scan_jobs row to a ScanJob."""
+        job_id, status, parameters, created_at, started_at, completed_at, progress, error = row
+        return ScanJob(
+            job_id=job_id,
+            status=ScanJobStatus(status),
+            parameters=json.loads(parameters),
+            created_at=datetime.fromisoformat(created_at),
+            started_at=datetime.fromisoformat(started_at) if started_at else None,
+            completed_at=datetime.fromisoformat(completed_at) if completed_at else None,
+            progress=ScanProgress.model_validate_json(progress) if progress else None,
+            error=error,
+        )
@@ -0,0 +1,158 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Sources of CloudTrail tag change events for incremental rescans.
+
+Two sources share one receive/ack interface:
+
+- DirectoryEventSource reads files dropped into a directory (CloudTrail
+  log files, optionally gzipped, or JSON lines) and moves each one into
+  a processed/ subdirectory once its events are applied.
+- QueueEventSource reads an SQS queue (e.g. fed by an EventBridge rule on
+  tagging API calls) and deletes messages once applied. It takes any
+  client with the SQS receive_message/delete_message calls: a boto3 SQS
+  client, or LocalQueue, an in-memory stand-in for tests and local runs.
+
+Messages are only acknowledged after their events are applied, so a
+failure part-way leaves them to be received again.
+"""
+
+import gzip
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple, Protocol
+
+logger = logging.getLogger(__name__)
+
+# SQS returns at most 10 messages per receive call
+SQS_MAX_MESSAGES = 10
+
+
+class EventMessage(NamedTuple):
+    """A received message: its body and the handle used to acknowledge it."""
+
+    receipt: str
+    body: str
+
+
+class TagEventSource(Protocol):
+    """Where incremental rescans read tag change events from."""
+
+    def receive(self, max_messages: int) -> list[EventMessage]: ...
+
+    def ack(self, messages: list[EventMessage]) -> None: ...
+
+
+class DirectoryEventSource:
+    """Event files dropped into a local directory."""
+
+    PATTERNS = ("*.json", "*.json.gz", "*.jsonl", "*.jsonl.gz")
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.processed_dir = self.path / "processed"
+
+    def receive(self, max_messages: int) -> list[EventMessage]:
+        """Read up to max_messages files, oldest name first."""
+        if not self.path.is_dir():
+            return []
+        files = sorted(
+            {f for pattern in self.PATTERNS for f in self.path.glob(pattern) if f.is_file()}
+        )
+        messages = []
+        for file in files[:max_messages]:
+            try:
+                if file.suffix == ".gz":
+                    body = gzip.decompress(file.read_bytes()).decode()
+                else:
+                    body = file.read_text()
+            except OSError as e:
+                logger.warning(f"Could not read event file {file}: {e}")
+                continue
+            messages.append(EventMessage(str(file), body))
+        return messages
+
+    def ack(self, messages: list[EventMessage]) -> None:
+        """Move applied files into processed/."""
+        self.processed_dir.mkdir(exist_ok=True)
+        for message in messages:
+            file = Path(message.receipt)
+            file.replace(self.processed_dir / file.name)
+
+
+class QueueEventSource:
+    """Messages from an SQS queue (or LocalQueue)."""
+
+    def __init__(self, client, queue_url: str):
+        """
+        Args:
+            client: boto3 SQS client or LocalQueue
+            queue_url: URL of the queue to read
+        """
+        self.client = client
+        self.queue_url = queue_url
+
+    def receive(self, max_messages: int) -> list[EventMessage]:
+        """Receive up to max_messages without waiting for new ones."""
+        messages: list[EventMessage] = []
+        while len(messages) < max_messages:
+            response = self.client.receive_message(
+                QueueUrl=self.queue_url,
+                MaxNumberOfMessages=min(SQS_MAX_MESSAGES, max_messages - len(messages)),
+                WaitTimeSeconds=0,
+            )
+            batch = response.get("Messages", [])
+            if not batch:
+                break
+            messages.extend(EventMessage(m["ReceiptHandle"], m["Body"]) for m in batch)
+        return messages
+
+    def ack(self, messages: list[EventMessage]) -> None:
+        """Delete applied messages from the queue."""
+        for message in messages:
+            self.client.delete_message(QueueUrl=self.queue_url, ReceiptHandle=message.receipt)
+
+
+class LocalQueue:
+    """In-memory stand-in for the SQS calls QueueEventSource uses.
+
+    Received messages are hidden for visibility_timeout seconds and come
+    back if they are not deleted in time, as in SQS.
+    """
+
+    def __init__(self, visibility_timeout: float = 30.0):
+        self.visibility_timeout = visibility_timeout
+        # message id -> (body, visible again at)
+        self._messages: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._ids = itertools.count(1)
+
+    def send_message(self, QueueUrl: str, MessageBody: str) -> dict:  # noqa: N803
+        message_id = str(next(self._ids))
+        self._messages[message_id] = (MessageBody, 0.0)
+        return {"MessageId": message_id}
+
+    def receive_message(
+        self, QueueUrl: str, MaxNumberOfMessages: int = 1, WaitTimeSeconds: int = 0  # noqa: N803
+    ) -> dict:
+        now = time.monotonic()
+        messages = []
+        for message_id, (body, visible_at) in self._messages.items():
+            if len(messages) == MaxNumberOfMessages:
+                break
+            if visible_at <= now:
+                self._messages[message_id] = (body, now + self.visibility_timeout)
+                messages.append(
+                    {"MessageId": message_id, "ReceiptHandle": message_id, "Body": body}
+                )
+        return {"Messages": messages} if messages else {}
+
+    def delete_message(self, QueueUrl: str, ReceiptHandle: str) -> dict:  # noqa: N803
+        self._messages.pop(ReceiptHandle, None)
+        return {}
+
+    def __len__(self) -> int:
+        return len(self._messages)
@@ -0,0 +1,640 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Per-resource tag state, recorded after each scan, for drift detection.
+
+HistoryService keeps aggregate scores only, which can't tell which tag
+changed on which resource. This store keeps each resource's tag set over
+time, compactly:
+
+- tag_sets holds every distinct tag set once, keyed by a hash of its
+  canonical JSON. Thousands of resources sharing the same tags share one
+  row.
+- resource_tag_state holds one row per (ARN, period with the same tags):
+  the tag hash plus first/last time it was seen. A rescan with unchanged
+  tags only moves last_seen, so rows are added only when tags change.
+- tag_state_scans records when state was written; drift baselines are
+  picked from these times.
+- tag_state_digests holds the hierarchical digest tree (see
+  utils/tag_digest.py) of each recording, so a later comparison can skip
+  every subtree whose digest is unchanged.
+
+Between scans, tag change events patch individual resources in place
+(patch_state); a deleted resource gets a tombstone row, an empty tag hash.
+
+Writes and diffs are sorted merges over ARN order (the primary key), so
+both are linear in the number of resources. They run on an SQLitePool
+(see clients/sqlite_pool.py): a recording or patch is one write job on
+the writer thread, and diffs and lookups run on reader threads.
+"""
+
+import json
+import logging
+import sqlite3
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
+
+from ..clients.sqlite_pool import DEFAULT_READERS, SQLitePool
+from ..models.tag_state import TagStateBaseline
+from ..utils.tag_digest import NodePath, TagDigestTree, leaf_path, tag_set_hash
+
+logger = logging.getLogger(__name__)
+
+# Baseline rows are read in batches of this many while merging
+_FETCH_SIZE = 5000
+
+# Recordings closer together than this belong to the same scan
+SCAN_SESSION_GAP = timedelta(minutes=15)
+
+# tag_hash of the row recording a resource's deletion
+TOMBSTONE = ""
+
+# ARNs per IN (...) lookup, below SQLite's host parameter limit
+_LOOKUP_CHUNK = 500
+
+
+class ResourceTagChange(NamedTuple):
+    """A resource whose tags differ between the baseline and now.
+
+    old_tags is None for resources new since the baseline; new_tags is
+    None for resources no longer present.
+    """
+
+    arn: str
+    resource_type: str
+    region: str
+    old_tags: dict[str, str] | None
+    new_tags: dict[str, str] | None
+
+
+class TagStateService:
+    """Service for recording per-resource tag state and diffing against it."""
+
+    def __init__(
+        self,
+        db_path: str = "tag_state.db",
+        retention_days: int = 90,
+        readers: int = DEFAULT_READERS,
+    ):
+        """
+        Initialize the tag state store.
+
+        Args:
+            db_path: Path to the SQLite database file
+            retention_days: State not seen for this many days is deleted
+            readers: Reader threads for diffs and lookups
+        """
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self._pool = SQLitePool(db_path, readers=readers, init=self._init_database)
+
+    def _init_database(self, conn: sqlite3.Connection) -> None:
+        """Create the tag state tables and their indexes."""
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tag_sets (
+                tag_hash TEXT PRIMARY KEY,
+                tags TEXT NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS resource_tag_state (
+                arn TEXT NOT NULL,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                tag_hash TEXT NOT NULL,
+                resource_type TEXT NOT NULL,
+                region TEXT NOT NULL,
+                PRIMARY KEY (arn, first_seen)
+            ) WITHOUT ROWID
+            """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_resource_tag_state_last_seen
+            ON resource_tag_state(last_seen)
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tag_state_scans (
+                scanned_at TEXT PRIMARY KEY,
+                resource_count INTEGER NOT NULL
+            )
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tag_state_digests (
+                scanned_at TEXT NOT NULL,
+                path TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                resource_count INTEGER NOT NULL,
+                PRIMARY KEY (scanned_at, path)
+            ) WITHOUT ROWID
+            """
+        )
+
+    async def record_state(
+        self, resources: Iterable[dict], scanned_at: datetime | None = None
+    ) -> int:
+        """
+        Record the current tags of scanned resources.
+
+        Resources are merged against each ARN's latest state in ARN order:
+        unchanged tag sets only extend last_seen, changed ones start a new
+        row. The digest tree of the recorded resources is stored with the
+        recording. Resources without an ARN are skipped.
+
+        Args:
+            resources: Resource dicts with arn, tags, resource_type and region
+            scanned_at: Scan time (default: now)
+
+        Returns:
+            Number of resources recorded
+        """
+        scanned_at = scanned_at or datetime.now(UTC)
+        timestamp = scanned_at.isoformat()
+
+        incoming = sorted(
+            (
+                (
+                    r["arn"],
+                    r.get("tags") or {},
+                    r.get("resource_type") or "",
+                    r.get("region") or "",
+                )
+                for r in resources
+                if r.get("arn")
+            ),
+            key=lambda row: row[0],
+        )
+
+        def record(conn: sqlite3.Connection) -> tuple[int, int]:
+            self._purge_expired(conn, scanned_at)
+
+            touched: list[tuple[str, str, str]] = []
+            inserted: list[tuple[str, str, str, str, str, str]] = []
+            tag_sets: dict[str, str] = {}
+            leaves: dict[NodePath, list[tuple[str, str]]] = {}
+            latest = self._iter_latest(conn, [row[0] for row in incoming])
+
+            current = next(latest, None)
+            for arn, tags, resource_type, region in incoming:
+                while current is not None and current[0] < arn:
+                    current = next(latest, None)
+                tag_hash = tag_set_hash(tags)
+                leaves.setdefault(leaf_path(arn, region, resource_type), []).append(
+                    (arn, tag_hash)
+                )
+                if current is not None and current[0] == arn and current[2] == tag_hash:
+                    touched.append((timestamp, arn, current[1]))
+                else:
+                    inserted.append((arn, timestamp, timestamp, tag_hash, resource_type, region))
+                    if tag_hash not in tag_sets:
+                        tag_sets[tag_hash] = json.dumps(tags, sort_keys=True)
+
+            conn.executemany(
+                "INSERT OR IGNORE INTO tag_sets (tag_hash, tags) VALUES (?, ?)",
+                tag_sets.items(),
+            )
+            conn.executemany(
+                "UPDATE resource_tag_state SET last_seen = ? WHERE arn = ? AND first_seen = ?",
+                touched,
+            )
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO resource_tag_state
+                (arn, first_seen, last_seen, tag_hash, resource_type, region)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                inserted,
+            )
+            conn.execute(
+                """
+                INSERT INTO tag_state_scans (scanned_at, resource_count) VALUES (?, ?)
+                ON CONFLICT(scanned_at) DO UPDATE
+                SET resource_count = resource_count + excluded.resource_count
+                """,
+                (timestamp, len(incoming)),
+            )
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO tag_state_digests
+                (scanned_at, path, digest, resource_count) VALUES (?, ?, ?, ?)
+                """,
+                (
+                    (timestamp, *row)
+                    for row in TagDigestTree.from_leaf_entries(leaves).iter_rows()
+                ),
+            )
+            return len(inserted), len(tag_sets)
+
+        inserted, new_tag_sets = await self._pool.write(record)
+
+        logger.info(
+            f"Recorded tag state for {len(incoming)} resources "
+            f"({inserted} new or changed, {new_tag_sets} new tag sets)"
+        )
+        return len(incoming)
+
+    def _iter_latest(
+        self, conn: sqlite3.Connection, arns: list[str]
+    ) -> Iterator[tuple[str, str, str]]:
+        """Latest (arn, first_seen, tag_hash) per ARN in [arns[0], arns[-1]], in ARN order."""
+        if not arns:
+            return iter(())
+        cursor = conn.execute(
+            """
+            SELECT arn, MAX(first_seen), tag_hash
+            FROM resource_tag_state
+            WHERE arn BETWEEN ? AND ?
+            GROUP BY arn
+            ORDER BY arn
+            """,
+            (arns[0], arns[-1]),
+        )
+        return self._iter_cursor(cursor)
+
+    @staticmethod
+    def _iter_cursor(cursor: sqlite3.Cursor) -> Iterator[tuple]:
+        while rows := cursor.fetchmany(_FETCH_SIZE):
+            yield from rows
+
+    async def current_state(
+        self, arns: Iterable[str]
+    ) -> dict[str, tuple[dict[str, str], str, str]]:
+        """
+        Latest recorded state of the given resources.
+
+        Args:
+            arns: Resource ARNs to look up
+
+        Returns:
+            Map of ARN -> (tags, resource_type, region) for resources that are
+            recorded and not deleted
+        """
+        live = {
+            arn: row
+            for arn, row in (await self._latest_rows(arns)).items()
+            if row[1] != TOMBSTONE
+        }
+        hashes = {row[1] for row in live.values()}
+        tags_by_hash = await self._pool.read(lambda conn: self._load_tag_sets(conn, hashes))
+        return {
+            arn: (tags_by_hash[tag_hash], resource_type, region)
+            for arn, (_, tag_hash, resource_type, region) in live.items()
+        }
+
+    @staticmethod
+    def _load_tag_sets(conn: sqlite3.Connection, hashes: set[str]) -> dict[str, dict[str, str]]:
+        hashes = sorted(hashes)
+        tag_sets = {}
+        for start in range(0, len(hashes), _LOOKUP_CHUNK):
+            chunk = hashes[start : start + _LOOKUP_CHUNK]
+            rows = conn.execute(
+                f"SELECT tag_hash, tags FROM tag_sets WHERE tag_hash IN "
+                f"({', '.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            tag_sets.update((tag_hash, json.loads(tags)) for tag_hash, tags in rows)
+        return tag_sets
+
+    async def patch_state(
+        self,
+        changes: Iterable[tuple[str, dict[str, str] | None, str, str]],
+        changed_at: datetime | None = None,
+    ) -> int:
+        """
+        Apply individual resource changes between scans.
+
+        Unlike record_state, this is not a scan: no scan time or digests are
+        recorded, so patches are never picked as drift baselines.
+
+        Args:
+            changes: (arn, tags, resource_type, region) per resource; tags of
+                     None records the resource as deleted
+            changed_at: When the changes happened (default: now)
+
+        Returns:
+            Number of resources whose recorded state changed
+        """
+        changes = list(changes)
+        timestamp = (changed_at or datetime.now(UTC)).isoformat()
+
+        def patch(conn: sqlite3.Connection) -> int:
+            latest = self._load_latest_rows(conn, [arn for arn, *_ in changes])
+            touched: list[tuple[str, str, str]] = []
+            inserted: list[tuple[str, str, str, str, str, str]] = []
+            tag_sets: dict[str, str] = {}
+            for arn, tags, resource_type, region in changes:
+                tag_hash = TOMBSTONE if tags is None else tag_set_hash(tags)
+                first_seen, old_hash, _, _ = latest.get(arn, (None, None, None, None))
+                if old_hash == tag_hash:
+                    touched.append((timestamp, arn, first_seen))
+                    continue
+                if tags is None and old_hash in (None, TOMBSTONE):
+                    continue
+                inserted.append((arn, timestamp, timestamp, tag_hash, resource_type, region))
+                if tags is not None:
+                    tag_sets.setdefault(tag_hash, json.dumps(tags, sort_keys=True))
+
+            conn.executemany(
+                "INSERT OR IGNORE INTO tag_sets (tag_hash, tags) VALUES (?, ?)",
+                tag_sets.items(),
+            )
+            conn.executemany(
+                "UPDATE resource_tag_state SET last_seen = ? WHERE arn = ? AND first_seen = ?",
+                touched,
+            )
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO resource_tag_state
+                (arn, first_seen, last_seen, tag_hash, resource_type, region)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                inserted,
+            )
+            return len(inserted)
+
+        # Reading the latest rows on the writer keeps the merge consistent
+        # with writes queued before it
+        return await self._pool.write(patch)
+
+    async def _latest_rows(self, arns: Iterable[str]) -> dict[str, tuple[str, str, str, str]]:
+        """ARN -> (first_seen, tag_hash, resource_type, region) of each ARN's latest row."""
+        arns = list(arns)
+        return await self._pool.read(lambda conn: self._load_latest_rows(conn, arns))
+
+    @staticmethod
+    def _load_latest_rows(
+        conn: sqlite3.Connection, arns: Iterable[str]
+    ) -> dict[str, tuple[str, str, str, str]]:
+        arns = sorted(set(arns))
+        latest = {}
+        for start in range(0, len(arns), _LOOKUP_CHUNK):
+            chunk = arns[start : start + _LOOKUP_CHUNK]
+            rows = conn.execute(
+                f"""
+                SELECT arn, MAX(first_seen), tag_hash, resource_type, region
+                FROM resource_tag_state
+                WHERE arn IN ({", ".join("?" * len(chunk))})
+                GROUP BY arn
+                """,
+                chunk,
+            ).fetchall()
+            latest.update((row[0], row[1:]) for row in rows)
+        return latest
+
+    async def find_baseline(
+        self, lookback_days: int, now: datetime | None = None
+    ) -> TagStateBaseline | None:
+        """
+        Find the recorded scan nearest to lookback_days ago.
+
+        A multi-region scan records each region separately a few seconds
+        apart; recordings less than SCAN_SESSION_GAP apart are treated as
+        one scan, and the baseline time is the end of that scan.
+
+        Args:
+            lookback_days: How far back the baseline should be
+            now: Reference time (default: now)
+
+        Returns:
+            TagStateBaseline, or None if no state has been recorded before now
+        """
+        now = now or datetime.now(UTC)
+        target_time = now - timedelta(days=lookback_days)
+        target = target_time.isoformat()
+
+        def load_session(conn: sqlite3.Connection) -> tuple[datetime, list[tuple]] | None:
+            # Nearest scan at or before the target, and nearest after it
+            # (but before now); whichever is closer wins
+            candidates = conn.execute(
+                """
+                SELECT * FROM (
+                    SELECT scanned_at FROM tag_state_scans
+                    WHERE scanned_at <= ? ORDER BY scanned_at DESC LIMIT 1
+                )
+                UNION ALL
+                SELECT * FROM (
+                    SELECT scanned_at FROM tag_state_scans
+                    WHERE scanned_at > ? AND scanned_at < ? ORDER BY scanned_at ASC LIMIT 1
+                )
+                """,
+                (target, target, now.isoformat()),
+            ).fetchall()
+            if not candidates:
+                return None
+            nearest = min(
+                (datetime.fromisoformat(row[0]) for row in candidates),
+                key=lambda scanned_at: abs(scanned_at - target_time),
+            )
+
+            # Extend to the rest of the same scan session
+            session = conn.execute(
+                """
+                SELECT scanned_at, resource_count FROM tag_state_scans
+                WHERE scanned_at >= ? AND scanned_at < ?
+                ORDER BY scanned_at ASC
+                """,
+                (
+                    (nearest - SCAN_SESSION_GAP).isoformat(),
+                    min(now, nearest + timedelta(days=1)).isoformat(),
+                ),
+            ).fetchall()
+            return nearest, session
+
+        found = await self._pool.read(load_session)
+        if found is None:
+            return None
+        nearest, session = found
+
+        started_at = ended_at = nearest
+        resource_count = 0
+        for scanned_at, count in session:
+            scanned_at = datetime.fromisoformat(scanned_at)
+            if scanned_at < nearest:
+                # Earlier recordings of the same session
+                started_at = min(started_at, scanned_at)
+            elif scanned_at - ended_at > SCAN_SESSION_GAP:
+                break
+            else:
+                ended_at = scanned_at
+            resource_count += count
+        return TagStateBaseline(
+            scanned_at=ended_at, started_at=started_at, resource_count=resource_count
+        )
+
+    async def load_digests(
+        self,
+        baseline: TagStateBaseline,
+        resource_types: list[str] | None = None,
+        scope: set[tuple[str, str]] | None = None,
+    ) -> TagDigestTree:
+        """
+        Digest tree of the state at a baseline.
+
+        A baseline spanning several recordings (one per region) is
+        reassembled from their leaves; for a leaf recorded more than once
+        the latest recording wins.
+
+        Args:
+            baseline: Baseline from find_baseline()
+            resource_types: Only include leaves of these resource types
+            scope: Only include leaves of these (region, resource_type) pairs
+        """
+        started_at = (baseline.started_at or baseline.scanned_at).isoformat()
+        rows = await self._pool.fetchall(
+            """
+            SELECT path, digest, resource_count FROM tag_state_digests
+            WHERE scanned_at BETWEEN ? AND ?
+            ORDER BY scanned_at
+            """,
+            (started_at, baseline.scanned_at.isoformat()),
+        )
+
+        tree = TagDigestTree.from_rows(rows)
+        if resource_types is not None or scope is not None:
+            return tree.restricted_to(resource_types, scope)
+        if started_at == baseline.scanned_at.isoformat():
+            return tree
+        return TagDigestTree.from_leaves(tree.leaves)
+
+    async def diff(
+        self,
+        baseline: TagStateBaseline,
+        current: Iterable[dict],
+        resource_types: list[str] | None = None,
+        leaves: set[NodePath] | None = None,
+        scope: set[tuple[str, str]] | None = None,
+    ) -> list[ResourceTagChange]:
+        """
+        Sorted-merge diff of current resources against the state at a baseline.
+
+        The baseline state of an ARN is its latest row first seen at or
+        before the baseline time. Resources whose tag hash is unchanged
+        are skipped without decoding their tags. A baseline resource
+        missing from the current inventory is reported as removed only if
+        it was still seen by the baseline scan (at or after its start).
+
+        Args:
+            baseline: Baseline from find_baseline()
+            current: Current resource dicts (arn, tags, resource_type, region)
+            resource_types: Only compare baseline resources of these types
+                            (the current inventory is assumed to match)
+            leaves: Only compare resources in these digest leaves, e.g.
+                    TagDigestTree.changed_leaves(); others are unchanged
+            scope: Only compare baseline resources in these (region,
+                   resource_type) pairs, e.g. the regions actually listed
+
+        Returns:
+            ResourceTagChange for every added, removed or re-tagged resource
+        """
+        types = set(resource_types) if resource_types else None
+        baseline_time = baseline.scanned_at.isoformat()
+        baseline_start = (baseline.started_at or baseline.scanned_at).isoformat()
+        current_rows = sorted(
+            (
+                (r["arn"], r)
+                for r in current
+                if r.get("arn")
+                and (
+                    leaves is None
+                    or leaf_path(r["arn"], r.get("region") or "", r.get("resource_type") or "")
+                    in leaves
+                )
+            ),
+            key=lambda row: row[0],
+        )
+
+        def merge(conn: sqlite3.Connection) -> list[ResourceTagChange]:
+            cursor = conn.execute(
+                """
+                SELECT arn, MAX(first_seen), tag_hash, resource_type, region, last_seen
+                FROM resource_tag_state
+                WHERE first_seen <= ?
+                GROUP BY arn
+                ORDER BY arn
+                """,
+                (baseline_time,),
+            )
+            baseline_rows = (
+                row
+                for row in self._iter_cursor(cursor)
+                if row[2] != TOMBSTONE
+                and (types is None or row[3] in types)
+                and (scope is None or (row[4], row[3]) in scope)
+                and (leaves is None or leaf_path(row[0], row[4], row[3]) in leaves)
+            )
+            tags_by_hash: dict[str, dict[str, str]] = {}
+            changes: list[ResourceTagChange] = []
+
+            def tags_for(tag_hash: str) -> dict[str, str]:
+                if tag_hash not in tags_by_hash:
+                    (tags_json,) = conn.execute(
+                        "SELECT tags FROM tag_sets WHERE tag_hash = ?", (tag_hash,)
+                    ).fetchone()
+                    tags_by_hash[tag_hash] = json.loads(tags_json)
+                return tags_by_hash[tag_hash]
+
+            def removed(row: tuple) -> None:
+                if row[5] >= baseline_start:
+                    changes.append(
+                        ResourceTagChange(row[0], row[3], row[4], tags_for(row[2]), None)
+                    )
+
+            old = next(baseline_rows, None)
+            for arn, resource in current_rows:
+                while old is not None and old[0] < arn:
+                    removed(old)
+                    old = next(baseline_rows, None)
+                new_tags = resource.get("tags") or {}
+                if old is not None and old[0] == arn:
+                    if old[2] != tag_set_hash(new_tags):
+                        changes.append(
+                            ResourceTagChange(arn, old[3], old[4], tags_for(old[2]), new_tags)
+                        )
+                    old = next(baseline_rows, None)
+                else:
+                    changes.append(
+                        ResourceTagChange(
+                            arn,
+                            resource.get("resource_type") or "",
+                            resource.get("region") or "",
+                            None,
+                            new_tags,
+                        )
+                    )
+            while old is not None:
+                removed(old)
+                old = next(baseline_rows, None)
+            return changes
+
+        return await self._pool.read(merge)
+
+    def _purge_expired(self, conn: sqlite3.Connection, now: datetime) -> None:
+        """Delete state not seen within the retention window, and orphaned tag sets."""
+        cutoff = (now - timedelta(days=self.retention_days)).isoformat()
+        deleted = conn.execute(
+            "DELETE FROM resource_tag_state WHERE last_seen < ?", (cutoff,)
+        ).rowcount
+        conn.execute("DELETE FROM tag_state_scans WHERE scanned_at < ?", (cutoff,))
+        conn.execute("DELETE FROM tag_state_digests WHERE scanned_at < ?", (cutoff,))
+        if deleted:
+            conn.execute(
+                """
+                DELETE FROM tag_sets
+                WHERE tag_hash NOT IN (SELECT DISTINCT tag_hash FROM resource_tag_state)
+                """
+            )
+            logger.info(f"Purged {deleted} expired tag state rows")
+
+    def close(self) -> None:
+        """Commit pending writes and close the database connections."""
+        self._pool.close()
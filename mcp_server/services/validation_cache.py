@@ -0,0 +1,284 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Reuse of policy validation results for unchanged parts of the inventory.
+
+A resource's violations depend only on its ARN, type, tags and the policy
+(fetched resources carry no cost impact of their own).
+Each scan groups its in-scope resources into digest leaves (see
+utils/tag_digest.py) and compares the resulting tree top-down against the
+previous scans' trees. Leaves whose digest is unchanged keep their cached
+results; only resources in differing leaves are validated again. Results
+are discarded whenever the policy changes.
+
+Each leaf is a shard of the validated inventory: its members (with the
+cost impact they were validated with), their violations and its compliant
+count. Tag change events patch shards one resource at a time (patch),
+keeping the resource's cost impact, and a scan records which (scan region,
+resource type) pairs it listed completely, so later requests for those
+pairs can be answered from the shards (totals) without listing again.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from ..models.tag_events import ShardSummary
+from ..models.violations import Violation
+from ..utils.tag_digest import (
+    NodePath,
+    TagDigestTree,
+    leaf_digest,
+    leaf_path,
+    resource_key,
+    tag_set_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+# Region of resources that exist once per account (e.g. S3 buckets)
+GLOBAL_REGION = "global"
+
+
+@dataclass
+class _Shard:
+    """Validated resources of one digest leaf."""
+
+    digest: str = ""
+    # ARN -> (tag hash, resource_id, cost impact)
+    members: dict[str, tuple[str, str, float]] = field(default_factory=dict)
+    violations: list[Violation] = field(default_factory=list)
+    compliant: int = 0
+
+
+@dataclass
+class _Coverage:
+    """Leaves listed by a complete scan of one resource type from one region."""
+
+    scanned_at: datetime
+    leaves: set[NodePath] = field(default_factory=set)
+
+
+class ValidationCache:
+    """Validation results per digest leaf, shared by every regional scan."""
+
+    def __init__(self):
+        self._policy_fingerprint: str | None = None
+        self._tree = TagDigestTree()
+        self._shards: dict[NodePath, _Shard] = {}
+        # (scan region, resource type) -> coverage
+        self._coverage: dict[tuple[str, str], _Coverage] = {}
+
+    @staticmethod
+    def policy_fingerprint(policy) -> str:
+        """Hash of a TagPolicy; cached results are only valid for one policy."""
+        return hashlib.blake2b(policy.model_dump_json().encode(), digest_size=16).hexdigest()
+
+    def check_policy(self, policy_fingerprint: str) -> bool:
+        """
+        Discard everything cached under a different policy.
+
+        Returns:
+            True if cached results are valid for this policy
+        """
+        if policy_fingerprint == self._policy_fingerprint:
+            return True
+        if self._shards:
+            logger.info("Policy changed - discarding cached validation results")
+        self._policy_fingerprint = policy_fingerprint
+        self._tree = TagDigestTree()
+        self._shards = {}
+        self._coverage = {}
+        return False
+
+    def reusable_leaves(self, tree: TagDigestTree, policy_fingerprint: str) -> set[NodePath]:
+        """
+        Leaves of tree whose cached results are still valid.
+
+        Args:
+            tree: Digest tree of the resources about to be validated
+            policy_fingerprint: policy_fingerprint() of the current policy
+
+        Returns:
+            Leaf paths whose results can be taken from get()
+        """
+        if not self.check_policy(policy_fingerprint):
+            return set()
+
+        changed = tree.changed_leaves(self._tree)
+        return {
+            path
+            for path, (digest, _) in tree.leaves.items()
+            if path not in changed and path in self._shards and self._shards[path].digest == digest
+        }
+
+    def get(self, leaf: NodePath) -> tuple[list[Violation], int]:
+        """Cached (violations, compliant count) of a reusable leaf."""
+        shard = self._shards[leaf]
+        return shard.violations, shard.compliant
+
+    def update(
+        self,
+        tree: TagDigestTree,
+        groups: dict[NodePath, list[dict]],
+        results: dict[NodePath, tuple[list[Violation], int]],
+        covered: tuple[str, list[str]] | None = None,
+    ) -> None:
+        """
+        Store the results of a scan.
+
+        Args:
+            tree: Digest tree of the validated resources
+            groups: The validated resources, grouped by leaf
+            results: (violations, compliant count) for every leaf of tree
+            covered: (scan region, resource types) the scan listed completely
+                     and without filters, or None
+        """
+        for path, (violations, compliant) in results.items():
+            self._shards[path] = _Shard(
+                digest=tree.nodes[path][0],
+                members={
+                    resource_key(r): (
+                        tag_set_hash(r.get("tags") or {}),
+                        r["resource_id"],
+                        float(r.get("cost_impact") or 0.0),
+                    )
+                    for r in groups[path]
+                },
+                violations=violations,
+                compliant=compliant,
+            )
+        # Leaves from other regions or earlier scans stay cached: a digest
+        # match means identical resources, so reusing them is always safe
+        self._tree = TagDigestTree.from_leaves({**self._tree.leaves, **tree.leaves})
+
+        if covered:
+            scan_region, resource_types = covered
+            now = datetime.now(UTC)
+            for resource_type in resource_types:
+                previous = self._coverage.get((scan_region, resource_type))
+                self._coverage[(scan_region, resource_type)] = _Coverage(
+                    scanned_at=now,
+                    leaves={path for path in tree.leaves if path[2] == resource_type},
+                )
+                if previous:
+                    self._drop_unlisted(previous.leaves)
+
+    def _drop_unlisted(self, leaves: set[NodePath]) -> None:
+        """Drop shards a complete rescan no longer lists (resources deleted since)."""
+        listed = set().union(*(coverage.leaves for coverage in self._coverage.values()))
+        for path in leaves - listed:
+            self._shards.pop(path, None)
+            self._tree.set_leaf(path, None)
+
+    def cost_impact(self, arn: str, region: str, resource_type: str) -> float:
+        """Cost impact a cached resource was last validated with (0.0 if not cached)."""
+        shard = self._shards.get(leaf_path(arn, region, resource_type))
+        member = shard.members.get(arn) if shard else None
+        return member[2] if member else 0.0
+
+    def patch(
+        self,
+        arn: str,
+        resource_id: str,
+        resource_type: str,
+        region: str,
+        tag_hash: str | None,
+        violations: list[Violation],
+        cost_impact: float = 0.0,
+    ) -> NodePath:
+        """
+        Replace one resource in its shard, or remove it (tag_hash None).
+
+        violations should have been validated with cost_impact, which is
+        kept for the next patch. Only the shard's digest and its ancestors
+        in the tree are recomputed. The shard joins the coverage of every scan that lists
+        resources of its region and type.
+
+        Returns:
+            The patched leaf
+        """
+        path = leaf_path(arn, region, resource_type)
+        shard = self._shards.setdefault(path, _Shard())
+
+        old = shard.members.pop(arn, None)
+        if old is not None:
+            kept = [v for v in shard.violations if v.resource_id != old[1]]
+            if len(kept) == len(shard.violations):
+                shard.compliant -= 1
+            shard.violations = kept
+        if tag_hash is not None:
+            shard.members[arn] = (tag_hash, resource_id, cost_impact)
+            shard.violations.extend(violations)
+            shard.compliant += not violations
+
+        if shard.members:
+            shard.digest = leaf_digest((a, h) for a, (h, _, _) in shard.members.items())
+            self._tree.set_leaf(path, (shard.digest, len(shard.members)))
+        else:
+            del self._shards[path]
+            self._tree.set_leaf(path, None)
+
+        for key in self._coverage_keys(region, resource_type):
+            self._coverage[key].leaves.add(path)
+        return path
+
+    def invalidate(self, region: str, resource_type: str) -> None:
+        """Forget scan coverage of resources whose contents are no longer known."""
+        for key in self._coverage_keys(region, resource_type):
+            del self._coverage[key]
+
+    def _coverage_keys(self, region: str, resource_type: str) -> list[tuple[str, str]]:
+        """Coverage entries whose scan lists resources of this region and type."""
+        return [
+            (scan_region, covered_type)
+            for scan_region, covered_type in self._coverage
+            if covered_type == resource_type and region in (scan_region, GLOBAL_REGION)
+        ]
+
+    def totals(
+        self, scan_region: str, resource_types: list[str], max_age: timedelta
+    ) -> tuple[list[Violation], int, int] | None:
+        """
+        Aggregate the shards covering a scan, if they can stand in for it.
+
+        Args:
+            scan_region: Region of the client that would scan
+            resource_types: Resource types the scan would list
+            max_age: Oldest full scan the shards may be based on
+
+        Returns:
+            (violations, compliant count, total resources), or None if any
+            resource type isn't covered by a full scan within max_age
+        """
+        now = datetime.now(UTC)
+        leaves: set[NodePath] = set()
+        for resource_type in resource_types:
+            coverage = self._coverage.get((scan_region, resource_type))
+            if coverage is None or now - coverage.scanned_at > max_age:
+                return None
+            leaves |= coverage.leaves
+
+        violations: list[Violation] = []
+        compliant = total = 0
+        for path in sorted(leaves):
+            shard = self._shards.get(path)
+            if shard:
+                violations.extend(shard.violations)
+                compliant += shard.compliant
+                total += len(shard.members)
+        return violations, compliant, total
+
+    def summarize(self, region: str, resource_type: str) -> ShardSummary:
+        """Aggregate of every shard of one (region, resource type)."""
+        summary = ShardSummary(region=region, resource_type=resource_type)
+        for path, shard in self._shards.items():
+            if path[1] == region and path[2] == resource_type:
+                summary.total_resources += len(shard.members)
+                summary.compliant_resources += shard.compliant
+                summary.violation_count += len(shard.violations)
+        if summary.total_resources:
+            summary.compliance_score = summary.compliant_resources / summary.total_resources
+        return summary
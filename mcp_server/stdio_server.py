@@ -25,13 +25,50 @@ Phase 1.9 Step 7.
 """
 
 import asyncio
+import functools
 import json
 import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
+from .clients.aws_client import DeadlineExceededError
 from .container import ServiceContainer
+from .models.audit import AuditStatus
+from .models.rollup import ROLLUP_DIMENSIONS, ComplianceRollup
+from .models.scan_job import ScanJob, ScanJobStatus, ScanProgress
+from .services.multi_region_scanner import ProgressCallback
+from .services.result_store_service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    ResultNotFoundError,
+)
+from .services.scan_job_service import ScanJobNotFoundError
+from .utils.api_ledger import (
+    ApiCallLedger,
+    clear_api_ledger,
+    get_api_ledger,
+    start_api_ledger,
+)
+from .utils.correlation import generate_correlation_id, set_correlation_id
+from .utils.deadline import (
+    begin_deadline_scope,
+    clear_request_deadline,
+    deadline_near,
+    record_refused_call,
+    start_request_deadline,
+)
+from .utils.timing import (
+    RequestTimings,
+    clear_request_timings,
+    get_request_timings,
+    span,
+    start_request_timings,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +78,9 @@ mcp = FastMCP("FinOps Tag Compliance")
 # Module-level container (initialized in lifespan)
 _container: ServiceContainer | None = None
 
+# Measures returned for every rollup slice in summary-only responses
+_ROLLUP_MEASURES = ("violation_count", "non_compliant_resources", "cost_gap")
+
 
 # ---------------------------------------------------------------------------
 # Anti-hallucination: data quality metadata
@@ -54,12 +94,74 @@ def _build_data_quality(result: Any) -> dict:
     """
     quality: dict[str, Any] = {"status": "complete"}
 
+    sampling = getattr(result, "sampling", None)
+    if sampling is not None:
+        quality["approximate"] = not sampling.exact
+        if not sampling.exact:
+            quality["status"] = "approximate"
+            quality["warning"] = (
+                f"Estimated from a random sample of {sampling.sample_size} of "
+                f"{sampling.population} resources. compliance_score, compliant_resources "
+                "and cost_attribution_gap are estimates; report them with the "
+                f"{sampling.confidence_level:.0%} confidence intervals in \"sampling\". "
+                "Violations listed are from the sampled resources only."
+            )
+        if not sampling.cost_estimated:
+            quality["status"] = "partial"
+            quality["cost_note"] = (
+                "Cost Explorer could not be queried, so cost_attribution_gap and its "
+                "interval are not estimated. Do not report the cost gap as zero."
+            )
+        if sampling.failed_regions or sampling.failed_resource_types:
+            quality["status"] = "partial"
+            missing = ", ".join(sampling.failed_regions + sampling.failed_resource_types)
+            strata_warning = (
+                f"These regions or resource types could not be listed and are not "
+                f"sampled: {missing}. The estimates and intervals cover only the "
+                "listed resources, not the whole account."
+            )
+            quality["warning"] = (
+                f"{quality['warning']} {strata_warning}" if "warning" in quality
+                else strata_warning
+            )
+            quality["failed_regions"] = sampling.failed_regions
+            quality["failed_resource_types"] = sampling.failed_resource_types
+
     if not hasattr(result, "region_metadata"):
+        incomplete_types = getattr(result, "incomplete_resource_types", None) or []
+        if incomplete_types:
+            quality["status"] = "partial"
+            deadline_warning = (
+                "The request deadline was reached before the scan finished. "
+                f"These resource types are missing or incomplete: {', '.join(incomplete_types)}. "
+                "Do not present these numbers as account-wide totals."
+            )
+            quality["warning"] = (
+                f"{quality['warning']} {deadline_warning}" if "warning" in quality
+                else deadline_warning
+            )
+            quality["incomplete_resource_types"] = incomplete_types
+        failed_regions = getattr(result, "failed_regions", None) or []
+        failed_types = getattr(result, "failed_resource_types", None) or []
+        if failed_regions or failed_types:
+            quality["status"] = "partial"
+            listing_warning = (
+                "Some regions or resource types could not be listed and are missing: "
+                f"{', '.join(failed_regions + failed_types)}. "
+                "Do not present these numbers as account-wide totals."
+            )
+            quality["warning"] = (
+                f"{quality['warning']} {listing_warning}" if "warning" in quality
+                else listing_warning
+            )
+            quality["failed_regions"] = failed_regions
+            quality["failed_resource_types"] = failed_types
         return quality
 
     meta = result.region_metadata
     failed = meta.failed_regions or []
     total = meta.total_regions or 0
+    incomplete = getattr(meta, "incomplete_regions", None) or []
 
     if meta.discovery_failed:
         quality["status"] = "partial"
@@ -78,23 +180,178 @@ def _build_data_quality(result: Any) -> dict:
             "Do not present these numbers as account-wide totals."
         )
         quality["failed_regions"] = failed
-    else:
+    elif not incomplete:
         quality["status"] = "complete"
         quality["note"] = f"All {total} regions scanned successfully."
 
+    if incomplete:
+        quality["status"] = "partial"
+        deadline_warning = (
+            "The request deadline was reached before the scan finished. "
+            f"Results DO NOT fully cover: {', '.join(incomplete)}. "
+            "Scan fewer resource types or regions per call for complete data."
+        )
+        quality["warning"] = (
+            f"{quality['warning']} {deadline_warning}" if "warning" in quality
+            else deadline_warning
+        )
+        quality["incomplete_regions"] = incomplete
+
     return quality
 
 
+# ---------------------------------------------------------------------------
+# Progress notifications
+# ---------------------------------------------------------------------------
+def _format_progress_message(progress: ScanProgress) -> str:
+    """Describe scan progress in one line for MCP progress notifications."""
+    if progress.completed_region_scans == 0:
+        return f"Scanning {progress.total_region_scans} region(s)..."
+    message = (
+        f"{progress.completed_region_scans}/{progress.total_region_scans} region scans done: "
+        f"{progress.resources_scanned} resources, "
+        f"{progress.violations_found} violations so far"
+    )
+    if progress.failed_region_scans:
+        message += f", {progress.failed_region_scans} failed"
+    eta = progress.eta_seconds
+    if eta is not None and progress.completed_region_scans < progress.total_region_scans:
+        message += f", ~{eta:.0f}s remaining"
+    return message
+
+
+def _progress_notifier(ctx: Context | None) -> ProgressCallback | None:
+    """Build a scanner progress callback that sends MCP progress notifications.
+
+    Notifications are only delivered when the client asked for them by
+    sending a progress token; otherwise report_progress is a no-op.
+    """
+    if ctx is None:
+        return None
+
+    async def notify(progress: ScanProgress) -> None:
+        await ctx.report_progress(
+            progress=progress.completed_region_scans,
+            total=progress.total_region_scans or None,
+            message=_format_progress_message(progress),
+        )
+
+    return notify
+
+
+# ---------------------------------------------------------------------------
+# Per-request instrumentation
+# ---------------------------------------------------------------------------
+def _instrumented(tool: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """Run a tool as one request with its own correlation ID, timings, call ledger and audit entry.
+
+    Applied under @mcp.tool(); functools.wraps keeps the signature FastMCP
+    builds the tool schema from. With TIMINGS_ENABLED off no timings are
+    collected and every span in the stack is a no-op.
+    """
+
+    @functools.wraps(tool)
+    async def run(*args: Any, **kwargs: Any) -> str:
+        if _container is None:
+            return await tool(*args, **kwargs)
+
+        correlation_id = generate_correlation_id()
+        set_correlation_id(correlation_id)
+        timings = start_request_timings() if _container.settings.timings_enabled else None
+        ledger = start_api_ledger(correlation_id)
+        started = time.perf_counter()
+        response: str | None = None
+        error: str | None = None
+        try:
+            response = await tool(*args, **kwargs)
+            return response
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            clear_request_timings()
+            clear_api_ledger()
+            _audit_tool_call(
+                tool.__name__,
+                kwargs,
+                response,
+                error,
+                (time.perf_counter() - started) * 1000,
+                timings,
+                ledger,
+            )
+
+    return run
+
+
+def _audit_tool_call(
+    tool_name: str,
+    kwargs: dict[str, Any],
+    response: str | None,
+    error: str | None,
+    execution_time_ms: float,
+    timings: RequestTimings | None,
+    ledger: ApiCallLedger,
+) -> None:
+    """Record a tool call in the audit log. Never fails the call."""
+    audit_service = _container.audit_service if _container else None
+    if audit_service is None:
+        return
+    # Tools report most failures as a response with an "error" key
+    if error is None and response is not None and response.startswith('{"error"'):
+        payload = json.loads(response)
+        error = payload.get("message") or payload["error"]
+    try:
+        audit_service.log_invocation(
+            tool_name=tool_name,
+            parameters={k: v for k, v in kwargs.items() if not isinstance(v, Context)},
+            status=AuditStatus.FAILURE if error else AuditStatus.SUCCESS,
+            error_message=error,
+            execution_time_ms=execution_time_ms,
+            stage_timings=timings.stage_dict() if timings else None,
+            aws_calls=ledger.rows() or None,
+            correlation_id=ledger.correlation_id,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to audit {tool_name} call: {e}")
+
+
+def _to_json(payload: Any, **kwargs: Any) -> str:
+    """Serialize a tool response, timed as the "serialize" stage.
+
+    Dict payloads get an "aws_api_calls" block summarizing the request's
+    AWS calls (AWS_CALLS_IN_RESPONSE, when it made any) and a "timings"
+    block with its stage timings so far (TIMINGS_IN_RESPONSE;
+    serialization itself is only in the audit log).
+    """
+    if isinstance(payload, dict) and _container is not None:
+        settings = _container.settings
+        ledger = get_api_ledger()
+        if ledger is not None and ledger.entries and settings.aws_calls_in_response:
+            payload = {**payload, "aws_api_calls": ledger.summary()}
+        timings = get_request_timings()
+        if timings is not None and settings.timings_in_response:
+            payload = {**payload, "timings": timings.to_dict()}
+    with span("serialize"):
+        return json.dumps(payload, **kwargs)
+
+
 # ---------------------------------------------------------------------------
 # Tool 1: check_tag_compliance
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def check_tag_compliance(
     resource_types: list[str],
     filters: dict[str, str] | None = None,
     severity: str = "all",
     store_snapshot: bool = False,
     force_refresh: bool = False,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    summary_only: bool = False,
+    group_by: list[str] | None = None,
+    sample_size: int | None = None,
+    ctx: Context | None = None,
 ) -> str:
     """Check tag compliance for AWS resources.
 
@@ -113,16 +370,40 @@ async def check_tag_compliance(
 
     TIMEOUT WARNING: MCP clients (e.g., Claude Desktop) may have a 60-second
     response timeout. Scanning many resource types across all regions can
-    take 2-5 minutes and will silently timeout on the client side. To avoid
-    this, scan in batches of 4-6 resource types per call and aggregate the
-    results yourself. Only use ["all"] if the client supports long timeouts.
+    take 2-5 minutes. For large scans (many types or ["all"]) use
+    start_compliance_scan instead: it returns a job ID immediately and the
+    result is fetched later with get_scan_result, so nothing times out.
 
     CRITICAL — data accuracy: Always check the "data_quality" field in the
     response. If data_quality.status is "partial", some regions failed to scan
-    and the results are INCOMPLETE. You MUST disclose this to the user — do NOT
+    or the request deadline was reached before the scan finished, and the
+    results are INCOMPLETE. You MUST disclose this to the user — do NOT
     present partial data as if it were a complete account-wide picture. Never
     estimate, extrapolate, or fabricate values for regions that failed.
 
+    PAGINATION: Only the first page_size violations are returned. The
+    "pagination" block gives total_violations and a next_cursor; call
+    get_violations_page with the result_id to read more, filter by region,
+    resource type or tag, or sort by cost impact. Scores and totals in this
+    response always cover ALL violations, not just the first page.
+
+    SUMMARY MODE: For "compliance by region / type / tag" questions set
+    summary_only=true. No violation list is returned; instead "rollup"
+    holds one row per group with violation_count, non_compliant_resources
+    and cost_gap. group_by picks the dimensions (region, resource_type,
+    tag_name, violation_type; default region, resource_type, tag_name).
+    "top_resources_by_cost" and "top_invalid_values" list the ten worst
+    resources and most common invalid tag values; on very large scans
+    these are tracked approximately and may slightly overstate values.
+
+    SAMPLING MODE: For a fast estimate on very large accounts set
+    sample_size (e.g. 2000). Only a stratified random sample of resources
+    (per region and resource type) is validated. data_quality.status is
+    "approximate" and "sampling" holds the sample size and 95% confidence
+    intervals for compliance_score and cost_attribution_gap. Always quote
+    the interval, not just the point estimate. Sampled results are never
+    stored in history.
+
     Args:
         resource_types: List of resource types to check. Examples:
             - ["ec2:instance", "s3:bucket", "lambda:function", "rds:db"] — batch (recommended)
@@ -131,10 +412,138 @@ async def check_tag_compliance(
         severity: Filter results by severity: "all", "errors_only", or "warnings_only"
         store_snapshot: If true, store result in history for trend tracking
         force_refresh: If true, bypass cache and force fresh scan
+        page_size: Violations to include in this response (1-1000, default 100)
+        summary_only: If true, return rollup slices instead of violations
+        group_by: Rollup dimensions for summary_only (see SUMMARY MODE)
+        sample_size: Resources to sample for an approximate result (see SAMPLING MODE)
     """
     _ensure_initialized()
+    if not 1 <= page_size <= MAX_PAGE_SIZE:
+        return _to_json({
+            "error": "invalid_page_size",
+            "message": f"page_size must be between 1 and {MAX_PAGE_SIZE}",
+        })
+    if sample_size is not None and sample_size < 1:
+        return _to_json({
+            "error": "invalid_sample_size",
+            "message": "sample_size must be at least 1",
+        })
+
+    # Stop scanning before the client gives up and return partial data instead
+    deadline_seconds = _container.settings.request_deadline_seconds
+    if deadline_seconds > 0:
+        start_request_deadline(deadline_seconds)
+    try:
+        response = await _run_check_tag_compliance(
+            resource_types=resource_types,
+            filters=filters,
+            severity=severity,
+            store_snapshot=store_snapshot,
+            force_refresh=force_refresh,
+            page_size=page_size,
+            progress_callback=_progress_notifier(ctx),
+            summary_only=summary_only,
+            group_by=group_by,
+            sample_size=sample_size,
+        )
+    finally:
+        clear_request_deadline()
+    return _to_json(response, default=str)
+
+
+async def _cost_attribution_gap(
+    result: Any, resource_types: list[str], filters: dict[str, str] | None
+) -> tuple[float, str | None]:
+    """Look up the cost attribution gap of a scan with CostService.
+
+    The compliance service doesn't fetch cost data, so CostService is
+    called separately. Returns the gap and, when the request deadline cut
+    the lookup short or stopped it from starting, a note for data_quality.
+    """
+    if deadline_near():
+        # Cost Explorer lookups would run past the deadline; keep the scan estimate
+        record_refused_call("cost attribution gap lookup")
+        return result.cost_attribution_gap, (
+            "Cost Explorer was not queried because the request deadline was reached. "
+            "cost_attribution_gap is the scan-time estimate only."
+        )
+    if not (_container.aws_client and _container.policy_service):
+        return result.cost_attribution_gap, None
+
+    from .services.cost_service import CostService
+
+    cost_service = CostService(
+        aws_client=_container.aws_client,
+        policy_service=_container.policy_service,
+        multi_region_scanner=_container.multi_region_scanner,
+    )
+    # Records every call the deadline refused or cut short during the lookup
+    scope = begin_deadline_scope()
+    try:
+        cost_result = await cost_service.calculate_attribution_gap(
+            resource_types=resource_types,
+            filters=filters,
+        )
+    except DeadlineExceededError as e:
+        logger.warning(f"Cost attribution gap lookup stopped at the deadline: {e}")
+        return result.cost_attribution_gap, (
+            "The request deadline was reached while Cost Explorer was being queried. "
+            "cost_attribution_gap is the scan-time estimate only."
+        )
+    except Exception as e:
+        logger.warning(f"Failed to get cost attribution gap: {e}")
+        return result.cost_attribution_gap, None
+
+    logger.info(f"Cost attribution gap calculated: ${cost_result.attribution_gap:.2f}")
+    if scope.affected:
+        return cost_result.attribution_gap, (
+            "The request deadline was reached while costs were being looked up, so some "
+            "resource types or regions are missing. cost_attribution_gap is understated."
+        )
+    return cost_result.attribution_gap, None
+
+
+def _invalid_group_by(group_by: list[str] | None) -> dict[str, Any] | None:
+    """Return an invalid_group_by payload if group_by names unknown rollup dimensions."""
+    unknown = sorted(set(group_by or []) - set(ROLLUP_DIMENSIONS))
+    if not unknown:
+        return None
+    return {
+        "error": "invalid_group_by",
+        "message": (
+            f"Invalid group_by dimensions: {unknown}. "
+            f"Valid dimensions: {list(ROLLUP_DIMENSIONS)}"
+        ),
+    }
+
+
+async def _run_check_tag_compliance(
+    resource_types: list[str],
+    filters: dict[str, str] | None,
+    severity: str,
+    store_snapshot: bool,
+    force_refresh: bool,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    progress_callback: ProgressCallback | None = None,
+    summary_only: bool = False,
+    group_by: list[str] | None = None,
+    sample_size: int | None = None,
+) -> dict[str, Any]:
+    """Run check_tag_compliance and build its response payload.
+
+    Shared by the check_tag_compliance tool and background scan jobs.
+    Scan errors are returned as a payload with an "error" key. In
+    summary-only mode the violation list is replaced by rollup slices.
+    With sample_size the result is a stratified-sample estimate.
+    """
     from .tools import check_tag_compliance as _check
 
+    if summary_only:
+        group_by = group_by or ["region", "resource_type", "tag_name"]
+        invalid = _invalid_group_by(group_by)
+        if invalid:
+            return invalid
+
     try:
         result = await _check(
             compliance_service=_container.compliance_service,
@@ -145,53 +554,45 @@ async def check_tag_compliance(
             store_snapshot=store_snapshot,
             force_refresh=force_refresh,
             multi_region_scanner=_container.multi_region_scanner,
+            progress_callback=progress_callback,
+            sample_size=sample_size,
         )
     except asyncio.TimeoutError as e:
         error_msg = str(e)
         logger.error(f"Timeout during compliance check: {error_msg}")
         # Return helpful error with suggestion
-        return json.dumps({
+        return {
             "error": "timeout",
             "message": f"Scan timed out: {error_msg}",
             "suggestion": "Try scanning specific resource types instead of 'all'. "
                          "Example: ['ec2:instance', 's3:bucket', 'lambda:function', 'rds:db']",
-        })
+        }
     except Exception as e:
         error_msg = str(e)
         logger.error(f"Error during compliance check: {error_msg}")
-        return json.dumps({
+        return {
             "error": "scan_failed",
             "message": error_msg,
             "suggestion": "If using 'all' mode, try specific resource types instead.",
-        })
-
-    # Try to get actual cost attribution gap from CostService
-    # The compliance service doesn't fetch cost data, so we need to call CostService separately
-    cost_attribution_gap = result.cost_attribution_gap
-    if _container.aws_client and _container.policy_service:
-        try:
-            from .services.cost_service import CostService
+        }
 
-            cost_service = CostService(
-                aws_client=_container.aws_client,
-                policy_service=_container.policy_service,
-                multi_region_scanner=_container.multi_region_scanner,
-            )
-            cost_result = await cost_service.calculate_attribution_gap(
-                resource_types=resource_types,
-                filters=filters,
-            )
-            cost_attribution_gap = cost_result.attribution_gap
-            logger.info(f"Cost attribution gap calculated: ${cost_attribution_gap:.2f}")
-        except Exception as e:
-            logger.warning(f"Failed to get cost attribution gap: {e}")
+    # Sampled results estimate the gap from Cost Explorer costs split by
+    # service and region; a per-type lookup would cost more than the check
+    sampling = getattr(result, "sampling", None)
+    if sampling is not None:
+        logger.info("Sampled check: using the sample's cost attribution gap estimate")
+        cost_attribution_gap, cost_note = result.cost_attribution_gap, None
+    else:
+        cost_attribution_gap, cost_note = await _cost_attribution_gap(
+            result, resource_types, filters
+        )
 
     # Build base response (common to both ComplianceResult and MultiRegionComplianceResult)
     response: dict[str, Any] = {
         "compliance_score": result.compliance_score,
         "total_resources": result.total_resources,
         "compliant_resources": result.compliant_resources,
-        "violations": [
+        "violations": [] if summary_only else [
             {
                 "resource_id": v.resource_id,
                 "resource_type": v.resource_type,
@@ -212,6 +613,17 @@ async def check_tag_compliance(
 
     # Add data quality metadata (anti-hallucination guard)
     response["data_quality"] = _build_data_quality(result)
+    if sampling is not None:
+        response["stored_in_history"] = False
+        response["sampling"] = sampling.model_dump(mode="json")
+    if response["data_quality"].get("incomplete_regions") or response["data_quality"].get(
+        "incomplete_resource_types"
+    ):
+        # Deadline-truncated scans are never stored (see tools.check_tag_compliance)
+        response["stored_in_history"] = False
+    if cost_note:
+        response["data_quality"]["status"] = "partial"
+        response["data_quality"]["cost_note"] = cost_note
 
     # Add multi-region fields if this is a MultiRegionComplianceResult
     if hasattr(result, "region_metadata"):
@@ -220,6 +632,7 @@ async def check_tag_compliance(
             "successful_regions": result.region_metadata.successful_regions,
             "failed_regions": result.region_metadata.failed_regions,
             "skipped_regions": result.region_metadata.skipped_regions,
+            "incomplete_regions": result.region_metadata.incomplete_regions,
             "discovery_failed": result.region_metadata.discovery_failed,
         }
         response["regional_breakdown"] = [
@@ -234,13 +647,65 @@ async def check_tag_compliance(
             for region, summary in result.regional_breakdown.items()
         ]
 
-    return json.dumps(response, default=str)
+    if summary_only:
+        del response["violations"]
+        rollup = ComplianceRollup.for_result(result)
+        response["total_violations"] = rollup.violation_count
+        response["rollup"] = {
+            "group_by": group_by,
+            "slices": [
+                cell.model_dump(include={*group_by, *_ROLLUP_MEASURES})
+                for cell in rollup.slice(group_by)
+            ],
+            "top_resources_by_cost": [
+                {"resource_id": resource_id, "cost_gap": round(cost, 2)}
+                for resource_id, cost in rollup.top_resources(10, by="cost")
+            ],
+            "top_invalid_values": [
+                {"value": value, "violation_count": int(count)}
+                for value, count in rollup.top_invalid_values(10)
+            ],
+        }
+        return response
+
+    return await _paginate_violations(response, page_size)
+
+
+async def _paginate_violations(response: dict[str, Any], page_size: int) -> dict[str, Any]:
+    """Store the full violation list server-side and keep only the first page.
+
+    Adds a "pagination" block with the result_id and next_cursor used by
+    get_violations_page. Without a result store, all violations are returned.
+    """
+    store = _container.result_store_service
+    if store is None:
+        return response
+
+    violations = response.pop("violations")
+    try:
+        result_id = await store.store_result(summary=response, violations=violations)
+        page = await store.get_page(result_id, page_size=page_size)
+    except Exception as e:
+        logger.warning(f"Failed to store scan result, returning all violations: {e}")
+        response["violations"] = violations
+        return response
+
+    response["violations"] = page.violations
+    response["pagination"] = {
+        "result_id": result_id,
+        "total_violations": page.total_matching,
+        "returned": len(page.violations),
+        "sort_by": page.sort_by,
+        "next_cursor": page.next_cursor,
+    }
+    return response
 
 
 # ---------------------------------------------------------------------------
 # Tool 2: find_untagged_resources
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def find_untagged_resources(
     resource_types: list[str],
     regions: list[str] | None = None,
@@ -289,7 +754,7 @@ async def find_untagged_resources(
     except asyncio.TimeoutError as e:
         error_msg = str(e)
         logger.error(f"Timeout during find_untagged_resources: {error_msg}")
-        return json.dumps({
+        return _to_json({
             "error": "timeout",
             "message": f"Scan timed out: {error_msg}",
             "suggestion": "Try scanning specific resource types instead of 'all'. "
@@ -298,7 +763,7 @@ async def find_untagged_resources(
     except Exception as e:
         error_msg = str(e)
         logger.error(f"Error during find_untagged_resources: {error_msg}")
-        return json.dumps({
+        return _to_json({
             "error": "scan_failed",
             "message": error_msg,
             "suggestion": "If using 'all' mode, try specific resource types instead.",
@@ -332,13 +797,14 @@ async def find_untagged_resources(
         if result.cost_data_note:
             response["cost_data_note"] = result.cost_data_note
 
-    return json.dumps(response, default=str)
+    return _to_json(response, default=str)
 
 
 # ---------------------------------------------------------------------------
 # Tool 3: validate_resource_tags
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def validate_resource_tags(
     resource_arns: list[str],
 ) -> str:
@@ -360,7 +826,7 @@ async def validate_resource_tags(
         multi_region_scanner=_container.multi_region_scanner,
     )
 
-    return json.dumps(
+    return _to_json(
         {
             "total_resources": result.total_resources,
             "compliant_resources": result.compliant_resources,
@@ -397,6 +863,7 @@ async def validate_resource_tags(
 # Tool 4: get_cost_attribution_gap
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def get_cost_attribution_gap(
     resource_types: list[str],
     time_period: dict[str, str] | None = None,
@@ -445,7 +912,7 @@ async def get_cost_attribution_gap(
     except asyncio.TimeoutError as e:
         error_msg = str(e)
         logger.error(f"Timeout during cost attribution gap: {error_msg}")
-        return json.dumps({
+        return _to_json({
             "error": "timeout",
             "message": f"Cost attribution analysis timed out: {error_msg}",
             "suggestion": "Try analyzing specific resource types instead of 'all'. "
@@ -454,7 +921,7 @@ async def get_cost_attribution_gap(
     except Exception as e:
         error_msg = str(e)
         logger.error(f"Error during cost attribution gap: {error_msg}")
-        return json.dumps({
+        return _to_json({
             "error": "analysis_failed",
             "message": error_msg,
             "suggestion": "If using 'all' mode, try specific resource types instead.",
@@ -471,7 +938,7 @@ async def get_cost_attribution_gap(
             for key, value in result.breakdown.items()
         }
 
-    return json.dumps(
+    return _to_json(
         {
             "total_spend": result.total_spend,
             "attributable_spend": result.attributable_spend,
@@ -490,6 +957,7 @@ async def get_cost_attribution_gap(
 # Tool 5: suggest_tags
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def suggest_tags(
     resource_arn: str,
 ) -> str:
@@ -511,13 +979,14 @@ async def suggest_tags(
         multi_region_scanner=_container.multi_region_scanner,
     )
 
-    return json.dumps(result.model_dump(mode="json"), default=str)
+    return _to_json(result.model_dump(mode="json"), default=str)
 
 
 # ---------------------------------------------------------------------------
 # Tool 6: get_tagging_policy
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def get_tagging_policy() -> str:
     """Retrieve the complete tagging policy configuration.
 
@@ -552,17 +1021,20 @@ async def get_tagging_policy() -> str:
             all_types.add(rt)
     response["all_applicable_resource_types"] = sorted(all_types)
 
-    return json.dumps(response, default=str)
+    return _to_json(response, default=str)
 
 
 # ---------------------------------------------------------------------------
 # Tool 7: generate_compliance_report
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def generate_compliance_report(
     resource_types: list[str],
     format: str = "json",
     include_recommendations: bool = True,
+    summary_only: bool = False,
+    group_by: list[str] | None = None,
 ) -> str:
     """Generate a comprehensive compliance report.
 
@@ -586,11 +1058,20 @@ async def generate_compliance_report(
             - ["all"] — comprehensive (WARNING: will likely timeout on Claude Desktop)
         format: Output format: "json", "csv", or "markdown"
         include_recommendations: Whether to include actionable recommendations
+        summary_only: If true, skip formatted_output and return the summary plus
+            "rollup" slices (violation_count, non_compliant_resources, cost_gap)
+        group_by: Rollup dimensions: region, resource_type, tag_name,
+            violation_type (default region, resource_type, tag_name)
     """
     _ensure_initialized()
     from .tools import check_tag_compliance as _check
     from .tools import generate_compliance_report as _report
 
+    # Reject unknown dimensions before paying for the scan
+    invalid = _invalid_group_by(group_by)
+    if invalid:
+        return _to_json(invalid)
+
     try:
         compliance_result = await _check(
             compliance_service=_container.compliance_service,
@@ -602,7 +1083,7 @@ async def generate_compliance_report(
     except asyncio.TimeoutError as e:
         error_msg = str(e)
         logger.error(f"Timeout during compliance report scan: {error_msg}")
-        return json.dumps({
+        return _to_json({
             "error": "timeout",
             "message": f"Scan timed out: {error_msg}",
             "suggestion": "Try generating a report for specific resource types instead of 'all'. "
@@ -611,7 +1092,7 @@ async def generate_compliance_report(
     except Exception as e:
         error_msg = str(e)
         logger.error(f"Error during compliance report scan: {error_msg}")
-        return json.dumps({
+        return _to_json({
             "error": "scan_failed",
             "message": error_msg,
             "suggestion": "If using 'all' mode, try specific resource types instead.",
@@ -637,17 +1118,23 @@ async def generate_compliance_report(
         compliance_result=compliance_result,
         format=format,
         include_recommendations=include_recommendations,
+        summary_only=summary_only,
+        group_by=group_by,
     )
 
-    report_data = result.model_dump(mode="json")
+    report_data = result.model_dump(mode="json", exclude={"rollup"})
+    if result.rollup is not None:
+        # Rolled-up dimensions are None; leave them out of the slices
+        report_data["rollup"] = [cell.model_dump(exclude_none=True) for cell in result.rollup]
     report_data["data_quality"] = _build_data_quality(compliance_result)
-    return json.dumps(report_data, default=str)
+    return _to_json(report_data, default=str)
 
 
 # ---------------------------------------------------------------------------
 # Tool 8: get_violation_history
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def get_violation_history(
     days_back: int = 30,
     group_by: str = "day",
@@ -671,16 +1158,18 @@ async def get_violation_history(
     result = await _history(
         days_back=days_back,
         group_by=group_by,
+        history_service=_container.history_service,
         db_path=db_path,
     )
 
-    return json.dumps(result.model_dump(mode="json"), default=str)
+    return _to_json(result.model_dump(mode="json"), default=str)
 
 
 # ---------------------------------------------------------------------------
 # Tool 9: generate_custodian_policy
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def generate_custodian_policy(
     resource_types: list[str] | None = None,
     violation_types: list[str] | None = None,
@@ -715,13 +1204,14 @@ async def generate_custodian_policy(
         compliance_service=_container.compliance_service,
     )
 
-    return json.dumps(result.model_dump(mode="json"), default=str)
+    return _to_json(result.model_dump(mode="json"), default=str)
 
 
 # ---------------------------------------------------------------------------
 # Tool 10: generate_openops_workflow
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def generate_openops_workflow(
     resource_types: list[str] | None = None,
     remediation_strategy: str = "notify",
@@ -758,13 +1248,14 @@ async def generate_openops_workflow(
         compliance_service=_container.compliance_service,
     )
 
-    return json.dumps(result.model_dump(mode="json"), default=str)
+    return _to_json(result.model_dump(mode="json"), default=str)
 
 
 # ---------------------------------------------------------------------------
 # Tool 11: schedule_compliance_audit
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def schedule_compliance_audit(
     schedule: str = "daily",
     time: str = "09:00",
@@ -811,13 +1302,14 @@ async def schedule_compliance_audit(
         notification_format=notification_format,
     )
 
-    return json.dumps(result.model_dump(mode="json"), default=str)
+    return _to_json(result.model_dump(mode="json"), default=str)
 
 
 # ---------------------------------------------------------------------------
 # Tool 12: detect_tag_drift
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def detect_tag_drift(
     resource_types: list[str] | None = None,
     tag_keys: list[str] | None = None,
@@ -825,8 +1317,11 @@ async def detect_tag_drift(
 ) -> str:
     """Detect unexpected tag changes since the last compliance scan.
 
-    Compares current resource tags against expected state from the tagging
-    policy to identify missing required tags and invalid tag values.
+    Compares current resource tags against the per-resource tag state
+    recorded by earlier scans nearest to lookback_days ago
+    (baseline_source "tag_state"). Until state has been recorded, falls
+    back to checking tags against the tagging policy (baseline_source
+    "policy"): missing required tags and invalid tag values.
     Classifies drift by severity: critical (required tag removed),
     warning (value changed), or info (optional tag changed).
 
@@ -857,11 +1352,12 @@ async def detect_tag_drift(
             history_service=_container.history_service,
             compliance_service=_container.compliance_service,
             multi_region_scanner=_container.multi_region_scanner,
+            tag_state_service=_container.tag_state_service,
         )
     except asyncio.TimeoutError as e:
         error_msg = str(e)
         logger.error(f"Timeout during tag drift detection: {error_msg}")
-        return json.dumps({
+        return _to_json({
             "error": "timeout",
             "message": f"Tag drift detection timed out: {error_msg}",
             "suggestion": "Try checking specific resource types instead of scanning all. "
@@ -870,24 +1366,28 @@ async def detect_tag_drift(
     except Exception as e:
         error_msg = str(e)
         logger.error(f"Error during tag drift detection: {error_msg}")
-        return json.dumps({
+        return _to_json({
             "error": "drift_detection_failed",
             "message": error_msg,
         })
 
     drift_data = result.model_dump(mode="json")
     drift_data["data_quality"] = _build_data_quality(result)
-    return json.dumps(drift_data, default=str)
+    return _to_json(drift_data, default=str)
 
 
 # ---------------------------------------------------------------------------
 # Tool 13: export_violations_csv
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def export_violations_csv(
     resource_types: list[str] | None = None,
     severity: str = "all",
     columns: list[str] | None = None,
+    output_file: str | None = None,
+    compress: bool = False,
+    ctx: Context | None = None,
 ) -> str:
     """Export compliance violations as CSV data.
 
@@ -912,10 +1412,23 @@ async def export_violations_csv(
             allowed_values, cost_impact, arn.
             Default: resource_id, resource_type, region, violation_type,
             tag_name, severity.
+        output_file: File name to stream the CSV to on the server (in the
+            configured export directory) instead of returning it inline.
+            Use for large exports; the response gives the path, row count
+            and SHA-256 checksum.
+        compress: Gzip the output file (requires output_file; ".gz" is appended)
     """
     _ensure_initialized()
     from .tools import export_violations_csv as _export
 
+    output_path = None
+    if output_file is not None:
+        if compress and not output_file.endswith(".gz"):
+            output_file += ".gz"
+        output_path = _resolve_export_path(output_file)
+        if output_path is None:
+            return _to_json(_INVALID_OUTPUT_FILE)
+
     try:
         result = await _export(
             compliance_service=_container.compliance_service,
@@ -923,11 +1436,14 @@ async def export_violations_csv(
             severity=severity,
             columns=columns,
             multi_region_scanner=_container.multi_region_scanner,
+            progress_callback=_progress_notifier(ctx),
+            output_path=output_path,
+            compress=compress,
         )
     except asyncio.TimeoutError as e:
         error_msg = str(e)
         logger.error(f"Timeout during violations export: {error_msg}")
-        return json.dumps({
+        return _to_json({
             "error": "timeout",
             "message": f"Export timed out: {error_msg}",
             "suggestion": "Try exporting specific resource types instead of all. "
@@ -936,20 +1452,42 @@ async def export_violations_csv(
     except Exception as e:
         error_msg = str(e)
         logger.error(f"Error during violations export: {error_msg}")
-        return json.dumps({
+        return _to_json({
             "error": "export_failed",
             "message": error_msg,
         })
 
     export_data = result.model_dump(mode="json")
     export_data["data_quality"] = _build_data_quality(result)
-    return json.dumps(export_data, default=str)
+    return _to_json(export_data, default=str)
+
+
+_INVALID_OUTPUT_FILE = {
+    "error": "invalid_output_file",
+    "message": "output_file must be a plain file name without directories",
+}
+
+
+def _resolve_export_path(output_file: str) -> str | None:
+    """Place an export file name in the export directory.
+
+    Returns None unless output_file is a plain file name, so exports
+    never leave the export directory.
+    """
+    if (
+        not output_file
+        or os.path.basename(output_file) != output_file
+        or output_file.startswith(".")
+    ):
+        return None
+    return os.path.join(_container.settings.export_dir, output_file)
 
 
 # ---------------------------------------------------------------------------
 # Tool 14: import_aws_tag_policy
 # ---------------------------------------------------------------------------
 @mcp.tool()
+@_instrumented
 async def import_aws_tag_policy(
     policy_id: str | None = None,
     save_to_file: bool = True,
@@ -978,13 +1516,432 @@ async def import_aws_tag_policy(
         output_path=output_path,
     )
 
-    return json.dumps(result.model_dump(mode="json"), default=str)
+    return _to_json(result.model_dump(mode="json"), default=str)
+
+
+# ---------------------------------------------------------------------------
+# Tool 15: start_compliance_scan
+# ---------------------------------------------------------------------------
+@mcp.tool()
+@_instrumented
+async def start_compliance_scan(
+    resource_types: list[str],
+    filters: dict[str, str] | None = None,
+    severity: str = "all",
+    store_snapshot: bool = False,
+    force_refresh: bool = False,
+) -> str:
+    """Start a compliance scan in the background and return a job ID.
+
+    Same scan as check_tag_compliance, but it runs on the server without a
+    time limit, so large scans (many resource types, all regions, or
+    ["all"]) never hit the client timeout. The call returns immediately.
+
+    WORKFLOW:
+    1. Call get_tagging_policy to get the resource types in scope.
+    2. Call this tool with ALL of those types (no need to batch).
+    3. Poll get_scan_status with the job_id every 15-30 seconds. It reports
+       progress and running totals found so far.
+    4. When status is "completed", call get_scan_result for the full result
+       (same format as check_tag_compliance, including data_quality).
+
+    Running totals in get_scan_status are PARTIAL until the job completes.
+    Do not present them as final results.
+
+    Args:
+        resource_types: List of resource types to check, or ["all"]
+        filters: Optional filters for region or account_id
+        severity: Filter results by severity: "all", "errors_only", or "warnings_only"
+        store_snapshot: If true, store the final result in history for trend tracking
+        force_refresh: If true, bypass cache and force fresh scan
+    """
+    _ensure_initialized()
+    if not _container.scan_job_service:
+        return _to_json({
+            "error": "jobs_unavailable",
+            "message": "Background scan jobs are not available. Use check_tag_compliance.",
+        })
+
+    async def run_scan(progress_callback: ProgressCallback) -> dict[str, Any]:
+        response = await _run_check_tag_compliance(
+            resource_types=resource_types,
+            filters=filters,
+            severity=severity,
+            store_snapshot=store_snapshot,
+            force_refresh=force_refresh,
+            progress_callback=progress_callback,
+        )
+        if "error" in response:
+            raise RuntimeError(response["message"])
+        return response
+
+    job = await _container.scan_job_service.start_job(
+        parameters={
+            "resource_types": resource_types,
+            "filters": filters,
+            "severity": severity,
+            "store_snapshot": store_snapshot,
+            "force_refresh": force_refresh,
+        },
+        runner=run_scan,
+    )
+
+    return _to_json({
+        "job_id": job.job_id,
+        "status": job.status.value,
+        "created_at": job.created_at.isoformat(),
+        "message": "Scan started. Poll get_scan_status with this job_id for progress.",
+    })
+
+
+# ---------------------------------------------------------------------------
+# Tool 16: get_scan_status
+# ---------------------------------------------------------------------------
+@mcp.tool()
+@_instrumented
+async def get_scan_status(job_id: str) -> str:
+    """Get the status and progress of a background compliance scan.
+
+    Returns the job status ("pending", "running", "completed" or "failed"),
+    how many region scans have finished, and running totals (resources
+    scanned, violations found, compliance score so far).
+
+    CRITICAL — data accuracy: running totals are PARTIAL while the status is
+    "pending" or "running". Only report final numbers from get_scan_result.
+
+    Args:
+        job_id: Job ID returned by start_compliance_scan
+    """
+    _ensure_initialized()
+    if not _container.scan_job_service:
+        return _to_json({
+            "error": "jobs_unavailable",
+            "message": "Background scan jobs are not available.",
+        })
+
+    try:
+        job = await _container.scan_job_service.get_job(job_id)
+    except ScanJobNotFoundError as e:
+        return _to_json({"error": "job_not_found", "message": str(e)})
+
+    return _to_json(_scan_job_to_dict(job), default=str)
+
+
+# ---------------------------------------------------------------------------
+# Tool 17: get_scan_result
+# ---------------------------------------------------------------------------
+@mcp.tool()
+@_instrumented
+async def get_scan_result(job_id: str) -> str:
+    """Get the final result of a completed background compliance scan.
+
+    The "result" field has the same format as check_tag_compliance,
+    including data_quality. If the job is still running, returns its
+    status and progress instead; poll get_scan_status and try again later.
+
+    Args:
+        job_id: Job ID returned by start_compliance_scan
+    """
+    _ensure_initialized()
+    if not _container.scan_job_service:
+        return _to_json({
+            "error": "jobs_unavailable",
+            "message": "Background scan jobs are not available.",
+        })
+
+    try:
+        job = await _container.scan_job_service.get_job(job_id)
+        result = await _container.scan_job_service.get_result(job_id)
+    except ScanJobNotFoundError as e:
+        return _to_json({"error": "job_not_found", "message": str(e)})
+
+    response = _scan_job_to_dict(job)
+    if job.status == ScanJobStatus.COMPLETED:
+        response["result"] = result
+    elif not job.is_finished:
+        response["message"] = "Scan is not finished yet. Poll get_scan_status and retry."
+
+    return _to_json(response, default=str)
+
+
+# ---------------------------------------------------------------------------
+# Tool 18: get_violations_page
+# ---------------------------------------------------------------------------
+@mcp.tool()
+@_instrumented
+async def get_violations_page(
+    result_id: str,
+    cursor: str | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    region: str | None = None,
+    resource_type: str | None = None,
+    tag_name: str | None = None,
+    severity: str | None = None,
+    sort_by: str = "resource_id",
+) -> str:
+    """Page through the violations of a stored check_tag_compliance result.
+
+    check_tag_compliance returns only the first page of violations plus a
+    "pagination" block. Use its result_id here to fetch further pages, or
+    start a new listing with filters and a different sort order.
+
+    To continue a listing, pass the next_cursor from the previous page. The
+    cursor remembers the filters and sort order, so they do not need to be
+    repeated. next_cursor is null on the last page.
+
+    Stored results expire after a day; re-run the scan if the result_id is
+    not found.
+
+    Args:
+        result_id: result_id from the pagination block of check_tag_compliance
+        cursor: next_cursor from the previous page (omit for the first page)
+        page_size: Violations per page (1-1000, default 100)
+        region: Only violations in this region (e.g. "us-east-1" or "global")
+        resource_type: Only violations for this resource type (e.g. "ec2:instance")
+        tag_name: Only violations of this tag (e.g. "CostCenter")
+        severity: Only "error" or "warning" violations
+        sort_by: "resource_id" (default), "cost_impact" (highest first),
+            "severity" (errors first), "region", "resource_type", or "tag_name"
+    """
+    _ensure_initialized()
+    store = _container.result_store_service
+    if store is None:
+        return _to_json({
+            "error": "result_store_unavailable",
+            "message": "Stored scan results are not available. Re-run check_tag_compliance.",
+        })
+
+    filters = {
+        "region": region,
+        "resource_type": resource_type,
+        "tag_name": tag_name,
+        "severity": severity,
+    }
+    try:
+        page = await store.get_page(
+            result_id,
+            cursor=cursor,
+            page_size=page_size,
+            filters=filters,
+            sort_by=sort_by,
+        )
+        summary = await store.get_summary(page.result_id)
+    except ResultNotFoundError as e:
+        return _to_json({
+            "error": "result_not_found",
+            "message": str(e),
+            "suggestion": "Run check_tag_compliance again to get a new result_id.",
+        })
+    except InvalidCursorError as e:
+        return _to_json({
+            "error": "invalid_cursor",
+            "message": str(e),
+            "suggestion": "Pass next_cursor exactly as returned, or omit it for the first page.",
+        })
+    except ValueError as e:
+        return _to_json({"error": "invalid_request", "message": str(e)})
+
+    response = page.model_dump(mode="json")
+    response["returned"] = len(page.violations)
+    # Carry the scan's completeness forward so partial data is never hidden
+    response["data_quality"] = summary.get("data_quality")
+    response["scan_timestamp"] = summary.get("scan_timestamp")
+    return _to_json(response, default=str)
+
+
+# ---------------------------------------------------------------------------
+# Tool 19: export_columnar
+# ---------------------------------------------------------------------------
+@mcp.tool()
+@_instrumented
+async def export_columnar(
+    output_file: str,
+    dataset: str = "violations",
+    resource_types: list[str] | None = None,
+    severity: str = "all",
+    format: str = "parquet",
+) -> str:
+    """Export violations or the raw resource inventory as a Parquet or Arrow file.
+
+    Writes a typed, columnar file on the server for analytics in DuckDB,
+    Pandas or Spark. Much smaller and faster to load than CSV, and safe for
+    millions of rows. The response gives the path, row count and SHA-256
+    checksum; the data itself is not returned.
+
+    CRITICAL — data accuracy: Check "data_quality" in the response. If status
+    is "partial", tell the user which regions or resource types are missing
+    from the file (also listed in failed_regions / failed_resource_types).
+
+    RECOMMENDED: Call get_tagging_policy first to know which resource types
+    are in scope, then pass them here rather than guessing.
+
+    Args:
+        output_file: File name to write in the server's export directory
+            (e.g. "violations-2026-01.parquet"). No directories.
+        dataset: "violations" (one row per violation, with the scan summary in
+            the file metadata) or "inventory" (one row per resource: ARN, type,
+            region, account, tags as a map, state, cost)
+        resource_types: Resource types to include. If None, scans all types
+            (WARNING: may timeout).
+        severity: For violations: "all", "errors_only", or "warnings_only"
+        format: "parquet" (default) or "arrow" (Arrow IPC stream)
+    """
+    _ensure_initialized()
+    from .tools import export_columnar as _export
+
+    output_path = _resolve_export_path(output_file)
+    if output_path is None:
+        return _to_json(_INVALID_OUTPUT_FILE)
+
+    try:
+        result = await _export(
+            compliance_service=_container.compliance_service,
+            output_path=output_path,
+            dataset=dataset,
+            resource_types=resource_types,
+            severity=severity,
+            format=format,
+            multi_region_scanner=_container.multi_region_scanner,
+        )
+    except ImportError as e:
+        return _to_json({"error": "missing_dependency", "message": str(e)})
+    except ValueError as e:
+        return _to_json({"error": "invalid_request", "message": str(e)})
+    except Exception as e:
+        logger.error(f"Error during columnar export: {e}")
+        return _to_json({"error": "export_failed", "message": str(e)})
+
+    export_data = result.model_dump(mode="json")
+    export_data["data_quality"] = _build_data_quality(result)
+    return _to_json(export_data, default=str)
+
+
+# ---------------------------------------------------------------------------
+# Tool 20: apply_tag_events
+# ---------------------------------------------------------------------------
+@mcp.tool()
+@_instrumented
+async def apply_tag_events(max_events: int = 1000) -> str:
+    """Apply pending CloudTrail tag change events instead of rescanning.
+
+    Reads tag and lifecycle events (CreateTags, TagResource, PutBucketTagging,
+    RunInstances, DeleteBucket, ...) from the configured event source
+    (TAG_EVENT_DIR or TAG_EVENT_QUEUE_URL) and applies them to the cached
+    inventory and validation results of the last full scan. Only the changed
+    resources are validated again. Afterwards check_tag_compliance answers
+    from the patched results, without listing resources, for types a full
+    scan covered within INCREMENTAL_MAX_AGE_HOURS.
+
+    Resources in "unresolved_resources" had tag events but no known prior
+    tags; their resource types are listed again on the next scan.
+
+    Args:
+        max_events: Maximum number of events to apply in this call (default 1000)
+    """
+    _ensure_initialized()
+
+    service = _container.incremental_scan_service
+    source = _container.tag_event_source
+    if service is None or source is None:
+        return _to_json({
+            "error": "event_source_unavailable",
+            "message": "No tag event source is configured. "
+                       "Set TAG_EVENT_DIR or TAG_EVENT_QUEUE_URL.",
+        })
+    if max_events < 1:
+        return _to_json({
+            "error": "invalid_request",
+            "message": "max_events must be at least 1",
+        })
+
+    try:
+        result = await service.consume(source, max_events=max_events)
+    except Exception as e:
+        logger.error(f"Error applying tag change events: {e}")
+        return _to_json({"error": "apply_events_failed", "message": str(e)})
+
+    return _to_json(result.model_dump(mode="json"), default=str)
+
+
+# ---------------------------------------------------------------------------
+# Tool 21: get_compliance_trend
+# ---------------------------------------------------------------------------
+@mcp.tool()
+@_instrumented
+async def get_compliance_trend(
+    dimension: str = "all",
+    key: str | None = None,
+    group_by: str = "month",
+    since: str | None = None,
+    until: str | None = None,
+) -> str:
+    """Retrieve long-range compliance trends, overall or per region, type or tag.
+
+    Reads the downsampled history rollups, so it reaches back years (monthly
+    points are kept forever by default), unlike get_violation_history, which
+    covers the last 90 days. Each series has one point per period, averaged
+    over the compliance snapshots stored in it (store_snapshot=True on
+    check_tag_compliance). Breakdowns report non-compliant resources,
+    violations and cost gap per snapshot; only the overall series has a
+    compliance score.
+
+    Args:
+        dimension: "all" (overall), "region", "resource_type", or "tag_name"
+        key: Only this region, resource type or tag name (e.g. "us-east-1").
+            If None, returns one series per value.
+        group_by: Period of each point: "day", "week", or "month" (default)
+        since: Start date, ISO 8601 (e.g. "2023-01-01"). If None, all retained history.
+        until: End date, ISO 8601. If None, up to now.
+    """
+    _ensure_initialized()
+    from .tools import get_compliance_trend as _trend
+
+    if _container.history_service is None:
+        return _to_json({
+            "error": "history_unavailable",
+            "message": "Compliance history storage is not available.",
+        })
+
+    try:
+        result = await _trend(
+            history_service=_container.history_service,
+            dimension=dimension,
+            key=key,
+            group_by=group_by,
+            since=since,
+            until=until,
+        )
+    except ValueError as e:
+        return _to_json({"error": "invalid_request", "message": str(e)})
+
+    return _to_json(result.model_dump(mode="json"), default=str)
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+def _scan_job_to_dict(job: ScanJob) -> dict[str, Any]:
+    """Build the status block shared by the scan job tools."""
+    data: dict[str, Any] = {
+        "job_id": job.job_id,
+        "status": job.status.value,
+        "parameters": job.parameters,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+    }
+    if job.progress:
+        progress = job.progress.model_dump(mode="json")
+        progress["percent_complete"] = job.progress.percent_complete
+        progress["compliance_score_so_far"] = round(job.progress.compliance_score, 4)
+        progress["eta_seconds"] = job.progress.eta_seconds
+        data["progress"] = progress
+    if job.error:
+        data["error_message"] = job.error
+    return data
+
+
 def _ensure_initialized() -> None:
     """Raise if the container hasn't been initialized yet."""
     if _container is None or not _container.initialized:
@@ -2,11 +2,13 @@
 
 from .check_tag_compliance import check_tag_compliance
 from .detect_tag_drift import DetectTagDriftResult, detect_tag_drift
+from .export_columnar import ExportColumnarResult, export_columnar
 from .export_violations_csv import ExportViolationsCsvResult, export_violations_csv
 from .find_untagged_resources import find_untagged_resources
 from .generate_compliance_report import GenerateComplianceReportResult, generate_compliance_report
 from .generate_custodian_policy import GenerateCustodianPolicyResult, generate_custodian_policy
 from .generate_openops_workflow import GenerateOpenOpsWorkflowResult, generate_openops_workflow
+from .get_compliance_trend import get_compliance_trend
 from .get_cost_attribution_gap import get_cost_attribution_gap
 from .get_tagging_policy import GetTaggingPolicyResult, get_tagging_policy
 from .get_violation_history import GetViolationHistoryResult, get_violation_history
@@ -42,4 +44,7 @@ __all__ = [
     "ExportViolationsCsvResult",
     "import_aws_tag_policy",
     "ImportAwsTagPolicyResult",
+    "export_columnar",
+    "ExportColumnarResult",
+    "get_compliance_trend",
 ]
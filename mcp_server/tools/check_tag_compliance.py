@@ -17,12 +17,14 @@ Requirements: 1.1, 1.2, 1.3, 1.4, 1.5, 3.1, 7.4, 8.1, 17.3, 17.7
 import logging
 from typing import Union
 
+from ..clients.aws_client import defer_tag_lookups, resolve_deferred_tags
 from ..models.compliance import ComplianceResult
 from ..models.multi_region import MultiRegionComplianceResult
 from ..services.compliance_service import ComplianceService
 from ..services.history_service import HistoryService
-from ..services.multi_region_scanner import MultiRegionScanner
-from ..utils.resource_utils import get_supported_resource_types
+from ..services.multi_region_scanner import MultiRegionScanner, ProgressCallback
+from ..services.sampling_service import DEFAULT_CONFIDENCE_LEVEL, SamplingService
+from ..utils.resource_utils import assign_service_costs, get_supported_resource_types
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +41,9 @@ async def check_tag_compliance(
     store_snapshot: bool = False,
     force_refresh: bool = False,
     multi_region_scanner: MultiRegionScanner | None = None,
+    progress_callback: ProgressCallback | None = None,
+    sample_size: int | None = None,
+    confidence_level: float = DEFAULT_CONFIDENCE_LEVEL,
 ) -> ComplianceResultType:
     """
     Check tag compliance for AWS resources.
@@ -91,6 +96,15 @@ async def check_tag_compliance(
                              When None or multi-region is disabled, falls back to
                              single-region scanning using compliance_service.
                              Requirements: 3.1, 7.4
+        progress_callback: Optional async callback receiving ScanProgress
+                          updates as each region finishes (multi-region mode only).
+                          Used by background scan jobs to report progress.
+        sample_size: If set, validate a stratified random sample of this many
+                    resources (per region and resource type) instead of every
+                    resource, and return a SampledComplianceResult with
+                    confidence intervals. Sampled results are never stored in
+                    history.
+        confidence_level: Confidence level of the sampling intervals (default 0.95)
 
     Returns:
         ComplianceResult or MultiRegionComplianceResult containing:
@@ -202,6 +216,42 @@ async def check_tag_compliance(
         and multi_region_scanner.multi_region_enabled
     )
 
+    if sample_size is not None:
+        # Sampling mode: list the inventory, validate only a stratified sample
+        if sample_size < 1:
+            raise ValueError("sample_size must be at least 1")
+        # Tag calls made one resource at a time are deferred until the draw
+        with defer_tag_lookups():
+            if use_multi_region:
+                inventory = await multi_region_scanner.fetch_inventory(resource_types, filters)
+            else:
+                inventory = await compliance_service.fetch_inventory(resource_types, filters)
+        resources = inventory.resources
+        cost_estimated = await assign_service_costs(compliance_service.aws_client, resources)
+        sampler = SamplingService(compliance_service.policy_service)
+        sample = sampler.draw(resources, sample_size)
+        refused = await resolve_deferred_tags([r for _, drawn in sample.values() for r in drawn])
+        # A refused tag lookup would read as an untagged resource; drop its
+        # stratum rather than bias the estimate, as exact scans drop the type
+        dropped = {(r["region"], r["resource_type"]) for r in refused}
+        result = sampler.estimate_sample(
+            {key: stratum for key, stratum in sample.items() if key not in dropped},
+            severity=severity,
+            confidence_level=confidence_level,
+            cost_estimated=cost_estimated,
+            failed_regions=inventory.failed_regions,
+            failed_resource_types=inventory.failed_type_names,
+        )
+        if dropped:
+            result.incomplete_resource_types = sorted({rt for _, rt in dropped})
+            logger.warning(
+                f"Request deadline reached - dropped {len(dropped)} strata whose tag "
+                f"lookups were refused: {sorted(dropped)}"
+            )
+        if store_snapshot:
+            logger.warning("Not storing compliance snapshot: sampled results are approximate.")
+        return result
+
     if use_multi_region:
         # Multi-region scanning mode
         logger.info(f"Using multi-region scanner for compliance check (force_refresh={force_refresh})")
@@ -210,6 +260,7 @@ async def check_tag_compliance(
             filters=filters,
             severity=severity,
             force_refresh=force_refresh,
+            progress_callback=progress_callback,
         )
         logger.info(
             f"Multi-region compliance check complete: score={result.compliance_score:.2%}, "
@@ -239,7 +290,17 @@ async def check_tag_compliance(
     # Store the result in history database only if explicitly requested
     # Note: History storage works with both ComplianceResult and MultiRegionComplianceResult
     # since they share the same core fields (compliance_score, total_resources, etc.)
-    if store_snapshot and history_service:
+    is_partial = bool(getattr(result, "incomplete_resource_types", None)) or bool(
+        getattr(getattr(result, "region_metadata", None), "incomplete_regions", None)
+    )
+
+    if store_snapshot and history_service and is_partial:
+        # A scan cut short by the request deadline would skew the trend line
+        logger.warning(
+            "Not storing compliance snapshot: the request deadline was reached "
+            "and the scan is incomplete."
+        )
+    elif store_snapshot and history_service:
         try:
             await history_service.store_scan_result(result)
             logger.info(
@@ -11,9 +11,12 @@ from typing import TYPE_CHECKING
 from pydantic import BaseModel, Field
 
 from ..clients.aws_client import AWSClient
+from ..models.inventory import ResourceInventory
 from ..services.compliance_service import ComplianceService
 from ..services.history_service import HistoryService
 from ..services.policy_service import PolicyService
+from ..services.tag_state_service import ResourceTagChange, TagStateService
+from ..utils.tag_digest import TagDigestTree, group_by_leaf
 
 if TYPE_CHECKING:
     from ..services.multi_region_scanner import MultiRegionScanner
@@ -58,6 +61,15 @@ class DetectTagDriftResult(BaseModel):
     baseline_timestamp: str | None = Field(
         None, description="Timestamp of the baseline scan used for comparison"
     )
+    baseline_source: str = Field(
+        "policy",
+        description="'tag_state' when compared against recorded per-resource tags, "
+        "'policy' when no baseline was recorded and tags were checked against the policy",
+    )
+    resources_added: int = Field(0, description="Resources that appeared since the baseline")
+    resources_removed: int = Field(
+        0, description="Baseline resources no longer present"
+    )
     summary: dict[str, int] = Field(
         default_factory=dict,
         description="Summary counts by drift type (added, removed, changed)",
@@ -77,6 +89,7 @@ async def detect_tag_drift(
     history_service: HistoryService | None = None,
     compliance_service: ComplianceService | None = None,
     multi_region_scanner: "MultiRegionScanner | None" = None,
+    tag_state_service: TagStateService | None = None,
 ) -> DetectTagDriftResult:
     """
     Detect unexpected tag changes since the last compliance scan.
@@ -85,9 +98,11 @@ async def detect_tag_drift(
     tags that were added, removed, or had their values changed. This helps
     detect unauthorized changes, accidental deletions, and configuration drift.
 
-    The baseline is determined by comparing current tags against tags stored
-    in previous compliance scan results. If no historical data is available,
-    the tool performs a fresh scan and reports the current state.
+    The baseline is the per-resource tag state recorded (by compliance scans
+    and by this tool) nearest to lookback_days ago; current tags are
+    diffed against it resource by resource. If no state has been recorded
+    yet, tags are checked against the policy instead: missing required tags
+    are reported as removed and disallowed values as changed.
 
     Args:
         aws_client: AWSClient for fetching current resource tags
@@ -100,7 +115,9 @@ async def detect_tag_drift(
             Default: 7. Range: 1-90.
         history_service: Optional HistoryService for retrieving baseline data
         compliance_service: Optional ComplianceService for scanning
-        multi_region_scanner: Optional MultiRegionScanner for multi-region support
+        multi_region_scanner: Optional MultiRegionScanner; when multi-region
+            scanning is enabled, current tags are listed in every enabled region
+        tag_state_service: Optional TagStateService holding recorded tag state
 
     Returns:
         DetectTagDriftResult containing:
@@ -109,6 +126,9 @@ async def detect_tag_drift(
         - resources_analyzed: How many resources were checked
         - lookback_days: How far back we looked
         - baseline_timestamp: When the baseline was captured
+        - baseline_source: "tag_state" or "policy"
+        - resources_added / resources_removed: Resources appearing or
+          disappearing since the baseline
         - summary: Counts by drift type
 
     Raises:
@@ -142,34 +162,166 @@ async def detect_tag_drift(
     else:
         monitored_keys = {tag.name for tag in policy.required_tags}
 
-    # Fetch current tags for all resources
-    current_tags_by_arn: dict[str, dict[str, str]] = {}
-    resources_analyzed = 0
+    # Fetch current tags for all resources, across all enabled regions
+    # when multi-region scanning is on
+    use_multi_region = (
+        multi_region_scanner is not None and multi_region_scanner.multi_region_enabled
+    )
+    current_resources: list[dict] = []
+    # (region, resource_type) pairs that were listed; the baseline is
+    # compared only within these, so a region or type that wasn't listed
+    # doesn't show up as removed resources
+    listed: set[tuple[str, str]] = set()
 
     for resource_type in resource_types:
         try:
-            resources = await aws_client.get_all_tagged_resources(
-                resource_type_filters=[resource_type]
-            )
-            for resource in resources:
-                arn = resource.get("arn", "")
-                if arn:
-                    current_tags_by_arn[arn] = resource.get("tags", {})
-                    resources_analyzed += 1
+            if use_multi_region:
+                inventory = await multi_region_scanner.fetch_inventory([resource_type])
+            else:
+                inventory = ResourceInventory(
+                    resources_by_region={
+                        aws_client.region: await aws_client.get_all_tagged_resources(
+                            resource_type_filters=[resource_type]
+                        )
+                    }
+                )
         except Exception as e:
             logger.warning(f"Error fetching resources of type {resource_type}: {e}")
+            continue
+        listed.update(
+            (region, resource_type)
+            for region in inventory.resources_by_region
+            if region not in inventory.failed_resource_types
+        )
+        for resource in inventory.resources:
+            arn = resource.get("arn", "")
+            if arn:
+                entry = {
+                    "arn": arn,
+                    "tags": resource.get("tags") or {},
+                    "resource_type": resource.get("resource_type") or _infer_resource_type(arn),
+                    "region": resource.get("region") or _extract_region_from_arn(arn),
+                }
+                current_resources.append(entry)
+                listed.add((entry["region"], entry["resource_type"]))
+    resources_analyzed = len(current_resources)
+
+    baseline = None
+    if tag_state_service:
+        try:
+            baseline = await tag_state_service.find_baseline(lookback_days)
+        except Exception as e:
+            logger.warning(f"Failed to read tag state baseline: {e}")
 
-    # Try to get baseline from history
-    # Since the history service stores aggregate data (not per-resource tags),
-    # we use a simulated baseline approach: compare current state against
-    # expected state from policy
     baseline_timestamp = None
+    baseline_source = "policy"
+    resources_added = resources_removed = 0
     drift_entries: list[TagDriftEntry] = []
 
-    # For each resource, check if required tags are present and valid
-    for arn, current_tags in current_tags_by_arn.items():
-        # Extract resource info from ARN
-        resource_id = arn.split("/")[-1] if "/" in arn else arn.split(":")[-1]
+    if baseline:
+        # Diff against the recorded state, comparing resource by resource
+        # only in digest leaves that differ
+        baseline_timestamp = baseline.scanned_at.isoformat()
+        baseline_source = "tag_state"
+        current_tree = TagDigestTree.from_groups(group_by_leaf(current_resources))
+        baseline_tree = await tag_state_service.load_digests(baseline, scope=listed)
+        changed_leaves = current_tree.changed_leaves(baseline_tree)
+        logger.info(
+            f"{len(changed_leaves)} of {len(current_tree.leaves)} digest leaves "
+            f"changed since {baseline_timestamp}"
+        )
+        changes = (
+            await tag_state_service.diff(
+                baseline, current_resources, leaves=changed_leaves, scope=listed
+            )
+            if changed_leaves
+            else []
+        )
+        for change in changes:
+            if change.old_tags is None:
+                resources_added += 1
+            elif change.new_tags is None:
+                resources_removed += 1
+            else:
+                drift_entries.extend(_diff_tags(change, monitored_keys, policy))
+    else:
+        drift_entries = _check_against_policy(current_resources, monitored_keys, policy)
+
+    # Record the current state so later runs have a baseline
+    if tag_state_service and current_resources:
+        try:
+            await tag_state_service.record_state(current_resources)
+        except Exception as e:
+            logger.warning(f"Failed to record tag state: {e}")
+
+    # Build summary
+    summary: dict[str, int] = {"added": 0, "removed": 0, "changed": 0}
+    for drift in drift_entries:
+        summary[drift.drift_type] = summary.get(drift.drift_type, 0) + 1
+
+    logger.info(
+        f"Drift detection complete: {len(drift_entries)} drifts detected "
+        f"across {resources_analyzed} resources (baseline: {baseline_source})"
+    )
+
+    return DetectTagDriftResult(
+        drift_detected=drift_entries,
+        resources_analyzed=resources_analyzed,
+        lookback_days=lookback_days,
+        baseline_timestamp=baseline_timestamp,
+        baseline_source=baseline_source,
+        resources_added=resources_added,
+        resources_removed=resources_removed,
+        summary=summary,
+    )
+
+
+def _diff_tags(
+    change: ResourceTagChange, monitored_keys: set[str], policy
+) -> list[TagDriftEntry]:
+    """Compare monitored tags of a resource between the baseline and now."""
+    entries = []
+    for tag_key in sorted(monitored_keys):
+        tag_def = _find_tag_definition(policy, tag_key)
+        if tag_def and tag_def.applies_to and change.resource_type not in tag_def.applies_to:
+            continue
+
+        old_value = change.old_tags.get(tag_key)
+        new_value = change.new_tags.get(tag_key)
+        if old_value == new_value:
+            continue
+        if old_value is None:
+            drift_type = "added"
+        elif new_value is None:
+            drift_type = "removed"
+        else:
+            drift_type = "changed"
+
+        entries.append(
+            TagDriftEntry(
+                resource_arn=change.arn,
+                resource_id=_resource_id_from_arn(change.arn),
+                resource_type=change.resource_type,
+                region=change.region,
+                tag_key=tag_key,
+                drift_type=drift_type,
+                old_value=old_value,
+                new_value=new_value,
+                severity=_classify_severity(tag_key, policy, drift_type),
+            )
+        )
+    return entries
+
+
+def _check_against_policy(
+    resources: list[dict], monitored_keys: set[str], policy
+) -> list[TagDriftEntry]:
+    """Without a recorded baseline, compare current tags against the policy."""
+    entries = []
+    for resource in resources:
+        arn = resource["arn"]
+        current_tags = resource["tags"]
+        resource_id = _resource_id_from_arn(arn)
         resource_type = _infer_resource_type(arn)
         region = _extract_region_from_arn(arn)
 
@@ -183,7 +335,7 @@ async def detect_tag_drift(
 
             if current_value is None:
                 # Tag is missing - this could be a removal drift
-                drift_entries.append(
+                entries.append(
                     TagDriftEntry(
                         resource_arn=arn,
                         resource_id=resource_id,
@@ -198,7 +350,7 @@ async def detect_tag_drift(
                 )
             elif tag_def and tag_def.allowed_values and current_value not in tag_def.allowed_values:
                 # Tag value is not in the allowed list — possible drift
-                drift_entries.append(
+                entries.append(
                     TagDriftEntry(
                         resource_arn=arn,
                         resource_id=resource_id,
@@ -211,24 +363,12 @@ async def detect_tag_drift(
                         severity=_classify_severity(tag_key, policy, "changed"),
                     )
                 )
+    return entries
 
-    # Build summary
-    summary: dict[str, int] = {"added": 0, "removed": 0, "changed": 0}
-    for drift in drift_entries:
-        summary[drift.drift_type] = summary.get(drift.drift_type, 0) + 1
 
-    logger.info(
-        f"Drift detection complete: {len(drift_entries)} drifts detected "
-        f"across {resources_analyzed} resources"
-    )
-
-    return DetectTagDriftResult(
-        drift_detected=drift_entries,
-        resources_analyzed=resources_analyzed,
-        lookback_days=lookback_days,
-        baseline_timestamp=baseline_timestamp,
-        summary=summary,
-    )
+def _resource_id_from_arn(arn: str) -> str:
+    """Last segment of an ARN (after the final "/" or ":")."""
+    return arn.split("/")[-1] if "/" in arn else arn.split(":")[-1]
 
 
 def _infer_resource_type(arn: str) -> str:
@@ -0,0 +1,193 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""MCP tool for exporting violations or resource inventory to Parquet/Arrow."""
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from pydantic import BaseModel, Field
+
+from ..services.compliance_service import ComplianceService
+from ..utils.columnar_export import (
+    COLUMNAR_FORMATS,
+    DEFAULT_ROW_GROUP_SIZE,
+    file_checksum,
+    write_inventory,
+    write_violations,
+)
+from ..utils.resource_utils import assign_service_costs
+
+if TYPE_CHECKING:
+    from ..services.multi_region_scanner import MultiRegionScanner
+
+logger = logging.getLogger(__name__)
+
+DATASETS = ("violations", "inventory")
+
+
+class ExportColumnarResult(BaseModel):
+    """Result from the export_columnar tool."""
+
+    dataset: str = Field(..., description="What was exported: violations or inventory")
+    format: str = Field(..., description="File format: parquet or arrow")
+    output_path: str = Field(..., description="File the export was written to")
+    row_count: int = Field(0, description="Rows written")
+    row_group_count: int = Field(0, description="Parquet row groups / Arrow record batches")
+    file_size_bytes: int = Field(0, description="Size of the output file in bytes")
+    checksum_sha256: str = Field(..., description="SHA-256 of the output file")
+    filters_applied: dict = Field(
+        default_factory=dict, description="Filters that were applied"
+    )
+    failed_regions: list[str] = Field(
+        default_factory=list,
+        description="Regions that failed or were cut short; the export doesn't fully cover them",
+    )
+    failed_resource_types: list[str] = Field(
+        default_factory=list,
+        description="Resource types that failed to list or were cut short in at least one region",
+    )
+    export_timestamp: datetime = Field(
+        default_factory=lambda: datetime.now(UTC),
+        description="When the export was generated",
+    )
+
+
+async def export_columnar(
+    compliance_service: ComplianceService,
+    output_path: str,
+    dataset: str = "violations",
+    resource_types: list[str] | None = None,
+    severity: str = "all",
+    format: str = "parquet",
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    multi_region_scanner: "MultiRegionScanner | None" = None,
+) -> ExportColumnarResult:
+    """
+    Export violations or the raw resource inventory to a columnar file.
+
+    Violations exports keep typed columns (enums as dictionary-encoded
+    strings, allowed_values as a list, cost as a double) and store the scan
+    summary in the file metadata so ReportService.generate_report_from_export
+    can report on the file directly. Inventory exports hold one row per
+    resource with its ARN, type, region, account, tags (a map column),
+    state and cost. The cost is the resource's even share of its service's
+    Cost Explorer cost in its region (0 if Cost Explorer can't be queried).
+
+    Regions or resource types that fail to list don't fail the export; they
+    are reported in failed_regions / failed_resource_types of the result and
+    of the summary stored in the file metadata.
+
+    Args:
+        compliance_service: ComplianceService for scans and inventory fetches
+        output_path: File to write
+        dataset: "violations" (default) or "inventory"
+        resource_types: Resource types to include. Default: ["all"]
+        severity: Severity filter for violations exports: "all", "errors_only",
+            or "warnings_only"
+        format: "parquet" (default) or "arrow" (Arrow IPC stream)
+        row_group_size: Rows buffered per row group; bounds memory use while writing
+        multi_region_scanner: Optional MultiRegionScanner for multi-region support
+
+    Returns:
+        ExportColumnarResult with the path, row count, size and checksum
+
+    Raises:
+        ValueError: If dataset, format or severity is invalid
+        ImportError: If pyarrow is not installed
+    """
+    if resource_types is None:
+        resource_types = ["all"]
+
+    if dataset not in DATASETS:
+        raise ValueError(f"Invalid dataset '{dataset}'. Must be one of: {list(DATASETS)}")
+    if format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Invalid format '{format}'. Must be one of: {list(COLUMNAR_FORMATS)}")
+    valid_severities = {"all", "errors_only", "warnings_only"}
+    if severity not in valid_severities:
+        raise ValueError(
+            f"Invalid severity '{severity}'. Must be one of: {valid_severities}"
+        )
+
+    logger.info(
+        f"Exporting {dataset} to {format}: resource_types={resource_types}, "
+        f"severity={severity}, path={output_path}"
+    )
+
+    use_multi_region = multi_region_scanner and multi_region_scanner.multi_region_enabled
+    filters_applied: dict = {"resource_types": resource_types}
+
+    if dataset == "inventory":
+        if use_multi_region:
+            inventory = await multi_region_scanner.fetch_inventory(resource_types)
+        else:
+            inventory = await compliance_service.fetch_inventory(resource_types)
+        failed_regions = inventory.failed_regions
+        failed_resource_types = inventory.failed_type_names
+        resources = inventory.resources
+        await assign_service_costs(compliance_service.aws_client, resources)
+        summary = {
+            "failed_regions": failed_regions,
+            "failed_resource_types": failed_resource_types,
+        }
+        row_count, row_groups = await asyncio.to_thread(
+            write_inventory, resources, output_path, format, row_group_size, summary
+        )
+    else:
+        filters_applied["severity"] = severity
+        if use_multi_region:
+            result = await multi_region_scanner.scan_all_regions(
+                resource_types=resource_types,
+                severity=severity,
+            )
+        else:
+            result = await compliance_service.check_compliance(
+                resource_types=resource_types,
+                severity=severity,
+            )
+        region_metadata = getattr(result, "region_metadata", None)
+        failed_regions = (
+            region_metadata.failed_regions + region_metadata.incomplete_regions
+            if region_metadata
+            else []
+        )
+        failed_resource_types = list(getattr(result, "incomplete_resource_types", []))
+        summary = {
+            "compliance_score": result.compliance_score,
+            "total_resources": result.total_resources,
+            "compliant_resources": result.compliant_resources,
+            "cost_attribution_gap": result.cost_attribution_gap,
+            "scan_timestamp": result.scan_timestamp.isoformat(),
+            "failed_regions": failed_regions,
+            "failed_resource_types": failed_resource_types,
+        }
+        row_count, row_groups = await asyncio.to_thread(
+            write_violations, result.violations, output_path, format, row_group_size, summary
+        )
+
+    checksum, size = await asyncio.to_thread(file_checksum, output_path)
+    logger.info(
+        f"Columnar export complete: {row_count} {dataset} rows in {row_groups} "
+        f"row group(s), {size} bytes"
+    )
+    if failed_regions or failed_resource_types:
+        logger.warning(
+            f"Columnar export is partial: failed_regions={failed_regions}, "
+            f"failed_resource_types={failed_resource_types}"
+        )
+
+    return ExportColumnarResult(
+        dataset=dataset,
+        format=format,
+        output_path=output_path,
+        row_count=row_count,
+        row_group_count=row_groups,
+        file_size_bytes=size,
+        checksum_sha256=checksum,
+        filters_applied=filters_applied,
+        failed_regions=failed_regions,
+        failed_resource_types=failed_resource_types,
+    )
@@ -4,11 +4,17 @@
 
 """MCP tool for exporting violation data to CSV format."""
 
+import asyncio
 import csv
+import gzip
+import hashlib
 import io
 import logging
+import os
+from collections.abc import Iterable
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from pydantic import BaseModel, Field
 
@@ -16,7 +22,7 @@ from ..services.compliance_service import ComplianceService
 from ..services.policy_service import PolicyService
 
 if TYPE_CHECKING:
-    from ..services.multi_region_scanner import MultiRegionScanner
+    from ..services.multi_region_scanner import MultiRegionScanner, ProgressCallback
 
 logger = logging.getLogger(__name__)
 
@@ -45,16 +51,53 @@ DEFAULT_COLUMNS = [
 ]
 
 
+class _ChecksumWriter:
+    """Binary sink that hashes and counts everything written to a file."""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.sha256 = hashlib.sha256()
+        self.bytes_written = 0
+
+    def write(self, data: bytes) -> int:
+        self.sha256.update(data)
+        self.bytes_written += len(data)
+        return self._raw.write(data)
+
+    def flush(self) -> None:
+        self._raw.flush()
+
+
+class _TextSink:
+    """Text front end for csv.writer that encodes rows onto a binary stream."""
+
+    def __init__(self, binary):
+        self._binary = binary
+
+    def write(self, text: str) -> int:
+        return self._binary.write(text.encode("utf-8"))
+
+
 class ExportViolationsCsvResult(BaseModel):
     """Result from the export_violations_csv tool."""
 
-    csv_data: str = Field(..., description="CSV formatted violation data")
+    csv_data: str = Field(
+        "", description="CSV formatted violation data (empty when written to a file)"
+    )
     row_count: int = Field(0, description="Number of data rows (excluding header)")
     column_count: int = Field(0, description="Number of columns in the export")
     columns: list[str] = Field(
         default_factory=list, description="Column names in the CSV"
     )
     format: str = Field("csv", description="Output format (always 'csv')")
+    output_path: str | None = Field(
+        None, description="File the CSV was streamed to, if a file export was requested"
+    )
+    compressed: bool = Field(False, description="Whether the output file is gzip-compressed")
+    checksum_sha256: str | None = Field(
+        None, description="SHA-256 of the output file as written to disk"
+    )
+    file_size_bytes: int | None = Field(None, description="Size of the output file in bytes")
     filters_applied: dict = Field(
         default_factory=dict, description="Filters that were applied"
     )
@@ -70,6 +113,9 @@ async def export_violations_csv(
     severity: str = "all",
     columns: list[str] | None = None,
     multi_region_scanner: "MultiRegionScanner | None" = None,
+    progress_callback: "ProgressCallback | None" = None,
+    output_path: str | None = None,
+    compress: bool = False,
 ) -> ExportViolationsCsvResult:
     """
     Export violation data to CSV format for external analysis.
@@ -88,10 +134,17 @@ async def export_violations_csv(
                       violation_type, tag_name, severity, current_value,
                       allowed_values, cost_impact_monthly
         multi_region_scanner: Optional MultiRegionScanner for multi-region support
+        progress_callback: Optional async callback receiving ScanProgress
+                          updates during a multi-region scan
+        output_path: If given, stream the CSV to this file instead of returning
+                    it in csv_data. Use for large exports: the CSV text is
+                    never held in memory. The scan's violation list still is.
+        compress: Gzip-compress the output file (only with output_path)
 
     Returns:
         ExportViolationsCsvResult containing:
-        - csv_data: The CSV content as a string
+        - csv_data: The CSV content as a string (empty for file exports)
+        - output_path, compressed, checksum_sha256, file_size_bytes: For file exports
         - row_count: Number of violation rows
         - column_count: Number of columns
         - columns: Column headers used
@@ -99,7 +152,8 @@ async def export_violations_csv(
         - export_timestamp: When the export was generated
 
     Raises:
-        ValueError: If invalid columns are specified
+        ValueError: If invalid columns are specified, or compress is set
+                    without output_path
 
     Example:
         >>> result = await export_violations_csv(
@@ -124,6 +178,9 @@ async def export_violations_csv(
     else:
         columns = DEFAULT_COLUMNS
 
+    if compress and not output_path:
+        raise ValueError("compress requires output_path")
+
     # Validate severity
     valid_severities = {"all", "errors_only", "warnings_only"}
     if severity not in valid_severities:
@@ -141,6 +198,7 @@ async def export_violations_csv(
         result = await multi_region_scanner.scan_all_regions(
             resource_types=resource_types,
             severity=severity,
+            progress_callback=progress_callback,
         )
     else:
         result = await compliance_service.check_compliance(
@@ -148,42 +206,46 @@ async def export_violations_csv(
             severity=severity,
         )
 
+    filters_applied = {
+        "resource_types": resource_types,
+        "severity": severity,
+    }
+
+    rows = (_violation_row(violation) for violation in result.violations)
+
+    if output_path:
+        # Disk and gzip work runs off the event loop
+        row_count, checksum, size = await asyncio.to_thread(
+            _write_csv_file, rows, columns, output_path, compress
+        )
+        logger.info(
+            f"CSV export streamed to {output_path}: {row_count} rows, "
+            f"{size} bytes{' (gzip)' if compress else ''}"
+        )
+        return ExportViolationsCsvResult(
+            row_count=row_count,
+            column_count=len(columns),
+            columns=columns,
+            filters_applied=filters_applied,
+            output_path=output_path,
+            compressed=compress,
+            checksum_sha256=checksum,
+            file_size_bytes=size,
+        )
+
     # Build CSV
     output = io.StringIO()
     writer = csv.DictWriter(output, fieldnames=columns, extrasaction="ignore")
     writer.writeheader()
 
     row_count = 0
-    for violation in result.violations:
-        row = {
-            "resource_arn": getattr(violation, "resource_arn", ""),
-            "resource_id": violation.resource_id,
-            "resource_type": violation.resource_type,
-            "region": violation.region,
-            "violation_type": violation.violation_type.value,
-            "tag_name": violation.tag_name,
-            "severity": violation.severity.value,
-            "current_value": violation.current_value or "",
-            "allowed_values": (
-                "; ".join(violation.allowed_values) if violation.allowed_values else ""
-            ),
-            "cost_impact_monthly": (
-                f"{violation.cost_impact_monthly:.2f}"
-                if violation.cost_impact_monthly
-                else "0.00"
-            ),
-        }
+    for row in rows:
         writer.writerow(row)
         row_count += 1
 
     csv_data = output.getvalue()
     output.close()
 
-    filters_applied = {
-        "resource_types": resource_types,
-        "severity": severity,
-    }
-
     logger.info(f"CSV export complete: {row_count} rows, {len(columns)} columns")
 
     return ExportViolationsCsvResult(
@@ -193,3 +255,73 @@ async def export_violations_csv(
         columns=columns,
         filters_applied=filters_applied,
     )
+
+
+def _violation_row(violation: Any) -> dict[str, str]:
+    """Convert a violation to a CSV row with every available column."""
+    return {
+        "resource_arn": getattr(violation, "resource_arn", ""),
+        "resource_id": violation.resource_id,
+        "resource_type": violation.resource_type,
+        "region": violation.region,
+        "violation_type": violation.violation_type.value,
+        "tag_name": violation.tag_name,
+        "severity": violation.severity.value,
+        "current_value": violation.current_value or "",
+        "allowed_values": (
+            "; ".join(violation.allowed_values) if violation.allowed_values else ""
+        ),
+        "cost_impact_monthly": (
+            f"{violation.cost_impact_monthly:.2f}"
+            if violation.cost_impact_monthly
+            else "0.00"
+        ),
+    }
+
+
+def _write_csv_file(
+    rows: Iterable[dict[str, str]],
+    columns: list[str],
+    output_path: str,
+    compress: bool,
+) -> tuple[int, str, int]:
+    """
+    Stream CSV rows to a file, one row at a time.
+
+    Rows go straight from the iterator to disk (through gzip when
+    compress is set), so no copy of the CSV text is built in memory.
+    The iterator itself reads from the scan result, whose violations
+    are already in memory.
+    The file is written under a temporary name and renamed when
+    complete, so readers never see a half-written export.
+
+    Returns:
+        Tuple of (row count, SHA-256 hex digest of the file, file size in bytes)
+    """
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial")
+
+    row_count = 0
+    try:
+        with open(partial, "wb") as raw:
+            checksum = _ChecksumWriter(raw)
+            # mtime=0 keeps the gzip header (and so the checksum) reproducible
+            binary = gzip.GzipFile(fileobj=checksum, mode="wb", mtime=0) if compress else None
+            try:
+                writer = csv.DictWriter(
+                    _TextSink(binary or checksum), fieldnames=columns, extrasaction="ignore"
+                )
+                writer.writeheader()
+                for row in rows:
+                    writer.writerow(row)
+                    row_count += 1
+            finally:
+                if binary is not None:
+                    binary.close()
+        os.replace(partial, path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+    return row_count, checksum.sha256.hexdigest(), checksum.bytes_written
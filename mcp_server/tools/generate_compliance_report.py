@@ -11,6 +11,7 @@ from pydantic import BaseModel, Field
 
 from ..models.compliance import ComplianceResult
 from ..models.report import ComplianceReport, ReportFormat
+from ..models.rollup import ComplianceRollup, RollupCell
 from ..services.report_service import ReportService
 
 logger = logging.getLogger(__name__)
@@ -33,8 +34,13 @@ class GenerateComplianceReportResult(BaseModel):
     """Result from the generate_compliance_report tool."""
 
     format: str = Field(..., description="Output format used (json, csv, markdown)")
-    formatted_output: str = Field(..., description="Complete formatted report string")
+    formatted_output: str = Field(
+        ..., description="Complete formatted report string (empty in summary-only mode)"
+    )
     summary: ReportSummary = Field(..., description="Quick summary with key metrics")
+    rollup: list[RollupCell] | None = Field(
+        None, description="Violation rollup slices, when group_by was requested"
+    )
     report_timestamp: datetime = Field(..., description="When the report was generated")
     scan_timestamp: datetime = Field(..., description="When the scan was performed")
 
@@ -44,6 +50,7 @@ class GenerateComplianceReportResult(BaseModel):
         report: ComplianceReport,
         formatted_output: str,
         report_format: ReportFormat,
+        rollup: list[RollupCell] | None = None,
     ) -> "GenerateComplianceReportResult":
         """Create result from a ComplianceReport instance."""
         return cls(
@@ -57,6 +64,7 @@ class GenerateComplianceReportResult(BaseModel):
                 total_violations=report.total_violations,
                 cost_attribution_gap=report.cost_attribution_gap,
             ),
+            rollup=rollup,
             report_timestamp=report.report_timestamp,
             scan_timestamp=report.scan_timestamp,
         )
@@ -67,6 +75,8 @@ async def generate_compliance_report(
     format: str = "json",
     include_recommendations: bool = True,
     report_service: ReportService | None = None,
+    summary_only: bool = False,
+    group_by: list[str] | None = None,
 ) -> GenerateComplianceReportResult:
     """
     Generate a comprehensive compliance report in the specified format.
@@ -83,12 +93,18 @@ async def generate_compliance_report(
         include_recommendations: Whether to include actionable recommendations (default: True)
         report_service: Optional injected ReportService instance. If not provided, one
                        will be created internally.
+        summary_only: If True, skip the formatted report and return only the
+                     summary and the rollup slices (default: False)
+        group_by: Rollup dimensions to slice by: any of "region", "resource_type",
+                 "tag_name", "violation_type". Defaults to ["region", "resource_type",
+                 "tag_name"] in summary-only mode, no rollup otherwise.
 
     Returns:
         GenerateComplianceReportResult containing:
         - format: The output format used
         - formatted_output: The complete formatted report as a string
         - summary: Quick summary with key metrics
+        - rollup: Violation rollup slices (when group_by is given or summary_only)
         - report_timestamp: When the report was generated
         - scan_timestamp: When the underlying scan was performed
 
@@ -114,6 +130,12 @@ async def generate_compliance_report(
     except ValueError:
         raise ValueError(f"Invalid format '{format}'. Must be one of: json, csv, markdown")
 
+    if summary_only and group_by is None:
+        group_by = ["region", "resource_type", "tag_name"]
+    rollup = None
+    if group_by is not None:
+        rollup = ComplianceRollup.for_result(compliance_result).slice(group_by)
+
     # Use injected service or create one
     service = report_service
     if service is None:
@@ -125,8 +147,10 @@ async def generate_compliance_report(
         include_recommendations=include_recommendations,
     )
 
-    # Format the report
-    formatted_output = service.format_report(report=report, format=report_format)
+    # Format the report (summary-only callers just want the numbers)
+    formatted_output = ""
+    if not summary_only:
+        formatted_output = service.format_report(report=report, format=report_format)
 
     logger.info(
         f"Report generated successfully: {report.total_violations} violations, "
@@ -137,4 +161,5 @@ async def generate_compliance_report(
         report=report,
         formatted_output=formatted_output,
         report_format=report_format,
+        rollup=rollup,
     )
@@ -0,0 +1,96 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""MCP tool for long-range compliance trends overall or per region, type or tag."""
+
+import logging
+from datetime import UTC, datetime
+
+from ..models.history import ComplianceTrendResult, GroupBy, HistoryDimension
+from ..services.history_service import HistoryService
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_moment(value: str | None, name: str) -> datetime | None:
+    """Parse an ISO 8601 date or timestamp argument (naive values are UTC)."""
+    if value is None:
+        return None
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(
+            f"Invalid {name} '{value}'. Use an ISO 8601 date or timestamp, e.g. 2024-01-31"
+        ) from None
+    return moment if moment.tzinfo else moment.replace(tzinfo=UTC)
+
+
+async def get_compliance_trend(
+    history_service: HistoryService,
+    dimension: str = "all",
+    key: str | None = None,
+    group_by: str = "month",
+    since: str | None = None,
+    until: str | None = None,
+) -> ComplianceTrendResult:
+    """
+    Retrieve compliance time series from the downsampled history rollups.
+
+    Unlike get_violation_history, the window isn't capped at 90 days: it
+    reaches back as far as rollups of the requested granularity are
+    retained (monthly rollups are kept forever by default).
+
+    Args:
+        history_service: HistoryService holding the compliance history
+        dimension: "all" (overall score), "region", "resource_type" or "tag_name"
+        key: Only this region, resource type or tag name; None for all of them
+        group_by: Period of each point: "day", "week" or "month" (default: "month")
+        since: Start of the window as an ISO 8601 date or timestamp; None for
+               all retained history
+        until: End of the window as an ISO 8601 date or timestamp; None for now
+
+    Returns:
+        ComplianceTrendResult with one series per dimension value
+
+    Raises:
+        ValueError: If dimension, group_by, since or until is invalid
+
+    Example:
+        >>> result = await get_compliance_trend(
+        ...     history_service, dimension="region", since="2023-01-01"
+        ... )
+        >>> for series in result.series:
+        ...     print(series.key, series.trend_direction)
+    """
+    try:
+        dimension_enum = HistoryDimension(dimension.lower())
+    except ValueError:
+        valid = [d.value for d in HistoryDimension]
+        raise ValueError(f"Invalid dimension '{dimension}'. Must be one of: {valid}") from None
+    try:
+        group_by_enum = GroupBy(group_by.lower())
+    except ValueError:
+        raise ValueError(
+            f"Invalid group_by '{group_by}'. Must be one of: day, week, month"
+        ) from None
+    since_moment = _parse_moment(since, "since")
+    until_moment = _parse_moment(until, "until")
+    if since_moment and until_moment and since_moment > until_moment:
+        raise ValueError("since must not be later than until")
+
+    logger.info(
+        f"Retrieving compliance trend: dimension={dimension_enum.value}, key={key}, "
+        f"group_by={group_by_enum.value}, since={since}, until={until}"
+    )
+
+    result = await history_service.get_trend(
+        dimension=dimension_enum,
+        key=key,
+        group_by=group_by_enum,
+        since=since_moment,
+        until=until_moment,
+    )
+
+    logger.info(f"Compliance trend retrieved: {len(result.series)} series")
+    return result
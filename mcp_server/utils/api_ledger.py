@@ -0,0 +1,228 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Per-request ledger of AWS API calls.
+
+Every call made through AWSClient._call_with_backoff is recorded in the
+ledger of the current request, which lives in a context variable like
+the deadline and the stage timings, and carries the request's
+correlation ID. Each row of the ledger aggregates the calls to one
+operation in one region for one resource type: calls, continuation
+pages, retries, throttles, errors, latency and response bytes.
+
+The resource type is whatever ``attribute_api_calls`` set in the current
+context (the compliance and cost fetchers set it around each type), so
+the audit rollups can tell which resource types are expensive to scan.
+
+Most AWS read APIs are free. Cost Explorer is not: every request,
+including each page of a paginated query, is billed. Prices per request
+are in REQUEST_PRICES_USD.
+"""
+
+import contextvars
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+# USD billed per API request, by service. Services not listed are free.
+REQUEST_PRICES_USD = {"ce": 0.01}
+
+# Request parameters that make a call a continuation page of a listing
+PAGE_TOKEN_PARAMS = frozenset(
+    {
+        "NextToken",
+        "nextToken",
+        "NextPageToken",
+        "PaginationToken",
+        "Marker",
+        "ContinuationToken",
+        "ExclusiveStartKey",
+        "ExclusiveStartTableName",
+    }
+)
+
+
+def request_cost_usd(service: str, calls: int) -> float:
+    """Estimated charge for a number of requests to a service."""
+    return calls * REQUEST_PRICES_USD.get(service, 0.0)
+
+
+@dataclass
+class ApiCallStats:
+    """
+    Aggregated AWS API calls.
+
+    Attributes:
+        calls: Requests that completed or failed (retries not included)
+        pages: Calls that fetched a continuation page of a listing
+        retries: Extra attempts after a throttling error
+        throttles: Throttling errors received
+        errors: Calls that failed after any retries
+        latency_ms: Summed call latency, including retries and backoff
+        max_latency_ms: Slowest single call
+        bytes: Response bytes, from the Content-Length header when present
+    """
+
+    calls: int = 0
+    pages: int = 0
+    retries: int = 0
+    throttles: int = 0
+    errors: int = 0
+    latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    bytes: int = 0
+
+    def add(self, other: "ApiCallStats") -> None:
+        """Add another set of stats into this one."""
+        self.calls += other.calls
+        self.pages += other.pages
+        self.retries += other.retries
+        self.throttles += other.throttles
+        self.errors += other.errors
+        self.latency_ms += other.latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, other.max_latency_ms)
+        self.bytes += other.bytes
+
+
+class ApiCallLedger:
+    """AWS API calls made for one request, keyed by (service, operation, region, type)."""
+
+    def __init__(self, correlation_id: str | None = None):
+        self.correlation_id = correlation_id
+        self.entries: dict[tuple[str, str, str, str], ApiCallStats] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        service: str,
+        operation: str,
+        region: str,
+        latency_ms: float,
+        retries: int = 0,
+        throttles: int = 0,
+        response_bytes: int = 0,
+        page: bool = False,
+        failed: bool = False,
+    ) -> None:
+        """Add one API call (with its retries) to the ledger."""
+        key = (service, operation, region, _resource_type_context.get())
+        with self._lock:
+            stats = self.entries.get(key)
+            if stats is None:
+                stats = self.entries[key] = ApiCallStats()
+            stats.calls += 1
+            stats.pages += page
+            stats.retries += retries
+            stats.throttles += throttles
+            stats.errors += failed
+            stats.latency_ms += latency_ms
+            stats.max_latency_ms = max(stats.max_latency_ms, latency_ms)
+            stats.bytes += response_bytes
+
+    def totals(self) -> ApiCallStats:
+        """All calls of the request added up."""
+        totals = ApiCallStats()
+        with self._lock:
+            for stats in self.entries.values():
+                totals.add(stats)
+        return totals
+
+    def rows(self) -> list[dict]:
+        """One dict per ledger entry, as stored in the audit log."""
+        with self._lock:
+            return [
+                {
+                    "service": service,
+                    "operation": operation,
+                    "region": region,
+                    "resource_type": resource_type,
+                    **asdict(stats),
+                    "latency_ms": round(stats.latency_ms, 1),
+                    "max_latency_ms": round(stats.max_latency_ms, 1),
+                }
+                for (service, operation, region, resource_type), stats in self.entries.items()
+            ]
+
+    def summary(self) -> dict:
+        """The ``aws_api_calls`` block of a tool response."""
+        totals = ApiCallStats()
+        by_operation: dict[str, int] = {}
+        cost_explorer_requests = 0
+        estimated_cost = 0.0
+        with self._lock:
+            for (service, operation, _, _), stats in self.entries.items():
+                totals.add(stats)
+                name = f"{service}.{operation}"
+                by_operation[name] = by_operation.get(name, 0) + stats.calls
+                if service == "ce":
+                    cost_explorer_requests += stats.calls
+                estimated_cost += request_cost_usd(service, stats.calls)
+        return {
+            "calls": totals.calls,
+            "pages": totals.pages,
+            "retries": totals.retries,
+            "throttles": totals.throttles,
+            "errors": totals.errors,
+            "bytes": totals.bytes,
+            "latency_ms": round(totals.latency_ms, 1),
+            "cost_explorer_requests": cost_explorer_requests,
+            "estimated_cost_usd": round(estimated_cost, 4),
+            "by_operation": dict(sorted(by_operation.items(), key=lambda item: -item[1])),
+        }
+
+
+# Context variables for the current request's ledger and the resource type
+# its calls are attributed to
+_ledger_context: contextvars.ContextVar[ApiCallLedger | None] = contextvars.ContextVar(
+    "api_call_ledger", default=None
+)
+_resource_type_context: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "api_call_resource_type", default=""
+)
+
+
+def start_api_ledger(correlation_id: str | None = None) -> ApiCallLedger:
+    """
+    Start recording AWS API calls for the current request.
+
+    Args:
+        correlation_id: Correlation ID of the request
+
+    Returns:
+        The ApiCallLedger now active in this context
+    """
+    ledger = ApiCallLedger(correlation_id)
+    _ledger_context.set(ledger)
+    return ledger
+
+
+def clear_api_ledger() -> None:
+    """Stop recording AWS API calls in the current context."""
+    _ledger_context.set(None)
+
+
+def get_api_ledger() -> ApiCallLedger | None:
+    """
+    Get the ledger of the current request.
+
+    Returns:
+        The active ApiCallLedger, or None outside a recorded request
+    """
+    return _ledger_context.get()
+
+
+@contextmanager
+def attribute_api_calls(resource_type: str) -> Iterator[None]:
+    """
+    Attribute the AWS calls made inside the block to a resource type.
+
+    Args:
+        resource_type: Resource type being fetched (e.g. "ec2:instance")
+    """
+    token = _resource_type_context.set(resource_type)
+    try:
+        yield
+    finally:
+        _resource_type_context.reset(token)
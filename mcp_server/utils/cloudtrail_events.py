@@ -0,0 +1,276 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Parse CloudTrail records into resource tag change events.
+
+Accepted payloads are CloudTrail log files ({"Records": [...]}),
+EventBridge "AWS API Call via CloudTrail" events ({"detail": {...}}),
+bare records, and lists or JSON lines of any of these. Each record
+yields zero or more TagChangeEvents; records for API calls that don't
+change tags or resource lifecycles yield none.
+
+EC2 APIs identify resources by ID (i-..., vol-...) rather than ARN, so
+ARNs are built from the record's region and account in the same form
+the EC2 fetchers use.
+"""
+
+import json
+import logging
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+from ..models.tag_events import TagChangeEvent
+from .arn_utils import parse_arn
+
+logger = logging.getLogger(__name__)
+
+# EC2 resource ID prefix -> (ARN resource segment, resource type)
+EC2_ID_PREFIXES: dict[str, tuple[str, str]] = {
+    "i-": ("instance", "ec2:instance"),
+    "vol-": ("volume", "ec2:volume"),
+    "snap-": ("snapshot", "ec2:snapshot"),
+    "eipalloc-": ("elastic-ip", "ec2:elastic-ip"),
+    "nat-": ("natgateway", "ec2:natgateway"),
+}
+
+
+def iter_records(payload: Any) -> Iterator[dict]:
+    """Yield CloudTrail records from any accepted payload shape."""
+    if isinstance(payload, list):
+        for item in payload:
+            yield from iter_records(item)
+    elif isinstance(payload, dict):
+        if "Records" in payload:
+            yield from iter_records(payload["Records"])
+        elif isinstance(payload.get("detail"), dict) and "eventName" in payload["detail"]:
+            yield payload["detail"]
+        elif "eventName" in payload:
+            yield payload
+
+
+def parse_payload(text: str) -> list[TagChangeEvent]:
+    """Parse a JSON document (or JSON lines) into tag change events."""
+    text = text.strip()
+    if not text:
+        return []
+    try:
+        payloads = [json.loads(text)]
+    except json.JSONDecodeError:
+        payloads = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    events = []
+    for record in iter_records(payloads):
+        try:
+            events.extend(parse_record(record))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Skipping malformed {record.get('eventName')} record: {e}")
+    return events
+
+
+def parse_record(record: dict) -> list[TagChangeEvent]:
+    """Parse one CloudTrail record; returns [] for irrelevant or failed calls."""
+    if record.get("errorCode"):
+        return []
+    handler = _HANDLERS.get(record.get("eventName", ""))
+    if handler is None:
+        return []
+
+    request = record.get("requestParameters") or {}
+    response = record.get("responseElements") or {}
+    context = {
+        "event_id": record.get("eventID", ""),
+        "event_name": record["eventName"],
+        "event_time": _parse_time(record.get("eventTime")),
+        "aws_region": record.get("awsRegion", ""),
+        "account_id": record.get("recipientAccountId")
+        or (record.get("userIdentity") or {}).get("accountId", ""),
+    }
+    return [
+        _event(context, arn, action, tags, removed)
+        for arn, action, tags, removed in handler(request, response, context)
+    ]
+
+
+def normalize_tags(value: Any) -> dict[str, str]:
+    """Tags from any of the shapes AWS APIs use (dict, [{Key, Value}], {"items": [...]})."""
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        for container in ("items", "Tag", "TagSet", "tagSet"):
+            if container in value:
+                return normalize_tags(value[container])
+        if {"key", "Key"} & value.keys():
+            return normalize_tags([value])
+        return {str(k): str(v) for k, v in value.items()}
+    tags = {}
+    for item in value:
+        key = item.get("key", item.get("Key"))
+        if key is not None:
+            tags[key] = str(item.get("value", item.get("Value", "")) or "")
+    return tags
+
+
+def _tag_keys(value: Any) -> list[str]:
+    if isinstance(value, dict):
+        value = value.get("items", [])
+    return [k if isinstance(k, str) else k.get("key", k.get("Key", "")) for k in value or []]
+
+
+def _parse_time(value: str | None) -> datetime:
+    if not value:
+        return datetime.now(UTC)
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _ec2_arn(resource_id: str, context: dict) -> str | None:
+    for prefix, (segment, _) in EC2_ID_PREFIXES.items():
+        if resource_id.startswith(prefix):
+            return (
+                f"arn:aws:ec2:{context['aws_region']}:{context['account_id']}:"
+                f"{segment}/{resource_id}"
+            )
+    return None
+
+
+def _event(
+    context: dict, arn: str, action: str, tags: dict[str, str], removed: list[str]
+) -> TagChangeEvent:
+    parsed = parse_arn(arn)
+    resource_type = parsed["resource_type"]
+    if parsed["service"] == "ec2":
+        resource_type = f"ec2:{parsed['resource'].split('/')[0]}"
+    return TagChangeEvent(
+        event_id=context["event_id"],
+        event_name=context["event_name"],
+        event_time=context["event_time"],
+        resource_arn=arn,
+        resource_id=parsed["resource_id"],
+        resource_type=resource_type,
+        region=parsed["region"],
+        action=action,
+        tags=tags,
+        removed_keys=removed,
+    )
+
+
+# Handlers: (requestParameters, responseElements, context) ->
+# iterable of (arn, action, tags, removed_keys)
+
+
+def _ec2_tags(request, response, context):
+    resource_ids = [item["resourceId"] for item in request["resourcesSet"]["items"]]
+    tag_items = (request.get("tagSet") or {}).get("items", [])
+    for resource_id in resource_ids:
+        arn = _ec2_arn(resource_id, context)
+        if arn is None:
+            continue
+        if context["event_name"] == "CreateTags":
+            yield arn, "tag", normalize_tags(tag_items), []
+        else:
+            yield arn, "untag", {}, _tag_keys(tag_items)
+
+
+def _tag_specifications(request: dict, resource_type: str) -> dict[str, str]:
+    tags: dict[str, str] = {}
+    for spec in (request.get("tagSpecificationSet") or {}).get("items", []):
+        if spec.get("resourceType") == resource_type:
+            tags.update(normalize_tags(spec.get("tags")))
+    return tags
+
+
+def _run_instances(request, response, context):
+    requested = _tag_specifications(request, "instance")
+    for item in (response.get("instancesSet") or {}).get("items", []):
+        tags = normalize_tags(item.get("tagSet")) or requested
+        yield _ec2_arn(item["instanceId"], context), "create", tags, []
+
+
+def _terminate_instances(request, response, context):
+    items = (response.get("instancesSet") or request.get("instancesSet") or {}).get("items", [])
+    for item in items:
+        yield _ec2_arn(item["instanceId"], context), "delete", {}, []
+
+
+def _create_volume(request, response, context):
+    tags = normalize_tags(response.get("tagSet")) or _tag_specifications(request, "volume")
+    yield _ec2_arn(response["volumeId"], context), "create", tags, []
+
+
+def _delete_volume(request, response, context):
+    yield _ec2_arn(request["volumeId"], context), "delete", {}, []
+
+
+# Request parameter names holding the target ARN(s), by service
+_ARN_LIST_KEYS = ("resourceARNList", "ResourceARNList")
+_ARN_KEYS = ("resourceArn", "resourceARN", "ResourceArn", "ResourceARN", "resource", "resourceName")
+
+
+def _resource_arns(request: dict) -> list[str]:
+    for key in _ARN_LIST_KEYS:
+        if key in request:
+            return list(request[key])
+    for key in _ARN_KEYS:
+        if key in request:
+            return [request[key]]
+    return []
+
+
+def _tag_resource(request, response, context):
+    tags = normalize_tags(request.get("tags") or request.get("Tags"))
+    for arn in _resource_arns(request):
+        yield arn, "tag", tags, []
+
+
+def _untag_resource(request, response, context):
+    keys = _tag_keys(request.get("tagKeys") or request.get("TagKeys"))
+    for arn in _resource_arns(request):
+        yield arn, "untag", {}, keys
+
+
+def _put_bucket_tagging(request, response, context):
+    tags = normalize_tags(request.get("Tagging"))
+    yield f"arn:aws:s3:::{request['bucketName']}", "replace", tags, []
+
+
+def _delete_bucket_tagging(request, response, context):
+    yield f"arn:aws:s3:::{request['bucketName']}", "replace", {}, []
+
+
+def _create_bucket(request, response, context):
+    yield f"arn:aws:s3:::{request['bucketName']}", "create", {}, []
+
+
+def _delete_bucket(request, response, context):
+    yield f"arn:aws:s3:::{request['bucketName']}", "delete", {}, []
+
+
+def _create_db_instance(request, response, context):
+    yield response["dBInstanceArn"], "create", normalize_tags(request.get("tags")), []
+
+
+def _delete_db_instance(request, response, context):
+    yield response["dBInstanceArn"], "delete", {}, []
+
+
+_HANDLERS = {
+    "CreateTags": _ec2_tags,
+    "DeleteTags": _ec2_tags,
+    "RunInstances": _run_instances,
+    "TerminateInstances": _terminate_instances,
+    "CreateVolume": _create_volume,
+    "DeleteVolume": _delete_volume,
+    "TagResource": _tag_resource,
+    "TagResources": _tag_resource,
+    "AddTagsToResource": _tag_resource,
+    "UntagResource": _untag_resource,
+    "UntagResources": _untag_resource,
+    "RemoveTagsFromResource": _untag_resource,
+    "PutBucketTagging": _put_bucket_tagging,
+    "DeleteBucketTagging": _delete_bucket_tagging,
+    "CreateBucket": _create_bucket,
+    "DeleteBucket": _delete_bucket,
+    "CreateDBInstance": _create_db_instance,
+    "DeleteDBInstance": _delete_db_instance,
+}
@@ -5,16 +5,27 @@
 """CloudWatch logging configuration and utilities.
 
 Provides CloudWatch logging and metrics emission for the MCP server.
+Log records and metric datums are buffered in process and shipped in
+batches by background threads, so neither logging nor recording a metric
+waits on CloudWatch. Metrics can also be written as embedded metric
+format (EMF) log lines instead of PutMetricData calls.
 Includes custom metrics for security monitoring (authentication failures,
 CORS violations) that trigger CloudWatch alarms.
 
 Requirements: 23.2, 23.5
 """
 
+import atexit
 import json
 import logging
 import os
-from datetime import datetime
+import queue
+import sys
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
 from typing import Any
 
 import boto3
@@ -53,14 +64,72 @@ class CorrelationIDFilter(logging.Filter):
         return True
 
 
+# PutLogEvents limits
+MAX_BATCH_EVENTS = 10_000
+MAX_BATCH_BYTES = 1_048_576
+# Bytes CloudWatch adds to each event's UTF-8 message size
+EVENT_OVERHEAD_BYTES = 26
+MAX_EVENT_BYTES = 262_144 - EVENT_OVERHEAD_BYTES
+# Longest time span between the first and last event of one batch
+MAX_BATCH_SPAN_MS = 24 * 60 * 60 * 1000
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+DEFAULT_MAX_QUEUE_SIZE = 10_000
+
+# Attempts per batch when CloudWatch throttles or is unavailable
+SEND_ATTEMPTS = 3
+_RETRYABLE_ERRORS = {"ThrottlingException", "ServiceUnavailableException"}
+
+
+@dataclass
+class CloudWatchHandlerStats:
+    """
+    Counters for one CloudWatch log handler.
+
+    Attributes:
+        queued: Events accepted into the queue
+        sent: Events accepted by CloudWatch
+        dropped: Events lost because the queue was full or the handler closed
+        failed: Events lost because their batch could not be sent
+        batches: PutLogEvents calls that succeeded
+        send_errors: PutLogEvents calls that failed after retrying
+        queue_depth: Events waiting to be sent
+        max_queue_depth: Highest queue depth observed
+    """
+
+    queued: int = 0
+    sent: int = 0
+    dropped: int = 0
+    failed: int = 0
+    batches: int = 0
+    send_errors: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+
+
 class CloudWatchHandler(logging.Handler):
-    """Custom logging handler that sends logs to AWS CloudWatch."""
+    """
+    Logging handler that ships records to AWS CloudWatch Logs.
+
+    emit() only formats the record and queues it, so logging never waits
+    on the network. A background thread sends the queue every
+    flush_interval_seconds, or as soon as a full batch is waiting, split
+    into PutLogEvents calls that stay within CloudWatch's per-call event,
+    byte and time span limits. When the queue is full new records are
+    dropped and counted, and a notice of the gap is shipped with the
+    next batch. flush() and close() (called by logging.shutdown() at
+    exit) send whatever is still queued.
+    """
 
     def __init__(
         self,
         log_group: str,
         log_stream: str,
         region: str = "us-east-1",
+        client: Any = None,
+        flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        max_batch_events: int = MAX_BATCH_EVENTS,
     ):
         """
         Initialize CloudWatch logging handler.
@@ -69,14 +138,34 @@ class CloudWatchHandler(logging.Handler):
             log_group: CloudWatch log group name
             log_stream: CloudWatch log stream name
             region: AWS region for CloudWatch
+            client: CloudWatch Logs client (created for region if not given)
+            flush_interval_seconds: Longest a record waits before being sent
+            max_queue_size: Records held in memory before new ones are dropped
+            max_batch_events: Most events sent in one PutLogEvents call
         """
         super().__init__()
         self.log_group = log_group
         self.log_stream = log_stream
         self.region = region
-        self.client = boto3.client("logs", region_name=region)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_batch_events = min(max_batch_events, MAX_BATCH_EVENTS)
+        self.client = client or boto3.client("logs", region_name=region)
         self._ensure_log_group_and_stream()
 
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._stats = CloudWatchHandlerStats()
+        self._stats_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._sending = threading.local()
+        self._reported_drops = 0
+        self._closed = False
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._sender = threading.Thread(
+            target=self._send_loop, name=f"cloudwatch-logs:{log_stream}", daemon=True
+        )
+        self._sender.start()
+
     def _ensure_log_group_and_stream(self) -> None:
         """Create log group and stream if they don't exist."""
         try:
@@ -98,13 +187,19 @@ class CloudWatchHandler(logging.Handler):
                     raise
         except Exception as e:
             # Log to stderr if CloudWatch setup fails
-            import sys
-
             print(f"Failed to setup CloudWatch logging: {e}", file=sys.stderr)
 
+    def handle(self, record: logging.LogRecord) -> bool:
+        """Filter and emit a record, unless it was logged while sending."""
+        # Records logged while sending (e.g. by botocore) would feed back
+        # into the queue, and could deadlock with a flush() holding our lock
+        if getattr(self._sending, "active", False):
+            return False
+        return super().handle(record)
+
     def emit(self, record: logging.LogRecord) -> None:
         """
-        Emit a log record to CloudWatch with structured fields.
+        Queue a log record for CloudWatch with structured fields.
 
         Args:
             record: The log record to emit
@@ -136,23 +231,158 @@ class CloudWatchHandler(logging.Handler):
 
             # Convert to JSON string for CloudWatch
             json_message = json.dumps(structured_message)
-
-            self.client.put_log_events(
-                logGroupName=self.log_group,
-                logStreamName=self.log_stream,
-                logEvents=[
-                    {
-                        "message": json_message,
-                        "timestamp": timestamp,
-                    }
-                ],
-            )
         except Exception as e:
             # Don't raise exceptions from logging handler
             # Instead, log to stderr
-            import sys
+            print(f"Failed to format log for CloudWatch: {e}", file=sys.stderr)
+            return
 
-            print(f"Failed to send log to CloudWatch: {e}", file=sys.stderr)
+        self._enqueue({"message": _truncate(json_message), "timestamp": timestamp})
+
+    def _enqueue(self, event: dict) -> None:
+        if self._closed:
+            with self._stats_lock:
+                self._stats.dropped += 1
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._stats_lock:
+                self._stats.dropped += 1
+            return
+
+        depth = self._queue.qsize()
+        with self._stats_lock:
+            self._stats.queued += 1
+            self._stats.max_queue_depth = max(self._stats.max_queue_depth, depth)
+        if depth >= self.max_batch_events:
+            self._wake.set()
+
+    def flush(self) -> None:
+        """Send every queued event now."""
+        with self._send_lock:
+            self._sending.active = True
+            try:
+                while True:
+                    events = []
+                    while len(events) < self.max_batch_events:
+                        try:
+                            events.append(self._queue.get_nowait())
+                        except queue.Empty:
+                            break
+                    notice = self._drop_notice()
+                    if notice is not None:
+                        events.append(notice)
+                    if not events:
+                        return
+                    for batch in _batches(events, self.max_batch_events):
+                        self._send(batch)
+            finally:
+                self._sending.active = False
+
+    def _drop_notice(self) -> dict | None:
+        """An event reporting records dropped since the last notice, if any."""
+        with self._stats_lock:
+            dropped = self._stats.dropped - self._reported_drops
+            self._reported_drops = self._stats.dropped
+        if not dropped:
+            return None
+        now = time.time()
+        message = {
+            "message": f"CloudWatch log handler dropped {dropped} log records (queue full)",
+            "level": "WARNING",
+            "logger": __name__,
+            "timestamp": now,
+        }
+        return {"message": json.dumps(message), "timestamp": int(now * 1000)}
+
+    def _send(self, batch: list[dict]) -> None:
+        """Send one batch, retrying while CloudWatch throttles."""
+        for attempt in range(SEND_ATTEMPTS):
+            try:
+                self.client.put_log_events(
+                    logGroupName=self.log_group,
+                    logStreamName=self.log_stream,
+                    logEvents=batch,
+                )
+            except ClientError as e:
+                code = e.response.get("Error", {}).get("Code")
+                if code in _RETRYABLE_ERRORS and attempt < SEND_ATTEMPTS - 1:
+                    time.sleep(0.2 * 2**attempt)
+                    continue
+                error: Exception = e
+            except Exception as e:
+                error = e
+            else:
+                with self._stats_lock:
+                    self._stats.sent += len(batch)
+                    self._stats.batches += 1
+                return
+            break
+
+        with self._stats_lock:
+            self._stats.failed += len(batch)
+            self._stats.send_errors += 1
+        print(f"Failed to send {len(batch)} logs to CloudWatch: {error}", file=sys.stderr)
+
+    def _send_loop(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def stats(self) -> CloudWatchHandlerStats:
+        """Snapshot of the handler's counters."""
+        with self._stats_lock:
+            snapshot = CloudWatchHandlerStats(**vars(self._stats))
+        snapshot.queue_depth = self._queue.qsize()
+        return snapshot
+
+    def close(self) -> None:
+        """Send every queued event and stop the sender thread."""
+        if not self._closed:
+            self._closed = True
+            self._stopping.set()
+            self._wake.set()
+            self._sender.join()
+            self.flush()
+        super().close()
+
+
+def _truncate(message: str) -> str:
+    """Cut a message to the largest size CloudWatch accepts for one event."""
+    encoded = message.encode("utf-8")
+    if len(encoded) <= MAX_EVENT_BYTES:
+        return message
+    return encoded[:MAX_EVENT_BYTES].decode("utf-8", errors="ignore")
+
+
+def _batches(events: list[dict], max_events: int) -> list[list[dict]]:
+    """
+    Split events into PutLogEvents batches.
+
+    Events in a batch must be in chronological order, so they are sorted
+    first; a batch ends when it reaches the event count, byte size or
+    24 hour span limit.
+    """
+    events.sort(key=lambda e: e["timestamp"])
+    batches: list[list[dict]] = []
+    batch: list[dict] = []
+    size = 0
+    for event in events:
+        event_size = len(event["message"].encode("utf-8")) + EVENT_OVERHEAD_BYTES
+        if batch and (
+            len(batch) >= max_events
+            or size + event_size > MAX_BATCH_BYTES
+            or event["timestamp"] - batch[0]["timestamp"] > MAX_BATCH_SPAN_MS
+        ):
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(event)
+        size += event_size
+    if batch:
+        batches.append(batch)
+    return batches
 
 
 def configure_cloudwatch_logging(
@@ -228,9 +458,28 @@ def configure_cloudwatch_logging(
 # CloudWatch Metrics for Security Monitoring (Requirements: 23.2, 23.5)
 # =============================================================================
 
-# Global CloudWatch client for metrics (initialized lazily)
+# Datums are aggregated in process and flushed on a timer, either with
+# PutMetricData ("api") or as embedded metric format log lines ("emf") that
+# CloudWatch Logs turns into metrics without any API call.
+
+METRICS_MODES = ("api", "emf")
+DEFAULT_METRICS_FLUSH_SECONDS = 60.0
+
+# Distinct metric series held between flushes; new ones beyond this are dropped
+DEFAULT_MAX_SERIES = 1000
+
+# PutMetricData limits: datums per call and entries in a Values/Counts array
+MAX_METRIC_DATUMS = 1000
+MAX_API_VALUES = 150
+# EMF limits: metrics per directive and values per metric
+MAX_EMF_METRICS = 100
+MAX_EMF_VALUES = 100
+
+# Global CloudWatch client and metric buffer (initialized lazily)
 _cloudwatch_client = None
 _metrics_enabled = None
+_metric_buffer = None
+_metric_buffer_lock = threading.Lock()
 
 
 def _get_cloudwatch_client():
@@ -263,6 +512,251 @@ def get_metrics_namespace() -> str:
     return f"{project}/{environment}"
 
 
+@dataclass
+class _Series:
+    """Aggregate of the datums recorded for one metric series since the last flush."""
+
+    unit: str
+    count: int = 0
+    total: float = 0.0
+    minimum: float = float("inf")
+    maximum: float = float("-inf")
+    # Distinct value -> occurrences; None once there are too many to keep
+    values: dict[float, int] | None = field(default_factory=dict)
+
+    def add(self, value: float, limit: int) -> None:
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        if self.values is not None:
+            self.values[value] = self.values.get(value, 0) + 1
+            if len(self.values) > limit:
+                self.values = None
+
+
+class MetricBuffer:
+    """
+    In-process aggregation of CloudWatch metric datums.
+
+    record() only updates a dict entry keyed by metric name, unit and
+    dimensions. A background thread flushes the aggregates every
+    flush_interval_seconds:
+
+    - "api" mode sends them with PutMetricData, up to MAX_METRIC_DATUMS
+      per call. Count metrics are summed into one value; other units are
+      sent as Values/Counts arrays, or as a statistic set when a series
+      has more distinct values than one array holds.
+    - "emf" mode writes one embedded metric format JSON line per
+      dimension set to sink (stderr by default, which container and
+      Lambda runtimes ship to CloudWatch Logs).
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        mode: str = "api",
+        client: Any = None,
+        sink: Callable[[str], None] | None = None,
+        flush_interval_seconds: float = DEFAULT_METRICS_FLUSH_SECONDS,
+        max_series: int = DEFAULT_MAX_SERIES,
+    ):
+        """
+        Initialize the metric buffer.
+
+        Args:
+            namespace: CloudWatch namespace for every metric
+            mode: "api" for PutMetricData, "emf" for embedded metric format lines
+            client: CloudWatch client for "api" mode (created lazily if not given)
+            sink: Writes one EMF line in "emf" mode (defaults to stderr)
+            flush_interval_seconds: How often aggregates are flushed
+            max_series: Distinct series held between flushes
+        """
+        if mode not in METRICS_MODES:
+            raise ValueError(f"Invalid metrics mode {mode!r}. Valid modes: {METRICS_MODES}")
+        self.namespace = namespace
+        self.mode = mode
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_series = max_series
+        self.dropped = 0
+        self._client = client
+        self._sink = sink or _write_stderr
+        self._series: dict[tuple, _Series] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._flusher: threading.Thread | None = None
+
+    def record(
+        self,
+        metric_name: str,
+        value: float = 1.0,
+        unit: str = "Count",
+        dimensions: dict[str, str] | None = None,
+    ) -> None:
+        """Add one datum to its series."""
+        key = (metric_name, unit, tuple(sorted((dimensions or {}).items())))
+        limit = MAX_EMF_VALUES if self.mode == "emf" else MAX_API_VALUES
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                if len(self._series) >= self.max_series:
+                    self.dropped += 1
+                    return
+                series = self._series[key] = _Series(unit)
+            series.add(float(value), limit)
+            if self._flusher is None:
+                self._start_flusher()
+
+    def _start_flusher(self) -> None:
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="cloudwatch-metrics", daemon=True
+        )
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def _flush_loop(self) -> None:
+        while not self._stopping.wait(self.flush_interval_seconds):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Failed to flush CloudWatch metrics: {e}", file=sys.stderr)
+
+    def flush(self) -> int:
+        """
+        Send or write every aggregate recorded since the last flush.
+
+        Returns:
+            Number of series flushed
+        """
+        with self._flush_lock:
+            with self._lock:
+                series, self._series = self._series, {}
+            if not series:
+                return 0
+            timestamp = datetime.now(UTC)
+            if self.mode == "emf":
+                self._write_emf(series, timestamp)
+            else:
+                self._put_metric_data(series, timestamp)
+            return len(series)
+
+    def _put_metric_data(self, series: dict[tuple, _Series], timestamp: datetime) -> None:
+        datums = []
+        for (name, unit, dimensions), aggregate in series.items():
+            datum: dict[str, Any] = {
+                "MetricName": name,
+                "Unit": unit,
+                "Timestamp": timestamp,
+                "Dimensions": [{"Name": k, "Value": v} for k, v in dimensions],
+            }
+            if unit == "Count":
+                datum["Value"] = aggregate.total
+            elif aggregate.values is not None:
+                datum["Values"] = list(aggregate.values)
+                datum["Counts"] = [float(c) for c in aggregate.values.values()]
+            else:
+                datum["StatisticValues"] = {
+                    "SampleCount": float(aggregate.count),
+                    "Sum": aggregate.total,
+                    "Minimum": aggregate.minimum,
+                    "Maximum": aggregate.maximum,
+                }
+            datums.append(datum)
+
+        client = self._client or _get_cloudwatch_client()
+        for start in range(0, len(datums), MAX_METRIC_DATUMS):
+            try:
+                client.put_metric_data(
+                    Namespace=self.namespace,
+                    MetricData=datums[start : start + MAX_METRIC_DATUMS],
+                )
+            except Exception as e:
+                # Don't fail anything over lost metrics
+                logging.getLogger(__name__).warning(
+                    f"Failed to send {len(datums[start : start + MAX_METRIC_DATUMS])} "
+                    f"CloudWatch metrics: {e}"
+                )
+
+    def _write_emf(self, series: dict[tuple, _Series], timestamp: datetime) -> None:
+        by_dimensions: dict[tuple, list] = {}
+        for (name, unit, dimensions), aggregate in series.items():
+            by_dimensions.setdefault(dimensions, []).append((name, unit, aggregate))
+
+        for dimensions, metrics in by_dimensions.items():
+            for start in range(0, len(metrics), MAX_EMF_METRICS):
+                chunk = metrics[start : start + MAX_EMF_METRICS]
+                document: dict[str, Any] = {
+                    "_aws": {
+                        "Timestamp": int(timestamp.timestamp() * 1000),
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": self.namespace,
+                                "Dimensions": [[k for k, _ in dimensions]],
+                                "Metrics": [{"Name": n, "Unit": u} for n, u, _ in chunk],
+                            }
+                        ],
+                    },
+                    **dict(dimensions),
+                }
+                for name, unit, aggregate in chunk:
+                    document[name] = _emf_value(unit, aggregate)
+                self._sink(json.dumps(document))
+
+    def close(self) -> None:
+        """Flush what is left and stop the flush thread."""
+        self._stopping.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            atexit.unregister(self.close)
+            self._flusher = None
+        self.flush()
+
+
+def _emf_value(unit: str, aggregate: _Series) -> Any:
+    """A series' value in an EMF document: a sum for counts, else a distribution."""
+    if unit == "Count":
+        return aggregate.total
+    if aggregate.values is not None:
+        values, counts = list(aggregate.values), list(aggregate.values.values())
+    else:
+        # Too many distinct values: the mean stands in for all of them
+        values, counts = [aggregate.total / aggregate.count], [aggregate.count]
+    return {
+        "Values": values,
+        "Counts": counts,
+        "Max": aggregate.maximum,
+        "Min": aggregate.minimum,
+        "Count": aggregate.count,
+        "Sum": aggregate.total,
+    }
+
+
+def _write_stderr(line: str) -> None:
+    print(line, file=sys.stderr, flush=True)
+
+
+def get_metric_buffer() -> MetricBuffer:
+    """
+    Get the process-wide metric buffer, creating it on first use.
+
+    Environment Variables:
+        CLOUDWATCH_METRICS_MODE: "api" (default) or "emf"
+        CLOUDWATCH_METRICS_FLUSH_SECONDS: Flush interval (default: 60)
+    """
+    global _metric_buffer
+    with _metric_buffer_lock:
+        if _metric_buffer is None:
+            _metric_buffer = MetricBuffer(
+                namespace=get_metrics_namespace(),
+                mode=os.getenv("CLOUDWATCH_METRICS_MODE", "api").lower(),
+                flush_interval_seconds=float(
+                    os.getenv("CLOUDWATCH_METRICS_FLUSH_SECONDS", DEFAULT_METRICS_FLUSH_SECONDS)
+                ),
+            )
+        return _metric_buffer
+
+
 def emit_metric(
     metric_name: str,
     value: float = 1.0,
@@ -270,7 +764,10 @@ def emit_metric(
     dimensions: dict[str, str] | None = None,
 ) -> None:
     """
-    Emit a custom metric to CloudWatch.
+    Record a custom metric for CloudWatch.
+
+    The datum is aggregated in the process-wide MetricBuffer and sent with
+    the next flush, so this never waits on the network.
 
     Args:
         metric_name: Name of the metric (e.g., "AuthenticationFailures")
@@ -284,41 +781,16 @@ def emit_metric(
         return
 
     try:
-        client = _get_cloudwatch_client()
-        namespace = get_metrics_namespace()
-        environment = os.getenv("ENVIRONMENT", "prod")
-
-        # Build metric data
-        metric_data: dict[str, Any] = {
-            "MetricName": metric_name,
-            "Value": value,
-            "Unit": unit,
-            "Timestamp": datetime.utcnow(),
-        }
-
-        # Add default dimension for environment
-        default_dimensions = [{"Name": "Environment", "Value": environment}]
-
-        # Add custom dimensions if provided
+        # Add default dimension for environment, then any custom ones
+        all_dimensions = {"Environment": os.getenv("ENVIRONMENT", "prod")}
         if dimensions:
-            for name, dim_value in dimensions.items():
-                default_dimensions.append({"Name": name, "Value": dim_value})
-
-        metric_data["Dimensions"] = default_dimensions
-
-        # Put metric data
-        client.put_metric_data(
-            Namespace=namespace,
-            MetricData=[metric_data],
-        )
-
-        logger = logging.getLogger(__name__)
-        logger.debug(f"Emitted CloudWatch metric: {metric_name}={value} ({unit})")
+            all_dimensions.update(dimensions)
 
+        get_metric_buffer().record(metric_name, value, unit, all_dimensions)
     except Exception as e:
         # Don't fail the request if metrics emission fails
         logger = logging.getLogger(__name__)
-        logger.warning(f"Failed to emit CloudWatch metric {metric_name}: {e}")
+        logger.warning(f"Failed to record CloudWatch metric {metric_name}: {e}")
 
 
 def emit_auth_failure_metric(
@@ -0,0 +1,367 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Columnar (Parquet / Arrow) export of violations and resource inventory.
+
+CSV exports lose types and are slow to reload into DuckDB or Pandas.
+These writers produce typed columnar files instead:
+
+- Low-cardinality string columns (region, resource type, tag name, ...)
+  are dictionary-encoded, so millions of rows stay small on disk.
+- Rows are buffered and written one row group (Parquet) or record batch
+  (Arrow) at a time, so memory use is bounded by the row group size,
+  not the export size.
+- Violation exports carry the scan summary in the schema metadata, so
+  load_compliance_result() can rebuild a ComplianceResult (and its
+  rollup) that ReportService accepts directly. Inventory exports carry
+  which regions and resource types could not be listed.
+
+"arrow" files use the Arrow IPC stream format, which allows each batch
+to carry its own dictionary.
+
+pyarrow is an optional dependency: pip install pyarrow
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from ..models.compliance import ComplianceResult
+from ..models.enums import Severity, ViolationType
+from ..models.rollup import ComplianceRollup
+from ..models.violations import Violation
+from .resource_utils import extract_account_from_arn
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+DEFAULT_ROW_GROUP_SIZE = 100_000
+
+# Schema metadata key holding the scan summary of a violations export
+SUMMARY_METADATA_KEY = b"finops.compliance_summary"
+# Schema metadata key holding the listing summary of an inventory export
+INVENTORY_METADATA_KEY = b"finops.inventory_summary"
+
+_PARQUET_MAGIC = b"PAR1"
+
+
+def _require_pyarrow() -> Any:
+    """Import pyarrow, with an install hint if it is missing."""
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Columnar exports require pyarrow. Install with: pip install pyarrow>=14.0.0"
+        ) from e
+    return pyarrow
+
+
+def violation_schema(pa: Any) -> Any:
+    """Arrow schema of a violations export."""
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            ("resource_id", pa.string()),
+            ("resource_type", category),
+            ("region", category),
+            ("violation_type", category),
+            ("tag_name", category),
+            ("severity", category),
+            ("current_value", pa.string()),
+            ("allowed_values", pa.list_(pa.string())),
+            ("cost_impact_monthly", pa.float64()),
+        ]
+    )
+
+
+def inventory_schema(pa: Any) -> Any:
+    """Arrow schema of a resource inventory export."""
+    category = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema(
+        [
+            ("resource_arn", pa.string()),
+            ("resource_id", pa.string()),
+            ("resource_type", category),
+            ("region", category),
+            ("account_id", category),
+            ("tags", pa.map_(pa.string(), pa.string())),
+            ("state", category),
+            ("cost_impact_monthly", pa.float64()),
+        ]
+    )
+
+
+def _violation_columns(violation: Violation) -> dict[str, Any]:
+    return {
+        "resource_id": violation.resource_id,
+        "resource_type": violation.resource_type,
+        "region": violation.region,
+        "violation_type": violation.violation_type.value,
+        "tag_name": violation.tag_name,
+        "severity": violation.severity.value,
+        "current_value": violation.current_value,
+        "allowed_values": violation.allowed_values,
+        "cost_impact_monthly": violation.cost_impact_monthly,
+    }
+
+
+def _inventory_columns(resource: dict) -> dict[str, Any]:
+    arn = resource.get("arn") or ""
+    tags = resource.get("tags") or {}
+    return {
+        "resource_arn": arn,
+        "resource_id": resource.get("resource_id") or "",
+        "resource_type": resource.get("resource_type") or "",
+        "region": resource.get("region") or "",
+        "account_id": extract_account_from_arn(arn) if arn else None,
+        "tags": [(str(k), str(v)) for k, v in tags.items()],
+        "state": resource.get("state") or resource.get("instance_state"),
+        "cost_impact_monthly": float(resource.get("cost_impact") or 0.0),
+    }
+
+
+def write_violations(
+    violations: Iterable[Violation],
+    output_path: str,
+    format: str = "parquet",
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    summary: dict[str, Any] | None = None,
+) -> tuple[int, int]:
+    """
+    Stream violations to a Parquet or Arrow file.
+
+    Args:
+        violations: Violations to write (consumed once)
+        output_path: Destination file
+        format: "parquet" or "arrow"
+        row_group_size: Rows per row group / record batch
+        summary: Scan summary stored in the schema metadata (compliance_score,
+                 total_resources, compliant_resources, cost_attribution_gap,
+                 scan_timestamp, failed_regions, failed_resource_types)
+
+    Returns:
+        Tuple of (rows written, row groups written)
+    """
+    pa = _require_pyarrow()
+    schema = violation_schema(pa)
+    if summary is not None:
+        schema = schema.with_metadata(
+            {SUMMARY_METADATA_KEY: json.dumps(summary, default=str).encode()}
+        )
+    return _write_columnar(
+        (_violation_columns(v) for v in violations),
+        schema,
+        output_path,
+        format,
+        row_group_size,
+    )
+
+
+def write_inventory(
+    resources: Iterable[dict],
+    output_path: str,
+    format: str = "parquet",
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    summary: dict[str, Any] | None = None,
+) -> tuple[int, int]:
+    """
+    Stream resource dictionaries to a Parquet or Arrow file.
+
+    Tags are stored as a map column; the account ID is taken from the ARN.
+
+    Args:
+        resources: Resources to write (consumed once)
+        output_path: Destination file
+        format: "parquet" or "arrow"
+        row_group_size: Rows per row group / record batch
+        summary: Listing summary stored in the schema metadata
+                 (failed_regions, failed_resource_types)
+
+    Returns:
+        Tuple of (rows written, row groups written)
+    """
+    pa = _require_pyarrow()
+    schema = inventory_schema(pa)
+    if summary is not None:
+        schema = schema.with_metadata(
+            {INVENTORY_METADATA_KEY: json.dumps(summary, default=str).encode()}
+        )
+    return _write_columnar(
+        (_inventory_columns(r) for r in resources),
+        schema,
+        output_path,
+        format,
+        row_group_size,
+    )
+
+
+def _write_columnar(
+    rows: Iterable[dict[str, Any]],
+    schema: Any,
+    output_path: str,
+    format: str,
+    row_group_size: int,
+) -> tuple[int, int]:
+    """Buffer rows column-wise and write them one row group at a time."""
+    if format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Invalid format '{format}'. Must be one of: {list(COLUMNAR_FORMATS)}")
+    if row_group_size < 1:
+        raise ValueError("row_group_size must be at least 1")
+
+    pa = _require_pyarrow()
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial")
+
+    dictionary_columns = [
+        field.name for field in schema if pa.types.is_dictionary(field.type)
+    ]
+    row_count = 0
+    row_groups = 0
+
+    try:
+        if format == "parquet":
+            writer = pa.parquet.ParquetWriter(
+                str(partial), schema, compression="zstd", use_dictionary=dictionary_columns
+            )
+            write: Callable[[Any], None] = writer.write_table
+        else:
+            sink = pa.OSFile(str(partial), "wb")
+            writer = pa.ipc.new_stream(
+                sink, schema, options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+            )
+            write = writer.write_table
+
+        try:
+            columns: dict[str, list] = {name: [] for name in schema.names}
+            buffered = 0
+            for row in rows:
+                for name, values in columns.items():
+                    values.append(row[name])
+                buffered += 1
+                if buffered == row_group_size:
+                    write(pa.Table.from_pydict(columns, schema=schema))
+                    row_count += buffered
+                    row_groups += 1
+                    columns = {name: [] for name in schema.names}
+                    buffered = 0
+            if buffered or row_groups == 0:
+                write(pa.Table.from_pydict(columns, schema=schema))
+                row_count += buffered
+                row_groups += 1
+        finally:
+            writer.close()
+            if format == "arrow":
+                sink.close()
+        os.replace(partial, path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+
+    return row_count, row_groups
+
+
+def file_checksum(path: str, chunk_size: int = 1 << 20) -> tuple[str, int]:
+    """
+    Hash a file in chunks.
+
+    Returns:
+        Tuple of (SHA-256 hex digest, file size in bytes)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+@contextmanager
+def _open_batches(path: str) -> Iterator[tuple[Any, Iterator[Any]]]:
+    """Open a columnar file, yielding (schema, record batch iterator); closed on exit."""
+    pa = _require_pyarrow()
+    with pa.OSFile(path, "rb") as source:
+        is_parquet = source.read(len(_PARQUET_MAGIC)) == _PARQUET_MAGIC
+        source.seek(0)
+        if is_parquet:
+            parquet_file = pa.parquet.ParquetFile(source)
+            yield parquet_file.schema_arrow, parquet_file.iter_batches()
+        else:
+            reader = pa.ipc.open_stream(source)
+            yield reader.schema, iter(reader)
+
+
+def read_violations(path: str) -> Iterator[Violation]:
+    """
+    Read violations back from a violations export, one batch at a time.
+
+    Args:
+        path: Parquet or Arrow file written by write_violations
+
+    Yields:
+        Violation objects
+    """
+    with _open_batches(path) as (_, batches):
+        yield from _violations_from_batches(batches)
+
+
+def _violations_from_batches(batches: Iterator[Any]) -> Iterator[Violation]:
+    for batch in batches:
+        for row in batch.to_pylist():
+            yield Violation(
+                resource_id=row["resource_id"],
+                resource_type=row["resource_type"],
+                region=row["region"],
+                violation_type=ViolationType(row["violation_type"]),
+                tag_name=row["tag_name"],
+                severity=Severity(row["severity"]),
+                current_value=row["current_value"],
+                allowed_values=row["allowed_values"],
+                cost_impact_monthly=row["cost_impact_monthly"] or 0.0,
+            )
+
+
+def load_compliance_result(path: str) -> ComplianceResult:
+    """
+    Rebuild a ComplianceResult from a violations export.
+
+    Totals come from the summary stored in the file's schema metadata;
+    the rollup cube is built while the violations are read.
+
+    Args:
+        path: Parquet or Arrow file written by write_violations with a summary
+
+    Returns:
+        ComplianceResult usable by ReportService.generate_report
+
+    Raises:
+        ValueError: If the file has no stored scan summary
+    """
+    with _open_batches(path) as (schema, batches):
+        metadata = schema.metadata or {}
+        if SUMMARY_METADATA_KEY not in metadata:
+            raise ValueError(f"{path} has no stored scan summary; is it a violations export?")
+        summary = json.loads(metadata[SUMMARY_METADATA_KEY])
+
+        violations = []
+        rollup = ComplianceRollup()
+        for violation in _violations_from_batches(batches):
+            violations.append(violation)
+            rollup.add(violation)
+
+    return ComplianceResult(
+        compliance_score=summary["compliance_score"],
+        total_resources=summary["total_resources"],
+        compliant_resources=summary["compliant_resources"],
+        violations=violations,
+        cost_attribution_gap=summary.get("cost_attribution_gap", 0.0),
+        scan_timestamp=datetime.fromisoformat(summary["scan_timestamp"]),
+        rollup=rollup,
+    )
@@ -0,0 +1,196 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Per-request deadline propagation for cooperative cancellation.
+
+MCP clients give up on a tool call after roughly a minute, but a
+multi-region scan can run for several. The request deadline is stored
+in a context variable (like the correlation ID in ``correlation.py``),
+so every layer of the scan stack - the multi-region scanner,
+ComplianceService, paginators, the AWS client and the cost path - can
+check it without threading a parameter through every call.
+
+When the deadline is near the stack stops issuing new AWS calls and
+returns what it has. Layers record what they cut short so the tool can
+label the response ``partial`` instead of failing with a timeout.
+
+Each asyncio task copies the context, so a DeadlineScope started inside
+a task only sees the calls made by that task and its children, while the
+Deadline itself is shared by the whole request.
+"""
+
+import contextvars
+import logging
+import time
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Stop issuing new calls this long before the deadline, leaving time to
+# aggregate results and send the response.
+DEFAULT_DEADLINE_MARGIN_SECONDS = 5.0
+
+
+@dataclass
+class Deadline:
+    """
+    Absolute deadline for the current request.
+
+    Attributes:
+        expires_at: time.monotonic() value at which the client gives up
+        margin_seconds: Safety margin before expires_at when no new work starts
+        exceeded: True once any layer skipped or truncated work because of it
+    """
+
+    expires_at: float
+    margin_seconds: float = DEFAULT_DEADLINE_MARGIN_SECONDS
+    exceeded: bool = False
+
+    def remaining_seconds(self) -> float:
+        """Seconds left until the deadline (negative once passed)."""
+        return self.expires_at - time.monotonic()
+
+    def is_near(self) -> bool:
+        """True when no new work should be started."""
+        return self.remaining_seconds() <= self.margin_seconds
+
+
+@dataclass
+class DeadlineScope:
+    """
+    Records how the deadline affected one unit of work (e.g. one resource type).
+
+    Attributes:
+        refused_calls: AWS calls refused because the deadline was near.
+                       Results built around a refused call may be wrong
+                       (e.g. a resource listed with no tags), not just short.
+        truncated: True if pagination stopped early. Results are a correct
+                   but incomplete subset.
+    """
+
+    refused_calls: int = 0
+    truncated: bool = False
+
+    @property
+    def affected(self) -> bool:
+        """True if the deadline cut this work short in any way."""
+        return self.refused_calls > 0 or self.truncated
+
+
+# Context variables for the request deadline and the current unit of work
+_deadline_context: contextvars.ContextVar[Deadline | None] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+_scope_context: contextvars.ContextVar[DeadlineScope | None] = contextvars.ContextVar(
+    "deadline_scope", default=None
+)
+
+
+def start_request_deadline(
+    timeout_seconds: float,
+    margin_seconds: float = DEFAULT_DEADLINE_MARGIN_SECONDS,
+) -> Deadline:
+    """
+    Set the deadline for the current request.
+
+    Args:
+        timeout_seconds: Seconds from now until the client gives up
+        margin_seconds: Stop starting new work this many seconds early
+
+    Returns:
+        The Deadline now active in this context
+    """
+    deadline = Deadline(
+        expires_at=time.monotonic() + timeout_seconds,
+        margin_seconds=margin_seconds,
+    )
+    _deadline_context.set(deadline)
+    return deadline
+
+
+def clear_request_deadline() -> None:
+    """Remove the deadline from the current context."""
+    _deadline_context.set(None)
+    _scope_context.set(None)
+
+
+def get_request_deadline() -> Deadline | None:
+    """
+    Get the deadline for the current request.
+
+    Returns:
+        The active Deadline, or None if the request has no deadline
+    """
+    return _deadline_context.get()
+
+
+def remaining_seconds() -> float | None:
+    """
+    Get the seconds left before the request deadline.
+
+    Returns:
+        Remaining seconds, or None if the request has no deadline
+    """
+    deadline = _deadline_context.get()
+    return deadline.remaining_seconds() if deadline else None
+
+
+def deadline_near() -> bool:
+    """
+    Check whether new work should be skipped.
+
+    Returns:
+        True if a deadline is set and falls within its safety margin
+    """
+    deadline = _deadline_context.get()
+    return deadline is not None and deadline.is_near()
+
+
+def begin_deadline_scope() -> DeadlineScope:
+    """
+    Start tracking deadline effects for a unit of work in this context.
+
+    Call from inside the task doing the work so sibling tasks get their
+    own scopes.
+
+    Returns:
+        A fresh DeadlineScope
+    """
+    scope = DeadlineScope()
+    _scope_context.set(scope)
+    return scope
+
+
+def record_refused_call(description: str) -> None:
+    """
+    Record that an AWS call was not made because the deadline was near.
+
+    Args:
+        description: What was refused, for logging (e.g. "ec2.describe_volumes")
+    """
+    _mark_exceeded()
+    scope = _scope_context.get()
+    if scope is not None:
+        scope.refused_calls += 1
+    logger.info(f"Request deadline near - skipped call: {description}")
+
+
+def record_truncation(description: str) -> None:
+    """
+    Record that work was cut short and its partial results kept.
+
+    Args:
+        description: What was truncated, for logging
+    """
+    _mark_exceeded()
+    scope = _scope_context.get()
+    if scope is not None:
+        scope.truncated = True
+    logger.info(f"Request deadline near - truncated: {description}")
+
+
+def _mark_exceeded() -> None:
+    deadline = _deadline_context.get()
+    if deadline is not None:
+        deadline.exceeded = True
@@ -0,0 +1,221 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Bounded-memory streaming aggregators for violation rankings.
+
+Low-cardinality keys (region, resource type, tag name) are ranked exactly
+from the rollup cube. High-cardinality keys such as resource IDs or
+invalid tag values can't be counted exactly without holding every key,
+so they are tracked here instead:
+
+- CountMinSketch estimates per-key totals in a fixed width x depth table.
+  Estimates never undercount; they overcount by at most ~e/width of the
+  stream total with probability 1 - e^-depth.
+- HeavyHitters keeps the `capacity` keys with the largest estimates in a
+  min-heap, so the top keys of an unbounded stream are available in
+  O(capacity + width * depth) memory.
+- DistinctCounter counts unique keys (e.g. non-compliant resources per
+  rollup cell). It is exact up to `exact_limit` keys, then switches to a
+  HyperLogLog of 2^precision one-byte registers (~1.6% standard error at
+  the default precision). Counters merge, so rolled-up slices of the
+  cube union their cells' counters without holding any resource IDs.
+"""
+
+import hashlib
+import heapq
+import math
+from array import array
+
+DEFAULT_SKETCH_WIDTH = 1024
+DEFAULT_SKETCH_DEPTH = 4
+DEFAULT_HEAVY_HITTER_CAPACITY = 50
+DEFAULT_DISTINCT_EXACT_LIMIT = 128
+DEFAULT_DISTINCT_PRECISION = 12
+
+
+class CountMinSketch:
+    """Count-min sketch of non-negative per-key amounts."""
+
+    def __init__(self, width: int = DEFAULT_SKETCH_WIDTH, depth: int = DEFAULT_SKETCH_DEPTH):
+        if width < 1 or not 1 <= depth <= 16:
+            raise ValueError("width must be at least 1 and depth between 1 and 16")
+        self.width = width
+        self.depth = depth
+        self.total = 0.0
+        self._rows = [array("d", bytes(8 * width)) for _ in range(depth)]
+
+    def _cells(self, key: str) -> list[int]:
+        # One digest, split into an independent 32-bit hash per row
+        digest = hashlib.blake2b(key.encode(), digest_size=4 * self.depth).digest()
+        return [
+            int.from_bytes(digest[4 * row : 4 * row + 4], "little") % self.width
+            for row in range(self.depth)
+        ]
+
+    def add(self, key: str, amount: float = 1.0) -> float:
+        """
+        Add an amount to a key.
+
+        Args:
+            key: Key to count
+            amount: Non-negative amount to add
+
+        Returns:
+            The key's updated estimate
+        """
+        if amount < 0:
+            raise ValueError("CountMinSketch amounts must be non-negative")
+        self.total += amount
+        estimate = None
+        for row, cell in zip(self._rows, self._cells(key), strict=True):
+            row[cell] += amount
+            if estimate is None or row[cell] < estimate:
+                estimate = row[cell]
+        return estimate
+
+    def estimate(self, key: str) -> float:
+        """Estimated total for a key (never less than the true total)."""
+        return min(row[cell] for row, cell in zip(self._rows, self._cells(key), strict=True))
+
+
+class HeavyHitters:
+    """Streaming top-K keys by summed amount, in bounded memory.
+
+    Every key is counted in a CountMinSketch; the `capacity` keys with the
+    largest estimates are kept as candidates in a min-heap so a new key
+    only displaces the current smallest candidate.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_HEAVY_HITTER_CAPACITY,
+        width: int = DEFAULT_SKETCH_WIDTH,
+        depth: int = DEFAULT_SKETCH_DEPTH,
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._sketch = CountMinSketch(width, depth)
+        self._candidates: dict[str, float] = {}
+        # Min-heap of (estimate, key). Entries go stale when a candidate's
+        # estimate grows; stale entries are skipped and periodically compacted.
+        self._heap: list[tuple[float, str]] = []
+
+    @property
+    def total(self) -> float:
+        """Sum of every amount added."""
+        return self._sketch.total
+
+    def add(self, key: str, amount: float = 1.0) -> None:
+        """Add an amount to a key and update the candidate set."""
+        if amount == 0:
+            return
+        estimate = self._sketch.add(key, amount)
+
+        if key not in self._candidates and len(self._candidates) >= self.capacity:
+            smallest = self._smallest()
+            if estimate <= smallest[0]:
+                return
+            heapq.heappop(self._heap)
+            del self._candidates[smallest[1]]
+
+        self._candidates[key] = estimate
+        heapq.heappush(self._heap, (estimate, key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(value, k) for k, value in self._candidates.items()]
+            heapq.heapify(self._heap)
+
+    def _smallest(self) -> tuple[float, str]:
+        """Smallest live candidate, dropping stale heap entries."""
+        while True:
+            value, key = self._heap[0]
+            if self._candidates.get(key) == value:
+                return value, key
+            heapq.heappop(self._heap)
+
+    def top(self, k: int | None = None) -> list[tuple[str, float]]:
+        """
+        The k keys with the largest estimates.
+
+        Args:
+            k: Number of keys (at most capacity). Default: capacity
+
+        Returns:
+            List of (key, estimated total), largest first
+        """
+        k = self.capacity if k is None else min(k, self.capacity)
+        return heapq.nlargest(k, self._candidates.items(), key=lambda item: item[1])
+
+
+class DistinctCounter:
+    """Count of unique keys: exact while small, a HyperLogLog beyond exact_limit."""
+
+    __slots__ = ("exact_limit", "precision", "_keys", "_registers")
+
+    def __init__(
+        self,
+        exact_limit: int = DEFAULT_DISTINCT_EXACT_LIMIT,
+        precision: int = DEFAULT_DISTINCT_PRECISION,
+    ):
+        if exact_limit < 0 or not 4 <= precision <= 16:
+            raise ValueError("exact_limit must be non-negative and precision between 4 and 16")
+        self.exact_limit = exact_limit
+        self.precision = precision
+        self._keys: set[str] | None = set()
+        self._registers: bytearray | None = None
+
+    @property
+    def exact(self) -> bool:
+        """Whether the count is still exact (no more than exact_limit keys seen)."""
+        return self._keys is not None
+
+    def add(self, key: str) -> None:
+        """Count a key."""
+        if self._keys is not None:
+            self._keys.add(key)
+            if len(self._keys) > self.exact_limit:
+                self._to_sketch()
+        else:
+            self._add_to_registers(key)
+
+    def merge(self, other: "DistinctCounter") -> None:
+        """Add every key counted by another counter of the same precision."""
+        if other.precision != self.precision:
+            raise ValueError("Only counters of the same precision can be merged")
+        if other._keys is not None:
+            for key in other._keys:
+                self.add(key)
+            return
+        if self._keys is not None:
+            self._to_sketch()
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def count(self) -> int:
+        """Number of unique keys (an estimate once the counter is no longer exact)."""
+        if self._keys is not None:
+            return len(self._keys)
+        m = len(self._registers)
+        zeros = self._registers.count(0)
+        estimate = (0.7213 / (1 + 1.079 / m)) * m * m / sum(2.0**-r for r in self._registers)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def _to_sketch(self) -> None:
+        self._registers = bytearray(1 << self.precision)
+        for key in self._keys:
+            self._add_to_registers(key)
+        self._keys = None
+
+    def _add_to_registers(self, key: str) -> None:
+        value = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+        bits = 64 - self.precision
+        index = value >> bits
+        rank = bits - (value & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
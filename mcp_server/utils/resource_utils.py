@@ -308,6 +308,49 @@ async def fetch_resources_via_tagging_api(
         raise
 
 
+async def assign_service_costs(aws_client, resources: list[dict]) -> bool:
+    """
+    Set each resource's "cost_impact" to its share of its service's cost, in place.
+
+    Makes one Cost Explorer query (AWSClient.get_cost_by_service_and_region)
+    and splits the cost of each (service, region) pair evenly across the
+    listed resources of that service in that region. Resources in region
+    "global" share the service's cost across all regions.
+
+    Args:
+        aws_client: AWS client used for Cost Explorer and service name mapping
+        resources: Listed resources (resource_type, region, ...)
+
+    Returns:
+        True if costs were assigned, False if Cost Explorer couldn't be queried
+    """
+    try:
+        costs = await aws_client.get_cost_by_service_and_region()
+    except Exception as e:
+        logger.warning(f"Could not fetch costs by service and region: {str(e)}")
+        return False
+
+    global_costs: dict[str, float] = {}
+    for (service, _), amount in costs.items():
+        global_costs[service] = global_costs.get(service, 0.0) + amount
+
+    groups: dict[tuple[str, str], list[dict]] = {}
+    for resource in resources:
+        service = aws_client.get_service_name_for_resource_type(resource.get("resource_type", ""))
+        groups.setdefault((service, resource.get("region", "")), []).append(resource)
+
+    for (service, region), members in groups.items():
+        if not service:
+            amount = 0.0
+        elif region == "global":
+            amount = global_costs.get(service, 0.0)
+        else:
+            amount = costs.get((service, region), 0.0)
+        for resource in members:
+            resource["cost_impact"] = amount / len(members)
+    return True
+
+
 def extract_account_from_arn(arn: str) -> str:
     """
     Extract AWS account ID from an ARN.
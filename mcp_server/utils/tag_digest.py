@@ -0,0 +1,215 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Hierarchical (Merkle-style) digests of resource tag state.
+
+Resources are placed in a four-level tree:
+
+    account -> region -> resource type -> bucket
+
+where the bucket is a hash of the ARN modulo DIGEST_BUCKETS. A leaf's
+digest covers its sorted (ARN, tag hash) pairs, and every inner node's
+digest covers its children's (key, digest) pairs. Two trees are compared
+top-down: equal digests mean an identical subtree, so only subtrees whose
+digests differ are descended into and only the resources in differing
+leaves need comparing or re-validating.
+"""
+
+import hashlib
+import json
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+
+from .resource_utils import extract_account_from_arn
+
+# Leaves per (account, region, resource type)
+DIGEST_BUCKETS = 256
+
+# A node path: (account,), (account, region), (account, region, type)
+# or (account, region, type, bucket)
+NodePath = tuple
+LEAF_DEPTH = 4
+
+
+def tag_set_hash(tags: dict[str, str]) -> str:
+    """Stable hash of a tag set (independent of key order)."""
+    canonical = json.dumps(tags, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def resource_key(resource: dict) -> str:
+    """The ARN of a resource dict, or its resource_id when it has none."""
+    return resource.get("arn") or resource.get("resource_id", "")
+
+
+def leaf_path(arn: str, region: str, resource_type: str) -> NodePath:
+    """The leaf a resource belongs to."""
+    bucket = int.from_bytes(hashlib.blake2b(arn.encode(), digest_size=4).digest(), "big")
+    return (extract_account_from_arn(arn), region, resource_type, bucket % DIGEST_BUCKETS)
+
+
+def group_by_leaf(resources: Iterable[dict]) -> dict[NodePath, list[dict]]:
+    """Group resource dicts (arn, region, resource_type, tags) by leaf."""
+    groups: dict[NodePath, list[dict]] = defaultdict(list)
+    for resource in resources:
+        path = leaf_path(
+            resource_key(resource),
+            resource.get("region") or "",
+            resource.get("resource_type") or "",
+        )
+        groups[path].append(resource)
+    return groups
+
+
+def _digest(entries: Iterable[str]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for entry in entries:
+        h.update(entry.encode())
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def leaf_digest(entries: Iterable[tuple[str, str]]) -> str:
+    """Digest of a leaf's (ARN, tag hash) pairs."""
+    return _digest(f"{arn}\t{tag_hash}" for arn, tag_hash in sorted(entries))
+
+
+class TagDigestTree:
+    """Digests and resource counts for every node of a tag state tree."""
+
+    def __init__(self, nodes: dict[NodePath, tuple[str, int]] | None = None):
+        """
+        Args:
+            nodes: Map of node path -> (digest, resource count)
+        """
+        self.nodes: dict[NodePath, tuple[str, int]] = nodes or {}
+        self._children: dict[NodePath, list[NodePath]] = defaultdict(list)
+        for path in self.nodes:
+            if len(path) > 1:
+                self._children[path[:-1]].append(path)
+
+    @classmethod
+    def from_leaf_entries(
+        cls, leaves: dict[NodePath, Iterable[tuple[str, str]]]
+    ) -> "TagDigestTree":
+        """Build a tree from the (ARN, tag hash) pairs of each leaf."""
+        leaf_digests = {}
+        for path, entries in leaves.items():
+            pairs = list(entries)
+            if pairs:
+                leaf_digests[path] = (leaf_digest(pairs), len(pairs))
+        return cls.from_leaves(leaf_digests)
+
+    @classmethod
+    def from_groups(cls, groups: dict[NodePath, list[dict]]) -> "TagDigestTree":
+        """Build a tree from resources grouped by group_by_leaf()."""
+        return cls.from_leaf_entries(
+            {
+                path: [(resource_key(r), tag_set_hash(r.get("tags") or {})) for r in members]
+                for path, members in groups.items()
+            }
+        )
+
+    @classmethod
+    def from_leaves(cls, leaves: dict[NodePath, tuple[str, int]]) -> "TagDigestTree":
+        """Build the inner levels above known leaf digests."""
+        nodes = dict(leaves)
+        level = leaves
+        for _ in range(LEAF_DEPTH - 1):
+            children: dict[NodePath, list[tuple[NodePath, tuple[str, int]]]] = defaultdict(list)
+            for path, node in level.items():
+                children[path[:-1]].append((path, node))
+            level = {
+                parent: (
+                    _digest(f"{path[-1]}\t{digest}" for path, (digest, _) in sorted(kids)),
+                    sum(count for _, (_, count) in kids),
+                )
+                for parent, kids in children.items()
+            }
+            nodes.update(level)
+        return cls(nodes)
+
+    def set_leaf(self, path: NodePath, node: tuple[str, int] | None) -> None:
+        """
+        Replace (or with None, remove) one leaf and recompute its ancestors.
+
+        Only the leaf's path to the root is rehashed, so patching a few
+        resources costs O(depth x siblings), not a rebuild.
+        """
+        self._set(path, node)
+        for depth in range(LEAF_DEPTH - 1, 0, -1):
+            parent = path[:depth]
+            kids = sorted(self._children.get(parent, ()))
+            self._set(
+                parent,
+                (
+                    _digest(f"{kid[-1]}\t{self.nodes[kid][0]}" for kid in kids),
+                    sum(self.nodes[kid][1] for kid in kids),
+                )
+                if kids
+                else None,
+            )
+
+    def _set(self, path: NodePath, node: tuple[str, int] | None) -> None:
+        if node is None:
+            if self.nodes.pop(path, None) is not None and len(path) > 1:
+                self._children[path[:-1]].remove(path)
+        else:
+            if path not in self.nodes and len(path) > 1:
+                self._children[path[:-1]].append(path)
+            self.nodes[path] = node
+
+    @property
+    def leaves(self) -> dict[NodePath, tuple[str, int]]:
+        return {path: node for path, node in self.nodes.items() if len(path) == LEAF_DEPTH}
+
+    def roots(self) -> list[NodePath]:
+        return [path for path in self.nodes if len(path) == 1]
+
+    def restricted_to(
+        self,
+        resource_types: Iterable[str] | None = None,
+        scope: set[tuple[str, str]] | None = None,
+    ) -> "TagDigestTree":
+        """The tree over only the given resource types and (region, resource_type) pairs."""
+        types = set(resource_types) if resource_types is not None else None
+        return TagDigestTree.from_leaves(
+            {
+                path: node
+                for path, node in self.leaves.items()
+                if (types is None or path[2] in types)
+                and (scope is None or (path[1], path[2]) in scope)
+            }
+        )
+
+    def changed_leaves(self, previous: "TagDigestTree") -> set[NodePath]:
+        """
+        Leaves whose contents differ from previous, found top-down.
+
+        Subtrees with equal digests in both trees are skipped without
+        visiting their children. Leaves that exist in only one of the
+        trees are included.
+        """
+        changed: set[NodePath] = set()
+        stack = list({*self.roots(), *previous.roots()})
+        while stack:
+            path = stack.pop()
+            current = self.nodes.get(path)
+            if current is not None and current == previous.nodes.get(path):
+                continue
+            if len(path) == LEAF_DEPTH:
+                changed.add(path)
+            else:
+                stack.extend({*self._children.get(path, ()), *previous._children.get(path, ())})
+        return changed
+
+    def iter_rows(self) -> Iterator[tuple[str, str, int]]:
+        """(path as JSON, digest, resource count) for persisting every node."""
+        for path, (digest, count) in self.nodes.items():
+            yield json.dumps(path), digest, count
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[str, str, int]]) -> "TagDigestTree":
+        """Inverse of iter_rows()."""
+        return cls({tuple(json.loads(path)): (digest, count) for path, digest, count in rows})
@@ -0,0 +1,165 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Per-request stage timings.
+
+A slow scan can spend its time in region discovery, per-type fetches,
+Cost Explorer, validation, aggregation or JSON serialization. Each of
+those stages is wrapped in a ``span``, which adds its duration to the
+RequestTimings of the current request. Like the deadline in
+``deadline.py``, the RequestTimings lives in a context variable, so no
+layer needs a parameter for it.
+
+Asyncio tasks copy the context but share the RequestTimings object, so
+spans in concurrent tasks all land in the request's totals. A stage's
+total is therefore the sum over its spans and can exceed the request's
+wall-clock time when they overlap (e.g. 17 regions scanned at once).
+
+When no RequestTimings is active (timings disabled, or code running
+outside a tool call) ``span`` returns a shared no-op context manager,
+so an instrumented stage costs one context variable lookup.
+"""
+
+import contextvars
+import threading
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class StageTiming:
+    """
+    Durations of one stage within a request.
+
+    Attributes:
+        count: Spans recorded for the stage
+        total_ms: Sum of their durations
+        max_ms: Longest single span
+    """
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+class RequestTimings:
+    """Stage timings collected for one request."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.stages: dict[str, StageTiming] = {}
+        # Spans may also end on worker threads (asyncio.to_thread copies the context)
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, elapsed_ms: float) -> None:
+        """Add one span of a stage."""
+        with self._lock:
+            timing = self.stages.get(stage)
+            if timing is None:
+                timing = self.stages[stage] = StageTiming()
+            timing.count += 1
+            timing.total_ms += elapsed_ms
+            timing.max_ms = max(timing.max_ms, elapsed_ms)
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the request started."""
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def stage_dict(self) -> dict[str, dict]:
+        """Stages as {stage: {"count", "total_ms", "max_ms"}}, durations rounded to 0.1 ms."""
+        with self._lock:
+            return {
+                stage: {
+                    "count": timing.count,
+                    "total_ms": round(timing.total_ms, 1),
+                    "max_ms": round(timing.max_ms, 1),
+                }
+                for stage, timing in self.stages.items()
+            }
+
+    def to_dict(self) -> dict:
+        """The ``timings`` block of a tool response."""
+        return {"total_ms": round(self.elapsed_ms(), 1), "stages": self.stage_dict()}
+
+
+class _Span:
+    __slots__ = ("_timings", "_stage", "_start")
+
+    def __init__(self, timings: RequestTimings, stage: str):
+        self._timings = timings
+        self._stage = stage
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        self._timings.record(self._stage, (time.perf_counter() - self._start) * 1000)
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> bool:
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+# Context variable for the timings of the current request
+_timings_context: contextvars.ContextVar[RequestTimings | None] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request_timings() -> RequestTimings:
+    """
+    Start collecting stage timings for the current request.
+
+    Returns:
+        The RequestTimings now active in this context
+    """
+    timings = RequestTimings()
+    _timings_context.set(timings)
+    return timings
+
+
+def clear_request_timings() -> None:
+    """Stop collecting stage timings in the current context."""
+    _timings_context.set(None)
+
+
+def get_request_timings() -> RequestTimings | None:
+    """
+    Get the timings of the current request.
+
+    Returns:
+        The active RequestTimings, or None if timings aren't being collected
+    """
+    return _timings_context.get()
+
+
+def span(stage: str) -> _Span | _NoSpan:
+    """
+    Time a stage of the current request.
+
+    Usage:
+        with span("validate"):
+            ...
+
+    Args:
+        stage: Stage name, e.g. "fetch" or "aws.ec2". Keep names to a small
+               fixed set: they become rows of the audit stage rollups.
+
+    Returns:
+        A context manager recording the stage's duration on exit
+    """
+    timings = _timings_context.get()
+    if timings is None:
+        return _NO_SPAN
+    return _Span(timings, stage)
@@ -10,6 +10,7 @@ timestamp, tool name, parameters, and result status (success/failure).
 When an error occurs, the error message SHALL be included in the log entry.
 """
 
+import asyncio
 import os
 import re
 import tempfile
@@ -129,9 +130,8 @@ class TestAuditLogCompleteness:
         Every audit log entry SHALL contain a timestamp.
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
-            service = AuditService(db_path=temp_db)
-
             before_log = datetime.now(timezone.utc)
 
             entry = service.log_invocation(
@@ -155,6 +155,7 @@ class TestAuditLogCompleteness:
                 before_ts <= entry_ts <= after_ts
             ), f"Timestamp {entry_ts} should be between {before_ts} and {after_ts}"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
 
     # -------------------------------------------------------------------------
@@ -178,9 +179,8 @@ class TestAuditLogCompleteness:
         Every audit log entry SHALL contain the tool name.
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
-            service = AuditService(db_path=temp_db)
-
             entry = service.log_invocation(
                 tool_name=tool_name,
                 parameters=parameters,
@@ -193,6 +193,7 @@ class TestAuditLogCompleteness:
                 entry.tool_name == tool_name
             ), f"Tool name should be '{tool_name}', got '{entry.tool_name}'"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
 
     # -------------------------------------------------------------------------
@@ -216,9 +217,8 @@ class TestAuditLogCompleteness:
         Every audit log entry SHALL contain the parameters passed to the tool.
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
-            service = AuditService(db_path=temp_db)
-
             entry = service.log_invocation(
                 tool_name=tool_name,
                 parameters=parameters,
@@ -231,6 +231,7 @@ class TestAuditLogCompleteness:
                 entry.parameters == parameters
             ), f"Parameters should be '{parameters}', got '{entry.parameters}'"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
 
     # -------------------------------------------------------------------------
@@ -256,9 +257,8 @@ class TestAuditLogCompleteness:
         Every audit log entry SHALL contain the result status (success/failure).
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
-            service = AuditService(db_path=temp_db)
-
             error_message = "Test error" if status == AuditStatus.FAILURE else None
 
             entry = service.log_invocation(
@@ -272,6 +272,7 @@ class TestAuditLogCompleteness:
             assert entry.status is not None, "Audit entry must have a status"
             assert entry.status == status, f"Status should be '{status}', got '{entry.status}'"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
 
     # -------------------------------------------------------------------------
@@ -297,9 +298,8 @@ class TestAuditLogCompleteness:
         When an error occurs, the error message SHALL be included in the log entry.
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
-            service = AuditService(db_path=temp_db)
-
             entry = service.log_invocation(
                 tool_name=tool_name,
                 parameters=parameters,
@@ -315,6 +315,7 @@ class TestAuditLogCompleteness:
                 entry.error_message == error_message
             ), f"Error message should be '{error_message}', got '{entry.error_message}'"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
 
     @given(
@@ -334,9 +335,8 @@ class TestAuditLogCompleteness:
         When a tool succeeds, the error message SHALL be None.
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
-            service = AuditService(db_path=temp_db)
-
             entry = service.log_invocation(
                 tool_name=tool_name,
                 parameters=parameters,
@@ -348,6 +348,7 @@ class TestAuditLogCompleteness:
                 entry.error_message is None
             ), f"Audit entry for success should not have error message, got '{entry.error_message}'"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
 
     # -------------------------------------------------------------------------
@@ -373,9 +374,8 @@ class TestAuditLogCompleteness:
         Audit log entries SHALL be stored in SQLite database and retrievable.
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
-            service = AuditService(db_path=temp_db)
-
             error_message = "Test error" if status == AuditStatus.FAILURE else None
 
             # Log the invocation
@@ -387,7 +387,7 @@ class TestAuditLogCompleteness:
             )
 
             # Retrieve logs
-            logs = service.get_logs(tool_name=tool_name)
+            logs = asyncio.run(service.get_logs(tool_name=tool_name))
 
             # Should find the logged entry
             assert len(logs) >= 1, "Should have at least one log entry"
@@ -406,6 +406,7 @@ class TestAuditLogCompleteness:
 
             assert found, f"Could not find logged entry with id {entry.id}"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
 
     # -------------------------------------------------------------------------
@@ -432,9 +433,8 @@ class TestAuditLogCompleteness:
         timestamp, tool name, parameters, and success status.
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
-            service = AuditService(db_path=temp_db)
-
             entry = service.log_invocation(
                 tool_name=tool_name,
                 parameters=parameters,
@@ -450,6 +450,7 @@ class TestAuditLogCompleteness:
             assert entry.error_message is None, "Success should not have error message"
             assert entry.execution_time_ms == execution_time, "Must have execution time"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
 
     @given(
@@ -474,9 +475,8 @@ class TestAuditLogCompleteness:
         timestamp, tool name, parameters, failure status, and error message.
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
-            service = AuditService(db_path=temp_db)
-
             entry = service.log_invocation(
                 tool_name=tool_name,
                 parameters=parameters,
@@ -493,6 +493,7 @@ class TestAuditLogCompleteness:
             assert entry.error_message == error_message, "Must have error message"
             assert entry.execution_time_ms == execution_time, "Must have execution time"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
 
     # -------------------------------------------------------------------------
@@ -553,6 +554,9 @@ class TestAuditLogCompleteness:
                             execution_time_ms=execution_time_ms,
                         )
                         raise
+                    finally:
+                        # Write the entry before the test reads it back
+                        audit_service.close()
 
                 return wrapper
 
@@ -567,7 +571,8 @@ class TestAuditLogCompleteness:
 
             # Check audit log
             service = AuditService(db_path=temp_db)
-            logs = service.get_logs()
+            logs = await service.get_logs()
+            service.close()
 
             assert len(logs) >= 1, "Should have at least one log entry"
 
@@ -632,6 +637,9 @@ class TestAuditLogCompleteness:
                             execution_time_ms=execution_time_ms,
                         )
                         raise
+                    finally:
+                        # Write the entry before the test reads it back
+                        audit_service.close()
 
                 return wrapper
 
@@ -645,7 +653,8 @@ class TestAuditLogCompleteness:
 
             # Check audit log
             service = AuditService(db_path=temp_db)
-            logs = service.get_logs()
+            logs = await service.get_logs()
+            service.close()
 
             assert len(logs) >= 1, "Should have at least one log entry"
 
@@ -709,6 +718,9 @@ class TestAuditLogCompleteness:
                             execution_time_ms=execution_time_ms,
                         )
                         raise
+                    finally:
+                        # Write the entry before the test reads it back
+                        audit_service.close()
 
                 return wrapper
 
@@ -723,7 +735,8 @@ class TestAuditLogCompleteness:
 
             # Check audit log
             service = AuditService(db_path=temp_db)
-            logs = service.get_logs()
+            logs = asyncio.run(service.get_logs())
+            service.close()
 
             assert len(logs) >= 1, "Should have at least one log entry"
 
@@ -787,6 +800,9 @@ class TestAuditLogCompleteness:
                             execution_time_ms=execution_time_ms,
                         )
                         raise
+                    finally:
+                        # Write the entry before the test reads it back
+                        audit_service.close()
 
                 return wrapper
 
@@ -800,7 +816,8 @@ class TestAuditLogCompleteness:
 
             # Check audit log
             service = AuditService(db_path=temp_db)
-            logs = service.get_logs()
+            logs = asyncio.run(service.get_logs())
+            service.close()
 
             assert len(logs) >= 1, "Should have at least one log entry"
 
@@ -833,9 +850,8 @@ class TestAuditLogCompleteness:
         audit log entry.
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
-            service = AuditService(db_path=temp_db)
-
             # Log multiple invocations
             for i in range(num_invocations):
                 service.log_invocation(
@@ -846,11 +862,12 @@ class TestAuditLogCompleteness:
                 )
 
             # Retrieve all logs
-            logs = service.get_logs(limit=num_invocations + 10)
+            logs = asyncio.run(service.get_logs(limit=num_invocations + 10))
 
             # Should have exactly num_invocations entries
             assert (
                 len(logs) == num_invocations
             ), f"Expected {num_invocations} log entries, got {len(logs)}"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
@@ -14,6 +14,7 @@ in all log entries, audit records, and trace spans related to that invocation.
 The correlation ID SHALL be returned in the response headers or metadata.
 """
 
+import asyncio
 import logging
 import os
 import re
@@ -230,9 +231,8 @@ class TestCorrelationIDInAuditLogs:
         SHALL include that correlation ID.
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
-            service = AuditService(db_path=temp_db)
-
             entry = service.log_invocation(
                 tool_name=tool_name,
                 parameters=parameters,
@@ -246,6 +246,7 @@ class TestCorrelationIDInAuditLogs:
                 entry.correlation_id == correlation_id
             ), f"Expected '{correlation_id}' but got '{entry.correlation_id}'"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
 
     @given(
@@ -268,9 +269,8 @@ class TestCorrelationIDInAuditLogs:
         SHALL return entries with the same correlation ID.
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
-            service = AuditService(db_path=temp_db)
-
             # Log the invocation
             entry = service.log_invocation(
                 tool_name=tool_name,
@@ -280,7 +280,7 @@ class TestCorrelationIDInAuditLogs:
             )
 
             # Retrieve logs by correlation ID
-            logs = service.get_logs(correlation_id=correlation_id)
+            logs = asyncio.run(service.get_logs(correlation_id=correlation_id))
 
             # Should find the logged entry
             assert len(logs) >= 1, "Should have at least one log entry"
@@ -297,6 +297,7 @@ class TestCorrelationIDInAuditLogs:
 
             assert found, f"Could not find logged entry with id {entry.id}"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
 
     @given(
@@ -319,12 +320,11 @@ class TestCorrelationIDInAuditLogs:
         the audit service SHALL automatically capture it.
         """
         temp_db = create_temp_db()
+        service = AuditService(db_path=temp_db)
         try:
             # Set correlation ID in context
             set_correlation_id(correlation_id)
 
-            service = AuditService(db_path=temp_db)
-
             # Log without explicitly passing correlation_id
             entry = service.log_invocation(
                 tool_name=tool_name,
@@ -338,6 +338,7 @@ class TestCorrelationIDInAuditLogs:
                 entry.correlation_id == correlation_id
             ), f"Expected '{correlation_id}' from context but got '{entry.correlation_id}'"
         finally:
+            service.close()
             cleanup_temp_db(temp_db)
 
 
@@ -0,0 +1,130 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Unit tests for AccountContext shared account metadata."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from mcp_server.clients.account_context import AccountContext
+from mcp_server.clients.aws_client import AWSClient
+from mcp_server.clients.regional_client_factory import RegionalClientFactory
+
+IDENTITY = {
+    "Account": "123456789012",
+    "Arn": "arn:aws-cn:iam::123456789012:user/scanner",
+}
+
+
+class TestAccountIdentity:
+    """Tests for account ID and partition resolution."""
+
+    @pytest.mark.asyncio
+    async def test_identity_fetched_once(self):
+        """Test the caller identity is fetched once and then cached."""
+        context = AccountContext(session=MagicMock())
+        fetch = AsyncMock(return_value=IDENTITY)
+
+        assert await context.get_account_id(fetch) == "123456789012"
+        assert await context.get_account_id(fetch) == "123456789012"
+
+        fetch.assert_awaited_once()
+        assert context.account_id == "123456789012"
+        assert context.partition == "aws-cn"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_fetch(self):
+        """Test concurrent regional callers wait on a single STS call."""
+        context = AccountContext(session=MagicMock())
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return IDENTITY
+
+        results = await asyncio.gather(*[context.get_account_id(fetch) for _ in range(17)])
+
+        assert set(results) == {"123456789012"}
+        assert calls == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_account_raises(self):
+        """Test an identity response without an account ID is rejected."""
+        context = AccountContext(session=MagicMock())
+
+        with pytest.raises(ValueError, match="Account ID not found"):
+            await context.get_account_id(AsyncMock(return_value={}))
+
+        assert context.account_id is None
+
+
+class TestSharedClientsAndRegions:
+    """Tests for the shared Cost Explorer client and region list."""
+
+    def test_cost_explorer_client_created_once_in_us_east_1(self):
+        """Test the Cost Explorer client is created once, in us-east-1."""
+        session = MagicMock()
+        context = AccountContext(session=session)
+
+        assert context.ce is context.ce
+        session.client.assert_called_once_with("ce", region_name="us-east-1")
+
+    def test_enabled_regions_respect_max_age(self):
+        """Test the cached region list expires after max_age_seconds."""
+        context = AccountContext(session=MagicMock())
+        assert context.get_enabled_regions(max_age_seconds=60) is None
+
+        with patch("mcp_server.clients.account_context.time.monotonic", return_value=100.0):
+            context.set_enabled_regions(["us-east-1", "eu-west-1"])
+
+        with patch("mcp_server.clients.account_context.time.monotonic", return_value=130.0):
+            assert context.get_enabled_regions(max_age_seconds=60) == ["us-east-1", "eu-west-1"]
+
+        with patch("mcp_server.clients.account_context.time.monotonic", return_value=200.0):
+            assert context.get_enabled_regions(max_age_seconds=60) is None
+
+    def test_clear_forgets_everything(self):
+        """Test clear() drops identity and region list."""
+        context = AccountContext(session=MagicMock())
+        context._account_id = "123456789012"
+        context.set_enabled_regions(["us-east-1"])
+
+        context.clear()
+
+        assert context.account_id is None
+        assert context.get_enabled_regions(max_age_seconds=3600) is None
+
+
+class TestRegionalClientsShareContext:
+    """Tests for account metadata sharing across RegionalClientFactory clients."""
+
+    @pytest.mark.asyncio
+    async def test_one_sts_call_across_regions(self):
+        """Test regional clients resolve the account ID with a single STS call."""
+        factory = RegionalClientFactory(session=MagicMock())
+        regions = ["us-east-1", "us-west-2", "eu-west-1", "ap-southeast-1"]
+        clients = [factory.get_client(region) for region in regions]
+
+        with patch.object(
+            AWSClient, "_call_with_backoff", new_callable=AsyncMock, return_value=IDENTITY
+        ) as mock_call:
+            account_ids = await asyncio.gather(*[c._get_account_id() for c in clients])
+
+        assert set(account_ids) == {"123456789012"}
+        assert mock_call.await_count == 1
+        assert factory.account_context.account_id == "123456789012"
+
+    def test_cost_explorer_client_shared_across_regions(self):
+        """Test every regional client returns the same Cost Explorer client."""
+        factory = RegionalClientFactory(session=MagicMock())
+
+        east = factory.get_client("us-east-1")
+        west = factory.get_client("us-west-2")
+
+        assert east.account_context is factory.account_context
+        assert east.ce is west.ce
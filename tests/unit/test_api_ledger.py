@@ -0,0 +1,166 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Tests for the per-request AWS API call ledger and its audit rollups."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from mcp_server import stdio_server
+from mcp_server.clients.aws_client import AWSAPIError, AWSClient
+from mcp_server.models.audit import AuditStatus
+from mcp_server.services.audit_service import AuditService
+from mcp_server.services.metrics_service import MetricsService
+from mcp_server.utils.api_ledger import (
+    attribute_api_calls,
+    clear_api_ledger,
+    start_api_ledger,
+)
+
+
+def client_error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, "DescribeInstances")
+
+
+def aws_response(size: int) -> dict:
+    return {"ResponseMetadata": {"HTTPHeaders": {"content-length": str(size)}}}
+
+
+@pytest.fixture
+def aws_client():
+    return AWSClient(region="eu-west-1", session=MagicMock())
+
+
+@pytest.fixture
+def ledger():
+    ledger = start_api_ledger("corr-1")
+    yield ledger
+    clear_api_ledger()
+
+
+@pytest.fixture
+def audit_service(tmp_path):
+    service = AuditService(db_path=str(tmp_path / "audit.db"))
+    yield service
+    service.close()
+
+
+class TestCallRecording:
+    """Tests for calls recorded by _call_with_backoff."""
+
+    @pytest.mark.asyncio
+    async def test_throttled_page_is_recorded_once_with_retry(self, aws_client, ledger):
+        """Test a throttled continuation page counts as one call with one retry."""
+        outcomes = [client_error("Throttling"), aws_response(512)]
+
+        def describe_instances(**kwargs):
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        with attribute_api_calls("ec2:instance"):
+            await aws_client._call_with_backoff("ec2", describe_instances, NextToken="t")
+
+        (row,) = ledger.rows()
+        assert (row["service"], row["operation"]) == ("ec2", "describe_instances")
+        assert (row["region"], row["resource_type"]) == ("eu-west-1", "ec2:instance")
+        assert (row["calls"], row["pages"], row["retries"], row["throttles"]) == (1, 1, 1, 1)
+        assert (row["errors"], row["bytes"]) == (0, 512)
+        assert row["latency_ms"] >= 1000  # includes the backoff
+
+    @pytest.mark.asyncio
+    async def test_failed_cost_explorer_call(self, aws_client, ledger):
+        """Test failed calls are counted and Cost Explorer requests are billed."""
+
+        def get_cost_and_usage(**kwargs):
+            raise client_error("AccessDeniedException")
+
+        def get_cost_forecast(**kwargs):
+            return aws_response(100)
+
+        with pytest.raises(AWSAPIError):
+            await aws_client._call_with_backoff("ce", get_cost_and_usage)
+        await aws_client._call_with_backoff("ce", get_cost_forecast)
+
+        summary = ledger.summary()
+        assert (summary["calls"], summary["errors"]) == (2, 1)
+        assert summary["cost_explorer_requests"] == 2
+        assert summary["estimated_cost_usd"] == 0.02
+        assert {row["region"] for row in ledger.rows()} == {"us-east-1"}
+
+    @pytest.mark.asyncio
+    async def test_no_ledger_outside_a_request(self, aws_client):
+        """Test calls outside a tool invocation aren't recorded anywhere."""
+        clear_api_ledger()
+        assert await aws_client._call_with_backoff("ec2", lambda: {"ok": True}) == {"ok": True}
+
+
+class TestLedgerReporting:
+    """Tests for the response block, audit entry and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_tool_response_and_audit_entry(self, audit_service, monkeypatch):
+        """Test an instrumented tool reports its AWS calls."""
+        monkeypatch.setattr(
+            stdio_server,
+            "_container",
+            SimpleNamespace(
+                audit_service=audit_service,
+                settings=SimpleNamespace(
+                    timings_enabled=False, timings_in_response=False, aws_calls_in_response=True
+                ),
+            ),
+        )
+        aws_client = AWSClient(region="eu-west-1", session=MagicMock())
+
+        @stdio_server._instrumented
+        async def scan_tool() -> str:
+            for _ in range(3):
+                await aws_client._call_with_backoff("ec2", lambda: aws_response(10))
+            return stdio_server._to_json({"total_resources": 0})
+
+        response = json.loads(await scan_tool())
+
+        assert response["aws_api_calls"]["calls"] == 3
+        assert response["aws_api_calls"]["bytes"] == 30
+        assert response["aws_api_calls"]["by_operation"] == {"ec2.<lambda>": 3}
+        (entry,) = await audit_service.get_logs()
+        (row,) = entry.aws_calls
+        assert row["calls"] == 3
+        assert entry.correlation_id
+
+    @pytest.mark.asyncio
+    async def test_api_call_stats(self, audit_service):
+        """Test calls are summed per tool and operation across regions and invocations."""
+        for region in ("us-east-1", "eu-west-1"):
+            audit_service.log_invocation(
+                tool_name="get_cost_attribution_gap",
+                parameters={},
+                status=AuditStatus.SUCCESS,
+                aws_calls=[
+                    {"service": "ce", "operation": "get_cost_and_usage", "region": "us-east-1",
+                     "resource_type": "", "calls": 2, "pages": 1, "retries": 0, "throttles": 0,
+                     "errors": 0, "latency_ms": 400.0, "max_latency_ms": 300.0, "bytes": 2048},
+                    {"service": "ec2", "operation": "describe_instances", "region": region,
+                     "resource_type": "ec2:instance", "calls": 1, "pages": 0, "retries": 1,
+                     "throttles": 1, "errors": 0, "latency_ms": 50.0, "max_latency_ms": 50.0,
+                     "bytes": 100},
+                ],
+            )
+
+        stats = await MetricsService(audit_service=audit_service).get_api_call_stats()
+
+        ce, ec2 = stats
+        assert (ce.service, ce.resource_type) == ("ce", None)
+        assert (ce.invocation_count, ce.call_count, ce.page_count) == (2, 4, 2)
+        assert ce.calls_per_invocation == 2.0
+        assert ce.average_latency_ms == pytest.approx(200.0)
+        assert ce.estimated_cost_usd == pytest.approx(0.04)
+        assert (ec2.resource_type, ec2.call_count, ec2.throttle_count) == ("ec2:instance", 2, 2)
+        assert ec2.estimated_cost_usd == 0.0
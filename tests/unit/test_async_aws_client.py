@@ -0,0 +1,240 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Unit tests for the aiobotocore-based AsyncAWSClient backend.
+
+aiobotocore is optional, so these tests drive the client with an
+in-memory stand-in for an aiobotocore session.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from mcp_server.clients.async_aws_client import AsyncAWSClient
+from mcp_server.clients.aws_client import AWSAPIError, AWSClient
+from mcp_server.clients.regional_client_factory import RegionalClientFactory
+from mcp_server.services.region_discovery_service import RegionDiscoveryService
+
+
+class FakeAioClient:
+    """Async service client exposing canned AsyncMock operations."""
+
+    def __init__(self, service_name: str, region_name: str, operations: dict):
+        self.service_name = service_name
+        self.region_name = region_name
+        self.closed = False
+        for name, op in operations.items():
+            setattr(self, name, op)
+
+
+class FakeAioSession:
+    """Mimics aiobotocore's AioSession.create_client context manager."""
+
+    def __init__(self, operations: dict[str, dict] | None = None):
+        self.operations = operations or {}
+        self.created: list[FakeAioClient] = []
+
+    def create_client(self, service_name, region_name=None, config=None):
+        session = self
+
+        class _Context:
+            async def __aenter__(self):
+                client = FakeAioClient(
+                    service_name, region_name, session.operations.get(service_name, {})
+                )
+                session.created.append(client)
+                return client
+
+            async def __aexit__(self, *exc):
+                session.created_by_name(service_name).closed = True
+
+        return _Context()
+
+    def created_by_name(self, service_name: str) -> FakeAioClient:
+        return next(c for c in self.created if c.service_name == service_name)
+
+
+def make_client(operations: dict[str, dict], region: str = "us-west-2") -> AsyncAWSClient:
+    client = AsyncAWSClient(
+        region=region, session=MagicMock(), aio_session=FakeAioSession(operations)
+    )
+    client._min_call_interval = 0
+    return client
+
+
+class TestAsyncAWSClientFetchers:
+    """Tests that inherited fetchers run over the async backend."""
+
+    @pytest.mark.asyncio
+    async def test_get_ec2_instances(self):
+        """Test the EC2 fetcher returns the same resource shape as AWSClient."""
+        client = make_client(
+            {
+                "sts": {"get_caller_identity": AsyncMock(return_value={"Account": "123456789012"})},
+                "ec2": {
+                    "describe_instances": AsyncMock(
+                        return_value={
+                            "Reservations": [
+                                {
+                                    "Instances": [
+                                        {
+                                            "InstanceId": "i-abc",
+                                            "InstanceType": "t3.micro",
+                                            "State": {"Name": "running"},
+                                            "Tags": [{"Key": "Owner", "Value": "team-a"}],
+                                        }
+                                    ]
+                                }
+                            ]
+                        }
+                    )
+                },
+            }
+        )
+
+        resources = await client.get_ec2_instances()
+
+        assert len(resources) == 1
+        assert resources[0]["resource_id"] == "i-abc"
+        assert resources[0]["tags"] == {"Owner": "team-a"}
+        assert resources[0]["arn"] == "arn:aws:ec2:us-west-2:123456789012:instance/i-abc"
+
+    @pytest.mark.asyncio
+    async def test_service_client_opened_once(self):
+        """Test each service client is opened on first call and reused."""
+        describe = AsyncMock(return_value={"Volumes": []})
+        client = make_client({"ec2": {"describe_volumes": describe}})
+
+        await client._call_with_backoff("ec2", client.ec2.describe_volumes)
+        await client._call_with_backoff("ec2", client.ec2.describe_volumes)
+
+        assert describe.await_count == 2
+        assert len(client._aio_session.created) == 1
+        assert client._aio_session.created[0].region_name == "us-west-2"
+
+    @pytest.mark.asyncio
+    async def test_cost_explorer_pinned_to_us_east_1(self):
+        """Test the Cost Explorer client always targets us-east-1."""
+        client = make_client({"ce": {"get_cost_and_usage": AsyncMock(return_value={})}})
+
+        await client._call_with_backoff("ce", client.ce.get_cost_and_usage)
+
+        assert client._aio_session.created_by_name("ce").region_name == "us-east-1"
+
+    @pytest.mark.asyncio
+    async def test_throttling_is_retried(self, monkeypatch):
+        """Test throttling errors from aiobotocore get the same backoff."""
+        monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+        throttled = ClientError({"Error": {"Code": "Throttling"}}, "DescribeVolumes")
+        describe = AsyncMock(side_effect=[throttled, {"Volumes": []}])
+        client = make_client({"ec2": {"describe_volumes": describe}})
+
+        response = await client._call_with_backoff("ec2", client.ec2.describe_volumes)
+
+        assert response == {"Volumes": []}
+        assert describe.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_other_errors_raise_aws_api_error(self):
+        """Test non-throttling errors are wrapped like the boto3 backend."""
+        denied = ClientError({"Error": {"Code": "AccessDenied"}}, "DescribeVolumes")
+        client = make_client({"ec2": {"describe_volumes": AsyncMock(side_effect=denied)}})
+
+        with pytest.raises(AWSAPIError, match="AccessDenied"):
+            await client._call_with_backoff("ec2", client.ec2.describe_volumes)
+
+
+class TestAsyncAWSClientCancellation:
+    """Tests that timeouts abort in-flight requests."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_cancels_request(self):
+        """Test asyncio.wait_for cancels the underlying request coroutine."""
+        cancelled = asyncio.Event()
+
+        async def slow_describe(**kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        client = make_client({"ec2": {"describe_volumes": slow_describe}})
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                client._call_with_backoff("ec2", client.ec2.describe_volumes), timeout=0.05
+            )
+
+        assert cancelled.is_set()
+
+
+class TestAsyncAWSClientLifecycle:
+    """Tests for closing async clients."""
+
+    @pytest.mark.asyncio
+    async def test_close_exits_open_clients(self):
+        """Test close() exits every opened client context."""
+        client = make_client({"ec2": {"describe_volumes": AsyncMock(return_value={})}})
+        await client._call_with_backoff("ec2", client.ec2.describe_volumes)
+
+        await client.close()
+
+        assert client._aio_session.created_by_name("ec2").closed is True
+        assert client._aio_clients == {}
+
+
+class TestBackendSelection:
+    """Tests for selecting the backend through RegionalClientFactory."""
+
+    def test_default_backend_is_boto3(self):
+        """Test the factory builds threaded AWSClients by default."""
+        factory = RegionalClientFactory(session=MagicMock())
+
+        client = factory.get_client("us-east-1")
+
+        assert type(client) is AWSClient
+
+    def test_aiobotocore_backend(self, monkeypatch):
+        """Test the aiobotocore backend builds AsyncAWSClients sharing account metadata."""
+        monkeypatch.setattr(
+            "mcp_server.clients.async_aws_client.get_shared_aio_session",
+            lambda: FakeAioSession(),
+        )
+        factory = RegionalClientFactory(session=MagicMock(), backend="aiobotocore")
+
+        east = factory.get_client("us-east-1")
+        west = factory.get_client("us-west-2")
+
+        assert isinstance(east, AsyncAWSClient)
+        assert east.account_context is west.account_context
+
+    def test_unknown_backend_rejected(self):
+        """Test an unknown backend name fails fast."""
+        with pytest.raises(ValueError, match="Unknown AWS client backend"):
+            RegionalClientFactory(session=MagicMock(), backend="curl")
+
+    @pytest.mark.asyncio
+    async def test_region_discovery_uses_async_client(self):
+        """Test region discovery awaits async clients directly."""
+        client = make_client(
+            {
+                "ec2": {
+                    "describe_regions": AsyncMock(
+                        return_value={
+                            "Regions": [
+                                {"RegionName": "us-east-1", "OptInStatus": "opt-in-not-required"},
+                                {"RegionName": "af-south-1", "OptInStatus": "not-opted-in"},
+                            ]
+                        }
+                    )
+                }
+            }
+        )
+        service = RegionDiscoveryService(ec2_client=client.ec2, cache=AsyncMock())
+
+        assert await service._discover_regions() == ["us-east-1"]
@@ -1,7 +1,11 @@
 """Unit tests for AuditService."""
 
+import asyncio
 import os
+import sqlite3
 import tempfile
+import threading
+import time
 from datetime import datetime
 
 import pytest
@@ -25,7 +29,9 @@ def temp_db():
 @pytest.fixture
 def audit_service(temp_db):
     """Create an AuditService instance with a temporary database."""
-    return AuditService(db_path=temp_db)
+    service = AuditService(db_path=temp_db)
+    yield service
+    service.close()
 
 
 def test_audit_service_initialization(audit_service):
@@ -34,7 +40,8 @@ def test_audit_service_initialization(audit_service):
     assert os.path.exists(audit_service.db_path)
 
 
-def test_log_successful_invocation(audit_service):
+@pytest.mark.asyncio
+async def test_log_successful_invocation(audit_service):
     """Test logging a successful tool invocation."""
     tool_name = "check_tag_compliance"
     parameters = {"resource_types": ["ec2:instance"], "severity": "all"}
@@ -45,6 +52,8 @@ def test_log_successful_invocation(audit_service):
         status=AuditStatus.SUCCESS,
         execution_time_ms=123.45,
     )
+    # IDs are assigned by SQLite once the entry is written
+    await audit_service.flush()
 
     assert entry.id is not None
     assert entry.tool_name == tool_name
@@ -55,7 +64,8 @@ def test_log_successful_invocation(audit_service):
     assert isinstance(entry.timestamp, datetime)
 
 
-def test_log_failed_invocation(audit_service):
+@pytest.mark.asyncio
+async def test_log_failed_invocation(audit_service):
     """Test logging a failed tool invocation."""
     tool_name = "find_untagged_resources"
     parameters = {"min_cost_threshold": 100}
@@ -68,6 +78,7 @@ def test_log_failed_invocation(audit_service):
         error_message=error_msg,
         execution_time_ms=50.0,
     )
+    await audit_service.flush()
 
     assert entry.id is not None
     assert entry.tool_name == tool_name
@@ -77,7 +88,8 @@ def test_log_failed_invocation(audit_service):
     assert entry.execution_time_ms == 50.0
 
 
-def test_get_logs_all(audit_service):
+@pytest.mark.asyncio
+async def test_get_logs_all(audit_service):
     """Test retrieving all audit logs."""
     # Log multiple invocations
     audit_service.log_invocation(
@@ -92,7 +104,7 @@ def test_get_logs_all(audit_service):
         error_message="Error occurred",
     )
 
-    logs = audit_service.get_logs()
+    logs = await audit_service.get_logs()
 
     assert len(logs) == 2
     # Logs should be in reverse chronological order
@@ -100,7 +112,8 @@ def test_get_logs_all(audit_service):
     assert logs[1].tool_name == "tool1"
 
 
-def test_get_logs_filter_by_tool_name(audit_service):
+@pytest.mark.asyncio
+async def test_get_logs_filter_by_tool_name(audit_service):
     """Test filtering logs by tool name."""
     audit_service.log_invocation(
         tool_name="check_tag_compliance",
@@ -119,13 +132,14 @@ def test_get_logs_filter_by_tool_name(audit_service):
         error_message="Error",
     )
 
-    logs = audit_service.get_logs(tool_name="check_tag_compliance")
+    logs = await audit_service.get_logs(tool_name="check_tag_compliance")
 
     assert len(logs) == 2
     assert all(log.tool_name == "check_tag_compliance" for log in logs)
 
 
-def test_get_logs_filter_by_status(audit_service):
+@pytest.mark.asyncio
+async def test_get_logs_filter_by_status(audit_service):
     """Test filtering logs by status."""
     audit_service.log_invocation(
         tool_name="tool1",
@@ -145,14 +159,38 @@ def test_get_logs_filter_by_status(audit_service):
         error_message="Error 2",
     )
 
-    logs = audit_service.get_logs(status=AuditStatus.FAILURE)
+    logs = await audit_service.get_logs(status=AuditStatus.FAILURE)
 
     assert len(logs) == 2
     assert all(log.status == AuditStatus.FAILURE for log in logs)
     assert all(log.error_message is not None for log in logs)
 
 
-def test_get_logs_with_limit(audit_service):
+@pytest.mark.asyncio
+async def test_get_recent_failures_uses_failure_index(audit_service, temp_db):
+    """Test recent failures come newest first from the partial failure index."""
+    for i in range(6):
+        audit_service.log_invocation(
+            tool_name=f"tool{i}",
+            parameters={},
+            status=AuditStatus.FAILURE if i % 2 else AuditStatus.SUCCESS,
+            error_message=f"Error {i}" if i % 2 else None,
+        )
+
+    failures = await audit_service.get_recent_failures(limit=2)
+
+    assert [log.error_message for log in failures] == ["Error 5", "Error 3"]
+    conn = sqlite3.connect(temp_db)
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM audit_logs "
+        "WHERE status = 'failure' ORDER BY id DESC LIMIT 10"
+    ).fetchall()
+    conn.close()
+    assert any("idx_audit_failures" in row[-1] for row in plan)
+
+
+@pytest.mark.asyncio
+async def test_get_logs_with_limit(audit_service):
     """Test limiting the number of logs returned."""
     # Log 10 invocations
     for i in range(10):
@@ -162,12 +200,13 @@ def test_get_logs_with_limit(audit_service):
             status=AuditStatus.SUCCESS,
         )
 
-    logs = audit_service.get_logs(limit=5)
+    logs = await audit_service.get_logs(limit=5)
 
     assert len(logs) == 5
 
 
-def test_get_logs_combined_filters(audit_service):
+@pytest.mark.asyncio
+async def test_get_logs_combined_filters(audit_service):
     """Test combining multiple filters."""
     audit_service.log_invocation(
         tool_name="check_tag_compliance",
@@ -187,7 +226,7 @@ def test_get_logs_combined_filters(audit_service):
         error_message="Error",
     )
 
-    logs = audit_service.get_logs(
+    logs = await audit_service.get_logs(
         tool_name="check_tag_compliance",
         status=AuditStatus.FAILURE,
     )
@@ -222,20 +261,26 @@ def test_log_invocation_with_complex_parameters(audit_service):
     assert entry.parameters == complex_params
 
 
-def test_multiple_audit_service_instances(temp_db):
+@pytest.mark.asyncio
+async def test_multiple_audit_service_instances(temp_db):
     """Test that multiple instances can access the same database."""
     service1 = AuditService(db_path=temp_db)
     service2 = AuditService(db_path=temp_db)
 
-    # Log with first instance
-    service1.log_invocation(
-        tool_name="tool1",
-        parameters={},
-        status=AuditStatus.SUCCESS,
-    )
+    try:
+        # Log with first instance and wait for the write
+        service1.log_invocation(
+            tool_name="tool1",
+            parameters={},
+            status=AuditStatus.SUCCESS,
+        )
+        await service1.flush()
 
-    # Retrieve with second instance
-    logs = service2.get_logs()
+        # Retrieve with second instance
+        logs = await service2.get_logs()
+    finally:
+        service1.close()
+        service2.close()
 
     assert len(logs) == 1
     assert logs[0].tool_name == "tool1"
@@ -291,7 +336,8 @@ def test_log_invocation_without_correlation_id(audit_service):
     assert entry.correlation_id is None
 
 
-def test_get_logs_filter_by_correlation_id(audit_service):
+@pytest.mark.asyncio
+async def test_get_logs_filter_by_correlation_id(audit_service):
     """Test filtering logs by correlation ID."""
     correlation_id_1 = "correlation-1"
     correlation_id_2 = "correlation-2"
@@ -318,14 +364,15 @@ def test_get_logs_filter_by_correlation_id(audit_service):
     )
 
     # Filter by correlation_id_1
-    logs = audit_service.get_logs(correlation_id=correlation_id_1)
+    logs = await audit_service.get_logs(correlation_id=correlation_id_1)
 
     assert len(logs) == 2
     assert all(log.correlation_id == correlation_id_1 for log in logs)
     assert {log.tool_name for log in logs} == {"tool1", "tool3"}
 
 
-def test_get_logs_combined_filters_with_correlation_id(audit_service):
+@pytest.mark.asyncio
+async def test_get_logs_combined_filters_with_correlation_id(audit_service):
     """Test combining correlation ID filter with other filters."""
     correlation_id = "test-correlation"
 
@@ -358,7 +405,7 @@ def test_get_logs_combined_filters_with_correlation_id(audit_service):
     )
 
     # Filter by tool name, status, and correlation ID
-    logs = audit_service.get_logs(
+    logs = await audit_service.get_logs(
         tool_name="check_tag_compliance",
         status=AuditStatus.FAILURE,
         correlation_id=correlation_id,
@@ -370,7 +417,8 @@ def test_get_logs_combined_filters_with_correlation_id(audit_service):
     assert logs[0].correlation_id == correlation_id
 
 
-def test_correlation_id_persists_across_queries(audit_service):
+@pytest.mark.asyncio
+async def test_correlation_id_persists_across_queries(audit_service):
     """Test that correlation ID is properly stored and retrieved."""
     correlation_id = "persistent-correlation-789"
 
@@ -384,9 +432,141 @@ def test_correlation_id_persists_across_queries(audit_service):
     )
 
     # Retrieve all logs
-    logs = audit_service.get_logs()
+    logs = await audit_service.get_logs()
 
     assert len(logs) == 1
     assert logs[0].correlation_id == correlation_id
     assert logs[0].tool_name == "suggest_tags"
     assert logs[0].execution_time_ms == 250.5
+
+
+def _stored_count(db_path: str) -> int:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM audit_logs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _wait_for(predicate, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.mark.asyncio
+async def test_batched_entries_are_written_together(temp_db):
+    """Test batched entries stay in memory until a flush writes them at once."""
+    service = AuditService(db_path=temp_db, batch_size=50, flush_interval_seconds=60)
+    try:
+        entries = [
+            service.log_invocation(tool_name="t", parameters={}, status=AuditStatus.SUCCESS)
+            for _ in range(10)
+        ]
+        assert _stored_count(temp_db) == 0
+
+        assert await service.flush() == 10
+        assert _stored_count(temp_db) == 10
+        assert [log.id for log in await service.get_logs()] == sorted(
+            (e.id for e in entries), reverse=True
+        )
+        stats = service.stats()
+        assert (stats.enqueued, stats.written, stats.flushes, stats.queue_depth) == (10, 10, 1, 0)
+    finally:
+        service.close()
+
+
+def test_batch_size_and_interval_trigger_flushes(temp_db):
+    """Test the writer flushes on a full batch and after the flush interval."""
+    by_size = AuditService(db_path=temp_db, batch_size=5, flush_interval_seconds=60)
+    for _ in range(5):
+        by_size.log_invocation(tool_name="t", parameters={}, status=AuditStatus.SUCCESS)
+    assert _wait_for(lambda: _stored_count(temp_db) == 5)
+    by_size.close()
+
+    by_time = AuditService(db_path=temp_db, batch_size=100, flush_interval_seconds=0.05)
+    by_time.log_invocation(tool_name="t", parameters={}, status=AuditStatus.SUCCESS)
+    assert _wait_for(lambda: _stored_count(temp_db) == 6)
+    by_time.close()
+
+
+def test_full_queue_drops_entries(temp_db):
+    """Test entries beyond max_queue_size are dropped instead of waiting for room."""
+    service = AuditService(db_path=temp_db, batch_size=1, max_queue_size=2)
+    # Keep the writer busy so handed-over entries stay pending
+    release = threading.Event()
+    service._pool.submit_write(lambda conn: release.wait(5))
+    try:
+        for _ in range(5):
+            service.log_invocation(tool_name="t", parameters={}, status=AuditStatus.SUCCESS)
+        stats = service.stats()
+    finally:
+        release.set()
+        service.close()
+
+    assert (stats.enqueued, stats.dropped, stats.queue_depth, stats.max_queue_depth) == (
+        2,
+        3,
+        2,
+        2,
+    )
+    assert _stored_count(temp_db) == 2
+
+
+@pytest.mark.asyncio
+async def test_logging_and_reads_never_block_the_event_loop(temp_db):
+    """Test a busy writer delays reads without stalling the loop or the logger."""
+    service = AuditService(db_path=temp_db)
+    release = threading.Event()
+    service._pool.submit_write(lambda conn: release.wait(5))
+    try:
+        entry = service.log_invocation(tool_name="t", parameters={}, status=AuditStatus.SUCCESS)
+        read = asyncio.ensure_future(service.get_logs())
+        await asyncio.sleep(0.05)
+        # The read waits for the pending entry to commit
+        assert not read.done()
+        release.set()
+        (log,) = await read
+    finally:
+        release.set()
+        service.close()
+
+    assert log.id == entry.id
+
+
+@pytest.mark.asyncio
+async def test_entry_ids_match_stored_rows_across_writers(temp_db):
+    """Test two services on one database get the IDs their entries are stored under."""
+    first = AuditService(db_path=temp_db)
+    second = AuditService(db_path=temp_db)
+    try:
+        entries = [
+            service.log_invocation(tool_name=name, parameters={}, status=AuditStatus.SUCCESS)
+            for _ in range(6)
+            for service, name in ((first, "first"), (second, "second"))
+        ]
+        await first.flush()
+        await second.flush()
+        stored = {log.id: log.tool_name for log in await first.get_logs(limit=100)}
+    finally:
+        first.close()
+        second.close()
+
+    assert len({e.id for e in entries}) == 12
+    assert stored == {e.id: e.tool_name for e in entries}
+
+
+def test_close_writes_queued_entries(temp_db):
+    """Test closing the service writes everything still queued."""
+    service = AuditService(db_path=temp_db, batch_size=1000, flush_interval_seconds=60)
+    for _ in range(25):
+        service.log_invocation(tool_name="t", parameters={}, status=AuditStatus.SUCCESS)
+
+    service.close()
+
+    assert _stored_count(temp_db) == 25
+    service.log_invocation(tool_name="t", parameters={}, status=AuditStatus.SUCCESS)
+    assert service.stats().dropped == 1
@@ -1,14 +1,20 @@
 """Unit tests for AWS client wrapper."""
 
 from datetime import datetime, timezone
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import boto3
 import pytest
 from moto import mock_aws
 
 from mcp_server.clients import AWSClient
-from mcp_server.clients.aws_client import AWSAPIError
+from mcp_server.clients.aws_client import (
+    AWSAPIError,
+    DeferredTags,
+    defer_tag_lookups,
+    get_shared_session,
+    resolve_deferred_tags,
+)
 
 
 @pytest.fixture
@@ -17,6 +23,51 @@ def aws_client():
     return AWSClient(region="us-east-1")
 
 
+# =============================================================================
+# Lazy Client Construction Tests
+# =============================================================================
+
+
+def test_init_creates_no_service_clients():
+    """Test that constructing AWSClient does not build any boto3 clients."""
+    session = MagicMock()
+    client = AWSClient(region="eu-west-1", session=session)
+
+    session.client.assert_not_called()
+    assert client.session is session
+
+
+def test_service_client_created_once_on_first_use():
+    """Test that a service client is built on first access and then reused."""
+    session = MagicMock()
+    client = AWSClient(region="eu-west-1", session=session)
+
+    ec2_first = client.ec2
+    ec2_second = client.ec2
+
+    assert ec2_first is ec2_second
+    session.client.assert_called_once_with("ec2", config=client._boto_config)
+
+
+def test_cost_explorer_client_pinned_to_us_east_1():
+    """Test that the Cost Explorer client is always created in us-east-1."""
+    session = MagicMock()
+    client = AWSClient(region="ap-southeast-2", session=session)
+
+    _ = client.ce
+
+    session.client.assert_called_once_with("ce", region_name="us-east-1")
+
+
+def test_clients_share_process_wide_session_by_default():
+    """Test that AWSClients in different regions share one boto3 Session."""
+    east = AWSClient(region="us-east-1")
+    west = AWSClient(region="us-west-2")
+
+    assert east.session is west.session
+    assert east.session is get_shared_session()
+
+
 # =============================================================================
 # EC2 Tests
 # =============================================================================
@@ -206,6 +257,27 @@ async def test_get_rds_instances_with_tags():
         assert resources[0]["tags"]["Owner"] == "team-a"
 
 
+@pytest.mark.asyncio
+async def test_deferred_tag_lookups():
+    """Test per-resource tag calls wait until the resources are resolved."""
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="us-east-1")
+        s3.create_bucket(Bucket="tagged")
+        s3.put_bucket_tagging(
+            Bucket="tagged", Tagging={"TagSet": [{"Key": "Owner", "Value": "team-a"}]}
+        )
+        s3.create_bucket(Bucket="untagged")
+
+        client = AWSClient(region="us-east-1")
+        with defer_tag_lookups():
+            resources = await client.get_s3_buckets()
+
+        assert all(isinstance(r["tags"], DeferredTags) for r in resources)
+        await resolve_deferred_tags(resources)
+        tags = {r["resource_id"]: r["tags"] for r in resources}
+        assert tags == {"tagged": {"Owner": "team-a"}, "untagged": {}}
+
+
 @pytest.mark.asyncio
 async def test_get_rds_instances_without_tags():
     """Test fetching RDS instances without tags."""
@@ -516,6 +588,40 @@ async def test_get_cost_data_default_period(aws_client):
     assert callable(aws_client.get_cost_data)
 
 
+@pytest.mark.asyncio
+async def test_get_cost_by_service_and_region_pages():
+    """Test costs are summed per service and region across result pages."""
+    client = AWSClient(region="eu-west-1", session=MagicMock())
+    client.ce.get_cost_and_usage.side_effect = [
+        {
+            "ResultsByTime": [
+                {"Groups": [
+                    {"Keys": ["AWS Lambda", "eu-west-1"],
+                     "Metrics": {"UnblendedCost": {"Amount": "4.5"}}},
+                    {"Keys": ["Amazon Route 53", "NoRegion"],
+                     "Metrics": {"UnblendedCost": {"Amount": "1"}}},
+                ]}
+            ],
+            "NextPageToken": "page-2",
+        },
+        {
+            "ResultsByTime": [
+                {"Groups": [
+                    {"Keys": ["AWS Lambda", "eu-west-1"],
+                     "Metrics": {"UnblendedCost": {"Amount": "0.5"}}},
+                ]}
+            ],
+        },
+    ]
+
+    costs = await client.get_cost_by_service_and_region()
+
+    assert costs == {("AWS Lambda", "eu-west-1"): 5.0, ("Amazon Route 53", "global"): 1.0}
+    first, second = client.ce.get_cost_and_usage.call_args_list
+    assert [g["Key"] for g in first.kwargs["GroupBy"]] == ["SERVICE", "REGION"]
+    assert second.kwargs["NextPageToken"] == "page-2"
+
+
 # =============================================================================
 # Error Handling Tests
 # =============================================================================
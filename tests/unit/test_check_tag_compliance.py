@@ -228,6 +228,7 @@ class TestCheckTagComplianceMultiRegion:
             filters=None,
             severity="all",
             force_refresh=False,
+            progress_callback=None,
         )
         mock_compliance_service.check_compliance.assert_not_called()
 
@@ -258,6 +259,7 @@ class TestCheckTagComplianceMultiRegion:
             filters=filters,
             severity="all",
             force_refresh=False,
+            progress_callback=None,
         )
 
     @pytest.mark.asyncio
@@ -313,6 +315,7 @@ class TestCheckTagComplianceMultiRegion:
             filters=None,
             severity="all",
             force_refresh=False,
+            progress_callback=None,
         )
         mock_compliance_service.check_compliance.assert_not_called()
 
@@ -1,15 +1,66 @@
 """Unit tests for CloudWatch logging integration."""
 
+import json
 import logging
 import os
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
+from botocore.exceptions import ClientError
+
+from mcp_server.utils import cloudwatch_logger
 from mcp_server.utils.cloudwatch_logger import (
+    MAX_BATCH_BYTES,
+    MAX_BATCH_SPAN_MS,
     CloudWatchHandler,
+    MetricBuffer,
     configure_cloudwatch_logging,
+    emit_metric,
 )
 
 
+class StubLogsClient:
+    """Local CloudWatch Logs stand-in that enforces the PutLogEvents limits."""
+
+    def __init__(self, delay: float = 0.0, throttle: int = 0):
+        self.delay = delay
+        self.throttle = throttle
+        self.batches: list[list[dict]] = []
+        self.sent = threading.Event()
+
+    def create_log_group(self, **kwargs):
+        pass
+
+    def create_log_stream(self, **kwargs):
+        pass
+
+    def put_log_events(self, logGroupName, logStreamName, logEvents):
+        time.sleep(self.delay)
+        if self.throttle:
+            self.throttle -= 1
+            raise ClientError({"Error": {"Code": "ThrottlingException"}}, "PutLogEvents")
+        timestamps = [e["timestamp"] for e in logEvents]
+        assert timestamps == sorted(timestamps)
+        assert len(logEvents) <= 10_000
+        assert sum(len(e["message"].encode()) + 26 for e in logEvents) <= MAX_BATCH_BYTES
+        assert timestamps[-1] - timestamps[0] <= MAX_BATCH_SPAN_MS
+        self.batches.append(logEvents)
+        self.sent.set()
+        return {}
+
+    @property
+    def messages(self) -> list[str]:
+        return [e["message"] for batch in self.batches for e in batch]
+
+
+def make_record(msg: str, created: float | None = None) -> logging.LogRecord:
+    record = logging.LogRecord("test.logger", logging.INFO, "test.py", 1, msg, (), None)
+    if created is not None:
+        record.created = created
+    return record
+
+
 class TestCloudWatchHandler:
     """Tests for CloudWatchHandler class."""
 
@@ -92,8 +143,9 @@ class TestCloudWatchHandler:
             exc_info=None,
         )
 
-        # Emit the record
+        # Emit the record; it is sent by the background sender or on flush
         handler.emit(record)
+        handler.flush()
 
         # Verify put_log_events was called
         mock_client.put_log_events.assert_called_once()
@@ -131,6 +183,9 @@ class TestCloudWatchHandler:
 
         # Should not raise exception
         handler.emit(record)
+        handler.flush()
+
+        assert handler.stats().failed == 1
 
 
 class TestConfigureCloudWatchLogging:
@@ -238,3 +293,178 @@ class TestConfigureCloudWatchLogging:
 
         # Should not raise exception
         configure_cloudwatch_logging()
+
+
+class TestCloudWatchBatching:
+    """Tests for queued, batched log shipping against a local stub."""
+
+    def test_emit_does_not_wait_for_cloudwatch(self):
+        """Test records are queued and sent together, off the logging thread."""
+        client = StubLogsClient(delay=0.5)
+        handler = CloudWatchHandler("/test/group", "test-stream", client=client)
+
+        started = time.perf_counter()
+        for i in range(200):
+            handler.emit(make_record(f"message {i}"))
+        elapsed = time.perf_counter() - started
+        handler.close()
+
+        assert elapsed < 0.25
+        assert len(client.batches) == 1
+        assert len(client.messages) == 200
+        assert handler.stats().sent == 200
+
+    def test_batches_respect_size_and_time_span_limits(self):
+        """Test large and far-apart events are split into valid batches."""
+        client = StubLogsClient()
+        handler = CloudWatchHandler("/test/group", "test-stream", client=client)
+        now = time.time()
+
+        for i in range(12):
+            handler.emit(make_record("x" * 200_000, created=now - 2 * 86400 + i))
+        handler.emit(make_record("tomorrow", created=now))
+        handler.emit(make_record("earlier", created=now - 2 * 86400 - 60))
+        handler.close()
+
+        assert len(client.messages) == 14
+        assert len(client.batches) >= 4
+        assert "earlier" in client.batches[0][0]["message"]
+        assert "tomorrow" in client.batches[-1][-1]["message"]
+
+    def test_full_queue_drops_and_reports(self):
+        """Test records beyond the queue size are dropped, counted and reported."""
+        client = StubLogsClient()
+        handler = CloudWatchHandler(
+            "/test/group", "test-stream", client=client, max_queue_size=5
+        )
+
+        for i in range(8):
+            handler.emit(make_record(f"message {i}"))
+        handler.close()
+        handler.emit(make_record("after close"))
+
+        stats = handler.stats()
+        assert (stats.queued, stats.sent, stats.dropped) == (5, 6, 4)
+        assert any("dropped 3 log records" in m for m in client.messages)
+
+    def test_sender_flushes_on_interval(self):
+        """Test queued records are sent without an explicit flush."""
+        client = StubLogsClient()
+        handler = CloudWatchHandler(
+            "/test/group", "test-stream", client=client, flush_interval_seconds=0.05
+        )
+
+        handler.emit(make_record("message"))
+
+        assert client.sent.wait(2)
+        handler.close()
+
+    def test_throttled_batches_are_retried(self):
+        """Test a throttled PutLogEvents call is retried before giving up."""
+        client = StubLogsClient(throttle=1)
+        handler = CloudWatchHandler("/test/group", "test-stream", client=client)
+
+        handler.emit(make_record("message"))
+        handler.close()
+
+        assert len(client.messages) == 1
+        assert handler.stats().send_errors == 0
+
+
+class TestMetricBuffer:
+    """Tests for in-process metric aggregation and batched flushing."""
+
+    def test_api_mode_aggregates_into_one_call(self):
+        """Test counts are summed and latencies sent as value/count arrays."""
+        client = MagicMock()
+        buffer = MetricBuffer("test/ns", client=client)
+
+        for _ in range(500):
+            buffer.record("AuthenticationFailures", dimensions={"FailureType": "missing"})
+        for latency in [10.0] * 300 + [250.0] * 200:
+            buffer.record("Latency", latency, unit="Milliseconds")
+        flushed = buffer.flush()
+
+        assert flushed == 2
+        client.put_metric_data.assert_called_once()
+        data = {d["MetricName"]: d for d in client.put_metric_data.call_args[1]["MetricData"]}
+        assert data["AuthenticationFailures"]["Value"] == 500.0
+        assert data["AuthenticationFailures"]["Dimensions"] == [
+            {"Name": "FailureType", "Value": "missing"}
+        ]
+        assert dict(zip(data["Latency"]["Values"], data["Latency"]["Counts"], strict=True)) == {
+            10.0: 300.0,
+            250.0: 200.0,
+        }
+        assert buffer.flush() == 0
+
+    def test_many_distinct_values_become_a_statistic_set(self):
+        """Test series with too many distinct values are sent as statistics."""
+        client = MagicMock()
+        buffer = MetricBuffer("test/ns", client=client)
+
+        for i in range(1000):
+            buffer.record("Latency", float(i), unit="Milliseconds")
+        buffer.flush()
+
+        (datum,) = client.put_metric_data.call_args[1]["MetricData"]
+        assert datum["StatisticValues"] == {
+            "SampleCount": 1000.0,
+            "Sum": 499500.0,
+            "Minimum": 0.0,
+            "Maximum": 999.0,
+        }
+
+    def test_emf_mode_writes_log_lines(self):
+        """Test EMF mode writes one document per dimension set and no API call."""
+        client = MagicMock()
+        lines: list[str] = []
+        buffer = MetricBuffer("test/ns", mode="emf", client=client, sink=lines.append)
+
+        buffer.record("CORSViolations", dimensions={"Origin": "evil"})
+        buffer.record("CORSViolations", dimensions={"Origin": "evil"})
+        buffer.record("Latency", 40.0, unit="Milliseconds", dimensions={"Origin": "evil"})
+        buffer.record("Latency", 60.0, unit="Milliseconds")
+        buffer.flush()
+
+        client.put_metric_data.assert_not_called()
+        documents = {}
+        for line in lines:
+            document = json.loads(line)
+            dimensions = document["_aws"]["CloudWatchMetrics"][0]["Dimensions"][0]
+            documents[tuple(dimensions)] = document
+        evil = documents[("Origin",)]
+        assert evil["Origin"] == "evil"
+        assert evil["CORSViolations"] == 2.0
+        assert evil["Latency"]["Values"] == [40.0]
+        assert evil["_aws"]["CloudWatchMetrics"][0]["Namespace"] == "test/ns"
+        assert documents[()]["Latency"]["Sum"] == 60.0
+
+    def test_series_beyond_limit_are_dropped(self):
+        """Test memory stays bounded when dimension values keep changing."""
+        buffer = MetricBuffer("test/ns", client=MagicMock(), max_series=3)
+
+        for i in range(5):
+            buffer.record("Requests", dimensions={"Path": f"/p{i}"})
+
+        assert buffer.dropped == 2
+        assert buffer.flush() == 3
+
+    @patch.dict(os.environ, {"ENVIRONMENT": "test"})
+    def test_emit_metric_records_without_calling_cloudwatch(self):
+        """Test emit_metric only updates the buffer until it is flushed."""
+        client = MagicMock()
+        buffer = MetricBuffer("test/ns", client=client)
+        with (
+            patch.object(cloudwatch_logger, "_metric_buffer", buffer),
+            patch.object(cloudwatch_logger, "_metrics_enabled", True),
+        ):
+            emit_metric("AuthenticationFailures")
+            emit_metric("AuthenticationFailures")
+
+            client.put_metric_data.assert_not_called()
+            buffer.close()
+
+        (datum,) = client.put_metric_data.call_args[1]["MetricData"]
+        assert datum["Value"] == 2.0
+        assert datum["Dimensions"] == [{"Name": "Environment", "Value": "test"}]
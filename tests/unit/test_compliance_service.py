@@ -1621,3 +1621,24 @@ class TestMultiRegionCacheBehavior:
         assert isinstance(result, ComplianceResult)
         assert result.total_resources == 1
         assert result.compliance_score == 1.0
+
+
+class TestFetchInventory:
+    """Test listing the raw inventory without validation."""
+
+    @pytest.mark.asyncio
+    async def test_failed_type_is_recorded(self, compliance_service):
+        """Test a resource type that fails to list is reported, not silently dropped."""
+
+        async def fetch(resource_type, filters):
+            if resource_type == "rds:db":
+                raise Exception("AccessDenied")
+            return [{"resource_id": "i-1", "resource_type": resource_type, "region": "us-east-1"}]
+
+        compliance_service._fetch_resources_by_type = AsyncMock(side_effect=fetch)
+
+        inventory = await compliance_service.fetch_inventory(["ec2:instance", "rds:db"])
+
+        assert [r["resource_id"] for r in inventory.resources] == ["i-1"]
+        assert inventory.failed_resource_types == {"us-east-1": ["rds:db"]}
+        assert not inventory.complete
@@ -0,0 +1,340 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Tests for request deadline propagation through the scan stack."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mcp_server import stdio_server
+from mcp_server.clients.aws_client import AWSClient, DeadlineExceededError
+from mcp_server.clients.cache import RedisCache
+from mcp_server.clients.regional_client_factory import RegionalClientFactory
+from mcp_server.models.compliance import ComplianceResult
+from mcp_server.services.compliance_service import ComplianceService
+from mcp_server.services.cost_service import CostService
+from mcp_server.services.multi_region_scanner import MultiRegionScanner
+from mcp_server.services.policy_service import PolicyService
+from mcp_server.services.region_discovery_service import (
+    RegionDiscoveryResult,
+    RegionDiscoveryService,
+)
+from mcp_server.stdio_server import _build_data_quality
+from mcp_server.utils.deadline import (
+    begin_deadline_scope,
+    clear_request_deadline,
+    deadline_near,
+    get_request_deadline,
+    record_refused_call,
+    record_truncation,
+    remaining_seconds,
+    start_request_deadline,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_deadline():
+    """Make sure no deadline leaks between tests."""
+    clear_request_deadline()
+    yield
+    clear_request_deadline()
+
+
+def expire_deadline() -> None:
+    """Start a deadline that is already inside its safety margin."""
+    start_request_deadline(timeout_seconds=1.0, margin_seconds=5.0)
+
+
+class TestDeadlineContext:
+    """Tests for the deadline context variable."""
+
+    def test_no_deadline_by_default(self):
+        """Test requests without a deadline are never cut short."""
+        assert get_request_deadline() is None
+        assert remaining_seconds() is None
+        assert deadline_near() is False
+
+    def test_deadline_near_inside_margin(self):
+        """Test the deadline counts as near once inside the safety margin."""
+        start_request_deadline(timeout_seconds=60.0, margin_seconds=5.0)
+        assert deadline_near() is False
+        assert 55.0 < remaining_seconds() <= 60.0
+
+        get_request_deadline().expires_at = time.monotonic() + 4.0
+        assert deadline_near() is True
+
+    @pytest.mark.asyncio
+    async def test_scopes_are_per_task_but_deadline_is_shared(self):
+        """Test child tasks get their own scope and mark the shared deadline."""
+        deadline = start_request_deadline(timeout_seconds=60.0)
+
+        async def truncating_work():
+            scope = begin_deadline_scope()
+            record_truncation("test pagination")
+            return scope
+
+        async def clean_work():
+            scope = begin_deadline_scope()
+            await asyncio.sleep(0)
+            return scope
+
+        truncated, clean = await asyncio.gather(truncating_work(), clean_work())
+
+        assert truncated.truncated is True
+        assert clean.affected is False
+        assert deadline.exceeded is True
+
+
+class TestAWSClientDeadline:
+    """Tests that the AWS client stops issuing calls near the deadline."""
+
+    @pytest.mark.asyncio
+    async def test_call_refused_near_deadline(self):
+        """Test no AWS call is made once the deadline is near."""
+        client = AWSClient(region="us-east-1", session=MagicMock())
+        describe = MagicMock(return_value={}, __name__="describe_volumes")
+        expire_deadline()
+        scope = begin_deadline_scope()
+
+        with pytest.raises(DeadlineExceededError):
+            await client._call_with_backoff("ec2", describe)
+
+        describe.assert_not_called()
+        assert scope.refused_calls == 1
+        assert get_request_deadline().exceeded is True
+
+    @pytest.mark.asyncio
+    async def test_pagination_keeps_pages_fetched_before_deadline(self):
+        """Test the Tagging API paginator returns the pages it already has."""
+        client = AWSClient(region="us-east-1", session=MagicMock())
+        client._min_call_interval = 0
+        deadline = start_request_deadline(timeout_seconds=60.0, margin_seconds=5.0)
+        scope = begin_deadline_scope()
+
+        def get_resources(**kwargs):
+            # The deadline becomes near while the first page is in flight
+            deadline.expires_at = time.monotonic()
+            return {
+                "ResourceTagMappingList": [
+                    {
+                        "ResourceARN": "arn:aws:ec2:us-east-1:123456789012:instance/i-1",
+                        "Tags": [{"Key": "Owner", "Value": "a"}],
+                    }
+                ],
+                "PaginationToken": "next",
+            }
+
+        client._clients["resourcegroupstaggingapi"] = MagicMock(
+            get_resources=MagicMock(side_effect=get_resources)
+        )
+
+        resources = await client.get_all_tagged_resources()
+
+        assert len(resources) == 1
+        assert scope.truncated is True
+        assert scope.refused_calls == 0
+
+
+class TestComplianceServiceDeadline:
+    """Tests that ComplianceService returns partial results near the deadline."""
+
+    @pytest.fixture
+    def service(self):
+        cache = MagicMock(spec=RedisCache)
+        cache.get = AsyncMock(return_value=None)
+        cache.set = AsyncMock(return_value=True)
+        policy = MagicMock(spec=PolicyService)
+        policy.get_required_tags.return_value = ["Owner"]
+        policy.validate_resource_tags.return_value = []
+        aws_client = MagicMock(spec=AWSClient)
+        aws_client.region = "us-east-1"
+        return ComplianceService(cache=cache, aws_client=aws_client, policy_service=policy)
+
+    @pytest.mark.asyncio
+    async def test_types_not_started_are_incomplete_and_not_cached(self, service):
+        """Test no fetch starts past the deadline and the partial result isn't cached."""
+        service._fetch_resources_by_type = AsyncMock(return_value=[])
+        expire_deadline()
+
+        result = await service.check_compliance(["ec2:instance", "rds:db"])
+
+        service._fetch_resources_by_type.assert_not_called()
+        assert sorted(result.incomplete_resource_types) == ["ec2:instance", "rds:db"]
+        service.cache.set.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_type_with_refused_call_is_dropped(self, service):
+        """Test a type whose tag lookups were refused is reported incomplete, not untagged."""
+        start_request_deadline(timeout_seconds=60.0)
+
+        async def fetch(resource_type, filters):
+            if resource_type == "s3:bucket":
+                # Simulates a fetcher that swallowed a refused tag lookup
+                get_request_deadline().expires_at = time.monotonic()
+                from mcp_server.utils.deadline import record_refused_call
+
+                record_refused_call("s3.get_bucket_tagging")
+            return [
+                {
+                    "resource_id": f"{resource_type}-1",
+                    "resource_type": resource_type,
+                    "region": "us-east-1",
+                    "tags": {},
+                }
+            ]
+
+        service._fetch_resources_by_type = fetch
+
+        result = await service.check_compliance(["ec2:instance", "s3:bucket"])
+
+        assert result.incomplete_resource_types == ["s3:bucket"]
+        assert result.total_resources == 1
+
+
+class TestMultiRegionScannerDeadline:
+    """Tests that the scanner skips regions instead of failing near the deadline."""
+
+    @pytest.fixture
+    def scanner(self):
+        discovery = AsyncMock(spec=RegionDiscoveryService)
+        discovery.get_enabled_regions_with_status.return_value = RegionDiscoveryResult(
+            regions=["us-east-1", "us-west-2"]
+        )
+        factory = MagicMock(spec=RegionalClientFactory)
+        factory.get_client.return_value = MagicMock()
+        compliance = AsyncMock()
+        compliance.check_compliance.return_value = ComplianceResult(
+            compliance_score=1.0, total_resources=2, compliant_resources=2
+        )
+        return MultiRegionScanner(
+            region_discovery=discovery,
+            client_factory=factory,
+            compliance_service_factory=lambda client: compliance,
+            max_concurrent_regions=1,
+        )
+
+    @pytest.mark.asyncio
+    async def test_all_regions_skipped_returns_partial_result(self, scanner):
+        """Test running out of time yields an empty partial result, not an error."""
+        expire_deadline()
+
+        result = await scanner.scan_all_regions(["ec2:instance"])
+
+        meta = result.region_metadata
+        assert meta.successful_regions == []
+        assert meta.failed_regions == []
+        assert sorted(meta.incomplete_regions) == ["us-east-1", "us-west-2"]
+
+    @pytest.mark.asyncio
+    async def test_queued_region_skipped_after_deadline(self, scanner):
+        """Test regions still queued when the deadline nears are not started."""
+        start_request_deadline(timeout_seconds=60.0)
+        compliance = scanner.compliance_service_factory(None)
+
+        async def check_and_expire(**kwargs):
+            get_request_deadline().expires_at = time.monotonic()
+            return ComplianceResult(compliance_score=1.0, total_resources=2, compliant_resources=2)
+
+        compliance.check_compliance.side_effect = check_and_expire
+
+        result = await scanner.scan_all_regions(["ec2:instance"])
+
+        meta = result.region_metadata
+        assert len(meta.successful_regions) == 1
+        assert len(meta.incomplete_regions) == 1
+        assert result.total_resources == 2
+        assert compliance.check_compliance.await_count == 1
+
+        quality = _build_data_quality(result)
+        assert quality["status"] == "partial"
+        assert quality["incomplete_regions"] == meta.incomplete_regions
+
+
+class TestDataQuality:
+    """Tests for the partial data_quality status."""
+
+    def test_single_region_incomplete_types_marked_partial(self):
+        """Test a single-region result with incomplete types is partial."""
+        result = ComplianceResult(
+            compliance_score=1.0,
+            total_resources=0,
+            compliant_resources=0,
+            incomplete_resource_types=["rds:db"],
+        )
+
+        quality = _build_data_quality(result)
+
+        assert quality["status"] == "partial"
+        assert quality["incomplete_resource_types"] == ["rds:db"]
+
+
+class TestCostLookupDeadline:
+    """Tests for the data_quality note when the deadline cuts the cost lookup short."""
+
+    @pytest.fixture
+    def container(self, monkeypatch):
+        container = SimpleNamespace(
+            aws_client=MagicMock(), policy_service=MagicMock(), multi_region_scanner=None
+        )
+        monkeypatch.setattr(stdio_server, "_container", container)
+        return container
+
+    @pytest.fixture
+    def scan_result(self):
+        return ComplianceResult(
+            compliance_score=0.5,
+            total_resources=2,
+            compliant_resources=1,
+            cost_attribution_gap=10.0,
+        )
+
+    @pytest.mark.asyncio
+    async def test_refused_calls_mark_cost_partial(self, container, scan_result, monkeypatch):
+        """Test types skipped near the deadline mark the looked-up gap as understated."""
+        start_request_deadline(timeout_seconds=60.0)
+
+        async def skip_type(self, **kwargs):
+            record_refused_call("cost scan of rds:db")
+            return SimpleNamespace(attribution_gap=4.0)
+
+        monkeypatch.setattr(CostService, "calculate_attribution_gap", skip_type)
+
+        gap, note = await stdio_server._cost_attribution_gap(scan_result, ["rds:db"], None)
+
+        assert gap == 4.0
+        assert "understated" in note
+
+    @pytest.mark.asyncio
+    async def test_deadline_error_keeps_scan_estimate(self, container, scan_result, monkeypatch):
+        """Test a lookup stopped by DeadlineExceededError falls back with a note."""
+        start_request_deadline(timeout_seconds=60.0)
+        monkeypatch.setattr(
+            CostService,
+            "calculate_attribution_gap",
+            AsyncMock(side_effect=DeadlineExceededError("deadline")),
+        )
+
+        gap, note = await stdio_server._cost_attribution_gap(scan_result, ["rds:db"], None)
+
+        assert gap == 10.0
+        assert "scan-time estimate" in note
+
+    @pytest.mark.asyncio
+    async def test_complete_lookup_has_no_note(self, container, scan_result, monkeypatch):
+        """Test a lookup the deadline didn't touch leaves data_quality alone."""
+        start_request_deadline(timeout_seconds=60.0)
+        monkeypatch.setattr(
+            CostService,
+            "calculate_attribution_gap",
+            AsyncMock(return_value=SimpleNamespace(attribution_gap=4.0)),
+        )
+
+        assert await stdio_server._cost_attribution_gap(scan_result, ["rds:db"], None) == (
+            4.0,
+            None,
+        )
@@ -0,0 +1,187 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Unit tests for the per-workload AWS call thread pools."""
+
+import asyncio
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from mcp_server.clients import executors
+from mcp_server.clients.aws_client import AWSClient
+from mcp_server.clients.executors import (
+    InstrumentedExecutor,
+    WorkloadClass,
+    classify_workload,
+    configure_executor_pools,
+    get_executor,
+    get_executor_stats,
+    pool_sizes_for_concurrency,
+    shutdown_executor_pools,
+)
+from mcp_server.services.metrics_service import MetricsService
+
+
+@pytest.fixture(autouse=True)
+def reset_pools():
+    """Give every test fresh pools with the default sizes."""
+    configure_executor_pools()
+    yield
+    shutdown_executor_pools()
+    configure_executor_pools()
+
+
+class TestPoolSizing:
+    """Tests for deriving pool sizes from concurrency settings."""
+
+    def test_sizes_scale_with_region_concurrency(self):
+        """Test inventory and tagging pools grow with max_concurrent_regions."""
+        sizes = pool_sizes_for_concurrency(10)
+
+        assert sizes[WorkloadClass.INVENTORY] == 40
+        assert sizes[WorkloadClass.TAGGING] == 20
+        assert sizes[WorkloadClass.COST_EXPLORER] == executors.COST_EXPLORER_WORKERS
+
+    def test_overrides_take_precedence(self):
+        """Test explicit sizes win and None overrides are ignored."""
+        sizes = configure_executor_pools(
+            max_concurrent_regions=3,
+            overrides={WorkloadClass.COST_EXPLORER: 1, WorkloadClass.TAGGING: None},
+        )
+
+        assert sizes[WorkloadClass.INVENTORY] == 12
+        assert sizes[WorkloadClass.TAGGING] == 6
+        assert sizes[WorkloadClass.COST_EXPLORER] == 1
+        assert get_executor(WorkloadClass.COST_EXPLORER).max_workers == 1
+
+    def test_reconfigure_replaces_existing_pools(self):
+        """Test reconfiguring swaps in new pools with the new size."""
+        before = get_executor(WorkloadClass.INVENTORY)
+        configure_executor_pools(max_concurrent_regions=1)
+        after = get_executor(WorkloadClass.INVENTORY)
+
+        assert after is not before
+        assert after.max_workers == executors.INVENTORY_WORKERS_PER_REGION
+
+
+class TestClassifyWorkload:
+    """Tests for routing AWS calls to workload classes."""
+
+    @pytest.mark.parametrize(
+        "service,operation,expected",
+        [
+            ("ce", "get_cost_and_usage", WorkloadClass.COST_EXPLORER),
+            ("resourcegroupstaggingapi", "get_resources", WorkloadClass.TAGGING),
+            ("rds", "list_tags_for_resource", WorkloadClass.TAGGING),
+            ("s3", "get_bucket_tagging", WorkloadClass.TAGGING),
+            ("ec2", "describe_instances", WorkloadClass.INVENTORY),
+            ("sts", "get_caller_identity", WorkloadClass.INVENTORY),
+        ],
+    )
+    def test_classification(self, service, operation, expected):
+        """Test service and operation names map to the right pool."""
+        assert classify_workload(service, operation) == expected
+
+
+class TestInstrumentedExecutor:
+    """Tests for queue depth and wait-time accounting."""
+
+    @pytest.mark.asyncio
+    async def test_runs_callable_in_worker_thread(self):
+        """Test calls run off the event loop thread and return their result."""
+        pool = InstrumentedExecutor(WorkloadClass.INVENTORY, max_workers=2)
+        try:
+            thread_name = await pool.run(lambda: threading.current_thread().name)
+        finally:
+            pool.shutdown()
+
+        assert thread_name.startswith("aws-inventory")
+
+    @pytest.mark.asyncio
+    async def test_exceptions_propagate_and_are_counted(self):
+        """Test a failing call raises to the caller and still counts as completed."""
+        pool = InstrumentedExecutor(WorkloadClass.TAGGING, max_workers=1)
+
+        def boom():
+            raise RuntimeError("boom")
+
+        try:
+            with pytest.raises(RuntimeError, match="boom"):
+                await pool.run(boom)
+        finally:
+            pool.shutdown()
+
+        stats = pool.stats()
+        assert stats.submitted == 1
+        assert stats.completed == 1
+        assert stats.active == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_and_wait_time_recorded(self):
+        """Test calls beyond the worker count queue and accumulate wait time."""
+        pool = InstrumentedExecutor(WorkloadClass.COST_EXPLORER, max_workers=1)
+        release = threading.Event()
+
+        try:
+            tasks = [asyncio.create_task(pool.run(release.wait, 5)) for _ in range(3)]
+            await asyncio.sleep(0.05)
+
+            busy = pool.stats()
+            assert busy.active == 1
+            assert busy.queue_depth == 2
+
+            release.set()
+            await asyncio.gather(*tasks)
+        finally:
+            pool.shutdown()
+
+        stats = pool.stats()
+        assert stats.submitted == 3
+        assert stats.completed == 3
+        assert stats.queue_depth == 0
+        assert stats.max_queue_depth >= 2
+        assert stats.max_wait_ms >= 40
+        assert stats.average_wait_ms > 0
+
+
+class TestAWSClientRouting:
+    """Tests that AWSClient sends calls to the matching pool."""
+
+    @pytest.mark.asyncio
+    async def test_calls_routed_by_workload(self):
+        """Test inventory, tag and Cost Explorer calls land in separate pools."""
+        client = AWSClient(region="us-east-1", session=MagicMock())
+        client._min_call_interval = 0
+
+        describe = MagicMock(return_value={}, __name__="describe_instances")
+        list_tags = MagicMock(return_value={}, __name__="list_tags_for_resource")
+        cost = MagicMock(return_value={}, __name__="get_cost_and_usage")
+
+        await client._call_with_backoff("ec2", describe)
+        await client._call_with_backoff("rds", list_tags)
+        await client._call_with_backoff("ce", cost)
+
+        submitted = {s.workload: s.submitted for s in get_executor_stats()}
+        assert submitted == {"inventory": 1, "tagging": 1, "cost_explorer": 1}
+
+
+class TestExecutorMetrics:
+    """Tests for exposing pool metrics through MetricsService."""
+
+    @pytest.mark.asyncio
+    async def test_metrics_service_reports_every_pool(self):
+        """Test every workload class is reported, including unused pools."""
+        await get_executor(WorkloadClass.INVENTORY).run(lambda: None)
+
+        service = MetricsService(
+            audit_service=MagicMock(), budget_tracker=MagicMock(), loop_detector=MagicMock()
+        )
+        metrics = {m.workload: m for m in service.get_executor_pool_metrics()}
+
+        assert set(metrics) == {"inventory", "tagging", "cost_explorer"}
+        assert metrics["inventory"].completed == 1
+        assert metrics["tagging"].submitted == 0
+        assert metrics["cost_explorer"].max_workers == executors.COST_EXPLORER_WORKERS
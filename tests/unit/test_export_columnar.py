@@ -0,0 +1,202 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Unit tests for the Parquet/Arrow export of violations and inventory."""
+
+import json
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from mcp_server.clients.aws_client import AWSClient
+from mcp_server.models.compliance import ComplianceResult
+from mcp_server.models.enums import Severity, ViolationType
+from mcp_server.models.inventory import ResourceInventory
+from mcp_server.models.violations import Violation
+from mcp_server.services.compliance_service import ComplianceService
+from mcp_server.services.report_service import ReportService
+from mcp_server.stdio_server import _build_data_quality
+from mcp_server.tools.export_columnar import export_columnar
+from mcp_server.utils.columnar_export import (
+    INVENTORY_METADATA_KEY,
+    SUMMARY_METADATA_KEY,
+    file_checksum,
+    load_compliance_result,
+    read_violations,
+    write_inventory,
+)
+
+
+@pytest.fixture
+def violations():
+    return [
+        Violation(
+            resource_id=f"i-{n}",
+            resource_type="ec2:instance",
+            region="us-east-1" if n % 2 else "eu-west-1",
+            violation_type=ViolationType.INVALID_VALUE if n % 3 else ViolationType.MISSING_REQUIRED_TAG,
+            tag_name="Environment",
+            severity=Severity.ERROR,
+            current_value="prod" if n % 3 else None,
+            allowed_values=["production", "staging"] if n % 3 else None,
+            cost_impact_monthly=float(n),
+        )
+        for n in range(7)
+    ]
+
+
+@pytest.fixture
+def compliance_service(violations):
+    service = MagicMock(spec=ComplianceService)
+    service.check_compliance = AsyncMock(
+        return_value=ComplianceResult(
+            compliance_score=0.3,
+            total_resources=10,
+            compliant_resources=3,
+            violations=violations,
+            cost_attribution_gap=21.0,
+            scan_timestamp=datetime(2026, 1, 5, tzinfo=UTC),
+        )
+    )
+    service.fetch_inventory = AsyncMock(
+        return_value=ResourceInventory(
+            resources_by_region={
+                "us-east-1": [
+                    {
+                        "arn": "arn:aws:ec2:us-east-1:123456789012:instance/i-1",
+                        "resource_id": "i-1",
+                        "resource_type": "ec2:instance",
+                        "region": "us-east-1",
+                        "tags": {"Owner": "team-a", "Environment": "prod"},
+                        "instance_state": "running",
+                    },
+                    {
+                        "arn": "arn:aws:s3:::logs",
+                        "resource_id": "logs",
+                        "resource_type": "s3:bucket",
+                        "region": "global",
+                        "tags": {},
+                    },
+                ]
+            }
+        )
+    )
+    aws_client = MagicMock(spec=AWSClient)
+    aws_client.get_cost_by_service_and_region = AsyncMock(
+        return_value={("Amazon Elastic Compute Cloud - Compute", "us-east-1"): 42.5}
+    )
+    aws_client.get_service_name_for_resource_type.side_effect = (
+        AWSClient.get_service_name_for_resource_type.__get__(aws_client)
+    )
+    service.aws_client = aws_client
+    return service
+
+
+class TestViolationsExport:
+    """Tests for violations exports."""
+
+    @pytest.mark.asyncio
+    async def test_parquet_is_dictionary_encoded_in_row_groups(
+        self, compliance_service, violations, tmp_path
+    ):
+        """Test low-cardinality columns are dictionaries and rows are split into row groups."""
+        path = tmp_path / "violations.parquet"
+
+        result = await export_columnar(
+            compliance_service, str(path), row_group_size=3
+        )
+
+        parquet_file = pq.ParquetFile(path)
+        schema = parquet_file.schema_arrow
+        assert result.row_count == 7
+        assert result.row_group_count == parquet_file.metadata.num_row_groups == 3
+        assert pa.types.is_dictionary(schema.field("region").type)
+        assert pa.types.is_list(schema.field("allowed_values").type)
+        assert (result.checksum_sha256, result.file_size_bytes) == file_checksum(str(path))
+        assert list(read_violations(str(path))) == violations
+        summary = json.loads(schema.metadata[SUMMARY_METADATA_KEY])
+        assert (summary["failed_regions"], summary["failed_resource_types"]) == ([], [])
+
+    @pytest.mark.asyncio
+    async def test_arrow_export_round_trips(self, compliance_service, violations, tmp_path):
+        """Test the Arrow stream format reads back to the same violations."""
+        path = tmp_path / "violations.arrow"
+
+        await export_columnar(compliance_service, str(path), format="arrow", row_group_size=2)
+
+        assert list(read_violations(str(path))) == violations
+
+    @pytest.mark.asyncio
+    async def test_report_service_reads_export(self, compliance_service, tmp_path):
+        """Test ReportService reports on an export with the scan's totals."""
+        path = tmp_path / "violations.parquet"
+        await export_columnar(compliance_service, str(path))
+
+        report = ReportService().generate_report_from_export(str(path))
+        original = ReportService().generate_report(
+            await compliance_service.check_compliance(resource_types=["all"])
+        )
+
+        assert report.total_resources == 10
+        assert report.cost_attribution_gap == 21.0
+        assert report.top_violations_by_count == original.top_violations_by_count
+        assert report.recommendations == original.recommendations
+
+    def test_load_rejects_inventory_file(self, tmp_path):
+        """Test an inventory export can't be mistaken for a violations export."""
+        path = tmp_path / "inventory.parquet"
+        write_inventory([], str(path))
+
+        with pytest.raises(ValueError, match="no stored scan summary"):
+            load_compliance_result(str(path))
+
+
+class TestInventoryExport:
+    """Tests for resource inventory exports."""
+
+    @pytest.mark.asyncio
+    async def test_inventory_columns(self, compliance_service, tmp_path):
+        """Test tags become a map column, the account comes from the ARN and costs from CE."""
+        path = tmp_path / "inventory.parquet"
+
+        result = await export_columnar(compliance_service, str(path), dataset="inventory")
+
+        rows = pq.read_table(path).to_pylist()
+        assert result.row_count == 2
+        assert rows[0]["account_id"] == "123456789012"
+        assert dict(rows[0]["tags"]) == {"Owner": "team-a", "Environment": "prod"}
+        assert rows[0]["state"] == "running"
+        assert rows[0]["cost_impact_monthly"] == 42.5
+        assert rows[1]["tags"] == []
+        assert rows[1]["cost_impact_monthly"] == 0.0
+        compliance_service.check_compliance.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_partial_listing_is_reported(self, compliance_service, tmp_path):
+        """Test types that failed to list are named in the result and the file metadata."""
+        inventory = compliance_service.fetch_inventory.return_value
+        inventory.failed_resource_types = {"us-east-1": ["rds:db"]}
+        path = tmp_path / "inventory.parquet"
+
+        result = await export_columnar(compliance_service, str(path), dataset="inventory")
+
+        metadata = pq.read_schema(path).metadata
+        assert result.row_count == 2
+        assert (result.failed_regions, result.failed_resource_types) == ([], ["rds:db"])
+        assert json.loads(metadata[INVENTORY_METADATA_KEY]) == {
+            "failed_regions": [],
+            "failed_resource_types": ["rds:db"],
+        }
+        quality = _build_data_quality(result)
+        assert quality["status"] == "partial"
+        assert quality["failed_resource_types"] == ["rds:db"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_dataset_rejected(self, compliance_service, tmp_path):
+        """Test unknown datasets raise ValueError before any scan."""
+        with pytest.raises(ValueError, match="Invalid dataset"):
+            await export_columnar(compliance_service, str(tmp_path / "x"), dataset="costs")
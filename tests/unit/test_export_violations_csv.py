@@ -1,6 +1,8 @@
 """Unit tests for export_violations_csv tool."""
 
 import csv
+import gzip
+import hashlib
 import io
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock, PropertyMock
@@ -621,3 +623,56 @@ class TestResultConsistency:
         )
         after = datetime.now(timezone.utc)
         assert before <= result.export_timestamp <= after
+
+
+# =============================================================================
+# Streaming File Export Tests
+# =============================================================================
+
+
+class TestFileExport:
+    """Test streaming the CSV to a file instead of returning it inline."""
+
+    @pytest.mark.asyncio
+    async def test_plain_file_export(self, mock_compliance_service, tmp_path):
+        """Test rows are written to the file and only metadata is returned."""
+        path = tmp_path / "nested" / "violations.csv"
+        result = await export_violations_csv(
+            compliance_service=mock_compliance_service,
+            output_path=str(path),
+        )
+
+        content = path.read_bytes()
+        assert result.csv_data == ""
+        assert result.output_path == str(path)
+        assert result.row_count == 3
+        assert result.file_size_bytes == len(content)
+        assert result.checksum_sha256 == hashlib.sha256(content).hexdigest()
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        assert [r["tag_name"] for r in rows] == ["Environment", "CostCenter", "Owner"]
+        assert not (tmp_path / "nested" / "violations.csv.partial").exists()
+
+    @pytest.mark.asyncio
+    async def test_gzip_file_export_matches_inline_csv(self, mock_compliance_service, tmp_path):
+        """Test the compressed file decompresses to the same CSV as inline export."""
+        path = tmp_path / "violations.csv.gz"
+        result = await export_violations_csv(
+            compliance_service=mock_compliance_service,
+            output_path=str(path),
+            compress=True,
+        )
+        inline = await export_violations_csv(compliance_service=mock_compliance_service)
+
+        content = path.read_bytes()
+        assert result.compressed is True
+        assert result.checksum_sha256 == hashlib.sha256(content).hexdigest()
+        assert gzip.decompress(content).decode() == inline.csv_data
+
+    @pytest.mark.asyncio
+    async def test_compress_requires_output_path(self, mock_compliance_service):
+        """Test compress without a file is rejected."""
+        with pytest.raises(ValueError, match="compress requires output_path"):
+            await export_violations_csv(
+                compliance_service=mock_compliance_service,
+                compress=True,
+            )
@@ -0,0 +1,158 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Unit tests for get_compliance_trend tool."""
+
+import json
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server import stdio_server
+from mcp_server.models.compliance import ComplianceResult
+from mcp_server.models.enums import Severity, ViolationType
+from mcp_server.models.history import GroupBy, HistoryDimension, TrendDirection
+from mcp_server.models.violations import Violation
+from mcp_server.services.history_service import HistoryService
+from mcp_server.tools.get_compliance_trend import get_compliance_trend
+
+NOW = datetime.now(UTC)
+
+
+def violation(resource_id: str, region: str) -> Violation:
+    return Violation(
+        resource_id=resource_id,
+        resource_type="ec2:instance",
+        region=region,
+        violation_type=ViolationType.MISSING_REQUIRED_TAG,
+        tag_name="Owner",
+        severity=Severity.ERROR,
+        cost_impact_monthly=10.0,
+    )
+
+
+def scan(timestamp: datetime, violations: list[Violation], total: int = 10) -> ComplianceResult:
+    non_compliant = len({v.resource_id for v in violations})
+    return ComplianceResult(
+        compliance_score=(total - non_compliant) / total,
+        total_resources=total,
+        compliant_resources=total - non_compliant,
+        violations=violations,
+        cost_attribution_gap=sum(v.cost_impact_monthly for v in violations),
+        scan_timestamp=timestamp,
+    )
+
+
+@pytest.fixture
+async def history_service(tmp_path):
+    """HistoryService with three years of snapshots, improving over time."""
+    service = HistoryService(str(tmp_path / "history.db"))
+    for days_ago, failing in ((3 * 365, 4), (2 * 365, 3), (365, 2), (1, 1)):
+        await service.store_scan_result(
+            scan(
+                NOW - timedelta(days=days_ago),
+                [violation(f"i-{n}", "us-east-1") for n in range(failing)]
+                + [violation("i-eu", "eu-west-1")],
+            )
+        )
+    yield service
+    service.close()
+
+
+class TestGetComplianceTrend:
+    """Tests for the get_compliance_trend tool function."""
+
+    @pytest.mark.asyncio
+    async def test_reaches_back_beyond_ninety_days(self, history_service):
+        """Test monthly points cover the full retained history."""
+        result = await get_compliance_trend(history_service)
+
+        assert result.dimension == HistoryDimension.ALL
+        assert result.group_by == GroupBy.MONTH
+        (series,) = result.series
+        assert len(series.points) == 4
+        assert series.points[0].period.year == (NOW - timedelta(days=3 * 365)).year
+        assert series.trend_direction == TrendDirection.IMPROVING
+
+    @pytest.mark.asyncio
+    async def test_region_key_selects_one_series(self, history_service):
+        """Test a dimension and key narrow the result to one region."""
+        result = await get_compliance_trend(
+            history_service, dimension="REGION", key="us-east-1"
+        )
+
+        (series,) = result.series
+        assert series.key == "us-east-1"
+        assert [p.non_compliant_resources for p in series.points] == [4.0, 3.0, 2.0, 1.0]
+
+    @pytest.mark.asyncio
+    async def test_since_and_until_bound_the_window(self, history_service):
+        """Test ISO dates (naive or not) limit the points returned."""
+        since = (NOW - timedelta(days=800)).date().isoformat()
+        until = (NOW - timedelta(days=300)).isoformat()
+
+        result = await get_compliance_trend(history_service, since=since, until=until)
+
+        (series,) = result.series
+        assert len(series.points) == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "kwargs, message",
+        [
+            ({"dimension": "account"}, "Invalid dimension"),
+            ({"group_by": "year"}, "Invalid group_by"),
+            ({"since": "last year"}, "Invalid since"),
+            ({"since": "2025-06-01", "until": "2025-01-01"}, "later than until"),
+        ],
+    )
+    async def test_invalid_arguments(self, history_service, kwargs, message):
+        """Test bad arguments raise ValueError before querying."""
+        with pytest.raises(ValueError, match=message):
+            await get_compliance_trend(history_service, **kwargs)
+
+
+class TestStdioTool:
+    """Tests for the get_compliance_trend MCP tool."""
+
+    @pytest.fixture
+    def container(self, history_service, monkeypatch):
+        container = SimpleNamespace(
+            initialized=True,
+            compliance_service=object(),
+            history_service=history_service,
+            audit_service=None,
+            settings=SimpleNamespace(
+                timings_enabled=False, timings_in_response=False, aws_calls_in_response=False
+            ),
+        )
+        monkeypatch.setattr(stdio_server, "_container", container)
+        return container
+
+    @pytest.mark.asyncio
+    async def test_returns_trend_json(self, container):
+        """Test the tool serializes every series of the requested dimension."""
+        response = json.loads(
+            await stdio_server.get_compliance_trend(dimension="region", group_by="month")
+        )
+
+        assert response["dimension"] == "region"
+        assert sorted(s["key"] for s in response["series"]) == ["eu-west-1", "us-east-1"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments_return_error(self, container):
+        """Test a bad argument is reported as an invalid request."""
+        response = json.loads(await stdio_server.get_compliance_trend(group_by="year"))
+
+        assert response["error"] == "invalid_request"
+
+    @pytest.mark.asyncio
+    async def test_history_unavailable(self, container):
+        """Test a missing history store is reported rather than raised."""
+        container.history_service = None
+
+        response = json.loads(await stdio_server.get_compliance_trend())
+
+        assert response["error"] == "history_unavailable"
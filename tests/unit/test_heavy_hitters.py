@@ -0,0 +1,157 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Tests for the streaming count-min sketch and heavy-hitter trackers."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from mcp_server.models.compliance import ComplianceResult
+from mcp_server.models.enums import Severity, ViolationType
+from mcp_server.models.rollup import ComplianceRollup
+from mcp_server.models.violations import Violation
+from mcp_server.services.report_service import ReportService
+from mcp_server.utils.heavy_hitters import CountMinSketch, DistinctCounter, HeavyHitters
+
+
+class TestCountMinSketch:
+    """Tests for CountMinSketch estimates."""
+
+    def test_estimates_never_undercount(self):
+        """Test every estimate is at least the true count."""
+        rng = random.Random(7)
+        keys = [f"r-{rng.randint(0, 5000)}" for _ in range(20000)]
+        sketch = CountMinSketch(width=256, depth=4)
+        for key in keys:
+            sketch.add(key)
+
+        for key, count in Counter(keys).items():
+            assert sketch.estimate(key) >= count
+        assert sketch.total == 20000
+
+    def test_negative_amount_rejected(self):
+        """Test amounts must be non-negative."""
+        with pytest.raises(ValueError):
+            CountMinSketch().add("k", -1.0)
+
+
+class TestHeavyHitters:
+    """Tests for bounded-memory top-K tracking."""
+
+    def test_finds_heavy_keys_in_long_tail(self):
+        """Test the true top keys surface from many distinct keys."""
+        rng = random.Random(11)
+        stream = [f"heavy-{n}" for n in range(5) for _ in range(500 - 50 * n)]
+        stream += [f"tail-{n}" for n in range(20000)]
+        rng.shuffle(stream)
+
+        tracker = HeavyHitters(capacity=20, width=2048)
+        for key in stream:
+            tracker.add(key)
+
+        assert [key for key, _ in tracker.top(5)] == [f"heavy-{n}" for n in range(5)]
+        assert len(tracker._candidates) <= 20
+        assert len(tracker._heap) <= 80
+
+    def test_weighted_amounts(self):
+        """Test keys are ranked by summed amount, not occurrences."""
+        tracker = HeavyHitters(capacity=2)
+        for key, amount in [("a", 1.0), ("a", 1.0), ("b", 10.0), ("c", 0.5), ("d", 0.0)]:
+            tracker.add(key, amount)
+
+        assert tracker.top() == [("b", 10.0), ("a", 2.0)]
+
+
+class TestDistinctCounter:
+    """Tests for unique key counts."""
+
+    def test_exact_below_limit(self):
+        """Test small counts are exact and repeats are ignored."""
+        counter = DistinctCounter(exact_limit=10)
+        for key in ["a", "b", "a", "c", "b"]:
+            counter.add(key)
+
+        assert counter.exact
+        assert counter.count() == 3
+
+    def test_estimate_beyond_limit(self):
+        """Test large counts switch to the sketch and stay within a few percent."""
+        counter = DistinctCounter()
+        for n in range(50_000):
+            counter.add(f"i-{n % 20_000:08x}")
+
+        assert not counter.exact
+        assert counter.count() == pytest.approx(20_000, rel=0.05)
+
+    def test_merge_counts_shared_keys_once(self):
+        """Test merged counters count their union, exact or sketched."""
+        small_a, small_b = DistinctCounter(), DistinctCounter()
+        for key in ["a", "b", "c"]:
+            small_a.add(key)
+        for key in ["b", "c", "d"]:
+            small_b.add(key)
+        small_a.merge(small_b)
+        assert small_a.count() == 4
+
+        large_a, large_b = DistinctCounter(), DistinctCounter()
+        for n in range(6_000):
+            large_a.add(f"r-{n}")
+            large_b.add(f"r-{n + 3_000}")
+        large_a.merge(large_b)
+        assert large_a.count() == pytest.approx(9_000, rel=0.05)
+
+
+class TestRollupRankings:
+    """Tests for rankings read from the rollup instead of the violation list."""
+
+    @staticmethod
+    def _violations():
+        return [
+            Violation(
+                resource_id=f"i-{n % 4}",
+                resource_type="ec2:instance" if n % 3 else "rds:db",
+                region="us-east-1",
+                violation_type=ViolationType.INVALID_VALUE,
+                tag_name="Environment",
+                severity=Severity.ERROR,
+                current_value="prod" if n % 2 else "dev",
+                allowed_values=["production"],
+                cost_impact_monthly=float(n % 4),
+            )
+            for n in range(12)
+        ]
+
+    def test_top_resources_and_values(self):
+        """Test heavy hitters match exact counts on small scans."""
+        rollup = ComplianceRollup.from_violations(self._violations())
+
+        assert rollup.top_resources(1, by="cost") == [("i-3", 9.0)]
+        assert dict(rollup.top_invalid_values()) == {
+            "Environment=prod": 6.0,
+            "Environment=dev": 6.0,
+        }
+        assert [c.resource_type for c in rollup.top("resource_type", k=1)] == ["ec2:instance"]
+
+    def test_report_without_materialized_violations(self):
+        """Test a report built only from a streamed rollup matches the full one."""
+        violations = self._violations()
+        full = ComplianceResult(
+            compliance_score=0.5,
+            total_resources=8,
+            compliant_resources=4,
+            violations=violations,
+        )
+        streamed = full.model_copy(
+            update={"violations": [], "rollup": ComplianceRollup.from_violations(violations)}
+        )
+
+        service = ReportService()
+        expected = service.generate_report(full)
+        report = service.generate_report(streamed)
+
+        assert report.total_violations == expected.total_violations == 12
+        assert report.top_violations_by_count == expected.top_violations_by_count
+        assert report.recommendations == expected.recommendations
@@ -0,0 +1,183 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Tests for the downsampled compliance time series in HistoryService."""
+
+import sqlite3
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from mcp_server.models.compliance import ComplianceResult
+from mcp_server.models.enums import Severity, ViolationType
+from mcp_server.models.history import GroupBy, HistoryDimension, TrendDirection
+from mcp_server.models.violations import Violation
+from mcp_server.services.history_rollups import HistoryRetention
+from mcp_server.services.history_service import HistoryService
+
+NOW = datetime.now(UTC)
+
+
+def violation(resource_id: str, region: str, tag_name: str = "Owner") -> Violation:
+    return Violation(
+        resource_id=resource_id,
+        resource_type="ec2:instance",
+        region=region,
+        violation_type=ViolationType.MISSING_REQUIRED_TAG,
+        tag_name=tag_name,
+        severity=Severity.ERROR,
+        cost_impact_monthly=10.0,
+    )
+
+
+def scan(timestamp: datetime, violations: list[Violation], total: int = 10) -> ComplianceResult:
+    non_compliant = len({v.resource_id for v in violations})
+    return ComplianceResult(
+        compliance_score=(total - non_compliant) / total,
+        total_resources=total,
+        compliant_resources=total - non_compliant,
+        violations=violations,
+        cost_attribution_gap=sum(v.cost_impact_monthly for v in violations),
+        scan_timestamp=timestamp,
+    )
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = HistoryService(str(tmp_path / "history.db"))
+    yield service
+    service.close()
+
+
+class TestDimensionSeries:
+    """Tests for per-region, per-type and per-tag series."""
+
+    @pytest.mark.asyncio
+    async def test_region_series_averages_over_period_snapshots(self, service):
+        """Test a region's values are averaged over every snapshot of the period."""
+        await service.store_scan_result(
+            scan(NOW, [violation("i-1", "us-east-1"), violation("i-2", "us-east-1")])
+        )
+        await service.store_scan_result(scan(NOW, [violation("i-3", "eu-west-1")]))
+
+        trend = await service.get_trend(HistoryDimension.REGION, group_by=GroupBy.DAY)
+
+        by_key = {s.key: s.points for s in trend.series}
+        assert sorted(by_key) == ["eu-west-1", "us-east-1"]
+        (point,) = by_key["us-east-1"]
+        assert point.scans == 2
+        assert point.non_compliant_resources == 1.0
+        assert point.cost_gap == 10.0
+        assert point.compliance_score is None
+
+    @pytest.mark.asyncio
+    async def test_tag_series_trend_direction(self, service):
+        """Test fewer non-compliant resources over time reads as improving."""
+        await service.store_scan_result(
+            scan(
+                NOW - timedelta(days=40),
+                [violation(f"i-{n}", "us-east-1", "CostCenter") for n in range(4)],
+            )
+        )
+        await service.store_scan_result(scan(NOW, [violation("i-1", "us-east-1", "CostCenter")]))
+
+        trend = await service.get_trend(HistoryDimension.TAG, key="CostCenter")
+
+        (series,) = trend.series
+        assert [p.non_compliant_resources for p in series.points] == [4.0, 1.0]
+        assert series.trend_direction == TrendDirection.IMPROVING
+
+    @pytest.mark.asyncio
+    async def test_fully_compliant_region_reads_as_zero(self, service):
+        """Test a region without violations in a later period gets a zero point."""
+        await service.store_scan_result(
+            scan(
+                NOW - timedelta(days=40),
+                [violation(f"i-{n}", "us-east-1") for n in range(10)],
+                total=20,
+            )
+        )
+        await service.store_scan_result(scan(NOW, [], total=20))
+
+        trend = await service.get_trend(HistoryDimension.REGION, key="us-east-1")
+
+        (series,) = trend.series
+        assert [p.non_compliant_resources for p in series.points] == [10.0, 0.0]
+        assert series.trend_direction == TrendDirection.IMPROVING
+
+
+class TestDownsamplingAndRetention:
+    """Tests for long-range queries over retained rollups."""
+
+    @pytest.mark.asyncio
+    async def test_old_snapshots_survive_as_monthly_rollups(self, tmp_path):
+        """Test raw points and daily rollups expire while monthly ones remain."""
+        path = str(tmp_path / "history.db")
+        service = HistoryService(path, retention=HistoryRetention(raw_days=7, daily_days=90))
+        try:
+            for days_ago in (3 * 365, 2 * 365, 200, 1):
+                await service.store_scan_result(
+                    scan(NOW - timedelta(days=days_ago), [violation("i-1", "us-east-1")])
+                )
+            monthly = await service.get_trend(group_by=GroupBy.MONTH)
+            daily = await service.get_trend(group_by=GroupBy.DAY)
+            recent = await service.get_history(days_back=30, group_by=GroupBy.DAY)
+        finally:
+            service.close()
+
+        (series,) = monthly.series
+        assert len(series.points) == 4
+        assert series.points[0].period.year == (NOW - timedelta(days=3 * 365)).year
+        assert all(p.compliance_score == 0.9 for p in series.points)
+        assert len(daily.series[0].points) == 1
+        assert len(recent.history) == 1
+
+        conn = sqlite3.connect(path)
+        assert conn.execute("SELECT COUNT(*) FROM compliance_scans").fetchone()[0] == 1
+        assert conn.execute(
+            "SELECT COUNT(DISTINCT scan_id) FROM compliance_points"
+        ).fetchone()[0] == 1
+        conn.close()
+
+    def test_retention_must_cover_history_window(self):
+        """Test rollups backing get_history can't expire inside its window."""
+        with pytest.raises(ValueError, match="daily_days"):
+            HistoryRetention(daily_days=30)
+
+    @pytest.mark.asyncio
+    async def test_existing_scans_are_rolled_up_on_open(self, tmp_path):
+        """Test a database from before the series tables keeps its history."""
+        path = str(tmp_path / "history.db")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            """
+            CREATE TABLE compliance_scans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                compliance_score REAL NOT NULL,
+                total_resources INTEGER NOT NULL,
+                compliant_resources INTEGER NOT NULL,
+                violation_count INTEGER NOT NULL,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        for score in (0.5, 0.7):
+            conn.execute(
+                "INSERT INTO compliance_scans (timestamp, compliance_score, total_resources, "
+                "compliant_resources, violation_count) VALUES (?, ?, 10, ?, 3)",
+                (datetime.utcnow().isoformat(), score, int(score * 10)),
+            )
+        conn.commit()
+        conn.close()
+
+        service = HistoryService(path)
+        try:
+            history = await service.get_history(days_back=1, group_by=GroupBy.DAY)
+        finally:
+            service.close()
+
+        (entry,) = history.history
+        assert entry.compliance_score == pytest.approx(0.6)
+        assert (entry.total_resources, entry.compliant_resources) == (20, 12)
@@ -0,0 +1,326 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Tests for event-driven incremental rescans."""
+
+import asyncio
+import json
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mcp_server.clients.aws_client import AWSClient
+from mcp_server.services.compliance_service import ComplianceService
+from mcp_server.services.incremental_scan_service import IncrementalScanService
+from mcp_server.services.policy_service import PolicyService
+from mcp_server.services.tag_event_source import (
+    DirectoryEventSource,
+    LocalQueue,
+    QueueEventSource,
+)
+from mcp_server.services.tag_state_service import TagStateService
+from mcp_server.services.validation_cache import ValidationCache
+from mcp_server.utils.cloudtrail_events import parse_payload, parse_record
+
+ACCOUNT = "123456789012"
+
+
+def record(event_name: str, request: dict, response: dict | None = None, **extra) -> dict:
+    return {
+        "eventID": f"evt-{event_name}",
+        "eventName": event_name,
+        "eventTime": "2026-03-01T12:00:00Z",
+        "awsRegion": "us-east-1",
+        "recipientAccountId": ACCOUNT,
+        "requestParameters": request,
+        "responseElements": response,
+        **extra,
+    }
+
+
+def create_tags(instance_id: str, **tags: str) -> dict:
+    return record(
+        "CreateTags",
+        {
+            "resourcesSet": {"items": [{"resourceId": instance_id}]},
+            "tagSet": {"items": [{"key": k, "value": v} for k, v in tags.items()]},
+        },
+    )
+
+
+def instance(n: int, **tags: str) -> dict:
+    return {
+        "arn": f"arn:aws:ec2:us-east-1:{ACCOUNT}:instance/i-{n:04d}",
+        "resource_id": f"i-{n:04d}",
+        "resource_type": "ec2:instance",
+        "region": "us-east-1",
+        "tags": tags,
+    }
+
+
+class TestCloudTrailParsing:
+    """Tests for turning CloudTrail records into tag change events."""
+
+    def test_ec2_create_tags_builds_arn(self):
+        """Test EC2 resource IDs become ARNs with the record's region and account."""
+        (event,) = parse_record(create_tags("i-0001", Owner="a"))
+
+        assert event.resource_arn == f"arn:aws:ec2:us-east-1:{ACCOUNT}:instance/i-0001"
+        assert (event.resource_type, event.action, event.tags) == (
+            "ec2:instance",
+            "tag",
+            {"Owner": "a"},
+        )
+
+    def test_lifecycle_and_generic_tagging_calls(self):
+        """Test RunInstances, TagResource and PutBucketTagging records."""
+        run = record(
+            "RunInstances",
+            {},
+            {"instancesSet": {"items": [{"instanceId": "i-0002", "tagSet": {"items": []}}]}},
+        )
+        tag = record(
+            "TagResource",
+            {"resourceArn": f"arn:aws:rds:us-east-1:{ACCOUNT}:db:orders", "tags": {"Owner": "b"}},
+        )
+        bucket = record(
+            "PutBucketTagging",
+            {
+                "bucketName": "logs",
+                "Tagging": {"TagSet": {"Tag": [{"Key": "Owner", "Value": "c"}]}},
+            },
+        )
+
+        events = parse_payload(json.dumps({"Records": [run, tag, bucket]}))
+
+        assert [(e.action, e.resource_type, e.region) for e in events] == [
+            ("create", "ec2:instance", "us-east-1"),
+            ("tag", "rds:db", "us-east-1"),
+            ("replace", "s3:bucket", "global"),
+        ]
+        assert events[2].tags == {"Owner": "c"}
+
+    def test_failed_calls_and_other_apis_are_skipped(self):
+        """Test records with an errorCode or untracked eventName yield nothing."""
+        failed = create_tags("i-0001", Owner="a")
+        failed["errorCode"] = "Client.UnauthorizedOperation"
+        lines = "\n".join(
+            json.dumps(r) for r in (failed, record("DescribeInstances", {}))
+        )
+
+        assert parse_payload(lines) == []
+
+
+class TestEventSources:
+    """Tests for the directory and queue event sources."""
+
+    def test_directory_source_moves_acked_files(self, tmp_path):
+        """Test files are read in name order and moved to processed/ on ack."""
+        for name in ("b.json", "a.json"):
+            (tmp_path / name).write_text(json.dumps({"Records": [create_tags("i-0001")]}))
+        source = DirectoryEventSource(tmp_path)
+
+        messages = source.receive(10)
+        source.ack(messages[:1])
+
+        assert [m.receipt.rsplit("/", 1)[1] for m in messages] == ["a.json", "b.json"]
+        assert (tmp_path / "processed" / "a.json").exists()
+        assert [m.receipt for m in source.receive(10)] == [messages[1].receipt]
+
+    def test_queue_source_deletes_acked_messages(self):
+        """Test unacknowledged messages come back after the visibility timeout."""
+        queue = LocalQueue(visibility_timeout=0)
+        for n in range(12):
+            queue.send_message(QueueUrl="q", MessageBody=json.dumps(create_tags(f"i-{n:04d}")))
+        source = QueueEventSource(queue, "q")
+
+        messages = source.receive(12)
+        source.ack(messages[:10])
+
+        assert len(messages) == 12
+        assert len(queue) == 2
+
+
+class TestApplyEvents:
+    """Tests for patching cached state and validation shards from events."""
+
+    @pytest.fixture
+    def policy_service(self, tmp_path):
+        path = tmp_path / "policy.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "version": "1.0",
+                    "required_tags": [
+                        {
+                            "name": "Owner",
+                            "description": "Owner",
+                            "allowed_values": ["a", "b"],
+                            "applies_to": ["ec2:instance"],
+                        }
+                    ],
+                }
+            )
+        )
+        service = PolicyService(policy_path=path)
+        service.load_policy()
+        return service
+
+    @pytest.fixture
+    async def scanned(self, policy_service):
+        """A compliance service whose full scan left state and shards behind."""
+        store = TagStateService(db_path=":memory:")
+        cache = ValidationCache()
+        aws_client = MagicMock(spec=AWSClient)
+        aws_client.region = "us-east-1"
+        service = ComplianceService(
+            cache=None,
+            aws_client=aws_client,
+            policy_service=policy_service,
+            tag_state_service=store,
+            validation_cache=cache,
+            incremental_max_age=timedelta(hours=24),
+        )
+        inventory = [{**instance(n, Owner="a"), "cost_impact": 25.0} for n in range(200)]
+        service._fetch_resources_by_type = AsyncMock(return_value=inventory)
+        result = await service.check_compliance(["ec2:instance"])
+        assert (result.total_resources, result.compliant_resources) == (200, 200)
+
+        incremental = IncrementalScanService(store, policy_service, cache, service)
+        yield service, incremental, inventory
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_events_patch_state_and_shards(self, scanned):
+        """Test patched shards match a full validation of the changed inventory."""
+        service, incremental, inventory = scanned
+        payload = json.dumps(
+            {
+                "Records": [
+                    create_tags("i-0003", Owner="nobody"),
+                    record(
+                        "DeleteTags",
+                        {
+                            "resourcesSet": {"items": [{"resourceId": "i-0004"}]},
+                            "tagSet": {"items": [{"key": "Owner"}]},
+                        },
+                    ),
+                    record(
+                        "TerminateInstances",
+                        {"instancesSet": {"items": [{"instanceId": "i-0005"}]}},
+                    ),
+                ]
+            }
+        )
+
+        result = await incremental.apply_events(parse_payload(payload))
+
+        assert (result.resources_updated, result.resources_deleted) == (2, 1)
+        (shard,) = result.affected_shards
+        assert (shard.total_resources, shard.compliant_resources) == (199, 197)
+        state = await incremental.tag_state_service.current_state(
+            [inventory[3]["arn"], inventory[5]["arn"]]
+        )
+        assert state[inventory[3]["arn"]][0] == {"Owner": "nobody"}
+        assert inventory[5]["arn"] not in state
+
+        # A full scan of the same inventory validates to the same shards
+        inventory[3] = instance(3, Owner="nobody")
+        inventory[4] = instance(4)
+        del inventory[5]
+        fresh = ComplianceService(
+            cache=None,
+            aws_client=service.aws_client,
+            policy_service=service.policy_service,
+            validation_cache=ValidationCache(),
+        )
+        violations, compliant = fresh._validate_incrementally(inventory)
+        assert compliant == shard.compliant_resources
+        assert len(violations) == shard.violation_count
+        assert fresh.validation_cache._tree.nodes == service.validation_cache._tree.nodes
+
+    @pytest.mark.asyncio
+    async def test_check_compliance_served_from_shards(self, scanned):
+        """Test a later request is answered from patched shards without listing."""
+        service, incremental, _ = scanned
+        await incremental.apply_events(
+            parse_payload(json.dumps(create_tags("i-0007", Owner="nobody")))
+        )
+        service._fetch_resources_by_type.reset_mock()
+
+        result = await service.check_compliance(["ec2:instance"])
+
+        service._fetch_resources_by_type.assert_not_called()
+        assert (result.total_resources, result.compliant_resources) == (200, 199)
+        assert [v.resource_id for v in result.violations] == ["i-0007"]
+        # The patched resource keeps the cost it was scanned with
+        assert result.cost_attribution_gap == 25.0
+
+    @pytest.mark.asyncio
+    async def test_unresolved_resources_force_a_rescan(self, scanned):
+        """Test tag events for unknown resources mark their type stale."""
+        service, incremental, _ = scanned
+
+        result = await incremental.apply_events(
+            parse_payload(json.dumps(create_tags("i-9999", Owner="a")))
+        )
+        service._fetch_resources_by_type.reset_mock()
+        await service.check_compliance(["ec2:instance"])
+
+        assert result.unresolved_resources == [
+            f"arn:aws:ec2:us-east-1:{ACCOUNT}:instance/i-9999"
+        ]
+        service._fetch_resources_by_type.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_listing_keeps_previous_shards(self, scanned):
+        """Test a rescan whose listing fails doesn't empty the type's shards."""
+        service, _, _ = scanned
+        service._fetch_resources_by_type = AsyncMock(side_effect=RuntimeError("throttled"))
+
+        await service.check_compliance(["ec2:instance"], force_refresh=True)
+        result = await service.check_compliance(["ec2:instance"])
+
+        assert (result.total_resources, result.compliant_resources) == (200, 200)
+
+    @pytest.mark.asyncio
+    async def test_consume_reads_each_directory_file_once(self, scanned, tmp_path):
+        """Test consume applies each dropped file once and acks it once."""
+        _, incremental, _ = scanned
+        events_dir = tmp_path / "events"
+        events_dir.mkdir()
+        (events_dir / "a.json").write_text(
+            json.dumps({"Records": [create_tags("i-0007", Owner="nobody")]})
+        )
+        (events_dir / "b.json").write_text(
+            json.dumps({"Records": [record("DescribeInstances", {})]})
+        )
+        source = DirectoryEventSource(events_dir)
+
+        result = await asyncio.wait_for(incremental.consume(source, max_events=5), 5)
+
+        assert (result.events_received, result.resources_updated) == (1, 1)
+        assert sorted(f.name for f in (events_dir / "processed").iterdir()) == [
+            "a.json",
+            "b.json",
+        ]
+        assert source.receive(10) == []
+
+    @pytest.mark.asyncio
+    async def test_incremental_age_without_validation_cache(self, policy_service):
+        """Test incremental_max_age alone falls back to a full scan."""
+        aws_client = MagicMock(spec=AWSClient)
+        aws_client.region = "us-east-1"
+        service = ComplianceService(
+            cache=None,
+            aws_client=aws_client,
+            policy_service=policy_service,
+            incremental_max_age=timedelta(hours=24),
+        )
+        service._fetch_resources_by_type = AsyncMock(return_value=[instance(1, Owner="a")])
+
+        result = await service.check_compliance(["ec2:instance"])
+
+        assert (result.total_resources, result.compliant_resources) == (1, 1)
@@ -0,0 +1,174 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Tests for MetricsService aggregation over audit rollups."""
+
+import sqlite3
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from mcp_server.models.audit import AuditStatus
+from mcp_server.services.audit_service import AuditService
+from mcp_server.services.metrics_service import MetricsService
+
+
+@pytest.fixture
+def audit_service(tmp_path):
+    service = AuditService(db_path=str(tmp_path / "audit.db"), batch_size=500)
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def metrics_service(audit_service):
+    return MetricsService(audit_service=audit_service)
+
+
+def log(service: AuditService, tool_name: str, failed: bool = False, **kwargs) -> None:
+    service.log_invocation(
+        tool_name=tool_name,
+        parameters={},
+        status=AuditStatus.FAILURE if failed else AuditStatus.SUCCESS,
+        error_message="Throttling: rate exceeded" if failed else None,
+        **kwargs,
+    )
+
+
+class TestToolUsageStats:
+    """Tests for per-tool statistics read from rollups."""
+
+    @pytest.mark.asyncio
+    async def test_counts_are_exact_past_a_thousand_calls(self, audit_service, metrics_service):
+        """Test every invocation is counted, not only the most recent 1000."""
+        for i in range(1500):
+            log(audit_service, "check_tag_compliance", failed=i % 10 == 0, execution_time_ms=20.0)
+        for _ in range(30):
+            log(audit_service, "find_untagged_resources", execution_time_ms=300.0)
+
+        stats = await metrics_service.get_tool_usage_stats()
+
+        assert [(s.tool_name, s.invocation_count) for s in stats] == [
+            ("check_tag_compliance", 1500),
+            ("find_untagged_resources", 30),
+        ]
+        assert (stats[0].success_count, stats[0].failure_count) == (1350, 150)
+        assert stats[0].error_rate == pytest.approx(0.1)
+        assert stats[0].total_execution_time_ms == pytest.approx(30000.0)
+        assert stats[0].last_error == "Throttling: rate exceeded"
+
+    @pytest.mark.asyncio
+    async def test_latency_histogram_and_percentile(self, audit_service, metrics_service):
+        """Test bucket counts, min/max and the p95 bucket bound."""
+        for latency in [5.0] * 90 + [400.0] * 9 + [45000.0]:
+            log(audit_service, "get_cost_attribution_gap", execution_time_ms=latency)
+        log(audit_service, "get_cost_attribution_gap")
+
+        (stats,) = await metrics_service.get_tool_usage_stats("get_cost_attribution_gap")
+
+        assert stats.invocation_count == 101
+        assert stats.latency_histogram["<=10ms"] == 90
+        assert stats.latency_histogram["<=500ms"] == 9
+        assert stats.latency_histogram[">30000ms"] == 1
+        assert (stats.min_execution_time_ms, stats.max_execution_time_ms) == (5.0, 45000.0)
+        assert stats.p95_execution_time_ms == 500.0
+        assert stats.average_execution_time_ms == pytest.approx((450 + 3600 + 45000) / 100)
+
+    @pytest.mark.asyncio
+    async def test_window_filters_by_minute(self, audit_service, metrics_service):
+        """Test since/until select only the minutes inside the window."""
+        for _ in range(5):
+            log(audit_service, "check_tag_compliance")
+        now = datetime.now(UTC)
+
+        assert await metrics_service.get_tool_usage_stats(since=now + timedelta(minutes=2)) == []
+        assert await metrics_service.get_tool_usage_stats(until=now - timedelta(minutes=2)) == []
+        (stats,) = await metrics_service.get_tool_usage_stats(since=now - timedelta(minutes=2))
+        assert stats.invocation_count == 5
+
+
+class TestErrorAndGlobalMetrics:
+    """Tests for error rates, sessions and global totals."""
+
+    @pytest.mark.asyncio
+    async def test_error_rate_metrics(self, audit_service, metrics_service):
+        """Test error totals, types and tools come from the rollups."""
+        for i in range(40):
+            log(audit_service, "check_tag_compliance", failed=i < 4)
+        log(audit_service, "suggest_tags", failed=True)
+
+        metrics = await metrics_service.get_error_rate_metrics()
+
+        assert (metrics.total_invocations, metrics.total_errors) == (41, 5)
+        assert metrics.errors_by_type == {"Throttling": 5}
+        assert metrics.errors_by_tool == {"check_tag_compliance": 4, "suggest_tags": 1}
+        assert len(metrics.recent_errors) == 5
+        assert metrics.error_trend == "stable"
+
+    @pytest.mark.asyncio
+    async def test_recent_errors_come_from_the_window(self, audit_service, metrics_service):
+        """Test a window ending in the past still lists its own failures."""
+        for _ in range(3):
+            log(audit_service, "suggest_tags", failed=True)
+        await audit_service.flush()
+        hour_ago = datetime.now(UTC) - timedelta(hours=1)
+        conn = sqlite3.connect(audit_service.db_path)
+        conn.execute("UPDATE audit_logs SET timestamp = ?", (hour_ago.isoformat(),))
+        conn.commit()
+        conn.close()
+        for _ in range(12):
+            log(audit_service, "check_tag_compliance", failed=True)
+
+        metrics = await metrics_service.get_error_rate_metrics(
+            until=hour_ago + timedelta(minutes=5)
+        )
+
+        assert [e["tool_name"] for e in metrics.recent_errors] == ["suggest_tags"] * 3
+
+    @pytest.mark.asyncio
+    async def test_global_and_session_metrics(self, audit_service, metrics_service):
+        """Test session counts and per-session totals are aggregated in SQL."""
+        for session in ("a", "b", "c"):
+            for _ in range(3):
+                log(audit_service, "check_tag_compliance", correlation_id=session,
+                    execution_time_ms=10.0)
+        log(audit_service, "suggest_tags", failed=True, correlation_id="a")
+
+        global_metrics = await metrics_service.get_global_metrics()
+        session = await metrics_service.get_session_metrics("a")
+
+        assert global_metrics.total_sessions == 3
+        assert global_metrics.total_tool_invocations == 10
+        assert global_metrics.total_tool_failures == 1
+        assert global_metrics.average_execution_time_ms == pytest.approx(10.0)
+        assert (session.tool_invocation_count, session.tool_failure_count) == (4, 1)
+        assert sorted(session.tools_used) == ["check_tag_compliance", "suggest_tags"]
+
+
+class TestRollupRebuild:
+    """Tests for logs written before rollups existed."""
+
+    @pytest.mark.asyncio
+    async def test_existing_log_is_rolled_up_on_open(self, tmp_path):
+        """Test rollup tables created on an existing log cover its entries."""
+        path = str(tmp_path / "audit.db")
+        service = AuditService(db_path=path)
+        for i in range(12):
+            log(service, "check_tag_compliance", failed=i < 2, execution_time_ms=75.0)
+        service.close()
+
+        conn = sqlite3.connect(path)
+        for table in ("audit_rollups", "audit_error_rollups", "audit_sessions"):
+            conn.execute(f"DROP TABLE {table}")
+        conn.commit()
+        conn.close()
+
+        service = AuditService(db_path=path)
+        try:
+            (stats,) = await MetricsService(audit_service=service).get_tool_usage_stats()
+        finally:
+            service.close()
+
+        assert (stats.invocation_count, stats.failure_count) == (12, 2)
+        assert stats.latency_histogram["<=100ms"] == 12
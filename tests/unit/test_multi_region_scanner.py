@@ -22,6 +22,7 @@ import pytest
 from mcp_server.clients.regional_client_factory import RegionalClientFactory
 from mcp_server.models.compliance import ComplianceResult
 from mcp_server.models.enums import Severity
+from mcp_server.models.inventory import ResourceInventory
 from mcp_server.models.multi_region import (
     GLOBAL_RESOURCE_TYPES,
     MultiRegionComplianceResult,
@@ -1260,3 +1261,89 @@ class TestAllowedRegions:
         assert "us-east-1" in error.failed_regions
         assert error.partial_results is not None
         assert error.partial_results.region_metadata.total_regions == 1
+
+
+class TestScanProgress:
+    """Tests for progress callbacks during multi-region scans."""
+
+    @pytest.mark.asyncio
+    async def test_progress_reported_per_region(self, scanner):
+        """Test the callback gets an initial update and one per region scan."""
+        updates = []
+
+        async def on_progress(progress):
+            updates.append(progress)
+
+        result = await scanner.scan_all_regions(
+            resource_types=["ec2:instance", "s3:bucket"],
+            progress_callback=on_progress,
+        )
+
+        # Initial report, then global + three regions
+        assert len(updates) == 5
+        assert updates[0].completed_region_scans == 0
+        assert updates[0].total_region_scans == 4
+        final = updates[-1]
+        assert final.completed_region_scans == 4
+        assert final.percent_complete == 100.0
+        assert final.resources_scanned == result.total_resources
+        assert final.compliant_resources == result.compliant_resources
+        assert set(final.completed_regions) == {"global", "us-east-1", "us-west-2", "eu-west-1"}
+
+    @pytest.mark.asyncio
+    async def test_failing_callback_does_not_fail_scan(self, scanner):
+        """Test errors raised by the progress callback are only logged."""
+        on_progress = AsyncMock(side_effect=RuntimeError("client gone"))
+
+        result = await scanner.scan_all_regions(
+            resource_types=["ec2:instance"],
+            progress_callback=on_progress,
+        )
+
+        assert len(result.region_metadata.successful_regions) == 3
+        assert on_progress.await_count == 4
+
+
+class TestFetchInventory:
+    """Tests for listing the raw inventory across regions."""
+
+    @pytest.mark.asyncio
+    async def test_failed_regions_and_types_are_reported(
+        self, mock_region_discovery, mock_client_factory
+    ):
+        """Test a failed region and a type that failed in one region are recorded."""
+        regions = ["us-east-1", "us-west-2", "eu-west-1"]
+        clients = {region: MagicMock(region=region) for region in regions + ["us-east-1"]}
+        mock_client_factory.get_client.side_effect = lambda region: clients[region]
+
+        def service_for(client):
+            service = AsyncMock()
+            if client.region == "us-west-2":
+                service.fetch_inventory.side_effect = Exception("AccessDenied")
+            elif client.region == "eu-west-1":
+                service.fetch_inventory.return_value = ResourceInventory(
+                    resources_by_region={"eu-west-1": [{"arn": "arn:eu"}]},
+                    failed_resource_types={"eu-west-1": ["rds:db"]},
+                )
+            else:
+                service.fetch_inventory.return_value = ResourceInventory(
+                    resources_by_region={"us-east-1": [{"arn": "arn:use1"}]}
+                )
+            return service
+
+        scanner = MultiRegionScanner(
+            region_discovery=mock_region_discovery,
+            client_factory=mock_client_factory,
+            compliance_service_factory=service_for,
+        )
+
+        inventory = await scanner.fetch_inventory(["ec2:instance", "rds:db", "s3:bucket"])
+
+        assert inventory.failed_regions == ["us-west-2"]
+        assert inventory.failed_resource_types == {"eu-west-1": ["rds:db"]}
+        assert inventory.failed_type_names == ["rds:db"]
+        assert not inventory.complete
+        assert set(inventory.resources_by_region) == {"global", "us-east-1", "eu-west-1"}
+        assert inventory.resources_by_region["global"] == [
+            {"arn": "arn:use1", "region": "global"}
+        ]
@@ -10,6 +10,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from botocore.exceptions import ClientError
 
+from mcp_server.clients.account_context import AccountContext
 from mcp_server.clients.cache import RedisCache
 from mcp_server.services.region_discovery_service import (
     ENABLED_REGIONS_CACHE_KEY,
@@ -440,3 +441,47 @@ class TestRegionDiscoveryError:
         """Test error inherits from Exception."""
         error = RegionDiscoveryError("Test")
         assert isinstance(error, Exception)
+
+
+class TestAccountContextRegionCache:
+    """Test the in-memory region list kept on the shared AccountContext."""
+
+    @pytest.mark.asyncio
+    async def test_discovered_regions_reused_without_cache_or_api(
+        self, mock_ec2_client, mock_cache
+    ):
+        """Test a second lookup is answered from the account context."""
+        context = AccountContext(session=MagicMock())
+        service = RegionDiscoveryService(
+            ec2_client=mock_ec2_client,
+            cache=mock_cache,
+            account_context=context,
+        )
+        mock_ec2_client.describe_regions.return_value = {
+            "Regions": [
+                {"RegionName": "us-east-1", "OptInStatus": "opt-in-not-required"},
+                {"RegionName": "eu-west-1", "OptInStatus": "opt-in-not-required"},
+            ]
+        }
+
+        first = await service.get_enabled_regions()
+        second = await service.get_enabled_regions()
+
+        assert first == second == ["eu-west-1", "us-east-1"]
+        mock_ec2_client.describe_regions.assert_called_once()
+        mock_cache.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_clears_account_context(self, mock_ec2_client, mock_cache):
+        """Test invalidate_cache also drops the in-memory region list."""
+        context = AccountContext(session=MagicMock())
+        context.set_enabled_regions(["us-east-1"])
+        service = RegionDiscoveryService(
+            ec2_client=mock_ec2_client,
+            cache=mock_cache,
+            account_context=context,
+        )
+
+        await service.invalidate_cache()
+
+        assert context.get_enabled_regions(max_age_seconds=3600) is None
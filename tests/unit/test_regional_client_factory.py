@@ -216,3 +216,17 @@ class TestRegionalClientFactoryConfigurationConsistency:
         called_regions = [call.kwargs["region"] for call in calls]
         
         assert set(called_regions) == set(regions)
+
+    def test_all_clients_share_one_session(self):
+        """Test all regional clients are created from the factory's session."""
+        session = MagicMock()
+        factory = RegionalClientFactory(session=session)
+
+        east = factory.get_client("us-east-1")
+        west = factory.get_client("us-west-2")
+
+        assert factory.session is session
+        assert east.session is session
+        assert west.session is session
+        # No service clients are built until a fetcher needs one
+        session.client.assert_not_called()
@@ -0,0 +1,211 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Unit tests for ResultStoreService paginated scan results."""
+
+import pytest
+
+from mcp_server.services.result_store_service import (
+    InvalidCursorError,
+    ResultNotFoundError,
+    ResultStoreService,
+    _encode_cursor,
+)
+
+
+def make_violation(i: int, region: str, tag: str, cost: float, severity: str = "error") -> dict:
+    return {
+        "resource_id": f"i-{i:04d}",
+        "resource_type": "ec2:instance" if i % 2 else "rds:db",
+        "region": region,
+        "violation_type": "missing_required_tag",
+        "tag_name": tag,
+        "severity": severity,
+        "current_value": None,
+        "allowed_values": None,
+        "cost_impact_monthly": cost,
+    }
+
+
+@pytest.fixture
+def store():
+    """Create a ResultStoreService backed by an in-memory database."""
+    return ResultStoreService(db_path=":memory:")
+
+
+@pytest.fixture
+def violations():
+    """25 violations across two regions and two tags with distinct costs."""
+    return [
+        make_violation(
+            i,
+            region="us-east-1" if i < 15 else "eu-west-1",
+            tag="Owner" if i % 3 else "CostCenter",
+            cost=float(i * 10),
+            severity="warning" if i % 5 == 0 else "error",
+        )
+        for i in range(25)
+    ]
+
+
+async def collect_pages(store, result_id, **kwargs) -> list[dict]:
+    page = await store.get_page(result_id, **kwargs)
+    collected = list(page.violations)
+    while page.next_cursor:
+        page = await store.get_page(result_id, cursor=page.next_cursor)
+        collected.extend(page.violations)
+    return collected
+
+
+class TestStoreAndPaginate:
+    """Tests for storing results and walking pages."""
+
+    @pytest.mark.asyncio
+    async def test_pages_cover_every_violation_once(self, store, violations):
+        """Test following cursors returns each violation exactly once, in order."""
+        result_id = await store.store_result({"compliance_score": 0.5}, violations)
+
+        collected = await collect_pages(store, result_id, page_size=10)
+
+        assert [v["resource_id"] for v in collected] == sorted(
+            v["resource_id"] for v in violations
+        )
+
+    @pytest.mark.asyncio
+    async def test_first_page_metadata(self, store, violations):
+        """Test the first page reports totals and a cursor."""
+        result_id = await store.store_result({}, violations)
+
+        page = await store.get_page(result_id, page_size=10)
+
+        assert len(page.violations) == 10
+        assert page.total_matching == 25
+        assert page.next_cursor is not None
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, store, violations):
+        """Test a page holding the remaining violations ends the listing."""
+        result_id = await store.store_result({}, violations)
+
+        page = await store.get_page(result_id, page_size=25)
+
+        assert page.next_cursor is None
+
+    @pytest.mark.asyncio
+    async def test_summary_round_trip(self, store, violations):
+        """Test the non-violation fields are returned unchanged."""
+        summary = {"compliance_score": 0.4, "data_quality": {"status": "complete"}}
+        result_id = await store.store_result(summary, violations)
+
+        assert await store.get_summary(result_id) == summary
+
+
+class TestFiltersAndSorting:
+    """Tests for filtered and sorted listings."""
+
+    @pytest.mark.asyncio
+    async def test_filter_by_region_and_tag(self, store, violations):
+        """Test filters narrow both the pages and the total."""
+        result_id = await store.store_result({}, violations)
+        expected = [
+            v for v in violations if v["region"] == "eu-west-1" and v["tag_name"] == "Owner"
+        ]
+
+        page = await store.get_page(
+            result_id, page_size=3, filters={"region": "eu-west-1", "tag_name": "Owner"}
+        )
+        collected = await collect_pages(
+            store, result_id, page_size=3, filters={"region": "eu-west-1", "tag_name": "Owner"}
+        )
+
+        assert page.total_matching == len(expected)
+        assert {v["resource_id"] for v in collected} == {v["resource_id"] for v in expected}
+
+    @pytest.mark.asyncio
+    async def test_sort_by_cost_descending_across_pages(self, store, violations):
+        """Test cost_impact sorting stays ordered across page boundaries."""
+        result_id = await store.store_result({}, violations)
+
+        collected = await collect_pages(store, result_id, page_size=4, sort_by="cost_impact")
+
+        costs = [v["cost_impact_monthly"] for v in collected]
+        assert costs == sorted(costs, reverse=True)
+        assert len(costs) == 25
+
+    @pytest.mark.asyncio
+    async def test_sort_ties_broken_by_scan_order(self, store, violations):
+        """Test rows with equal sort values are neither skipped nor repeated."""
+        result_id = await store.store_result({}, violations)
+
+        collected = await collect_pages(store, result_id, page_size=7, sort_by="severity")
+
+        severities = [v["severity"] for v in collected]
+        assert severities == sorted(severities)
+        assert len({v["resource_id"] for v in collected}) == 25
+
+    @pytest.mark.asyncio
+    async def test_cursor_keeps_filters(self, store, violations):
+        """Test continuation pages reuse the filters of the first page."""
+        result_id = await store.store_result({}, violations)
+
+        first = await store.get_page(result_id, page_size=2, filters={"severity": "warning"})
+        second = await store.get_page(result_id, cursor=first.next_cursor, page_size=2)
+
+        assert second.filters == {"severity": "warning"}
+        assert all(v["severity"] == "warning" for v in second.violations)
+
+
+class TestErrors:
+    """Tests for invalid requests."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_result(self, store):
+        """Test an unknown result ID raises ResultNotFoundError."""
+        with pytest.raises(ResultNotFoundError):
+            await store.get_page("missing")
+
+    @pytest.mark.asyncio
+    async def test_malformed_cursor(self, store, violations):
+        """Test a garbage cursor raises InvalidCursorError."""
+        result_id = await store.store_result({}, violations)
+
+        with pytest.raises(InvalidCursorError):
+            await store.get_page(result_id, cursor="not-a-cursor")
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "tampered",
+        [
+            {"filters": ["region"]},
+            {"filters": {"region": 1}},
+            {"filters": {"account": "123"}},
+            {"sort_by": ["region"]},
+            {"last_key": {"$gt": 0}},
+            {"last_seq": "0"},
+            {"result_id": None},
+        ],
+    )
+    async def test_tampered_cursor(self, store, violations, tampered):
+        """Test a well-formed cursor with fields of the wrong type is rejected."""
+        result_id = await store.store_result({}, violations)
+        state = {
+            "result_id": result_id,
+            "filters": {},
+            "sort_by": "resource_id",
+            "last_key": "i-0001",
+            "last_seq": 1,
+        }
+
+        with pytest.raises(InvalidCursorError):
+            await store.get_page(result_id, cursor=_encode_cursor({**state, **tampered}))
+
+    @pytest.mark.asyncio
+    async def test_invalid_sort_and_filter(self, store, violations):
+        """Test unknown sort keys and filter names are rejected."""
+        result_id = await store.store_result({}, violations)
+
+        with pytest.raises(ValueError, match="sort_by"):
+            await store.get_page(result_id, sort_by="age")
+        with pytest.raises(ValueError, match="filters"):
+            await store.get_page(result_id, filters={"account": "123"})
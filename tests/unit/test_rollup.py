@@ -0,0 +1,285 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Tests for the compliance rollup cube and summary-only mode."""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mcp_server import stdio_server
+from mcp_server.clients.aws_client import AWSClient
+from mcp_server.clients.cache import RedisCache
+from mcp_server.models.compliance import ComplianceResult
+from mcp_server.models.enums import Severity, ViolationType
+from mcp_server.models.multi_region import RegionalScanResult
+from mcp_server.models.report import ReportFormat
+from mcp_server.models.rollup import ComplianceRollup
+from mcp_server.models.violations import Violation
+from mcp_server.services.compliance_service import ComplianceService
+from mcp_server.services.multi_region_scanner import MultiRegionScanner
+from mcp_server.services.policy_service import PolicyService
+from mcp_server.services.report_service import ReportService
+from mcp_server.tools.generate_compliance_report import generate_compliance_report
+
+
+def make_violation(
+    resource_id: str,
+    tag_name: str = "Owner",
+    region: str = "us-east-1",
+    resource_type: str = "ec2:instance",
+    severity: Severity = Severity.ERROR,
+    cost: float = 10.0,
+) -> Violation:
+    return Violation(
+        resource_id=resource_id,
+        resource_type=resource_type,
+        region=region,
+        violation_type=ViolationType.MISSING_REQUIRED_TAG,
+        tag_name=tag_name,
+        severity=severity,
+        cost_impact_monthly=cost,
+    )
+
+
+@pytest.fixture
+def violations():
+    return [
+        make_violation("i-1", "Owner"),
+        make_violation("i-1", "CostCenter", cost=5.0),
+        make_violation("i-2", "Owner", region="eu-west-1"),
+        make_violation("db-1", "Owner", resource_type="rds:db", cost=100.0),
+    ]
+
+
+class TestComplianceRollup:
+    """Tests for building and slicing the cube."""
+
+    def test_full_grain_cells(self, violations):
+        """Test one cell per (region, resource_type, tag_name, violation_type)."""
+        rollup = ComplianceRollup.from_violations(violations)
+
+        assert rollup.violation_count == 4
+        assert len(rollup.cells) == 4
+        assert all(cell.violation_type == "missing_required_tag" for cell in rollup.cells)
+
+    def test_rolled_up_unique_resources_are_exact(self, violations):
+        """Test a resource with several violations counts once when rolled up."""
+        rollup = ComplianceRollup.from_violations(violations)
+
+        by_region = {c.region: c for c in rollup.slice(["region"])}
+
+        assert by_region["us-east-1"].violation_count == 3
+        assert by_region["us-east-1"].non_compliant_resources == 2
+        assert by_region["us-east-1"].cost_gap == pytest.approx(115.0)
+        assert by_region["us-east-1"].tag_name is None
+        assert by_region["eu-west-1"].non_compliant_resources == 1
+
+    def test_filters_and_total(self, violations):
+        """Test slicing with a dimension filter and rolling up everything."""
+        rollup = ComplianceRollup.from_violations(violations)
+
+        owner = rollup.slice(["resource_type"], filters={"tag_name": "Owner"})
+        (total,) = rollup.slice()
+
+        assert [(c.resource_type, c.violation_count) for c in owner] == [
+            ("ec2:instance", 2),
+            ("rds:db", 1),
+        ]
+        assert total.violation_count == 4
+        assert total.non_compliant_resources == 3
+
+    def test_invalid_dimension_rejected(self, violations):
+        """Test unknown dimensions raise ValueError."""
+        rollup = ComplianceRollup.from_violations(violations)
+
+        with pytest.raises(ValueError, match="Invalid rollup dimensions"):
+            rollup.slice(["account_id"])
+
+    def test_rollup_not_serialized(self, violations):
+        """Test cached results rebuild the cube from their violations."""
+        result = ComplianceResult(
+            compliance_score=0.5,
+            total_resources=6,
+            compliant_resources=3,
+            violations=violations,
+            rollup=ComplianceRollup.from_violations(violations),
+        )
+
+        restored = ComplianceResult.model_validate_json(result.model_dump_json())
+
+        assert restored.rollup is None
+        assert ComplianceRollup.for_result(restored).violation_count == 4
+
+
+class TestRollupBuiltDuringScan:
+    """Tests that scans attach a rollup built in the same pass."""
+
+    @pytest.mark.asyncio
+    async def test_compliance_service_rollup_respects_severity(self):
+        """Test the cube only holds violations the severity filter keeps."""
+        cache = MagicMock(spec=RedisCache)
+        cache.get = AsyncMock(return_value=None)
+        cache.set = AsyncMock(return_value=True)
+        policy = MagicMock(spec=PolicyService)
+        policy.get_required_tags.return_value = ["Owner"]
+        policy.validate_resource_tags.side_effect = lambda resource_id, **kwargs: [
+            make_violation(resource_id, "Owner"),
+            make_violation(resource_id, "Team", severity=Severity.WARNING),
+        ]
+        aws_client = MagicMock(spec=AWSClient)
+        aws_client.region = "us-east-1"
+        service = ComplianceService(cache=cache, aws_client=aws_client, policy_service=policy)
+        service._fetch_resources_by_type = AsyncMock(
+            return_value=[
+                {
+                    "resource_id": f"i-{n}",
+                    "resource_type": "ec2:instance",
+                    "region": "us-east-1",
+                    "tags": {},
+                }
+                for n in range(3)
+            ]
+        )
+
+        result = await service.check_compliance(["ec2:instance"], severity="errors_only")
+
+        assert result.rollup.violation_count == len(result.violations) == 3
+        assert [c.tag_name for c in result.rollup.slice(["tag_name"])] == ["Owner"]
+
+    def test_aggregated_rollup_deduplicates_global_violations(self):
+        """Test a global violation seen in several regions is counted once."""
+        scanner = MultiRegionScanner(
+            region_discovery=MagicMock(),
+            client_factory=MagicMock(),
+            compliance_service_factory=MagicMock(),
+        )
+        bucket = make_violation("my-bucket", region="global", resource_type="s3:bucket")
+        results = [
+            RegionalScanResult(
+                region=region,
+                success=True,
+                violations=[bucket, make_violation(f"i-{region}", region=region)],
+                non_compliant_count=2,
+            )
+            for region in ("us-east-1", "us-west-2")
+        ]
+
+        aggregated = scanner._aggregate_results(results)
+
+        by_type = {c.resource_type: c for c in aggregated.rollup.slice(["resource_type"])}
+        assert by_type["s3:bucket"].violation_count == 1
+        assert by_type["ec2:instance"].non_compliant_resources == 2
+
+
+class TestReportsFromRollup:
+    """Tests that reports read rankings and slices from the cube."""
+
+    def test_rankings_from_cube(self, violations):
+        """Test count and cost rankings match the violations they summarize."""
+        result = ComplianceResult(
+            compliance_score=0.5,
+            total_resources=6,
+            compliant_resources=3,
+            violations=violations,
+        )
+
+        report = ReportService().generate_report(result, include_recommendations=False)
+
+        top_count = report.top_violations_by_count[0]
+        assert (top_count.tag_name, top_count.violation_count) == ("Owner", 3)
+        assert top_count.affected_resource_types == ["ec2:instance", "rds:db"]
+        assert top_count.total_cost_impact == pytest.approx(120.0)
+        assert [r.tag_name for r in report.top_violations_by_cost] == ["Owner", "CostCenter"]
+
+    @pytest.mark.asyncio
+    async def test_summary_only_report(self, violations):
+        """Test summary-only mode returns slices without a formatted report."""
+        result = ComplianceResult(
+            compliance_score=0.5,
+            total_resources=6,
+            compliant_resources=3,
+            violations=violations,
+        )
+
+        report = await generate_compliance_report(
+            result, summary_only=True, group_by=["tag_name"]
+        )
+
+        assert report.formatted_output == ""
+        assert {c.tag_name: c.non_compliant_resources for c in report.rollup} == {
+            "Owner": 3,
+            "CostCenter": 1,
+        }
+        assert report.summary.total_violations == 4
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("summary_only", [True, False])
+    async def test_report_tool_rejects_unknown_group_by_before_scanning(
+        self, summary_only, monkeypatch
+    ):
+        """Test an unknown dimension is reported before the scan runs."""
+        compliance_service = MagicMock(spec=ComplianceService)
+        monkeypatch.setattr(
+            stdio_server,
+            "_container",
+            SimpleNamespace(
+                initialized=True,
+                compliance_service=compliance_service,
+                audit_service=None,
+                settings=SimpleNamespace(
+                    timings_enabled=False, timings_in_response=False, aws_calls_in_response=False
+                ),
+            ),
+        )
+
+        response = json.loads(
+            await stdio_server.generate_compliance_report(
+                resource_types=["ec2:instance"], summary_only=summary_only, group_by=["account"]
+            )
+        )
+
+        assert response["error"] == "invalid_group_by"
+        compliance_service.check_compliance.assert_not_called()
+
+    def test_single_pass_rankings_keep_top_n(self):
+        """Test both rankings are cut to top_n from one aggregation."""
+        rollup = ComplianceRollup.from_violations(
+            [
+                make_violation(f"i-{tag}-{n}", f"Tag{tag}", cost=float(10 - tag))
+                for tag in range(6)
+                for n in range(tag + 1)
+            ]
+        )
+
+        by_count, by_cost = ReportService()._rank_violations(rollup, top_n=2)
+
+        assert [(r.tag_name, r.violation_count) for r in by_count] == [("Tag5", 6), ("Tag4", 5)]
+        assert [(r.tag_name, r.total_cost_impact) for r in by_cost] == [
+            ("Tag5", 30.0),
+            ("Tag4", 30.0),
+        ]
+
+    @pytest.mark.parametrize("report_format", list(ReportFormat))
+    def test_render_report_streams_same_output(self, violations, report_format, tmp_path):
+        """Test rendering to a file matches format_report for every format."""
+        service = ReportService()
+        report = service.generate_report(
+            ComplianceResult(
+                compliance_score=0.2,
+                total_resources=6,
+                compliant_resources=3,
+                violations=violations,
+                cost_attribution_gap=2000.0,
+            )
+        )
+        path = tmp_path / "report.out"
+
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            service.render_report(report, report_format, f)
+
+        rendered = path.read_bytes().decode("utf-8")
+        assert rendered == service.format_report(report, report_format)
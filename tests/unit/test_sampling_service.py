@@ -0,0 +1,277 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Tests for stratified-sample compliance estimates."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mcp_server.clients.aws_client import AWSAPIError, AWSClient, DeferredTags
+from mcp_server.models.enums import Severity, ViolationType
+from mcp_server.models.inventory import ResourceInventory
+from mcp_server.models.violations import Violation
+from mcp_server.services.compliance_service import ComplianceService
+from mcp_server.services.history_service import HistoryService
+from mcp_server.services.policy_service import PolicyService
+from mcp_server.services.sampling_service import SamplingService
+from mcp_server.stdio_server import _build_data_quality
+from mcp_server.tools.check_tag_compliance import check_tag_compliance
+from mcp_server.utils.deadline import clear_request_deadline, start_request_deadline
+
+
+def make_resources(count: int, region: str, resource_type: str, compliant_every: int) -> list[dict]:
+    """Resources where every compliant_every-th one carries an Owner tag."""
+    return [
+        {
+            "resource_id": f"{region}-{resource_type}-{n}",
+            "resource_type": resource_type,
+            "region": region,
+            "tags": {"Owner": "team"} if n % compliant_every == 0 else {},
+            "cost_impact": 10.0,
+        }
+        for n in range(count)
+    ]
+
+
+def make_compliance_service(
+    policy_service, inventory: list[dict], costs: dict | None = None
+) -> MagicMock:
+    """ComplianceService listing the inventory, with Cost Explorer costs."""
+    compliance_service = MagicMock(spec=ComplianceService)
+    compliance_service.policy_service = policy_service
+    compliance_service.fetch_inventory = AsyncMock(
+        return_value=ResourceInventory(resources_by_region={"us-east-1": inventory})
+    )
+    aws_client = MagicMock(spec=AWSClient)
+    aws_client.get_cost_by_service_and_region = AsyncMock(return_value=costs or {})
+    aws_client.get_service_name_for_resource_type.side_effect = (
+        AWSClient.get_service_name_for_resource_type.__get__(aws_client)
+    )
+    compliance_service.aws_client = aws_client
+    return compliance_service
+
+
+@pytest.fixture
+def policy_service():
+    service = MagicMock(spec=PolicyService)
+    service.get_required_tags.side_effect = lambda resource_type: (
+        [] if resource_type == "kms:key" else ["Owner"]
+    )
+
+    def validate(resource_id, resource_type, region, tags, cost_impact):
+        if "Owner" in tags:
+            return []
+        return [
+            Violation(
+                resource_id=resource_id,
+                resource_type=resource_type,
+                region=region,
+                violation_type=ViolationType.MISSING_REQUIRED_TAG,
+                tag_name="Owner",
+                severity=Severity.ERROR,
+                cost_impact_monthly=cost_impact,
+            )
+        ]
+
+    service.validate_resource_tags.side_effect = validate
+    return service
+
+
+@pytest.fixture
+def inventory():
+    # 4000 resources: us-east-1 ec2 50% compliant, eu-west-1 rds 25%,
+    # global s3 100%; kms keys are out of scope
+    return (
+        make_resources(2000, "us-east-1", "ec2:instance", 2)
+        + make_resources(1600, "eu-west-1", "rds:db", 4)
+        + make_resources(400, "global", "s3:bucket", 1)
+        + make_resources(50, "us-east-1", "kms:key", 1)
+    )
+
+
+class TestSamplingService:
+    """Tests for the stratified estimators."""
+
+    def test_full_sample_is_exact(self, policy_service, inventory):
+        """Test sampling every resource reproduces the exact scan."""
+        result = SamplingService(policy_service, seed=1).estimate(inventory, sample_size=10_000)
+
+        assert result.sampling.exact
+        assert result.total_resources == 4000
+        assert result.compliant_resources == 1000 + 400 + 400
+        assert result.compliance_score == pytest.approx(0.45)
+        assert result.cost_attribution_gap == pytest.approx(2200 * 10.0)
+        assert result.sampling.compliance_score_ci.lower == pytest.approx(0.45)
+        assert result.sampling.compliance_score_ci.upper == pytest.approx(0.45)
+
+    def test_estimate_within_interval(self, policy_service, inventory):
+        """Test a small sample's interval covers the true score and cost gap."""
+        result = SamplingService(policy_service, seed=3).estimate(inventory, sample_size=400)
+
+        sampling = result.sampling
+        assert not sampling.exact
+        assert sampling.population == 4000
+        assert sampling.sample_size == 400
+        assert sampling.compliance_score_ci.lower < 0.45 < sampling.compliance_score_ci.upper
+        cost_ci = sampling.cost_attribution_gap_ci
+        assert cost_ci.lower < 22000 < cost_ci.upper
+        assert len(result.violations) == result.rollup.violation_count < 400
+
+    def test_proportional_allocation(self, policy_service, inventory):
+        """Test strata get proportional samples, with a floor of two."""
+        result = SamplingService(policy_service, seed=5).estimate(inventory, sample_size=20)
+
+        sizes = {(s.region, s.resource_type): s.sample_size for s in result.sampling.strata}
+        assert sizes == {
+            ("eu-west-1", "rds:db"): 8,
+            ("global", "s3:bucket"): 2,
+            ("us-east-1", "ec2:instance"): 10,
+        }
+
+    def test_interval_narrows_as_sample_grows(self, policy_service, inventory):
+        """Test larger samples give tighter intervals."""
+        widths = []
+        for sample_size in (100, 1000, 3000):
+            ci = SamplingService(policy_service, seed=7).estimate(
+                inventory, sample_size=sample_size
+            ).sampling.compliance_score_ci
+            widths.append(ci.upper - ci.lower)
+
+        assert widths[0] > widths[1] > widths[2] > 0
+
+    def test_invalid_arguments(self, policy_service, inventory):
+        """Test sample_size and confidence_level are validated."""
+        service = SamplingService(policy_service)
+        with pytest.raises(ValueError, match="sample_size"):
+            service.estimate(inventory, sample_size=0)
+        with pytest.raises(ValueError, match="confidence_level"):
+            service.estimate(inventory, sample_size=10, confidence_level=1.0)
+
+
+class TestSamplingMode:
+    """Tests for sampling mode on check_tag_compliance."""
+
+    @pytest.mark.asyncio
+    async def test_tool_samples_inventory_and_skips_history(self, policy_service, inventory):
+        """Test sampling lists the inventory, validates a sample and never stores it."""
+        compliance_service = make_compliance_service(policy_service, inventory)
+        history_service = MagicMock(spec=HistoryService)
+
+        result = await check_tag_compliance(
+            compliance_service=compliance_service,
+            resource_types=["ec2:instance", "rds:db", "s3:bucket"],
+            history_service=history_service,
+            store_snapshot=True,
+            sample_size=200,
+        )
+
+        assert result.sampling.sample_size == 200
+        assert policy_service.validate_resource_tags.call_count == 200
+        compliance_service.check_compliance.assert_not_called()
+        history_service.store_scan_result.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_tool_spreads_service_costs_over_resources(self, policy_service, inventory):
+        """Test each resource gets an even share of its service's cost in its region."""
+        compliance_service = make_compliance_service(
+            policy_service,
+            inventory,
+            costs={
+                ("Amazon Elastic Compute Cloud - Compute", "us-east-1"): 4000.0,
+                ("Amazon Relational Database Service", "eu-west-1"): 1600.0,
+                ("Amazon Relational Database Service", "us-east-1"): 999.0,
+            },
+        )
+
+        result = await check_tag_compliance(
+            compliance_service=compliance_service,
+            resource_types=["ec2:instance", "rds:db", "s3:bucket"],
+            sample_size=10_000,
+        )
+
+        # 1000 non-compliant ec2 at $2 each, 1200 non-compliant rds at $1 each
+        assert result.cost_attribution_gap == pytest.approx(1000 * 2.0 + 1200 * 1.0)
+        assert result.sampling.cost_estimated
+        compliance_service.aws_client.get_cost_by_service_and_region.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_tool_without_cost_explorer(self, policy_service, inventory):
+        """Test the cost gap is flagged as not estimated when Cost Explorer fails."""
+        compliance_service = make_compliance_service(policy_service, inventory)
+        compliance_service.aws_client.get_cost_by_service_and_region.side_effect = AWSAPIError(
+            "AccessDenied"
+        )
+
+        result = await check_tag_compliance(
+            compliance_service=compliance_service,
+            resource_types=["ec2:instance"],
+            sample_size=100,
+        )
+
+        assert not result.sampling.cost_estimated
+        quality = _build_data_quality(result)
+        assert quality["status"] == "partial"
+        assert "cost_attribution_gap" in quality["cost_note"]
+
+    @pytest.mark.asyncio
+    async def test_tool_reports_strata_that_failed_to_list(self, policy_service, inventory):
+        """Test regions and types that failed to list are reported with the estimate."""
+        compliance_service = make_compliance_service(policy_service, inventory)
+        listed = compliance_service.fetch_inventory.return_value
+        listed.failed_regions = ["ap-south-1"]
+        listed.failed_resource_types = {"us-east-1": ["lambda:function"]}
+
+        result = await check_tag_compliance(
+            compliance_service=compliance_service,
+            resource_types=["ec2:instance", "rds:db", "lambda:function"],
+            sample_size=10_000,
+        )
+
+        assert result.sampling.exact
+        assert result.sampling.failed_regions == ["ap-south-1"]
+        assert result.sampling.failed_resource_types == ["lambda:function"]
+        quality = _build_data_quality(result)
+        assert quality["status"] == "partial"
+        assert "ap-south-1, lambda:function" in quality["warning"]
+
+    @pytest.mark.asyncio
+    async def test_tool_drops_strata_with_refused_tag_lookups(self, policy_service, inventory):
+        """Test tag lookups refused near the deadline don't count as untagged resources."""
+        client = AWSClient(region="eu-west-1", session=MagicMock())
+        for resource in inventory:
+            if resource["resource_type"] == "rds:db":
+                resource["tags"] = DeferredTags(
+                    client, "rds", lambda **kwargs: {"TagList": []}, lambda r: {}, {}
+                )
+        compliance_service = make_compliance_service(policy_service, inventory)
+
+        start_request_deadline(timeout_seconds=1.0)
+        try:
+            result = await check_tag_compliance(
+                compliance_service=compliance_service,
+                resource_types=["ec2:instance", "rds:db", "s3:bucket"],
+                sample_size=10_000,
+            )
+        finally:
+            clear_request_deadline()
+
+        assert result.incomplete_resource_types == ["rds:db"]
+        assert [s.resource_type for s in result.sampling.strata] == ["s3:bucket", "ec2:instance"]
+        # Only the listed ec2 and s3 strata are estimated, without bias
+        assert result.compliant_resources == 1000 + 400
+        quality = _build_data_quality(result)
+        assert quality["status"] == "partial"
+        assert quality["incomplete_resource_types"] == ["rds:db"]
+
+    def test_data_quality_marked_approximate(self, policy_service, inventory):
+        """Test data_quality flags sampled results unless every resource was sampled."""
+        sampled = SamplingService(policy_service, seed=1).estimate(inventory, sample_size=100)
+        exact = SamplingService(policy_service, seed=1).estimate(inventory, sample_size=10_000)
+
+        quality = _build_data_quality(sampled)
+        assert quality["status"] == "approximate"
+        assert quality["approximate"] is True
+        assert "sample" in quality["warning"]
+        assert _build_data_quality(exact) == {"status": "complete", "approximate": False}
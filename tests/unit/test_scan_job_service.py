@@ -0,0 +1,227 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Unit tests for ScanJobService background scan jobs."""
+
+import asyncio
+
+import pytest
+
+from mcp_server.models.audit import AuditStatus
+from mcp_server.models.scan_job import ScanJobStatus, ScanProgress
+from mcp_server.services.audit_service import AuditService
+from mcp_server.services.scan_job_service import ScanJobNotFoundError, ScanJobService
+from mcp_server.utils.api_ledger import clear_api_ledger, get_api_ledger, start_api_ledger
+from mcp_server.utils.timing import span
+
+
+@pytest.fixture
+def service():
+    """Create a ScanJobService backed by an in-memory database."""
+    return ScanJobService(db_path=":memory:")
+
+
+async def finished_scan(progress_callback):
+    await progress_callback(ScanProgress(total_region_scans=2, completed_region_scans=1))
+    await progress_callback(
+        ScanProgress(
+            total_region_scans=2,
+            completed_region_scans=2,
+            resources_scanned=10,
+            compliant_resources=7,
+            violations_found=4,
+        )
+    )
+    return {"compliance_score": 0.7, "total_resources": 10}
+
+
+class TestScanJobLifecycle:
+    """Tests for running jobs to completion."""
+
+    @pytest.mark.asyncio
+    async def test_start_returns_pending_job(self, service):
+        """Test start_job returns immediately with a pending job."""
+        release = asyncio.Event()
+
+        async def slow_scan(progress_callback):
+            await release.wait()
+            return {}
+
+        job = await service.start_job({"resource_types": ["ec2:instance"]}, slow_scan)
+
+        assert job.status == ScanJobStatus.PENDING
+        assert await service.get_result(job.job_id) is None
+
+        release.set()
+        await service.wait_for_job(job.job_id)
+
+    @pytest.mark.asyncio
+    async def test_completed_job_has_progress_and_result(self, service):
+        """Test a finished job stores its last progress update and result."""
+        job = await service.start_job({"resource_types": ["all"]}, finished_scan)
+
+        finished = await service.wait_for_job(job.job_id)
+
+        assert finished.status == ScanJobStatus.COMPLETED
+        assert finished.parameters == {"resource_types": ["all"]}
+        assert finished.started_at is not None
+        assert finished.completed_at is not None
+        assert finished.progress.percent_complete == 100.0
+        assert finished.progress.compliance_score == 0.7
+        assert await service.get_result(job.job_id) == {
+            "compliance_score": 0.7,
+            "total_resources": 10,
+        }
+
+    @pytest.mark.asyncio
+    async def test_progress_visible_while_running(self, service):
+        """Test progress updates can be read before the job finishes."""
+        release = asyncio.Event()
+
+        async def scan(progress_callback):
+            await progress_callback(
+                ScanProgress(total_region_scans=4, completed_region_scans=1, violations_found=3)
+            )
+            await release.wait()
+            return {}
+
+        job = await service.start_job({}, scan)
+        await asyncio.sleep(0.01)
+
+        running = await service.get_job(job.job_id)
+        assert running.status == ScanJobStatus.RUNNING
+        assert running.progress.percent_complete == 25.0
+        assert running.progress.violations_found == 3
+
+        release.set()
+        await service.wait_for_job(job.job_id)
+
+    @pytest.mark.asyncio
+    async def test_failed_job_records_error(self, service):
+        """Test an exception in the scan marks the job failed with its message."""
+
+        async def broken_scan(progress_callback):
+            raise RuntimeError("All regions failed to scan")
+
+        job = await service.start_job({}, broken_scan)
+        finished = await service.wait_for_job(job.job_id)
+
+        assert finished.status == ScanJobStatus.FAILED
+        assert finished.error == "All regions failed to scan"
+        assert await service.get_result(job.job_id) is None
+
+    @pytest.mark.asyncio
+    async def test_unknown_job(self, service):
+        """Test looking up an unknown job ID raises ScanJobNotFoundError."""
+        with pytest.raises(ScanJobNotFoundError):
+            await service.get_job("missing")
+
+
+class TestScanJobContext:
+    """Tests for the request context of a background job."""
+
+    @pytest.mark.asyncio
+    async def test_job_has_its_own_ledger_and_audit_entry(self, tmp_path):
+        """Test a job's AWS calls and stages are audited apart from the starting call."""
+        audit_service = AuditService(db_path=str(tmp_path / "audit.db"))
+        service = ScanJobService(db_path=":memory:", audit_service=audit_service)
+
+        async def scan(progress_callback):
+            with span("fetch"):
+                get_api_ledger().record("ec2", "describe_instances", "eu-west-1", 12.0)
+            return {}
+
+        caller_ledger = start_api_ledger("caller")
+        try:
+            job = await service.start_job({"resource_types": ["ec2:instance"]}, scan)
+            await service.wait_for_job(job.job_id)
+        finally:
+            clear_api_ledger()
+
+        (entry,) = await audit_service.get_logs()
+        audit_service.close()
+        assert caller_ledger.entries == {}
+        assert entry.tool_name == "scan_job"
+        assert entry.status == AuditStatus.SUCCESS
+        assert entry.parameters == {"job_id": job.job_id, "resource_types": ["ec2:instance"]}
+        assert entry.correlation_id not in ("", "caller")
+        assert set(entry.stage_timings) == {"fetch"}
+        (row,) = entry.aws_calls
+        assert (row["operation"], row["calls"]) == ("describe_instances", 1)
+
+
+class TestScanJobConcurrency:
+    """Tests for limiting concurrently running jobs."""
+
+    @pytest.mark.asyncio
+    async def test_jobs_beyond_limit_stay_pending(self):
+        """Test only max_concurrent_jobs jobs run at once."""
+        service = ScanJobService(db_path=":memory:", max_concurrent_jobs=1)
+        release = asyncio.Event()
+
+        async def blocked_scan(progress_callback):
+            await release.wait()
+            return {}
+
+        first = await service.start_job({}, blocked_scan)
+        second = await service.start_job({}, blocked_scan)
+        await asyncio.sleep(0.01)
+
+        assert (await service.get_job(first.job_id)).status == ScanJobStatus.RUNNING
+        assert (await service.get_job(second.job_id)).status == ScanJobStatus.PENDING
+
+        release.set()
+        assert (await service.wait_for_job(second.job_id)).status == ScanJobStatus.COMPLETED
+
+
+class TestScanJobPersistence:
+    """Tests for job state surviving restarts."""
+
+    @pytest.mark.asyncio
+    async def test_result_readable_after_restart(self, tmp_path):
+        """Test a new service instance can read jobs finished by a previous one."""
+        db_path = str(tmp_path / "jobs.db")
+        old_service = ScanJobService(db_path=db_path)
+        job = await old_service.start_job({}, finished_scan)
+        await old_service.wait_for_job(job.job_id)
+
+        service = ScanJobService(db_path=db_path)
+
+        assert (await service.get_job(job.job_id)).status == ScanJobStatus.COMPLETED
+        assert (await service.get_result(job.job_id))["total_resources"] == 10
+
+    @pytest.mark.asyncio
+    async def test_interrupted_jobs_marked_failed_on_start(self, tmp_path):
+        """Test jobs left running by a previous process are failed at startup."""
+        db_path = str(tmp_path / "jobs.db")
+        old_service = ScanJobService(db_path=db_path)
+
+        async def never_finishes(progress_callback):
+            await asyncio.Event().wait()
+
+        job = await old_service.start_job({}, never_finishes)
+        await asyncio.sleep(0.01)
+
+        new_service = ScanJobService(db_path=db_path)
+        interrupted = await new_service.get_job(job.job_id)
+
+        assert interrupted.status == ScanJobStatus.FAILED
+        assert "restarted" in interrupted.error
+        await old_service.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_fails_running_jobs(self, service):
+        """Test shutdown cancels running jobs and records why."""
+
+        async def never_finishes(progress_callback):
+            await asyncio.Event().wait()
+
+        job = await service.start_job({}, never_finishes)
+        await asyncio.sleep(0.01)
+
+        await service.shutdown()
+
+        stopped = await service.get_job(job.job_id)
+        assert stopped.status == ScanJobStatus.FAILED
+        assert "shut down" in stopped.error
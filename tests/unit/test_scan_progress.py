@@ -0,0 +1,81 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Unit tests for scan progress reporting and MCP progress notifications."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mcp_server.models.scan_job import ScanProgress
+from mcp_server.stdio_server import _format_progress_message, _progress_notifier
+
+
+class TestScanProgressEstimates:
+    """Tests for derived progress values."""
+
+    def test_eta_unknown_before_first_region(self):
+        """Test no ETA is given until a region scan has finished."""
+        progress = ScanProgress(total_region_scans=10, elapsed_seconds=3.0)
+
+        assert progress.eta_seconds is None
+        assert progress.percent_complete == 0.0
+
+    def test_eta_from_average_region_time(self):
+        """Test the ETA extrapolates the average time per finished region scan."""
+        progress = ScanProgress(
+            total_region_scans=10, completed_region_scans=4, elapsed_seconds=20.0
+        )
+
+        assert progress.eta_seconds == 30.0
+        assert progress.percent_complete == 40.0
+
+    def test_eta_zero_when_done(self):
+        """Test a finished scan has nothing remaining."""
+        progress = ScanProgress(
+            total_region_scans=3, completed_region_scans=3, elapsed_seconds=9.0
+        )
+
+        assert progress.eta_seconds == 0.0
+
+
+class TestProgressNotifications:
+    """Tests for turning scanner progress into MCP notifications."""
+
+    def test_message_includes_counts_and_eta(self):
+        """Test the message carries resources, violations and time remaining."""
+        progress = ScanProgress(
+            total_region_scans=8,
+            completed_region_scans=2,
+            failed_region_scans=1,
+            resources_scanned=120,
+            violations_found=45,
+            elapsed_seconds=10.0,
+        )
+
+        message = _format_progress_message(progress)
+
+        assert message == (
+            "2/8 region scans done: 120 resources, 45 violations so far, "
+            "1 failed, ~30s remaining"
+        )
+
+    def test_no_notifier_without_context(self):
+        """Test direct (non-MCP) calls get no progress callback."""
+        assert _progress_notifier(None) is None
+
+    @pytest.mark.asyncio
+    async def test_notifier_reports_progress(self):
+        """Test the callback forwards region scan counts to ctx.report_progress."""
+        ctx = MagicMock()
+        ctx.report_progress = AsyncMock()
+        notify = _progress_notifier(ctx)
+
+        await notify(ScanProgress(total_region_scans=4, completed_region_scans=1))
+
+        ctx.report_progress.assert_awaited_once()
+        kwargs = ctx.report_progress.await_args.kwargs
+        assert kwargs["progress"] == 1
+        assert kwargs["total"] == 4
+        assert kwargs["message"].startswith("1/4 region scans done")
@@ -0,0 +1,183 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Tests for the non-blocking SQLite pool and HistoryService on top of it."""
+
+import asyncio
+import concurrent.futures
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from mcp_server.clients.sqlite_pool import SQLitePool
+from mcp_server.models.compliance import ComplianceResult
+from mcp_server.models.history import GroupBy
+from mcp_server.services.history_service import HistoryService
+
+
+def create_table(conn: sqlite3.Connection) -> None:
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL)")
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = SQLitePool(str(tmp_path / "pool.db"), init=create_table)
+    yield pool
+    pool.close()
+
+
+class TestSQLitePool:
+    """Tests for batched writes and off-loop reads."""
+
+    @pytest.mark.asyncio
+    async def test_file_database_uses_wal(self, pool):
+        """Test file databases are switched to WAL mode."""
+        (mode,) = (await pool.fetchall("PRAGMA journal_mode"))[0]
+        assert mode == "wal"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_share_transactions(self, pool):
+        """Test writes queued while the writer is busy commit together."""
+        gate = threading.Event()
+        blocker = pool.submit_write(lambda conn: gate.wait(5))
+
+        writes = [
+            asyncio.create_task(pool.execute("INSERT INTO items (name) VALUES (?)", (f"n{i}",)))
+            for i in range(50)
+        ]
+        await asyncio.sleep(0.05)
+        gate.set()
+        await asyncio.gather(*writes)
+        await asyncio.wrap_future(blocker)
+
+        assert (await pool.fetchall("SELECT COUNT(*) FROM items"))[0][0] == 50
+        assert pool.stats.writes == 51
+        assert pool.stats.batches <= 3
+        assert pool.stats.max_batch_size >= 50
+
+    @pytest.mark.asyncio
+    async def test_failed_write_does_not_undo_batch(self, pool):
+        """Test a failing write is rolled back alone."""
+        gate = threading.Event()
+        pool.submit_write(lambda conn: gate.wait(5))
+        good = asyncio.create_task(pool.execute("INSERT INTO items (name) VALUES ('a')"))
+        bad = asyncio.create_task(pool.execute("INSERT INTO items (name) VALUES (NULL)"))
+        await asyncio.sleep(0.05)
+        gate.set()
+
+        await good
+        with pytest.raises(sqlite3.IntegrityError):
+            await bad
+        assert await pool.fetchall("SELECT name FROM items") == [("a",)]
+        assert pool.stats.failed_writes == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_writes_do_not_block_the_loop(self, pool):
+        """Test the event loop keeps running while the writer is busy."""
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(heartbeat())
+        await pool.write(lambda conn: time.sleep(0.3))
+        task.cancel()
+
+        assert ticks >= 10
+
+    @pytest.mark.asyncio
+    async def test_close_commits_queued_writes(self, tmp_path):
+        """Test writes queued before close are committed."""
+        path = str(tmp_path / "pool.db")
+        pool = SQLitePool(path, init=create_table)
+        for i in range(20):
+            pool.submit_write(
+                lambda conn, i=i: conn.execute("INSERT INTO items (name) VALUES (?)", (f"n{i}",))
+            )
+        pool.close()
+
+        with pytest.raises(RuntimeError):
+            pool.submit_write(lambda conn: None)
+        conn = sqlite3.connect(path)
+        assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 20
+        conn.close()
+
+    def test_writes_racing_close_always_resolve(self, tmp_path):
+        """Test every write accepted while closing either commits or fails."""
+        pool = SQLitePool(str(tmp_path / "pool.db"), init=create_table)
+        futures = []
+        start = threading.Barrier(5)
+
+        def submit_until_closed():
+            start.wait()
+            while True:
+                try:
+                    futures.append(pool.submit_write(lambda conn: None))
+                except RuntimeError:
+                    return
+
+        threads = [threading.Thread(target=submit_until_closed) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        time.sleep(0.01)
+        pool.close()
+        for thread in threads:
+            thread.join(5)
+
+        assert futures
+        assert all(future.done() for future in futures)
+
+    def test_jobs_behind_stop_marker_fail(self, tmp_path):
+        """Test jobs the writer finds after its stop marker fail instead of hanging."""
+        pool = SQLitePool(str(tmp_path / "pool.db"), init=create_table)
+        gate = threading.Event()
+        pool.submit_write(lambda conn: gate.wait(5))
+        closer = threading.Thread(target=pool.close)
+        closer.start()
+        while pool._queue.empty():
+            time.sleep(0.001)
+        # As if a put had slipped in after close() queued the stop marker
+        late = concurrent.futures.Future()
+        pool._queue.put((lambda conn: None, late, True))
+        gate.set()
+        closer.join(5)
+
+        with pytest.raises(RuntimeError):
+            late.result(timeout=1)
+
+
+class TestHistoryServiceStorage:
+    """Tests for HistoryService on file and in-memory databases."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("in_memory", [True, False])
+    async def test_store_and_query(self, tmp_path, in_memory):
+        """Test concurrent snapshot writes are all readable afterwards."""
+        service = HistoryService(":memory:" if in_memory else str(tmp_path / "history.db"))
+        results = [
+            ComplianceResult(
+                compliance_score=0.5,
+                total_resources=10,
+                compliant_resources=5,
+                violations=[],
+                cost_attribution_gap=0.0,
+                scan_timestamp=datetime.utcnow(),
+            )
+            for _ in range(10)
+        ]
+        try:
+            await asyncio.gather(*(service.store_scan_result(r) for r in results))
+            history = await service.get_history(days_back=1, group_by=GroupBy.DAY)
+        finally:
+            service.close()
+
+        assert len(history.history) == 1
+        assert history.history[0].total_resources == 100
@@ -0,0 +1,198 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Tests for hierarchical tag state digests and incremental validation."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from mcp_server.clients.aws_client import AWSClient
+from mcp_server.models.enums import Severity, ViolationType
+from mcp_server.models.policy import TagPolicy
+from mcp_server.models.violations import Violation
+from mcp_server.services.compliance_service import ComplianceService
+from mcp_server.services.policy_service import PolicyService
+from mcp_server.services.tag_state_service import TagStateService
+from mcp_server.services.validation_cache import ValidationCache
+from mcp_server.utils.tag_digest import TagDigestTree, group_by_leaf, leaf_path
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+
+
+def resource(n: int, region: str = "us-east-1", **tags: str) -> dict:
+    return {
+        "arn": f"arn:aws:ec2:{region}:123456789012:instance/i-{n:04d}",
+        "resource_id": f"i-{n:04d}",
+        "resource_type": "ec2:instance",
+        "region": region,
+        "tags": tags,
+    }
+
+
+def inventory() -> list[dict]:
+    return [
+        resource(n, region, Owner="a")
+        for n in range(500)
+        for region in ("us-east-1", "eu-west-1")
+    ]
+
+
+def tree_of(resources: list[dict]) -> TagDigestTree:
+    return TagDigestTree.from_groups(group_by_leaf(resources))
+
+
+class TestTagDigestTree:
+    """Tests for building and comparing digest trees."""
+
+    def test_levels_and_counts(self):
+        """Test the tree has account, region, type and bucket levels with counts."""
+        tree = tree_of(inventory())
+
+        assert tree.nodes[("123456789012",)][1] == 1000
+        assert tree.nodes[("123456789012", "eu-west-1")][1] == 500
+        assert tree.nodes[("123456789012", "eu-west-1", "ec2:instance")][1] == 500
+        assert sum(count for _, count in tree.leaves.values()) == 1000
+
+    def test_digests_ignore_order_and_detect_changes(self):
+        """Test equal inventories give equal roots and one re-tag changes one leaf."""
+        resources = inventory()
+        before = tree_of(resources)
+        assert tree_of(list(reversed(resources))).nodes == before.nodes
+        assert before.changed_leaves(tree_of(resources)) == set()
+
+        resources[7] = resource(3, "eu-west-1", Owner="b")
+        after = tree_of(resources)
+
+        changed = after.changed_leaves(before)
+        assert len(changed) == 1
+        (leaf,) = changed
+        assert leaf[:3] == ("123456789012", "eu-west-1", "ec2:instance")
+        us_east = ("123456789012", "us-east-1")
+        assert after.nodes[us_east] == before.nodes[us_east]
+
+    def test_changed_leaves_include_removed_resources(self):
+        """Test leaves only in the previous tree are reported."""
+        resources = inventory()
+        before = tree_of(resources)
+        after = tree_of([r for r in resources if r["region"] == "us-east-1"])
+
+        changed = after.changed_leaves(before)
+        assert changed == {path for path in before.leaves if path[1] == "eu-west-1"}
+
+    def test_rows_round_trip(self):
+        """Test the persisted row form rebuilds the same tree."""
+        tree = tree_of(inventory())
+        assert TagDigestTree.from_rows(tree.iter_rows()).nodes == tree.nodes
+
+
+class TestDigestPersistence:
+    """Tests for digests stored with tag state recordings."""
+
+    @pytest.mark.asyncio
+    async def test_session_digests_reassembled_from_regions(self):
+        """Test a baseline recorded per region loads as one tree."""
+        store = TagStateService(db_path=":memory:")
+        resources = inventory()
+        for minute, region in enumerate(("us-east-1", "eu-west-1")):
+            await store.record_state(
+                [r for r in resources if r["region"] == region],
+                scanned_at=NOW - timedelta(days=7, minutes=-minute),
+            )
+
+        baseline = await store.find_baseline(7, now=NOW)
+        loaded = await store.load_digests(baseline)
+        store.close()
+
+        assert loaded.nodes == tree_of(resources).nodes
+
+    @pytest.mark.asyncio
+    async def test_diff_limited_to_changed_leaves(self):
+        """Test diff skips resources outside the given leaves."""
+        store = TagStateService(db_path=":memory:")
+        resources = inventory()
+        await store.record_state(resources, scanned_at=NOW - timedelta(days=7))
+        baseline = await store.find_baseline(7, now=NOW)
+
+        resources[0] = resource(0, Owner="b")
+        resources[1] = resource(0, "eu-west-1", Owner="b")
+        changed = tree_of(resources).changed_leaves(await store.load_digests(baseline))
+        us_leaf = {leaf for leaf in changed if leaf[1] == "us-east-1"}
+
+        changes = await store.diff(baseline, resources, leaves=us_leaf)
+        store.close()
+
+        assert len(changed) == 2
+        assert [c.region for c in changes] == ["us-east-1"]
+
+
+class TestIncrementalValidation:
+    """Tests for re-validating only resources in changed leaves."""
+
+    @pytest.fixture
+    def policy_service(self):
+        service = MagicMock(spec=PolicyService)
+        service.get_policy.return_value = TagPolicy(
+            version="1.0", required_tags=[{"name": "Owner", "description": "Owner"}]
+        )
+
+        def validate(resource_id, resource_type, region, tags, cost_impact):
+            if tags.get("Owner") == "a":
+                return []
+            return [
+                Violation(
+                    resource_id=resource_id,
+                    resource_type=resource_type,
+                    region=region,
+                    violation_type=ViolationType.INVALID_VALUE,
+                    tag_name="Owner",
+                    severity=Severity.ERROR,
+                )
+            ]
+
+        service.validate_resource_tags.side_effect = validate
+        return service
+
+    def test_unchanged_leaves_reuse_results(self, policy_service):
+        """Test a rescan validates only resources in leaves that changed."""
+        service = ComplianceService(
+            cache=None,
+            aws_client=MagicMock(spec=AWSClient),
+            policy_service=policy_service,
+            validation_cache=ValidationCache(),
+        )
+        resources = inventory()
+        violations, compliant = service._validate_incrementally(resources)
+        assert (len(violations), compliant) == (0, 1000)
+        assert policy_service.validate_resource_tags.call_count == 1000
+
+        resources[7] = resource(3, "eu-west-1", Owner="b")
+        policy_service.validate_resource_tags.reset_mock()
+        violations, compliant = service._validate_incrementally(resources)
+
+        changed_leaf = leaf_path(resources[7]["arn"], "eu-west-1", "ec2:instance")
+        leaf_size = len(group_by_leaf(resources)[changed_leaf])
+        assert policy_service.validate_resource_tags.call_count == leaf_size < 20
+        assert [v.resource_id for v in violations] == ["i-0003"]
+        assert compliant == 999
+
+    def test_policy_change_discards_results(self, policy_service):
+        """Test results cached under one policy are not reused under another."""
+        cache = ValidationCache()
+        service = ComplianceService(
+            cache=None,
+            aws_client=MagicMock(spec=AWSClient),
+            policy_service=policy_service,
+            validation_cache=cache,
+        )
+        resources = inventory()[:100]
+        service._validate_incrementally(resources)
+
+        policy_service.get_policy.return_value = TagPolicy(
+            version="2.0", required_tags=[{"name": "Owner", "description": "Owner"}]
+        )
+        service._validate_incrementally(resources)
+
+        assert policy_service.validate_resource_tags.call_count == 200
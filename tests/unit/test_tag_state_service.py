@@ -0,0 +1,270 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Tests for the per-resource tag state store and state-based drift detection."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from mcp_server.clients.aws_client import AWSClient
+from mcp_server.models.inventory import ResourceInventory
+from mcp_server.models.policy import TagPolicy
+from mcp_server.services.policy_service import PolicyService
+from mcp_server.services.tag_state_service import TagStateService
+from mcp_server.tools.detect_tag_drift import detect_tag_drift
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+
+
+def ec2(n: int, region: str = "us-east-1", **tags: str) -> dict:
+    return {
+        "arn": f"arn:aws:ec2:{region}:123456789012:instance/i-{n:04d}",
+        "resource_type": "ec2:instance",
+        "region": region,
+        "tags": tags,
+    }
+
+
+@pytest.fixture
+def policy_service():
+    service = MagicMock(spec=PolicyService)
+    service.get_policy.return_value = TagPolicy(
+        version="1.0",
+        required_tags=[{"name": "Owner", "description": "Owner"}],
+        optional_tags=[{"name": "Project", "description": "Project"}],
+    )
+    return service
+
+
+@pytest.fixture
+def store():
+    service = TagStateService(db_path=":memory:", retention_days=30)
+    yield service
+    service.close()
+
+
+async def row_count(store: TagStateService, table: str) -> int:
+    (row,) = await store._pool.fetchall(f"SELECT COUNT(*) FROM {table}")
+    return row[0]
+
+
+class TestTagStateService:
+    """Tests for recording, baselines and diffs."""
+
+    @pytest.mark.asyncio
+    async def test_tag_sets_deduplicated_and_unchanged_rows_extended(self, store):
+        """Test shared tag sets are stored once and rescans only add changed rows."""
+        resources = [ec2(n, Owner="team-a") for n in range(100)]
+        await store.record_state(resources, scanned_at=NOW - timedelta(days=2))
+        assert await row_count(store, "tag_sets") == 1
+        assert await row_count(store, "resource_tag_state") == 100
+
+        resources[5] = ec2(5, Owner="team-b")
+        await store.record_state(resources, scanned_at=NOW - timedelta(days=1))
+
+        assert await row_count(store, "tag_sets") == 2
+        assert await row_count(store, "resource_tag_state") == 101
+        ((last_seen,),) = await store._pool.fetchall(
+            "SELECT MAX(last_seen) FROM resource_tag_state WHERE tag_hash = ("
+            "SELECT tag_hash FROM resource_tag_state WHERE arn LIKE '%i-0000')"
+        )
+        assert last_seen == (NOW - timedelta(days=1)).isoformat()
+
+    @pytest.mark.asyncio
+    async def test_find_baseline_nearest_scan_session(self, store):
+        """Test the baseline is the scan session nearest to the lookback target."""
+        assert await store.find_baseline(7, now=NOW) is None
+
+        for days in (10, 6):
+            start = NOW - timedelta(days=days)
+            # One scan recorded per region, a minute apart
+            for region_offset in range(3):
+                await store.record_state(
+                    [ec2(region_offset)], scanned_at=start + timedelta(minutes=region_offset)
+                )
+
+        baseline = await store.find_baseline(7, now=NOW)
+
+        assert baseline.started_at == NOW - timedelta(days=6)
+        assert baseline.scanned_at == NOW - timedelta(days=6) + timedelta(minutes=2)
+        assert baseline.resource_count == 3
+
+    @pytest.mark.asyncio
+    async def test_diff_reports_changed_added_and_removed(self, store):
+        """Test the merge diff finds re-tagged, new and vanished resources."""
+        baseline_resources = [ec2(n, Owner="a") for n in range(5)]
+        await store.record_state(baseline_resources, scanned_at=NOW - timedelta(days=7))
+        baseline = await store.find_baseline(7, now=NOW)
+
+        current = [ec2(n, Owner="a") for n in (0, 1, 3)] + [ec2(4, Owner="b"), ec2(9)]
+        changes = {c.arn[-6:]: c for c in await store.diff(baseline, current)}
+
+        assert set(changes) == {"i-0002", "i-0004", "i-0009"}
+        assert changes["i-0002"].new_tags is None
+        assert changes["i-0004"].old_tags == {"Owner": "a"}
+        assert changes["i-0004"].new_tags == {"Owner": "b"}
+        assert changes["i-0009"].old_tags is None
+        assert (await store.diff(baseline, current, ["s3:bucket"]))[0].arn.endswith("i-0000")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_recordings_go_through_the_writer(self, tmp_path):
+        """Test regional recordings made at once are all written by the pool's writer."""
+        store = TagStateService(db_path=str(tmp_path / "tag_state.db"))
+        try:
+            await asyncio.gather(
+                *(
+                    store.record_state([ec2(n, Owner="a")], scanned_at=NOW + timedelta(seconds=n))
+                    for n in range(5)
+                )
+            )
+            assert await row_count(store, "resource_tag_state") == 5
+            assert store._pool.stats.writes == 5
+        finally:
+            store.close()
+
+    @pytest.mark.asyncio
+    async def test_retention_purges_unseen_resources(self, store):
+        """Test state not seen within retention_days is deleted with its tag sets."""
+        await store.record_state([ec2(1, Owner="old")], scanned_at=NOW - timedelta(days=40))
+        await store.record_state([ec2(2, Owner="new")], scanned_at=NOW)
+
+        assert await row_count(store, "resource_tag_state") == 1
+        assert await row_count(store, "tag_sets") == 1
+        assert await row_count(store, "tag_state_scans") == 1
+
+
+class TestDriftFromTagState:
+    """Tests for detect_tag_drift with a recorded baseline."""
+
+    @pytest.mark.asyncio
+    async def test_drift_compares_against_recorded_tags(self, store, policy_service):
+        """Test tag-level drift, resource counts and that the run records state."""
+        aws_client = MagicMock(spec=AWSClient)
+        aws_client.region = "us-east-1"
+        aws_client.get_all_tagged_resources = AsyncMock(
+            return_value=[
+                ec2(1, Owner="a", Project="x"),
+                ec2(2, Project="x"),
+                ec2(3, Owner="c"),
+                ec2(4),
+            ]
+        )
+        recorded_at = datetime.now(UTC) - timedelta(days=7)
+        await store.record_state(
+            [ec2(1, Owner="a", Project="x"), ec2(2, Owner="b"), ec2(3, Owner="a"), ec2(5)],
+            scanned_at=recorded_at,
+        )
+
+        result = await detect_tag_drift(
+            aws_client=aws_client,
+            policy_service=policy_service,
+            resource_types=["ec2:instance"],
+            tag_keys=["Owner"],
+            tag_state_service=store,
+        )
+
+        assert result.baseline_source == "tag_state"
+        assert result.baseline_timestamp == recorded_at.isoformat()
+        assert result.resources_added == 1
+        assert result.resources_removed == 1
+        drifts = {(d.resource_id, d.drift_type): d for d in result.drift_detected}
+        assert set(drifts) == {("i-0002", "removed"), ("i-0003", "changed")}
+        assert drifts[("i-0002", "removed")].severity == "critical"
+        assert drifts[("i-0003", "changed")].old_value == "a"
+        assert await row_count(store, "tag_state_scans") == 2
+
+    @pytest.mark.asyncio
+    async def test_multi_region_drift_lists_every_region(self, store, policy_service):
+        """Test a two-region baseline is compared against both regions' listings."""
+        recorded_at = datetime.now(UTC) - timedelta(days=7)
+        await store.record_state(
+            [ec2(1, Owner="a"), ec2(2, "eu-west-1", Owner="b"), ec2(3, "eu-west-1", Owner="c")],
+            scanned_at=recorded_at,
+        )
+        aws_client = MagicMock(spec=AWSClient)
+        aws_client.region = "us-east-1"
+        scanner = MagicMock()
+        scanner.multi_region_enabled = True
+        scanner.fetch_inventory = AsyncMock(
+            return_value=ResourceInventory(
+                resources_by_region={
+                    "us-east-1": [ec2(1, Owner="a")],
+                    "eu-west-1": [
+                        ec2(2, "eu-west-1", Owner="b"),
+                        ec2(3, "eu-west-1", Owner="x"),
+                    ],
+                }
+            )
+        )
+
+        result = await detect_tag_drift(
+            aws_client=aws_client,
+            policy_service=policy_service,
+            resource_types=["ec2:instance"],
+            multi_region_scanner=scanner,
+            tag_state_service=store,
+        )
+
+        aws_client.get_all_tagged_resources.assert_not_called()
+        assert result.resources_analyzed == 3
+        assert (result.resources_added, result.resources_removed) == (0, 0)
+        (drift,) = result.drift_detected
+        assert (drift.region, drift.old_value, drift.new_value) == ("eu-west-1", "c", "x")
+
+    @pytest.mark.asyncio
+    async def test_multi_region_drift_ignores_types_that_failed_to_list(
+        self, store, policy_service
+    ):
+        """Test a type that failed to list in a region isn't reported as removed there."""
+        recorded_at = datetime.now(UTC) - timedelta(days=7)
+        await store.record_state(
+            [ec2(1, Owner="a"), ec2(2, "eu-west-1", Owner="b")],
+            scanned_at=recorded_at,
+        )
+        aws_client = MagicMock(spec=AWSClient)
+        aws_client.region = "us-east-1"
+        scanner = MagicMock()
+        scanner.multi_region_enabled = True
+        scanner.fetch_inventory = AsyncMock(
+            return_value=ResourceInventory(
+                resources_by_region={"us-east-1": [ec2(1, Owner="a")], "eu-west-1": []},
+                failed_resource_types={"eu-west-1": ["ec2:instance"]},
+            )
+        )
+
+        result = await detect_tag_drift(
+            aws_client=aws_client,
+            policy_service=policy_service,
+            resource_types=["ec2:instance"],
+            multi_region_scanner=scanner,
+            tag_state_service=store,
+        )
+
+        assert (result.resources_added, result.resources_removed) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_single_region_drift_ignores_other_regions(self, store, policy_service):
+        """Test baseline resources in regions that weren't listed aren't reported removed."""
+        recorded_at = datetime.now(UTC) - timedelta(days=7)
+        await store.record_state(
+            [ec2(1, Owner="a"), ec2(2, Owner="b"), ec2(3, "eu-west-1", Owner="c")],
+            scanned_at=recorded_at,
+        )
+        aws_client = MagicMock(spec=AWSClient)
+        aws_client.region = "us-east-1"
+        aws_client.get_all_tagged_resources = AsyncMock(return_value=[ec2(1, Owner="a")])
+
+        result = await detect_tag_drift(
+            aws_client=aws_client,
+            policy_service=policy_service,
+            resource_types=["ec2:instance"],
+            tag_state_service=store,
+        )
+
+        # Only i-0002 is gone; eu-west-1 wasn't listed
+        assert (result.resources_added, result.resources_removed) == (0, 1)
+        assert result.drift_detected == []
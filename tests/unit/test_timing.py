@@ -0,0 +1,198 @@
+# Copyright (c) 2025-2026 OptimNow. All Rights Reserved.
+# Licensed under the Apache License, Version 2.0.
+# See LICENSE file in the project root for full license information.
+
+"""Tests for per-request stage timings and their audit rollups."""
+
+import asyncio
+import json
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_server import stdio_server
+from mcp_server.models.audit import AuditStatus
+from mcp_server.services.audit_service import AuditService
+from mcp_server.services.metrics_service import MetricsService
+from mcp_server.utils.timing import (
+    clear_request_timings,
+    get_request_timings,
+    span,
+    start_request_timings,
+)
+
+
+@pytest.fixture
+def audit_service(tmp_path):
+    service = AuditService(db_path=str(tmp_path / "audit.db"))
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def container(audit_service, monkeypatch):
+    container = SimpleNamespace(
+        audit_service=audit_service,
+        settings=SimpleNamespace(
+            timings_enabled=True, timings_in_response=True, aws_calls_in_response=True
+        ),
+    )
+    monkeypatch.setattr(stdio_server, "_container", container)
+    return container
+
+
+class TestSpans:
+    """Tests for recording stage durations."""
+
+    def test_span_without_timings_is_a_no_op(self):
+        """Test spans outside a timed request record nothing."""
+        clear_request_timings()
+        with span("fetch"):
+            pass
+        assert get_request_timings() is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_share_request_timings(self):
+        """Test spans in child tasks add up in the request's totals."""
+        timings = start_request_timings()
+
+        async def fetch(delay: float) -> None:
+            with span("fetch"):
+                await asyncio.sleep(delay)
+
+        try:
+            await asyncio.gather(fetch(0.02), fetch(0.05), fetch(0.02))
+        finally:
+            clear_request_timings()
+
+        stage = timings.stages["fetch"]
+        assert stage.count == 3
+        assert stage.max_ms >= 50
+        assert stage.total_ms >= 90
+
+    def test_span_records_on_exception(self):
+        """Test a stage that raises is still timed."""
+        timings = start_request_timings()
+        try:
+            with pytest.raises(ValueError):
+                with span("validate"):
+                    raise ValueError("bad resource")
+        finally:
+            clear_request_timings()
+        assert timings.stage_dict()["validate"]["count"] == 1
+
+
+class TestInstrumentedTools:
+    """Tests for the stdio tool wrapper."""
+
+    @pytest.mark.asyncio
+    async def test_response_timings_and_audit_entry(self, container, audit_service):
+        """Test the timings block and the audited stage timings of a tool call."""
+
+        @stdio_server._instrumented
+        async def scan_tool(resource_types: list[str]) -> str:
+            with span("fetch"):
+                await asyncio.sleep(0.01)
+            return stdio_server._to_json({"total_resources": 3})
+
+        response = json.loads(await scan_tool(resource_types=["ec2:instance"]))
+
+        assert response["total_resources"] == 3
+        assert response["timings"]["stages"]["fetch"]["count"] == 1
+        assert response["timings"]["total_ms"] >= 10
+        (entry,) = await audit_service.get_logs()
+        assert entry.tool_name == "scan_tool"
+        assert entry.status == AuditStatus.SUCCESS
+        assert entry.parameters == {"resource_types": ["ec2:instance"]}
+        assert entry.correlation_id
+        assert set(entry.stage_timings) == {"fetch", "serialize"}
+        assert get_request_timings() is None
+
+    @pytest.mark.asyncio
+    async def test_disabled_timings(self, container, audit_service):
+        """Test no timings are collected or returned when disabled."""
+        container.settings.timings_enabled = False
+
+        @stdio_server._instrumented
+        async def scan_tool() -> str:
+            with span("fetch"):
+                pass
+            return stdio_server._to_json({"error": "invalid_page_size", "message": "too big"})
+
+        response = json.loads(await scan_tool())
+
+        assert "timings" not in response
+        (entry,) = await audit_service.get_logs()
+        assert entry.status == AuditStatus.FAILURE
+        assert entry.error_message == "too big"
+        assert entry.stage_timings is None
+
+
+class TestStageRollups:
+    """Tests for stage timings aggregated from the audit log."""
+
+    @pytest.mark.asyncio
+    async def test_stage_timing_stats(self, audit_service):
+        """Test per-tool, per-stage totals across invocations."""
+        for total_ms in (100.0, 300.0):
+            audit_service.log_invocation(
+                tool_name="check_tag_compliance",
+                parameters={},
+                status=AuditStatus.SUCCESS,
+                stage_timings={
+                    "fetch": {"count": 4, "total_ms": total_ms, "max_ms": total_ms / 2},
+                    "serialize": {"count": 1, "total_ms": 1.0, "max_ms": 1.0},
+                },
+            )
+        audit_service.log_invocation(
+            tool_name="suggest_tags", parameters={}, status=AuditStatus.SUCCESS
+        )
+
+        stats = await MetricsService(audit_service=audit_service).get_stage_timing_stats()
+
+        assert [(s.tool_name, s.stage) for s in stats] == [
+            ("check_tag_compliance", "fetch"),
+            ("check_tag_compliance", "serialize"),
+        ]
+        fetch = stats[0]
+        assert (fetch.invocation_count, fetch.span_count) == (2, 8)
+        assert fetch.total_time_ms == pytest.approx(400.0)
+        assert fetch.average_time_per_invocation_ms == pytest.approx(200.0)
+        assert fetch.max_span_ms == 150.0
+
+    @pytest.mark.asyncio
+    async def test_log_without_stage_column_is_migrated(self, tmp_path):
+        """Test an audit log created before stage timings gains the column."""
+        path = str(tmp_path / "audit.db")
+        conn = sqlite3.connect(path)
+        conn.execute(
+            """
+            CREATE TABLE audit_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                tool_name TEXT NOT NULL,
+                parameters TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error_message TEXT,
+                execution_time_ms REAL,
+                correlation_id TEXT
+            )
+            """
+        )
+        conn.commit()
+        conn.close()
+
+        service = AuditService(db_path=path)
+        try:
+            service.log_invocation(
+                tool_name="check_tag_compliance",
+                parameters={},
+                status=AuditStatus.SUCCESS,
+                stage_timings={"fetch": {"count": 1, "total_ms": 5.0, "max_ms": 5.0}},
+            )
+            (rollup,) = await service.get_stage_rollups()
+        finally:
+            service.close()
+
+        assert (rollup.stage, rollup.spans, rollup.total_ms) == ("fetch", 1, 5.0)